@@ -0,0 +1,308 @@
+"""
+Saved-search alerts, matched against new articles as they are indexed.
+
+Editors' standing queries (party names, constituencies, reporters) are
+stored as percolator queries in ALERTS_INDEX, built by es_queries.build_query
+from the same filters search_articles takes. Instead of re-running every
+saved search against the whole index after each crawl, every committed bulk
+batch is percolated in one request: Elasticsearch runs the saved queries
+against just the new documents, so alerting cost grows with new articles,
+not with the index.
+
+Matches are handed to a dispatcher: a POST of the batch's alerts to
+ALERTS_WEBHOOK if set, otherwise one JSON line per alert appended to
+ALERTS_QUEUE_FILE for a local consumer to tail.
+
+Usage:
+    python alerts.py --add "BNP" --q বিএনপি --owner desk
+    python alerts.py --add "Dhaka-10" --q ঢাকা-১০ --start-date 2025-01-01
+    python alerts.py --add "Staff reporter" --author "নিজস্ব প্রতিবেদক"
+    python alerts.py --list
+    python alerts.py --delete desk%2FBNP
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import requests
+from elasticsearch.exceptions import NotFoundError
+
+from article_feed import summarize_article
+from es_connector import get_es_client
+from es_queries import build_query
+from index_mappings import (
+    CURRENT_MAPPING_VERSION,
+    PERCOLATOR_EXCLUDED_FIELDS,
+    get_saved_search_index_definition,
+)
+
+logger = logging.getLogger(__name__)
+
+ALERTS_INDEX = os.environ.get("ALERTS_INDEX", "prothomalo_saved_searches")
+ALERTS_WEBHOOK = os.environ.get("ALERTS_WEBHOOK")  # POST target for alerts, queue file if unset
+ALERTS_QUEUE_FILE = os.environ.get("ALERTS_QUEUE_FILE", "alerts.jsonl")
+WEBHOOK_TIMEOUT = 2  # seconds; the scraper waits for the webhook between batches
+MAX_MATCHING_SEARCHES = 1000  # saved searches returned per percolated batch
+
+# build_query arguments a saved search may use (search_articles' filters)
+SAVED_SEARCH_FILTERS = (
+    "query", "author", "location", "start_date", "end_date",
+    "min_word_count", "max_word_count", "headline",
+)
+
+
+def saved_search_id(name: str, owner: Optional[str] = None) -> str:
+    """Document ID of a saved search; saving the same name again replaces it."""
+    return quote(f"{owner}/{name}" if owner else name, safe="")
+
+
+def build_saved_search(name: str, owner: Optional[str] = None, **filters) -> Dict[str, Any]:
+    """
+    Builds a saved-search document.
+
+    Args:
+        name: Display name of the search
+        owner: Editor or desk the alerts are for
+        **filters: search_articles filters (query, author, location, start_date, ...)
+
+    Returns:
+        dict: Document for the saved-search index
+    """
+    unknown = set(filters) - set(SAVED_SEARCH_FILTERS)
+    if unknown:
+        raise ValueError(f"Unknown saved search filters: {', '.join(sorted(unknown))}")
+    filters = {key: value for key, value in filters.items() if value not in (None, "")}
+    if not filters:
+        raise ValueError("A saved search needs at least one filter")
+
+    return {
+        "name": name,
+        "owner": owner,
+        "filters": filters,
+        "created_at": datetime.now().isoformat(),
+        "query": build_query(**filters),
+    }
+
+
+def percolate_document(article: Dict[str, Any]) -> Dict[str, Any]:
+    """The article fields saved queries can match (vectors etc. would only slow parsing)."""
+    return {key: value for key, value in article.items() if key not in PERCOLATOR_EXCLUDED_FIELDS}
+
+
+class WebhookDispatcher:
+    """POSTs each batch's alerts as {"alerts": [...]} to a URL."""
+
+    def __init__(self, url: str, timeout: float = WEBHOOK_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def dispatch(self, alerts: List[Dict[str, Any]]) -> bool:
+        try:
+            response = self.session.post(self.url, json={"alerts": alerts}, timeout=self.timeout)
+            response.raise_for_status()
+            return True
+        except requests.RequestException as e:
+            logger.error(f"Failed to deliver {len(alerts)} alerts to {self.url}: {e}")
+            return False
+
+
+class QueueFileDispatcher:
+    """Appends one JSON line per alert to a local queue file."""
+
+    def __init__(self, path: str = ALERTS_QUEUE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def dispatch(self, alerts: List[Dict[str, Any]]) -> bool:
+        lines = "".join(json.dumps(alert, ensure_ascii=False) + "\n" for alert in alerts)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            return True
+        except OSError as e:
+            logger.error(f"Failed to queue {len(alerts)} alerts in {self.path}: {e}")
+            return False
+
+
+def get_alert_dispatcher():
+    """The webhook dispatcher if ALERTS_WEBHOOK is set, otherwise the queue file."""
+    if ALERTS_WEBHOOK:
+        return WebhookDispatcher(ALERTS_WEBHOOK)
+    return QueueFileDispatcher(ALERTS_QUEUE_FILE)
+
+
+class SavedSearchAlerts:
+    """Saved searches in a percolator index; a batch listener that raises their alerts."""
+
+    def __init__(self, index: str = ALERTS_INDEX, dispatcher=None, es_client=None):
+        self.index = index
+        self.dispatcher = dispatcher or get_alert_dispatcher()
+        self._es_client = es_client
+
+    @property
+    def es_client(self):
+        # Shared process-wide client unless one was given explicitly
+        return self._es_client or get_es_client()
+
+    def create_index_if_not_exists(self) -> bool:
+        """Creates the saved-search index with the current article field mappings."""
+        try:
+            if self.es_client.indices.exists(index=self.index):
+                return True
+            self.es_client.indices.create(index=self.index, body=get_saved_search_index_definition())
+            logger.info(f"Created saved-search index '{self.index}' (article mapping v{CURRENT_MAPPING_VERSION})")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to create saved-search index: {e}")
+            return False
+
+    def save_search(self, name: str, owner: Optional[str] = None, **filters) -> Optional[str]:
+        """
+        Stores a saved search; it applies to batches indexed from then on.
+
+        Returns:
+            str: ID of the saved search, or None on failure
+        """
+        try:
+            document = build_saved_search(name, owner, **filters)
+            if not self.create_index_if_not_exists():
+                return None
+            search_id = saved_search_id(name, owner)
+            # Visible to the next percolation as soon as this returns
+            self.es_client.index(index=self.index, id=search_id, body=document, refresh="wait_for")
+            logger.info(f"Saved search '{name}' ({search_id})")
+            return search_id
+        except Exception as e:
+            logger.error(f"Failed to save search '{name}': {e}")
+            return None
+
+    def delete_search(self, search_id: str) -> bool:
+        try:
+            self.es_client.delete(index=self.index, id=search_id, refresh="wait_for")
+            logger.info(f"Deleted saved search {search_id}")
+            return True
+        except NotFoundError:
+            logger.warning(f"Saved search {search_id} not found")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to delete saved search {search_id}: {e}")
+            return False
+
+    def list_searches(self) -> List[Dict[str, Any]]:
+        try:
+            response = self.es_client.search(
+                index=self.index,
+                body={"size": 1000, "_source": ["name", "owner", "filters", "created_at"],
+                      "sort": [{"owner": "asc"}, {"name": "asc"}]}
+            )
+            return [{"id": hit["_id"], **hit["_source"]} for hit in response["hits"]["hits"]]
+        except NotFoundError:
+            return []
+        except Exception as e:
+            logger.error(f"Failed to list saved searches: {e}")
+            return []
+
+    def percolate_batch(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Runs every saved search against a batch of articles in one request.
+
+        Returns:
+            list: One alert per (saved search, matching article) pair
+        """
+        response = self.es_client.search(
+            index=self.index,
+            body={
+                "size": MAX_MATCHING_SEARCHES,
+                "_source": ["name", "owner"],
+                "query": {
+                    "percolate": {
+                        "field": "query",
+                        "documents": [percolate_document(article) for article in articles]
+                    }
+                }
+            }
+        )
+        hits = response["hits"]["hits"]
+        if response["hits"]["total"]["value"] > len(hits):
+            logger.warning(f"More than {len(hits)} saved searches matched one batch; the rest were dropped")
+
+        matched_at = datetime.now().isoformat()
+        alerts = []
+        for hit in hits:
+            # Slots are the positions of the matching documents in the batch
+            for slot in hit.get("fields", {}).get("_percolator_document_slot", [0]):
+                alerts.append({
+                    "search_id": hit["_id"],
+                    "name": hit["_source"].get("name"),
+                    "owner": hit["_source"].get("owner"),
+                    "matched_at": matched_at,
+                    "article": summarize_article(articles[slot]),
+                })
+        return alerts
+
+    def update_batch(self, articles: List[Dict[str, Any]]) -> bool:
+        """
+        Batch listener: percolates a committed batch and dispatches its alerts.
+
+        Returns:
+            bool: True unless percolation or delivery failed
+        """
+        if not articles:
+            return True
+        try:
+            alerts = self.percolate_batch(articles)
+        except NotFoundError:
+            return True  # nothing saved yet
+        except Exception as e:
+            logger.error(f"Failed to percolate {len(articles)} articles: {e}")
+            return False
+
+        if not alerts:
+            return True
+        logger.info(f"{len(alerts)} saved-search alerts for {len(articles)} new articles")
+        return self.dispatcher.dispatch(alerts)
+
+
+def main():
+    """Manages saved searches from the command line."""
+    parser = argparse.ArgumentParser(description="Manage saved-search alerts")
+    parser.add_argument("--add", metavar="NAME", help="Save a search under this name")
+    parser.add_argument("--owner", help="Editor or desk the alerts are for")
+    parser.add_argument("--q", dest="query", help="Text to match in headline and content")
+    parser.add_argument("--author", help="Exact author name")
+    parser.add_argument("--location", help="Location")
+    parser.add_argument("--headline", help="Exact headline")
+    parser.add_argument("--start-date", help="Earliest publication date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="Latest publication date (YYYY-MM-DD)")
+    parser.add_argument("--min-word-count", type=int)
+    parser.add_argument("--max-word-count", type=int)
+    parser.add_argument("--list", action="store_true", help="Print the saved searches")
+    parser.add_argument("--delete", metavar="ID", help="Delete a saved search")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    alerts = SavedSearchAlerts()
+
+    if args.list:
+        for search in alerts.list_searches():
+            print(f"{search['id']}\t{search.get('owner') or '-'}\t{search['name']}\t"
+                  f"{json.dumps(search['filters'], ensure_ascii=False)}")
+        return
+    if args.delete:
+        sys.exit(0 if alerts.delete_search(args.delete) else 1)
+    if args.add:
+        filters = {key: getattr(args, key) for key in SAVED_SEARCH_FILTERS}
+        sys.exit(0 if alerts.save_search(args.add, args.owner, **filters) else 1)
+    parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
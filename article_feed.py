@@ -0,0 +1,159 @@
+"""
+Local pub/sub for newly indexed articles.
+
+Scrapers publish compact summaries of every bulk batch they index; backend
+workers subscribe and push them to browsers (see the /api/news/stream/ SSE
+endpoint) without querying Elasticsearch.
+
+Transport: each subscriber binds its own Unix datagram socket inside
+FEED_SOCKET_DIR, and the publisher sends every message to each socket found
+there. This fans out to all backend worker processes on the host, costs the
+scraper one short send per subscriber (bounded by SEND_TIMEOUT, as a socket
+only queues a handful of datagrams), and silently does nothing when no
+backend is running. Sockets left behind by dead subscribers are removed by
+the publisher.
+"""
+
+import json
+import logging
+import os
+import socket
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+FEED_SOCKET_DIR = os.environ.get(
+    "FEED_SOCKET_DIR", os.path.join(tempfile.gettempdir(), "prothomalo-feed")
+)
+MAX_MESSAGE_BYTES = 64 * 1024  # keep datagrams well below the socket buffer size
+SEND_TIMEOUT = 0.2  # seconds to wait for a busy subscriber before dropping a message
+
+SUMMARY_FIELDS = ("url", "headline", "author", "location", "published_at", "excerpt")
+
+
+def summarize_article(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the compact form of an article sent to feed subscribers."""
+    summary = {field: article.get(field) for field in SUMMARY_FIELDS}
+    summary["_id"] = quote(article["url"], safe="")
+    return summary
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _chunk_messages(msg_type: str, key: str, items: List[Dict[str, Any]]) -> Iterable[bytes]:
+    """Splits items into as few datagrams as fit MAX_MESSAGE_BYTES."""
+    chunk: List[Dict[str, Any]] = []
+    for item in items:
+        candidate = _encode({"type": msg_type, key: chunk + [item]})
+        if chunk and len(candidate) > MAX_MESSAGE_BYTES:
+            yield _encode({"type": msg_type, key: chunk})
+            chunk = [item]
+        else:
+            chunk.append(item)
+    if chunk:
+        yield _encode({"type": msg_type, key: chunk})
+
+
+class FeedPublisher:
+    """Sends feed messages to every subscriber socket in the feed directory."""
+
+    def __init__(self, socket_dir: str = FEED_SOCKET_DIR):
+        self.socket_dir = socket_dir
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.settimeout(SEND_TIMEOUT)
+        # Event ids are "<stamp>-<publisher_id>": the stamp is a microsecond
+        # timestamp kept strictly increasing per publisher, and the publisher
+        # id tells apart scrapers that publish in the same microsecond
+        self.publisher_id = uuid.uuid4().hex[:12]
+        self.last_stamp = 0
+
+    def _subscribers(self) -> List[str]:
+        try:
+            return [
+                os.path.join(self.socket_dir, name)
+                for name in os.listdir(self.socket_dir)
+                if name.endswith(".sock")
+            ]
+        except FileNotFoundError:
+            return []
+
+    def send(self, payloads: Iterable[bytes]) -> None:
+        """Sends raw datagrams to all subscribers, dropping dead ones."""
+        subscribers = self._subscribers()
+        if not subscribers:
+            return
+
+        for payload in payloads:
+            for path in list(subscribers):
+                try:
+                    self.sock.sendto(payload, path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Subscriber process is gone
+                    subscribers.remove(path)
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+                except (BlockingIOError, socket.timeout):
+                    logger.warning(f"Feed subscriber {path} is not keeping up, message dropped")
+                except OSError as e:
+                    logger.warning(f"Failed to publish to feed subscriber {path}: {e}")
+
+    def publish_batch(self, articles: List[Dict[str, Any]]) -> None:
+        """Publishes summaries of a committed bulk batch. Never raises."""
+        try:
+            summaries = []
+            for article in articles:
+                summary = summarize_article(article)
+                self.last_stamp = max(time.time_ns() // 1000, self.last_stamp + 1)
+                summary["event_id"] = f"{self.last_stamp}-{self.publisher_id}"
+                summaries.append(summary)
+            self.send(_chunk_messages("articles", "articles", summaries))
+        except Exception as e:
+            logger.warning(f"Failed to publish feed batch: {e}")
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class FeedSubscriber:
+    """Non-blocking receiving end, one per subscribing process."""
+
+    def __init__(self, socket_dir: str = FEED_SOCKET_DIR):
+        os.makedirs(socket_dir, exist_ok=True)
+        self.path = os.path.join(socket_dir, f"{os.getpid()}.sock")
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self.sock.bind(self.path)
+        self.sock.setblocking(False)
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def receive(self) -> Optional[Dict[str, Any]]:
+        """Returns the next message, or None if nothing is waiting."""
+        try:
+            payload = self.sock.recv(MAX_MESSAGE_BYTES * 2)
+        except BlockingIOError:
+            return None
+        try:
+            return json.loads(payload.decode("utf-8"))
+        except ValueError:
+            logger.warning("Discarding malformed feed message")
+            return None
+
+    def close(self) -> None:
+        self.sock.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
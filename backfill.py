@@ -0,0 +1,517 @@
+"""
+Parallel historical backfill of the politics collection.
+
+Paging the collection API one page at a time enumerates years of coverage
+for hours before the first article is fetched. The backfill instead:
+
+1. Probes the largest page size the API honours (up to --limit) and the
+   collection depth (exponential then binary search over page numbers).
+2. Splits the skip range into shards that are paged concurrently. Each page's
+   URLs are checked against the index (one mget) and the new ones go straight
+   to a pool of article fetch workers, so scraping starts with the first page.
+3. Indexes scraped articles in BULK_INDEX_SIZE batches from the main thread.
+
+API pages and article fetches share one request budget (--rate requests per
+second across all threads). Progress is checkpointed per shard in a JSON
+state file: a shard's checkpoint only moves past a page once every new
+article on it has been indexed (or has failed), so an interrupted run
+(SIGTERM/SIGINT or a crash) resumes where it left off with the same command.
+A bulk batch that still fails after FLUSH_ATTEMPTS stops the run with its
+pages open.
+
+Stories published during the backfill push older ones to larger skips, so
+each shard reads one page past its end; duplicates are dropped by the mget.
+
+With --sitemaps the shards are the daily sitemaps in a date window instead
+(see sitemap.py), which reaches further back with a request per day; the
+rest of the pipeline is the same.
+
+Usage:
+    python backfill.py
+    python backfill.py --shards 8 --workers 4 --rate 4
+    python backfill.py --state backfill_state.json --fresh
+    python backfill.py --sitemaps --since 2024-01-01 --until 2024-06-30
+"""
+
+import argparse
+import json
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from frontier import indexed_urls
+from metrics import SCRAPER_QUEUE_DEPTH
+from pipeline_stats import PipelineRun
+from scraper import ProthomAloScraperEnhanced, logger
+from sitemap import SECTIONS, SitemapDiscovery
+from storage import ElasticsearchStore
+
+DEFAULT_SHARDS = 8
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = float(os.environ.get("BACKFILL_RATE", "4"))  # requests per second, all threads
+DEFAULT_LIMIT = 100  # page size to request; the probe falls back to what the API returns
+DEFAULT_STATE_FILE = "backfill_state.json"
+PAGE_ATTEMPTS = 3  # per page before a shard is left for the next run
+FLUSH_ATTEMPTS = 3  # per bulk batch before the backfill stops
+SITEMAP_CHUNK = 100  # sitemap entries per index check and checkpoint step
+OPEN_END = sys.maxsize  # end of a sitemap shard until it has been read
+URL_QUEUE_SIZE = 1000  # bounded so page fetchers can't run far ahead of article fetchers
+
+_DONE = object()
+
+
+class RateLimiter:
+    """Thread-safe pacing of requests to a fixed rate."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until the caller may send its next request."""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Shard:
+    """A contiguous range of API skips (or of a sitemap's entries) and its checkpoint."""
+
+    def __init__(self, start: int, end: int, next_skip: Optional[int] = None,
+                 step: int = 1, name: Optional[str] = None):
+        self.start = start
+        self.end = end
+        self.next_skip = start if next_skip is None else next_skip  # checkpoint
+        self.step = step  # positions per page
+        self.name = name  # sitemap URL for sitemap shards
+        self.pages = OrderedDict()  # skip -> articles on the page still in flight
+
+    @property
+    def done(self) -> bool:
+        return self.next_skip >= self.end
+
+    def to_dict(self) -> Dict[str, Any]:
+        state = {"start": self.start, "end": self.end, "next": self.next_skip, "step": self.step}
+        if self.name:
+            state["name"] = self.name
+        return state
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "Shard":
+        return cls(state["start"], state["end"], state["next"], state["step"], state.get("name"))
+
+
+class Backfill:
+    """Sharded, rate-limited, resumable backfill driven by one scraper."""
+
+    def __init__(self, scraper, shards: int = DEFAULT_SHARDS, workers: int = DEFAULT_WORKERS,
+                 rate: float = DEFAULT_RATE, limit: int = DEFAULT_LIMIT,
+                 state_file: str = DEFAULT_STATE_FILE):
+        self.scraper = scraper
+        # The backfill enumerates the archive itself; links inside articles are not followed
+        self.scraper.frontier = None
+        self.config = scraper.config
+        self.shard_count = shards
+        self.worker_count = workers
+        self.limiter = RateLimiter(rate)
+        self.requested_limit = limit
+        self.state_file = state_file
+        self.limit = self.config.STORIES_PER_PAGE
+        self.total = 0
+        self.shards: List[Shard] = []
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.urls = queue.Queue(maxsize=URL_QUEUE_SIZE)
+        self.results = queue.Queue()
+
+    def request_stop(self, signum=None, frame=None) -> None:
+        """Signal handler: stop fetching, index what was scraped, save the checkpoints."""
+        if not self.stop_event.is_set():
+            logger.info(f"Received signal {signum}, stopping backfill after the current batch")
+        self.stop_event.set()
+
+    # --- Planning ---
+
+    def _page(self, skip: int, limit: Optional[int] = None) -> List[str]:
+        self.limiter.acquire()
+        return self.scraper.fetch_api_page(skip, limit or self.limit)
+
+    def probe_limit(self) -> int:
+        """Largest page size the API returns, up to the requested limit."""
+        returned = len(self._page(0, self.requested_limit))
+        return max(returned, self.config.STORIES_PER_PAGE)
+
+    def probe_depth(self) -> int:
+        """Number of stories in the collection, to page granularity."""
+        if not self._page(0):
+            return 0
+
+        # Exponential search for an empty page, then binary search for the last full one
+        low, high = 0, 1
+        while self._page(high * self.limit):
+            low, high = high, high * 2
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self._page(middle * self.limit):
+                low = middle
+            else:
+                high = middle
+        return (low + 1) * self.limit
+
+    @property
+    def state_key(self) -> str:
+        """What is being backfilled; a saved state for anything else is ignored."""
+        return self.config.API_URL
+
+    def _load_state(self) -> bool:
+        if not os.path.exists(self.state_file):
+            return False
+        with open(self.state_file, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("collection") != self.state_key:
+            return False
+
+        self.limit = state["limit"]
+        self.total = state["total"]
+        self.shards = [Shard.from_dict(shard) for shard in state["shards"]]
+        remaining = sum(1 for shard in self.shards if not shard.done)
+        logger.info(f"Resuming backfill from {self.state_file}: {remaining} shards left")
+        return True
+
+    def plan(self, fresh: bool = False) -> None:
+        """Loads the saved shards or probes the collection and creates new ones."""
+        if not fresh and self._load_state():
+            return
+
+        self.limit = self.probe_limit()
+        self.total = self.probe_depth()
+        pages = -(-self.total // self.limit)
+        per_shard = max(1, -(-pages // self.shard_count))
+        self.shards = [
+            Shard(page * self.limit, min(page + per_shard, pages) * self.limit, step=self.limit)
+            for page in range(0, pages, per_shard)
+        ]
+        logger.info(f"Collection holds about {self.total} stories; {len(self.shards)} shards "
+                    f"of up to {per_shard} pages with limit={self.limit}")
+        self.save_state()
+
+    def save_state(self) -> None:
+        with self.lock:
+            state = {
+                "collection": self.state_key,
+                "limit": self.limit,
+                "total": self.total,
+                "shards": [shard.to_dict() for shard in self.shards]
+            }
+        tmp = f"{self.state_file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self.state_file)
+
+    # --- Checkpoints ---
+
+    def _open_page(self, shard: Shard, skip: int, count: int) -> None:
+        with self.lock:
+            shard.pages[skip] = count
+            self._advance(shard)
+
+    def _complete(self, shard: Shard, skip: int) -> None:
+        with self.lock:
+            shard.pages[skip] -= 1
+            self._advance(shard)
+
+    def _advance(self, shard: Shard) -> None:
+        # Caller holds the lock; moves the checkpoint past leading finished pages
+        while shard.pages:
+            skip, remaining = next(iter(shard.pages.items()))
+            if remaining > 0:
+                return
+            shard.pages.popitem(last=False)
+            shard.next_skip = max(shard.next_skip, skip + shard.step)
+
+    # --- Threads ---
+
+    def _page_shard(self, shard: Shard) -> None:
+        """Pages one shard (plus one overlap page) and queues its new URLs."""
+        skip = shard.next_skip
+        attempts = 0
+        while skip < shard.end + self.limit and not self.stop_event.is_set():
+            try:
+                urls = self._page(skip)
+            except Exception as e:
+                self.scraper.run_stats.record_failure("api_page", e)
+                attempts += 1
+                if attempts >= PAGE_ATTEMPTS:
+                    logger.error(f"Giving up on shard at skip={skip} until the next run: {e}")
+                    return
+                logger.warning(f"Backfill page skip={skip} failed, retrying: {e}")
+                self.stop_event.wait(5)
+                continue
+            attempts = 0
+            if not urls:
+                with self.lock:
+                    shard.end = min(shard.end, skip)  # reached the end of the collection
+                break
+
+            if not self._queue_page(shard, skip, urls):
+                return
+            skip += self.limit
+
+    def _queue_page(self, shard: Shard, skip: int, urls: List[str]) -> bool:
+        """Queues a page's URLs that are not indexed yet; False once stopping."""
+        try:
+            indexed = indexed_urls(self.scraper.es_client, self.config.ES_INDEX, urls)
+        except Exception as e:
+            logger.warning(f"Index check failed for skip={skip}, fetching the whole page: {e}")
+            indexed = set()
+        new_urls = [url for url in urls if url not in indexed]
+        self.scraper.run_stats.count("discovered", len(new_urls))
+        self._open_page(shard, skip, len(new_urls))
+        for url in new_urls:
+            if self.stop_event.is_set():
+                return False
+            self.urls.put((shard, skip, url))
+        return True
+
+    def _fetch_articles(self) -> None:
+        """Article fetch worker."""
+        while True:
+            item = self.urls.get()
+            if item is _DONE:
+                self.results.put(_DONE)
+                return
+            if self.stop_event.is_set():
+                continue  # drain; the checkpoint keeps these pages for the next run
+            shard, skip, url = item
+            self.limiter.acquire()
+            self.results.put((shard, skip, self.scraper.scrape_single_article(url)))
+
+    def _page_shards(self, pending: "queue.Queue[Shard]") -> None:
+        while not self.stop_event.is_set():
+            try:
+                shard = pending.get_nowait()
+            except queue.Empty:
+                return
+            self._page_shard(shard)
+
+    def _page_all_shards(self) -> None:
+        # At most --shards shards are paged at a time (sitemap runs have one per day)
+        pending = queue.Queue()
+        for shard in self.shards:
+            if not shard.done:
+                pending.put(shard)
+        pagers = [
+            threading.Thread(target=self._page_shards, args=(pending,), name=f"backfill-pager-{i}", daemon=True)
+            for i in range(min(self.shard_count, pending.qsize()))
+        ]
+        for thread in pagers:
+            thread.start()
+        for thread in pagers:
+            thread.join()
+        for _ in range(self.worker_count):
+            self.urls.put(_DONE)
+
+    def _flush(self, batch: List[Any]) -> bool:
+        """Indexes a batch and completes its pages; False (and stops) if indexing keeps failing."""
+        if not batch:
+            return True
+        articles = [article for _, _, article in batch]
+        for attempt in range(1, FLUSH_ATTEMPTS + 1):
+            if self.scraper.bulk_index_articles(articles):
+                break
+            if attempt < FLUSH_ATTEMPTS:
+                logger.warning(f"Indexing {len(articles)} backfilled articles failed, retrying")
+                time.sleep(5 * attempt)
+        else:
+            # Their pages stay open, so the next run fetches these articles again
+            logger.error(f"Stopping backfill: {len(articles)} articles could not be indexed")
+            self.stop_event.set()
+            return False
+
+        # Failed documents are reported by bulk_index_articles and not retried
+        for shard, skip, _ in batch:
+            self._complete(shard, skip)
+        self.save_state()
+        return True
+
+    def run(self, fresh: bool = False) -> bool:
+        """
+        Runs (or resumes) the backfill.
+
+        Args:
+            fresh: Ignore a saved state file and probe the collection again
+
+        Returns:
+            bool: True if every shard was completed
+        """
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+        # Known URLs are looked up in the index, so the articles must go there too
+        if not isinstance(self.scraper.store, ElasticsearchStore):
+            logger.error("Backfill needs ARTICLE_STORE=elasticsearch")
+            return False
+        if not self.scraper.connect_to_elasticsearch():
+            return False
+        if not self.scraper.create_index_if_not_exists():
+            return False
+
+        self.scraper.run_stats = PipelineRun(events_file=self.config.RUN_EVENTS_FILE)
+        complete = False
+        try:
+            self.plan(fresh)
+            workers = [
+                threading.Thread(target=self._fetch_articles, name=f"backfill-fetch-{i}", daemon=True)
+                for i in range(self.worker_count)
+            ]
+            for thread in workers:
+                thread.start()
+            threading.Thread(target=self._page_all_shards, name="backfill-pager", daemon=True).start()
+
+            batch = []
+            indexed = True
+            finished_workers = 0
+            while finished_workers < self.worker_count:
+                try:
+                    item = self.results.get(timeout=1)
+                except queue.Empty:
+                    continue
+                if item is _DONE:
+                    finished_workers += 1
+                    continue
+
+                shard, skip, article = item
+                if article is None:
+                    self._complete(shard, skip)
+                    continue
+                batch.append(item)
+                self.scraper.run_stats.count("scraped")
+                SCRAPER_QUEUE_DEPTH.labels("urls").set(self.urls.qsize())
+                SCRAPER_QUEUE_DEPTH.labels("bulk").set(len(batch))
+                if len(batch) >= self.config.BULK_INDEX_SIZE:
+                    indexed = self._flush(batch)
+                    if not indexed:
+                        break
+                    batch = []
+
+            if indexed:
+                self._flush(batch)
+            self.save_state()
+            complete = not self.stop_event.is_set() and all(shard.done for shard in self.shards)
+        except Exception as e:
+            logger.error(f"Backfill failed: {e}")
+        finally:
+            SCRAPER_QUEUE_DEPTH.labels("urls").set(0)
+            self.scraper.run_stats.finish(report_file=self.config.RUN_REPORT_FILE)
+
+        logger.info("Backfill complete" if complete else "Backfill stopped; resume with the same command")
+        return complete
+
+
+class SitemapBackfill(Backfill):
+    """
+    Backfill whose shards are the sitemaps covering a date window (sitemap.py).
+
+    Each sitemap is streamed, filtered by section and date, and queued in
+    chunks of SITEMAP_CHUNK URLs; its checkpoint counts finished chunks.
+    """
+
+    def __init__(self, scraper, discovery: SitemapDiscovery, **kwargs):
+        super().__init__(scraper, **kwargs)
+        self.discovery = discovery
+        self.discovery.throttle = self.limiter.acquire
+
+    @property
+    def state_key(self) -> str:
+        return f"sitemap:{self.discovery.key}"
+
+    def plan(self, fresh: bool = False) -> None:
+        if not fresh and self._load_state():
+            return
+
+        self.shards = [
+            Shard(0, OPEN_END, step=SITEMAP_CHUNK, name=loc) for loc in self.discovery.sitemaps()
+        ]
+        logger.info(f"{len(self.shards)} sitemaps cover the requested window")
+        self.save_state()
+
+    def _page_shard(self, shard: Shard) -> None:
+        """Streams one sitemap and queues its new URLs chunk by chunk."""
+        skip, chunk = shard.next_skip, []
+        try:
+            for position, url in enumerate(self.discovery.urls(shard.name)):
+                if self.stop_event.is_set():
+                    return
+                if position < shard.next_skip:
+                    continue
+                chunk.append(url)
+                if len(chunk) == shard.step:
+                    if not self._queue_page(shard, skip, chunk):
+                        return
+                    skip, chunk = skip + shard.step, []
+        except Exception as e:
+            self.scraper.run_stats.record_failure("sitemap", e)
+            logger.error(f"Sitemap {shard.name} failed, leaving it for the next run: {e}")
+            return
+
+        if chunk and not self._queue_page(shard, skip, chunk):
+            return
+        with self.lock:
+            shard.end = skip + len(chunk)
+            self._advance(shard)
+
+
+def main():
+    """Parses arguments and runs the backfill."""
+    parser = argparse.ArgumentParser(description="Backfill the politics collection in parallel shards")
+    parser.add_argument("--shards", type=int, default=DEFAULT_SHARDS,
+                        help=f"Skip-range shards paged concurrently (default: {DEFAULT_SHARDS})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Article fetch threads (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help=f"Requests per second across all threads (default: {DEFAULT_RATE:g})")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT,
+                        help=f"Stories per API page to ask for (default: {DEFAULT_LIMIT})")
+    parser.add_argument("--state", default=DEFAULT_STATE_FILE,
+                        help=f"Checkpoint file (default: {DEFAULT_STATE_FILE})")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Ignore the checkpoint file and start over")
+    parser.add_argument("--sitemaps", action="store_true",
+                        help="Discover articles from the sitemaps instead of the collection API")
+    parser.add_argument("--since", type=date.fromisoformat, default=None,
+                        help="With --sitemaps: first day to backfill (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, default=None,
+                        help="With --sitemaps: last day to backfill (YYYY-MM-DD)")
+    parser.add_argument("--sections", default=",".join(SECTIONS),
+                        help=f"With --sitemaps: comma-separated site sections (default: {','.join(SECTIONS)})")
+    args = parser.parse_args()
+
+    scraper = ProthomAloScraperEnhanced()
+    options = dict(shards=args.shards, workers=args.workers, rate=args.rate,
+                   limit=args.limit, state_file=args.state)
+    if args.sitemaps:
+        discovery = SitemapDiscovery(
+            scraper.session,
+            scraper.config.BASE_URL,
+            sections=args.sections.split(","),
+            since=args.since,
+            until=args.until
+        )
+        backfill = SitemapBackfill(scraper, discovery, **options)
+    else:
+        backfill = Backfill(scraper, **options)
+    sys.exit(0 if backfill.run(fresh=args.fresh) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+HTTP load benchmark for the news API.
+
+Drives one or more backend URLs with a fixed number of concurrent clients for
+a fixed duration and reports requests/sec, latency percentiles and errors.
+Use it to compare serving paths, e.g. the previous sync DRF views under the
+WSGI dev server (from a checkout of the commit before the async views) against
+the async views under uvicorn:
+
+    # terminal 1: WSGI path (older checkout)
+    cd prothomalo_backend && python manage.py runserver 8001 --noreload
+    # terminal 2: ASGI path
+    cd prothomalo_backend && uvicorn prothomalo_backend.asgi:application --workers 4 --port 8000
+    # terminal 3
+    python -m benchmarks.bench_api_load --concurrency 500 --duration 30 --unique \\
+        --target wsgi=http://localhost:8001/api/news/search/?q=নির্বাচন \\
+        --target asgi=http://localhost:8000/api/news/search/?q=নির্বাচন
+
+--unique appends a distinct query parameter per request so the server-side
+response cache is bypassed and every request reaches Elasticsearch. Raise the
+"anon" throttle rate in settings.py first, or the run measures 429s.
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+import aiohttp
+
+from benchmarks.common import print_table, summarize_ms
+
+
+async def run_load(url: str, concurrency: int, duration: float, unique: bool):
+    """Runs `concurrency` clients against url for `duration` seconds."""
+    latencies = []
+    statuses = {}
+    counter = itertools.count()
+    deadline = time.perf_counter() + duration
+    separator = "&" if "?" in url else "?"
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async def client():
+            while time.perf_counter() < deadline:
+                target = f"{url}{separator}_bench={next(counter)}" if unique else url
+                started = time.perf_counter()
+                try:
+                    async with session.get(target) as response:
+                        await response.read()
+                        status = response.status
+                except Exception as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return latencies, statuses, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test news API endpoints")
+    parser.add_argument("--target", action="append", required=True,
+                        help="label=url, may be repeated")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per target")
+    parser.add_argument("--unique", action="store_true", help="Bypass the server response cache")
+    args = parser.parse_args()
+
+    rows = []
+    for target in args.target:
+        label, _, url = target.partition("=")
+        latencies, statuses, elapsed = asyncio.run(
+            run_load(url, args.concurrency, args.duration, args.unique)
+        )
+        summary = summarize_ms(latencies)
+        ok = statuses.get(200, 0) + statuses.get(304, 0)
+        rows.append({
+            "target": label,
+            "requests": len(latencies),
+            "req_per_s": round(len(latencies) / elapsed, 1),
+            "p50_ms": summary["p50_ms"],
+            "p99_ms": summary["p99_ms"],
+            "ok": ok,
+            "errors": len(latencies) - ok,
+        })
+        print(f"{label}: status counts {statuses}")
+
+    print(f"\nLoad benchmark: {args.concurrency} concurrent clients, {args.duration}s per target\n")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
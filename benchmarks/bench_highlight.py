@@ -0,0 +1,108 @@
+"""
+Highlighting benchmark: mapping v3 (re-analysis) vs v4 (indexed offsets).
+
+Loads the fixture corpus into one throwaway index per mapping version, then
+times the search_articles highlight request for each query term and reports
+latency percentiles and on-disk index size.
+
+Usage (from the repository root, with Elasticsearch running):
+    python -m benchmarks.bench_highlight --docs 2000 --repeats 20
+"""
+
+import argparse
+import time
+
+from elasticsearch import helpers
+
+from benchmarks.common import print_table, summarize_ms
+from benchmarks.fixtures import QUERY_TERMS, generate_corpus
+from es_connector import get_es_client
+from index_mappings import get_index_definition
+
+HIGHLIGHT = {
+    "type": "unified",
+    "fields": {
+        "headline": {},
+        "content": {"fragment_size": 150, "number_of_fragments": 3}
+    }
+}
+
+
+def load_index(es, index: str, version: int, corpus) -> int:
+    """Creates a benchmark index for a mapping version and returns its size in bytes."""
+    if es.indices.exists(index=index):
+        es.indices.delete(index=index)
+
+    definition = get_index_definition(version)
+    definition["settings"]["number_of_replicas"] = 0
+    es.indices.create(index=index, body=definition)
+
+    helpers.bulk(es, ({"_index": index, "_id": doc["url"], "_source": doc} for doc in corpus),
+                 chunk_size=500, request_timeout=120)
+    es.indices.refresh(index=index)
+    es.indices.forcemerge(index=index, max_num_segments=1, request_timeout=300)
+
+    stats = es.indices.stats(index=index, metric="store")
+    return stats["indices"][index]["primaries"]["store"]["size_in_bytes"]
+
+
+def time_queries(es, index: str, repeats: int, highlight: bool):
+    """Runs every query term `repeats` times and returns wall-clock samples."""
+    samples = []
+    for _ in range(repeats):
+        for term in QUERY_TERMS:
+            body = {
+                "size": 20,
+                "query": {"multi_match": {"query": term, "fields": ["headline^2", "content"]}}
+            }
+            if highlight:
+                body["highlight"] = HIGHLIGHT
+            started = time.perf_counter()
+            es.search(index=index, body=body)
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare highlight latency for mapping v3 and v4")
+    parser.add_argument("--docs", type=int, default=2000, help="Fixture corpus size")
+    parser.add_argument("--repeats", type=int, default=20, help="Runs per query term")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark indices")
+    args = parser.parse_args()
+
+    es = get_es_client()
+    if not es.ping():
+        print("Could not connect to Elasticsearch")
+        return
+
+    corpus = generate_corpus(args.docs)
+    rows = []
+
+    for label, version in (("before (v3)", 3), ("after (v4, offsets)", 4)):
+        index = f"bench_highlight_v{version}"
+        size_bytes = load_index(es, index, version, corpus)
+
+        # Warm up caches so both runs start from the same state
+        time_queries(es, index, 1, highlight=True)
+
+        plain = summarize_ms(time_queries(es, index, args.repeats, highlight=False))
+        highlighted = summarize_ms(time_queries(es, index, args.repeats, highlight=True))
+
+        rows.append({
+            "mapping": label,
+            "index_mb": round(size_bytes / 1024 / 1024, 2),
+            "no_hl_p50_ms": plain["p50_ms"],
+            "hl_p50_ms": highlighted["p50_ms"],
+            "hl_p95_ms": highlighted["p95_ms"],
+            "hl_overhead_p50_ms": round(highlighted["p50_ms"] - plain["p50_ms"], 2),
+        })
+
+        if not args.keep:
+            es.indices.delete(index=index)
+
+    print(f"\nHighlight benchmark: {args.docs} docs, {args.repeats} x {len(QUERY_TERMS)} queries\n")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
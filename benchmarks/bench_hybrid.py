@@ -0,0 +1,127 @@
+"""
+Hybrid search benchmark: current search vs BM25 + kNN rank fusion.
+
+Loads the fixture corpus with document vectors (mapping v7, embeddings fitted
+on the corpus) into a throwaway index, then runs the labeled query set from
+benchmarks/fixtures.py through each search mode and reports recall@10, mean
+reciprocal rank and latency percentiles, separately for exact and inflected
+queries:
+
+- current: search_articles' multi_match with fuzziness AUTO, by relevance
+- lexical: the same without fuzziness (the lexical side of hybrid search)
+- knn: the vector side alone
+- hybrid: both in one msearch, fused by reciprocal rank
+
+The synthetic articles' bodies are unrelated to their headlines, so the
+relevant set (headline contains both query words) is harder to find than
+in real news, for every mode alike.
+
+Usage (from the repository root, with Elasticsearch running):
+    python -m benchmarks.bench_hybrid --docs 2000 --repeats 5
+"""
+
+import argparse
+import time
+from statistics import mean
+
+from benchmarks.bench_highlight import load_index
+from benchmarks.common import print_table, summarize_ms
+from benchmarks.fixtures import generate_corpus, generate_labeled_queries
+from embeddings import HashingEncoder, embed_articles
+from es_connector import get_es_client
+from es_queries import build_hybrid_searches, build_search_body, fuse_search_responses
+
+INDEX = "bench_hybrid"
+VERSION = 7
+TOP_K = 10
+
+
+def run_search(es, mode: str, query: str, encoder: HashingEncoder):
+    """Returns the ranked URLs of one search in the given mode."""
+    if mode in ("current", "lexical"):
+        body = build_search_body(query=query, size=TOP_K, sort_by="_score", profile="list",
+                                 fuzzy=mode == "current")
+        hits = es.search(index=INDEX, body=body)["hits"]["hits"]
+        return [hit["_source"]["url"] for hit in hits]
+
+    lexical, knn = build_hybrid_searches(query, encoder.encode_query(query).tolist(),
+                                         size=TOP_K, profile="list")
+    if mode == "knn":
+        knn["size"] = knn["knn"]["k"] = TOP_K
+        hits = es.search(index=INDEX, body=knn)["hits"]["hits"]
+        return [hit["_source"]["url"] for hit in hits]
+
+    responses = es.msearch(body=[{"index": INDEX}, lexical, {"index": INDEX}, knn])["responses"]
+    return [article["url"] for article in fuse_search_responses(responses, TOP_K)["articles"]]
+
+
+def evaluate(es, mode: str, queries, encoder: HashingEncoder, repeats: int):
+    """Recall@k, MRR and latency samples of one mode over the labeled queries."""
+    recalls, reciprocal_ranks, samples = [], [], []
+    for _ in range(repeats):
+        for labeled in queries:
+            started = time.perf_counter()
+            urls = run_search(es, mode, labeled["query"], encoder)
+            samples.append(time.perf_counter() - started)
+
+            relevant = labeled["relevant"]
+            recalls.append(len(relevant.intersection(urls)) / min(TOP_K, len(relevant)))
+            first = next((rank for rank, url in enumerate(urls, 1) if url in relevant), None)
+            reciprocal_ranks.append(1 / first if first else 0.0)
+    return mean(recalls), mean(reciprocal_ranks), samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare current and hybrid search quality and latency")
+    parser.add_argument("--docs", type=int, default=2000, help="Fixture corpus size")
+    parser.add_argument("--queries", type=int, default=50, help="Labeled word pairs (each exact and inflected)")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per query")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark index")
+    args = parser.parse_args()
+
+    es = get_es_client()
+    if not es.ping():
+        print("Could not connect to Elasticsearch")
+        return
+
+    corpus = generate_corpus(args.docs)
+    queries = generate_labeled_queries(corpus, args.queries)
+
+    encoder = HashingEncoder()
+    started = time.perf_counter()
+    encoder.partial_fit(corpus)
+    encoder.refresh_idf()
+    for i in range(0, len(corpus), 100):
+        embed_articles(corpus[i:i + 100], encoder)
+    embed_ms = (time.perf_counter() - started) * 1000 / len(corpus)
+
+    size_bytes = load_index(es, INDEX, VERSION, corpus)
+
+    rows = []
+    for mode in ("current", "lexical", "knn", "hybrid"):
+        for kind in ("exact", "inflected"):
+            subset = [labeled for labeled in queries if labeled["kind"] == kind]
+            evaluate(es, mode, subset, encoder, 1)  # warm up caches
+            recall, mrr, samples = evaluate(es, mode, subset, encoder, args.repeats)
+            latency = summarize_ms(samples)
+            rows.append({
+                "mode": mode,
+                "queries": kind,
+                f"recall@{TOP_K}": round(recall, 3),
+                "mrr": round(mrr, 3),
+                "p50_ms": latency["p50_ms"],
+                "p95_ms": latency["p95_ms"],
+            })
+
+    if not args.keep:
+        es.indices.delete(index=INDEX)
+
+    print(f"\nHybrid search benchmark: {args.docs} docs, {len(queries)} labeled queries, "
+          f"{args.repeats} runs each")
+    print(f"Embedding cost at ingest: {embed_ms:.2f} ms/article (fit + encode); "
+          f"index size {size_bytes / 1024 / 1024:.1f} MB\n")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
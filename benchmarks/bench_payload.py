@@ -0,0 +1,103 @@
+"""
+Payload size and serialization benchmark for news API responses.
+
+Builds list- and search-shaped payloads from the fixture corpus and compares
+the stdlib encoder with ASCII escaping (the previous DRF/JsonResponse output)
+against orjson UTF-8 output, uncompressed and with gzip/brotli. Optionally
+measures real bytes on the wire from a running backend.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_payload
+    python -m benchmarks.bench_payload --url http://localhost:8000/api/news/search/?q=নির্বাচন
+"""
+
+import argparse
+import gzip
+import json
+import time
+
+import orjson
+import requests
+
+from benchmarks.common import print_table
+from benchmarks.fixtures import generate_corpus
+from index_mappings import SOURCE_PROFILES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def build_payloads(corpus):
+    """Returns {name: payload} shaped like the list and search endpoint responses."""
+    card_fields = SOURCE_PROFILES["card"]
+    cards = [{field: doc.get(field) for field in card_fields} for doc in corpus[:20]]
+    excluded = SOURCE_PROFILES["full"]["excludes"]
+    full = [
+        dict({k: v for k, v in doc.items() if k not in excluded}, _id=doc["url"], _score=1.0)
+        for doc in corpus[:20]
+    ]
+    return {
+        "list (card, 20)": cards,
+        "search (card, 20)": {"count": len(corpus), "took": 3, "next": None, "results": cards},
+        "search (full, 20)": {"count": len(corpus), "took": 3, "next": None, "results": full},
+        "legacy list (full, 20)": full,
+    }
+
+
+def time_it(func, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        result = func()
+    return result, (time.perf_counter() - started) / repeats * 1000
+
+
+def measure_offline(repeats):
+    rows = []
+    corpus = generate_corpus(200)
+    for name, payload in build_payloads(corpus).items():
+        escaped, escaped_ms = time_it(lambda: json.dumps(payload).encode("utf-8"), repeats)
+        compact, orjson_ms = time_it(lambda: orjson.dumps(payload), repeats)
+        row = {
+            "payload": name,
+            "ascii_json_kb": round(len(escaped) / 1024, 1),
+            "utf8_json_kb": round(len(compact) / 1024, 1),
+            "gzip_kb": round(len(gzip.compress(compact, compresslevel=6)) / 1024, 1),
+            "br_kb": round(len(brotli.compress(compact, quality=5)) / 1024, 1) if brotli else "-",
+            "stdlib_ms": round(escaped_ms, 3),
+            "orjson_ms": round(orjson_ms, 3),
+        }
+        rows.append(row)
+    print("\nSerialization and size (fixture corpus)\n")
+    print_table(rows)
+
+
+def measure_wire(url):
+    rows = []
+    for encoding in ("identity", "gzip", "br"):
+        response = requests.get(url, headers={"Accept-Encoding": encoding}, stream=True, timeout=30)
+        raw = response.raw.read(decode_content=False)
+        rows.append({
+            "accept_encoding": encoding,
+            "status": response.status_code,
+            "content_encoding": response.headers.get("Content-Encoding", "-"),
+            "wire_kb": round(len(raw) / 1024, 1),
+        })
+    print(f"\nBytes on the wire: {url}\n")
+    print_table(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API payload size and serialization time")
+    parser.add_argument("--repeats", type=int, default=200, help="Serializations per measurement")
+    parser.add_argument("--url", action="append", default=[], help="Live endpoint to measure, may be repeated")
+    args = parser.parse_args()
+
+    measure_offline(args.repeats)
+    for url in args.url:
+        measure_wire(url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Storage backend benchmark: Elasticsearch vs embedded SQLite FTS5.
+
+Ingests the fixture corpus through each ArticleStore (storage.py) with the
+scraper's bulk chunk size, then times the store operations the scraper
+uses: full-text search per query term, filtered browsing, lookup by URL
+and collection statistics. Reports ingest throughput and latency
+percentiles per operation.
+
+The Elasticsearch run is skipped when no cluster is reachable, so the
+SQLite numbers can be taken anywhere.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_storage --docs 2000 --repeats 20
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.common import print_table, summarize_ms
+from benchmarks.fixtures import AUTHORS, QUERY_TERMS, generate_corpus
+from es_connector import get_es_client
+from index_mappings import CURRENT_MAPPING_VERSION, get_index_definition
+from storage import ElasticsearchStore, SQLiteStore
+
+CHUNK_SIZE = 100  # matches Config.BULK_INDEX_SIZE
+
+
+def operations(corpus):
+    """Named store calls timed by the benchmark."""
+    urls = [doc["url"] for doc in corpus[::max(1, len(corpus) // 50)]]
+    return {
+        "search": [lambda store, term=term: store.search_articles(query=term, profile="card")
+                   for term in QUERY_TERMS],
+        "search_hl": [lambda store, term=term: store.search_articles(query=term, profile="card", highlight=True)
+                      for term in QUERY_TERMS],
+        "filter": [lambda store, author=author: store.search_articles(author=author, profile="list")
+                   for author in AUTHORS],
+        "by_url": [lambda store, url=url: store.get_article_by_url(url) for url in urls],
+        "stats": [lambda store: store.get_articles_statistics()],
+    }
+
+
+def ingest(store, corpus) -> float:
+    """Bulk loads the corpus and returns the elapsed seconds."""
+    started = time.perf_counter()
+    success, failed = store.bulk_index_articles(corpus, chunk_size=CHUNK_SIZE)
+    elapsed = time.perf_counter() - started
+    if failed:
+        print(f"{store.name}: {len(failed)} documents failed to index")
+    return elapsed
+
+
+def time_operations(store, calls, repeats: int):
+    """Runs every call `repeats` times and returns wall-clock samples."""
+    samples = []
+    for _ in range(repeats):
+        for call in calls:
+            started = time.perf_counter()
+            call(store)
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def benchmark_queries(store, corpus, repeats: int):
+    """Latency columns for one loaded store."""
+    row = {}
+    for name, calls in operations(corpus).items():
+        time_operations(store, calls, 1)  # warm up caches
+        summary = summarize_ms(time_operations(store, calls, repeats))
+        row[f"{name}_p50_ms"] = summary["p50_ms"]
+        row[f"{name}_p95_ms"] = summary["p95_ms"]
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the Elasticsearch and SQLite article stores")
+    parser.add_argument("--docs", type=int, default=2000, help="Fixture corpus size")
+    parser.add_argument("--repeats", type=int, default=20, help="Runs per operation")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark index and database")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.docs)
+    rows = []
+
+    es = get_es_client()
+    try:
+        es_available = es.ping()
+    except Exception:
+        es_available = False
+    if es_available:
+        index = "bench_storage"
+        if es.indices.exists(index=index):
+            es.indices.delete(index=index)
+        definition = get_index_definition(CURRENT_MAPPING_VERSION)
+        definition["settings"]["number_of_replicas"] = 0
+        es.indices.create(index=index, body=definition)
+
+        store = ElasticsearchStore(index, es)
+        seconds = ingest(store, corpus)
+        es.indices.refresh(index=index)  # searchable, like the SQLite commit
+        row = benchmark_queries(store, corpus, args.repeats)
+        rows.append({"store": store.name, "ingest_s": round(seconds, 2),
+                     "docs_per_s": round(len(corpus) / seconds), **row})
+        if not args.keep:
+            es.indices.delete(index=index)
+    else:
+        print("Could not connect to Elasticsearch; benchmarking SQLite only")
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_storage_"), "articles.sqlite3")
+    store = SQLiteStore(path)
+    store.open()
+    seconds = ingest(store, corpus)
+    row = benchmark_queries(store, corpus, args.repeats)
+    rows.append({"store": store.name, "ingest_s": round(seconds, 2),
+                 "docs_per_s": round(len(corpus) / seconds), **row})
+    store.close()
+    if args.keep:
+        print(f"SQLite database kept at {path}")
+    else:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    print(f"\nStorage benchmark: {args.docs} docs, {args.repeats} runs per operation\n")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Autocomplete benchmark: completion suggester (mapping v5) vs fuzzy search.
+
+Loads the fixture corpus into a throwaway v5 index, then times the suggest
+request used by /api/news/suggest/ for typed prefixes (1 to 6 characters of
+each query term) against the fuzzy multi_match the viewer used to run on
+every keystroke. The target for suggestions is p99 under 10 ms.
+
+Usage (from the repository root, with Elasticsearch running):
+    python -m benchmarks.bench_suggest --docs 2000 --repeats 50
+"""
+
+import argparse
+import time
+
+from benchmarks.bench_highlight import load_index
+from benchmarks.common import print_table, summarize_ms
+from benchmarks.fixtures import QUERY_TERMS, generate_corpus
+from es_connector import get_es_client
+from es_queries import build_query, build_suggest_body
+
+TARGET_P99_MS = 10
+
+
+def typed_prefixes():
+    """Every prefix a user types on the way to each query term."""
+    return [term[:length] for term in QUERY_TERMS for length in range(1, min(len(term), 6) + 1)]
+
+
+def time_requests(es, index: str, bodies, repeats: int):
+    """Returns (wall-clock samples, server-side took samples) in seconds."""
+    wall, took = [], []
+    for _ in range(repeats):
+        for body in bodies:
+            started = time.perf_counter()
+            res = es.search(index=index, body=body)
+            wall.append(time.perf_counter() - started)
+            took.append(res["took"] / 1000)
+    return wall, took
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure autocomplete latency against fuzzy search")
+    parser.add_argument("--docs", type=int, default=2000, help="Fixture corpus size")
+    parser.add_argument("--repeats", type=int, default=50, help="Runs per prefix")
+    parser.add_argument("--size", type=int, default=5, help="Suggestions per request")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark index")
+    args = parser.parse_args()
+
+    es = get_es_client()
+    if not es.ping():
+        print("Could not connect to Elasticsearch")
+        return
+
+    index = "bench_suggest_v5"
+    load_index(es, index, 5, generate_corpus(args.docs))
+
+    prefixes = typed_prefixes()
+    workloads = {
+        "completion suggest": [build_suggest_body(prefix, args.size) for prefix in prefixes],
+        "fuzzy multi_match": [
+            {"size": args.size, "_source": ["url", "headline"], "query": build_query(query=prefix)}
+            for prefix in prefixes
+        ],
+    }
+
+    rows = []
+    for label, bodies in workloads.items():
+        time_requests(es, index, bodies, 1)  # warm-up
+        wall, took = time_requests(es, index, bodies, args.repeats)
+        wall_ms, took_ms = summarize_ms(wall), summarize_ms(took)
+        rows.append({
+            "request": label,
+            "p50_ms": wall_ms["p50_ms"],
+            "p95_ms": wall_ms["p95_ms"],
+            "p99_ms": wall_ms["p99_ms"],
+            "es_took_p99_ms": took_ms["p99_ms"],
+        })
+
+    if not args.keep:
+        es.indices.delete(index=index)
+
+    print(f"\nAutocomplete benchmark: {args.docs} docs, {args.repeats} x {len(prefixes)} prefixes\n")
+    print_table(rows)
+    verdict = "meets" if rows[0]["p99_ms"] < TARGET_P99_MS else "misses"
+    print(f"\nSuggest p99 {rows[0]['p99_ms']} ms {verdict} the {TARGET_P99_MS} ms target")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Shared helpers for benchmark scripts: timing summaries and result tables."""
+
+import statistics
+from typing import Dict, List, Sequence
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Returns the pct-th percentile (nearest rank) of the samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize_ms(samples: Sequence[float]) -> Dict[str, float]:
+    """Summarizes latency samples given in seconds as milliseconds."""
+    ms = [s * 1000 for s in samples]
+    return {
+        "mean_ms": round(statistics.mean(ms), 2) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p95_ms": round(percentile(ms, 95), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+    }
+
+
+def print_table(rows: List[Dict[str, object]]) -> None:
+    """Prints a list of dicts as an aligned text table."""
+    if not rows:
+        return
+    columns = list(rows[0])
+    widths = {c: max(len(str(c)), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+    print("  ".join(str(c).ljust(widths[c]) for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+    for row in rows:
+        print("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in columns))
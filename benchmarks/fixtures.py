@@ -0,0 +1,130 @@
+"""
+Deterministic fixture corpus for benchmarks.
+
+Generates article documents shaped like the scraper's output (same fields,
+Bengali text, realistic lengths) so benchmarks are reproducible without
+scraping the live site. The same seed always yields the same corpus.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from index_mappings import build_excerpt, build_suggest
+
+VOCABULARY = [
+    "রাজনীতি", "নির্বাচন", "সরকার", "সংসদ", "দল", "নেতা", "মন্ত্রী", "প্রধানমন্ত্রী",
+    "বিএনপি", "আওয়ামী", "লীগ", "জামায়াত", "কমিশন", "ভোট", "প্রার্থী", "আসন",
+    "ঢাকা", "চট্টগ্রাম", "রাজশাহী", "খুলনা", "সিলেট", "বরিশাল", "রংপুর", "ময়মনসিংহ",
+    "সমাবেশ", "আন্দোলন", "দাবি", "বক্তব্য", "সংবাদ", "সম্মেলন", "বৈঠক", "আলোচনা",
+    "সংস্কার", "সংবিধান", "আইন", "আদালত", "মামলা", "গ্রেপ্তার", "পুলিশ", "নিরাপত্তা",
+    "অর্থনীতি", "বাজেট", "উন্নয়ন", "প্রকল্প", "দুর্নীতি", "তদন্ত", "প্রতিবেদন", "জনগণ",
+    "গণতন্ত্র", "অধিকার", "স্বাধীনতা", "মতামত", "সিদ্ধান্ত", "প্রস্তাব", "চুক্তি", "সমঝোতা",
+    "আজ", "গতকাল", "বলেন", "জানান", "করেছেন", "হয়েছে", "থেকে", "এবং", "কিন্তু", "তবে",
+    "এই", "সেই", "একটি", "বিভিন্ন", "নতুন", "পুরোনো", "বড়", "ছোট", "প্রথম", "শেষ",
+]
+
+AUTHORS = [
+    "নিজস্ব প্রতিবেদক", "বিশেষ প্রতিনিধি", "কূটনৈতিক প্রতিবেদক", "প্রতিনিধি",
+    "জ্যেষ্ঠ প্রতিবেদক", "ঢাকা", "প্রথম আলো ডেস্ক",
+]
+
+LOCATIONS = ["ঢাকা", "চট্টগ্রাম", "রাজশাহী", "খুলনা", "সিলেট", "বরিশাল", "Location not found"]
+
+# Search terms used by the query benchmarks.
+QUERY_TERMS = ["নির্বাচন", "সংসদ", "দুর্নীতি তদন্ত", "বাজেট", "সংবিধান সংস্কার", "গণতন্ত্র"]
+
+# Case and plural endings used to inflect labeled queries.
+INFLECTIONS = ["ের", "ে", "টি", "গুলো", "কে", "তে"]
+
+
+# Zipf-like weights: early vocabulary entries are more frequent
+_WEIGHTS = [1 / (rank + 1) ** 0.8 for rank in range(len(VOCABULARY))]
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(VOCABULARY, weights=_WEIGHTS, k=rng.randint(6, 18))
+    return " ".join(words) + "।"
+
+
+def generate_corpus(size: int = 2000, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Builds a list of synthetic article documents.
+
+    Args:
+        size: Number of articles
+        seed: Random seed; identical seeds produce identical corpora
+
+    Returns:
+        list: Article dictionaries ready for bulk indexing
+    """
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    articles = []
+
+    for i in range(size):
+        paragraphs = [
+            " ".join(_sentence(rng) for _ in range(rng.randint(2, 6)))
+            for _ in range(rng.randint(4, 30))
+        ]
+        content = "\n".join(paragraphs)
+        published = start + timedelta(minutes=rng.randint(0, 60 * 24 * 180))
+
+        headline = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(5, 10)))
+        author = rng.choice(AUTHORS)
+        published_at = published.strftime("%Y-%m-%d %H:%M")
+
+        articles.append({
+            "url": f"https://www.prothomalo.com/politics/fixture-{i}",
+            "headline": headline,
+            "author": author,
+            "location": rng.choice(LOCATIONS),
+            "published_at": published_at,
+            "content": content,
+            "excerpt": build_excerpt(content),
+            "suggest": build_suggest(headline, author, published_at),
+            "scraped_at": published.isoformat(),
+            "word_count": len(content.split()),
+            "last_updated": published.isoformat()
+        })
+
+    return articles
+
+
+def generate_labeled_queries(corpus: List[Dict[str, Any]], count: int = 50,
+                             seed: int = 7) -> List[Dict[str, Any]]:
+    """
+    Builds search queries with known relevant articles for recall benchmarks.
+
+    Each query is two words taken from one article's headline; the relevant
+    articles are all those whose headline contains both words. Every query
+    comes twice: as the plain words ("exact") and with Bengali case or plural
+    endings attached ("inflected"), as readers would type them in a sentence.
+
+    Args:
+        corpus: Articles from generate_corpus()
+        count: Number of word pairs
+        seed: Random seed; identical seeds produce identical queries
+
+    Returns:
+        list: {"query", "kind", "relevant" (set of URLs)} dictionaries
+    """
+    rng = random.Random(seed)
+    headline_words = [set(article["headline"].split()) for article in corpus]
+    queries = []
+
+    for _ in range(count):
+        words = sorted(rng.choice(headline_words))
+        pair = rng.sample(words, 2)
+        relevant = {
+            article["url"] for article, vocabulary in zip(corpus, headline_words)
+            if all(word in vocabulary for word in pair)
+        }
+        queries.append({"query": " ".join(pair), "kind": "exact", "relevant": relevant})
+        queries.append({
+            "query": " ".join(word + rng.choice(INFLECTIONS) for word in pair),
+            "kind": "inflected",
+            "relevant": relevant
+        })
+
+    return queries
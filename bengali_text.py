@@ -0,0 +1,34 @@
+"""
+Bengali text helpers shared by the SQLite full-text index (storage.py) and
+the document embeddings (embeddings.py).
+
+Generic Unicode word splitting treats combining marks as separators, which
+breaks Bengali words at every vowel sign and virama (নির্বাচন -> ন, র, চন), so
+words are matched with the Bengali marks added to the word characters.
+"""
+
+import re
+import unicodedata
+from typing import List, Optional
+
+# Bengali vowel signs, virama, nukta etc. (Unicode categories Mn/Mc)
+BENGALI_MARKS = "".join(
+    chr(cp) for cp in range(0x0980, 0x0A00) if unicodedata.category(chr(cp)) in ("Mn", "Mc")
+)
+
+WORD_PATTERN = re.compile(r"[\w" + BENGALI_MARKS + r"]+")
+
+
+def bn_normalize(text: Optional[str]) -> Optional[str]:
+    """Canonical form used for indexing and querying Bengali text."""
+    if text is None:
+        return None
+    # ZWNJ/ZWJ only select glyph forms; str.replace is much faster than translate here
+    return unicodedata.normalize("NFC", text).replace("\u200c", "").replace("\u200d", "")
+
+
+def bn_words(text: Optional[str]) -> List[str]:
+    """Normalized words of a text, vowel signs kept inside words."""
+    if not text:
+        return []
+    return WORD_PATTERN.findall(bn_normalize(text))
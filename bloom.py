@@ -0,0 +1,112 @@
+"""
+Persistent Bloom filter over a memory-mapped file.
+
+Used by the URL frontier (frontier.py) to remember which article URLs have
+been seen without holding them in memory or asking Elasticsearch about each
+one: a million URLs at a 0.1% false-positive rate take about 1.8 MB, paged
+in by the OS on demand, and the filter survives restarts.
+
+Membership is probabilistic in one direction only: "not seen" is always
+right, "seen" is wrong with roughly the configured error rate once the
+filter holds `capacity` keys (more often beyond that).
+"""
+
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PABLOOM1"
+# magic, number of bits, hashes per key, capacity, error rate, keys added
+_HEADER = struct.Struct("<8sQQQdQ")
+_COUNT_OFFSET = _HEADER.size - 8
+
+
+def optimal_parameters(capacity: int, error_rate: float):
+    """Bit count and hashes per key for `capacity` keys at `error_rate`."""
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFilter:
+    """Bloom filter stored in (and mapped from) a file."""
+
+    def __init__(self, path: str, capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.path = path
+        self._lock = threading.Lock()
+        self._warned_full = False
+
+        if not os.path.exists(path):
+            bits, hashes = optimal_parameters(capacity, error_rate)
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, bits, hashes, capacity, error_rate, 0))
+                f.truncate(_HEADER.size + bits // 8)
+            logger.info(f"Created Bloom filter {path}: {bits // 8 / 1024 / 1024:.1f} MB, {hashes} hashes")
+
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.bits, self.hashes, self.capacity, self.error_rate, _ = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a Bloom filter file")
+        if (self.capacity, self.error_rate) != (capacity, error_rate):
+            logger.warning(f"Bloom filter {path} keeps its original capacity {self.capacity} "
+                           f"and error rate {self.error_rate}; delete it to resize")
+
+    @property
+    def count(self) -> int:
+        """Keys added so far (a key colliding with earlier ones on every bit is not counted)."""
+        return struct.unpack_from("<Q", self._map, _COUNT_OFFSET)[0]
+
+    def _positions(self, key: str):
+        # Double hashing (Kirsch-Mitzenmacher) from one 128-bit digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        h2 |= 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, key: str) -> bool:
+        data = self._map
+        offset = _HEADER.size
+        return all(data[offset + (p >> 3)] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key: str) -> bool:
+        """Adds a key; returns True if it was not (probably) present before."""
+        offset = _HEADER.size
+        added = False
+        with self._lock:
+            data = self._map
+            for p in self._positions(key):
+                index = offset + (p >> 3)
+                mask = 1 << (p & 7)
+                if not data[index] & mask:
+                    data[index] |= mask
+                    added = True
+            if added:
+                count = self.count + 1
+                struct.pack_into("<Q", data, _COUNT_OFFSET, count)
+                if count > self.capacity and not self._warned_full:
+                    self._warned_full = True
+                    logger.warning(f"Bloom filter {self.path} is over capacity; false positives will rise")
+        return added
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def flush(self) -> None:
+        self._map.flush()
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.flush()
+            self._map.close()
+        self._file.close()
@@ -0,0 +1,249 @@
+"""
+Continuous crawl mode for the scrapers.
+
+CrawlDaemon keeps one scraper (and with it the pooled HTTP session and
+Elasticsearch client) alive and polls the collection API in cycles:
+
+- Each cycle pages from the newest stories and stops as soon as a page is
+  mostly made of articles that are already indexed, so a quiet cycle costs a
+  single API request. URLs are checked against a bounded in-memory set of
+  recently seen URLs first and then with one mget per page.
+- Story links found in the new articles (with SCRAPER_DISCOVER_LINKS=1) are
+  scraped in the same cycle, up to MAX_DISCOVERED_LINKS.
+- New articles are scraped and flushed in BULK_INDEX_SIZE batches, so batch
+  listeners (live feed, related articles) hear about them during the cycle.
+- Indexed articles that are due for a re-crawl (recrawl.py) are rechecked
+  after the new ones, up to RECRAWL_PER_CYCLE per cycle, and updated if
+  they were edited.
+- Trending terms (trending.py) are rescored after each cycle once the clock
+  has entered a new hour, so /api/trending/ moves on during quiet hours.
+- The wait between cycles follows the publication rate observed for the
+  current hour of day (PollScheduler): short at news peaks, long overnight.
+- SIGTERM/SIGINT stop the daemon after the article being scraped; articles
+  already scraped are flushed to the index before it exits.
+
+Usage:
+    python scraper.py --daemon
+    python prothom_alo_scraper.py --daemon
+"""
+
+import logging
+import os
+import signal
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional
+
+from frontier import indexed_urls
+from metrics import SCRAPER_QUEUE_DEPTH
+from pipeline_stats import PipelineRun
+from recrawl import RECRAWL_PER_CYCLE, Recrawler
+from storage import ElasticsearchStore
+
+logger = logging.getLogger(__name__)
+
+MIN_INTERVAL = float(os.environ.get("CRAWL_MIN_INTERVAL", "60"))  # seconds between polls at peaks
+MAX_INTERVAL = float(os.environ.get("CRAWL_MAX_INTERVAL", "1800"))  # seconds between polls when quiet
+START_INTERVAL = 300  # until the current hour has been observed
+TARGET_NEW_PER_POLL = 3  # aim to pick up about this many new stories per poll
+RATE_SMOOTHING = 0.3  # weight of the latest observation in the hourly rate averages
+MAX_PAGES_PER_CYCLE = int(os.environ.get("CRAWL_MAX_PAGES", "10"))
+STOP_OVERLAP = 0.5  # stop paging once this fraction of a page is already indexed
+KNOWN_URLS = 5000  # recently seen URLs kept in memory
+
+
+class PollScheduler:
+    """
+    Picks the wait before the next poll from the publication rate observed
+    at the same hour of day (exponentially weighted, articles per hour).
+    """
+
+    def __init__(self, min_interval: float = MIN_INTERVAL, max_interval: float = MAX_INTERVAL,
+                 target_per_poll: float = TARGET_NEW_PER_POLL, smoothing: float = RATE_SMOOTHING):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_per_poll = target_per_poll
+        self.smoothing = smoothing
+        self.hourly_rate: List[Optional[float]] = [None] * 24
+
+    def observe(self, new_articles: int, elapsed: float, now: Optional[datetime] = None) -> None:
+        """Records how many new articles appeared over the last `elapsed` seconds."""
+        if elapsed <= 0:
+            return
+        hour = (now or datetime.now()).hour
+        rate = new_articles * 3600 / elapsed
+        previous = self.hourly_rate[hour]
+        self.hourly_rate[hour] = rate if previous is None else previous + self.smoothing * (rate - previous)
+
+    def next_interval(self, now: Optional[datetime] = None) -> float:
+        """Seconds to wait before the next poll."""
+        rate = self.hourly_rate[(now or datetime.now()).hour]
+        if rate is None:
+            return min(max(START_INTERVAL, self.min_interval), self.max_interval)
+        if rate <= 0:
+            return self.max_interval
+        interval = self.target_per_poll * 3600 / rate
+        return min(max(interval, self.min_interval), self.max_interval)
+
+
+class CrawlDaemon:
+    """Runs a scraper continuously until SIGTERM/SIGINT."""
+
+    def __init__(self, scraper, scheduler: Optional[PollScheduler] = None,
+                 max_pages: int = MAX_PAGES_PER_CYCLE, known_size: int = KNOWN_URLS):
+        self.scraper = scraper
+        self.config = scraper.config
+        self.scheduler = scheduler or PollScheduler()
+        self.max_pages = max_pages
+        self.known_size = known_size
+        self.known = OrderedDict()
+        self.stop_event = threading.Event()
+        self.last_poll = None
+        self.recrawler = None
+
+    def request_stop(self, signum=None, frame=None) -> None:
+        """Signal handler: finish the current article, flush and exit."""
+        if not self.stop_event.is_set():
+            logger.info(f"Received signal {signum}, stopping after in-flight articles are flushed")
+        self.stop_event.set()
+
+    def _remember(self, urls: List[str]) -> None:
+        for url in urls:
+            self.known[url] = True
+            self.known.move_to_end(url)
+        while len(self.known) > self.known_size:
+            self.known.popitem(last=False)
+
+    def poll_new_urls(self) -> List[str]:
+        """Pages the collection API until it reaches already indexed stories."""
+        new_urls = []
+        for page_num in range(self.max_pages):
+            if self.stop_event.is_set():
+                break
+            try:
+                urls = self.scraper.fetch_api_page(page_num * self.config.STORIES_PER_PAGE)
+            except Exception as e:
+                self.scraper.run_stats.record_failure("api_page", e)
+                logger.error(f"Error fetching API page {page_num + 1}: {e}")
+                break
+            if not urls:
+                break
+
+            unseen = [url for url in urls if url not in self.known and url not in new_urls]
+            indexed = indexed_urls(self.scraper.es_client, self.config.ES_INDEX, unseen)
+            self._remember(list(indexed))
+            fresh = [url for url in unseen if url not in indexed]
+            new_urls.extend(fresh)
+
+            if len(urls) - len(fresh) >= STOP_OVERLAP * len(urls):
+                break
+            self.stop_event.wait(self.config.REQUEST_DELAY)
+        return new_urls
+
+    def _flush(self, articles: List[dict]) -> None:
+        if articles and self.scraper.bulk_index_articles(articles):
+            self._remember([article["url"] for article in articles])
+
+    def run_cycle(self) -> int:
+        """
+        Polls once, then scrapes and indexes the new articles.
+
+        Returns:
+            int: Number of new article URLs found
+        """
+        self.scraper.run_stats = PipelineRun(events_file=self.config.RUN_EVENTS_FILE)
+        pending = []
+        try:
+            new_urls = self.poll_new_urls()
+            new_count = len(new_urls)
+            self.scraper.run_stats.count("discovered", new_count)
+            logger.info(f"Found {new_count} new article URLs")
+
+            links_budget = self.config.MAX_DISCOVERED_LINKS
+            for i, url in enumerate(new_urls, 1):
+                if self.stop_event.is_set():
+                    break
+                SCRAPER_QUEUE_DEPTH.labels("urls").set(len(new_urls) - i + 1)
+                article_data = self.scraper.scrape_single_article(url)
+                if article_data:
+                    pending.append(article_data)
+                    self.scraper.run_stats.count("scraped")
+                    SCRAPER_QUEUE_DEPTH.labels("bulk").set(len(pending))
+                if len(pending) >= self.config.BULK_INDEX_SIZE:
+                    self._flush(pending)
+                    pending = []
+                # Links found in the articles join the end of this cycle's list
+                if self.scraper.frontier is not None and links_budget > 0:
+                    linked = [link for link in self.scraper.frontier.pop(links_budget) if link not in new_urls]
+                    links_budget -= len(linked)
+                    new_urls.extend(linked)
+                    self.scraper.run_stats.count("linked", len(linked))
+                if i < len(new_urls):
+                    self.stop_event.wait(self.config.REQUEST_DELAY)
+            if self.recrawler is not None and not self.stop_event.is_set():
+                # New articles go in first; rechecks can take a while
+                self._flush(pending)
+                pending = []
+                self.recrawler.sync()
+                self.recrawler.run_due(RECRAWL_PER_CYCLE, self.stop_event)
+            # Only stories from the API count towards the publication rate
+            return new_count
+        finally:
+            # Runs on stop requests and errors too, so scraped articles are never dropped
+            self._flush(pending)
+            SCRAPER_QUEUE_DEPTH.labels("urls").set(0)
+            self.scraper.run_stats.finish(report_file=self.config.RUN_REPORT_FILE)
+
+    def run(self) -> bool:
+        """
+        Polls until stopped by SIGTERM/SIGINT.
+
+        Returns:
+            bool: False if Elasticsearch could not be set up, True after a clean stop
+        """
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+        # Known URLs are looked up in the index, so the articles must go there too
+        # (prothom_alo_scraper.py has no store setting and always uses it)
+        store = getattr(self.scraper, "store", None)
+        if store is not None and not isinstance(store, ElasticsearchStore):
+            logger.error("The crawl daemon needs ARTICLE_STORE=elasticsearch")
+            return False
+        if not self.scraper.connect_to_elasticsearch():
+            return False
+        if not self.scraper.create_index_if_not_exists():
+            return False
+
+        if self.config.RECRAWL_ENABLED:
+            self.recrawler = Recrawler(self.scraper)
+
+        logger.info("Crawl daemon started")
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            try:
+                new_count = self.run_cycle()
+            except Exception as e:
+                logger.error(f"Crawl cycle failed: {e}")
+                new_count = None
+
+            # Only scraper.py's scraper counts trending terms
+            refresh_trending = getattr(self.scraper, "refresh_trending", None)
+            if refresh_trending is not None:
+                try:
+                    refresh_trending()
+                except Exception as e:
+                    logger.warning(f"Trending refresh failed: {e}")
+
+            if new_count is not None and self.last_poll is not None:
+                self.scheduler.observe(new_count, started - self.last_poll)
+            self.last_poll = started
+
+            interval = self.scheduler.next_interval()
+            logger.info(f"Next poll in {interval:.0f}s")
+            self.stop_event.wait(interval)
+
+        logger.info("Crawl daemon stopped")
+        return True
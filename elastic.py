@@ -1,8 +1,4 @@
-from elasticsearch import Elasticsearch
+# Kept for backwards compatibility; the shared client lives in es_connector.
+from es_connector import get_es_client
 
-def get_es_client():
-    return Elasticsearch(
-        "http://localhost:9200",
-        basic_auth=("elastic", "JvQhvZYl"),  # use your actual credentials
-        verify_certs=False
-    )
+__all__ = ["get_es_client"]
@@ -0,0 +1,320 @@
+"""
+CPU-only document embeddings for hybrid search (mapping v7 "embedding" field).
+
+Vectors are hashed TF-IDF reduced by a sparse random projection, computed
+with NumPy in batches and without any model download:
+
+1. Text is normalized like the SQLite store's index (NFC, no ZWJ/ZWNJ) and
+   split into Bengali-aware words. Only the headline (weighted up) and the
+   lead of the body are embedded: they carry the topic, and long bodies
+   would mostly add noise and CPU time. Each word contributes its stem
+   (common case and plural suffixes stripped, so নির্বাচনের and নির্বাচনে
+   meet নির্বাচন) and, with less weight, the stem's character trigrams.
+2. Features are hashed into 2**20 buckets. Term frequencies are damped with
+   1 + log(tf), multiplied by the field weight and by each bucket's inverse
+   document frequency.
+3. Every bucket is spread over PROJECTION_NONZEROS of the EMBEDDING_DIMS
+   output dimensions with random signs (a sparse Johnson-Lindenstrauss
+   transform derived from the bucket number, so nothing is stored), and the
+   result is L2-normalized for cosine kNN.
+
+The IDF table is the only fitted state. It is learned from the indexed
+articles and saved to EMBEDDING_MODEL (python migrate_index.py
+--rebuild-embeddings, which also re-embeds every article); until then all
+buckets weigh the same. Running processes reload the file when it changes.
+"""
+
+import logging
+import math
+import os
+import threading
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from elasticsearch import helpers
+
+from bengali_text import bn_words
+from es_connector import get_es_client
+from index_mappings import EMBEDDING_DIMS
+
+logger = logging.getLogger(__name__)
+
+HASH_BITS = 20  # 2**20 feature buckets (4 MB IDF table)
+NGRAM_SIZE = 3
+NGRAM_WEIGHT = 0.5  # L2 weight of a word's trigrams in total, next to 1 for its stem
+PROJECTION_NONZEROS = 8  # output dimensions each bucket is spread over
+HEADLINE_WEIGHT = 4.0
+LEAD_CHARS = 500  # characters of the article body that are embedded
+PROJECTION_SEED = 0x9E3779B97F4A7C15
+MODEL_FILE = os.environ.get("EMBEDDING_MODEL", "embedding_model.npz")
+
+# Inflection suffixes removed by stem(), longest first
+SUFFIXES = sorted(
+    ["গুলোর", "গুলোতে", "গুলো", "দের", "য়ের", "য়ে", "েরা", "ের", "টির", "টিতে", "টি", "টা", "কে", "তে", "ে"],
+    key=len, reverse=True
+)
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _mix(keys: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer over a uint64 array (wrapping arithmetic)."""
+    with np.errstate(over="ignore"):
+        z = (keys + np.uint64(PROJECTION_SEED)) & _MASK64
+        z = ((z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK64
+        z = ((z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK64
+        return z ^ (z >> np.uint64(31))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-cased words of a text, Bengali vowel signs kept inside words."""
+    return [word.lower() for word in bn_words(text)]
+
+
+def stem(word: str) -> str:
+    """Light Bengali stemmer: strips one inflection suffix, keeping at least two characters."""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[:-len(suffix)]
+    return word
+
+
+def _lead(article: Dict[str, Any]) -> str:
+    return (article.get("content") or "")[:LEAD_CHARS]
+
+
+class HashingEncoder:
+    """Hashed TF-IDF features projected to EMBEDDING_DIMS dense vectors."""
+
+    def __init__(self, df: Optional[np.ndarray] = None, docs: int = 0, dims: int = EMBEDDING_DIMS):
+        self.dims = dims
+        self.buckets = 1 << HASH_BITS
+        self.df = df if df is not None else np.zeros(self.buckets, dtype=np.int32)
+        self.docs = docs
+        self.idf = self._idf()
+        self._features: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def _idf(self) -> np.ndarray:
+        if not self.docs:
+            return np.ones(self.buckets, dtype=np.float32)
+        return (np.log((1 + self.docs) / (1 + self.df)) + 1).astype(np.float32)
+
+    @property
+    def fitted(self) -> bool:
+        return self.docs > 0
+
+    def _word_features(self, word: str) -> Tuple[np.ndarray, np.ndarray]:
+        # Cached per word: the vocabulary is small next to the token stream
+        features = self._features.get(word)
+        if features is None:
+            root = stem(word)
+            padded = f"<{root}>"
+            grams = [padded[i:i + NGRAM_SIZE] for i in range(max(1, len(padded) - NGRAM_SIZE + 1))]
+            keys = [root] + grams
+            buckets = np.array([zlib.crc32(key.encode("utf-8")) for key in keys], dtype=np.uint32)
+            buckets &= np.uint32(self.buckets - 1)
+            weights = np.full(len(keys), NGRAM_WEIGHT / math.sqrt(len(grams)), dtype=np.float32)
+            weights[0] = 1.0
+            features = (buckets, weights)
+            if len(self._features) < 500_000:
+                with self._lock:
+                    self._features[word] = features
+        return features
+
+    def _sparse(self, fields: Sequence[Tuple[Optional[str], float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Bucket ids and TF (not yet IDF) weights of one document."""
+        term_weights = Counter()
+        for text, field_weight in fields:
+            for word, tf in Counter(tokenize(text)).items():
+                term_weights[word] += field_weight * (1 + math.log(tf))
+        if not term_weights:
+            return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.float32)
+
+        buckets, weights = [], []
+        for word, weight in term_weights.items():
+            word_buckets, word_weights = self._word_features(word)
+            buckets.append(word_buckets)
+            weights.append(word_weights * np.float32(weight))
+        return np.concatenate(buckets), np.concatenate(weights)
+
+    def _project(self, docs: List[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """Dense, L2-normalized vectors for sparse documents (all-zero if empty)."""
+        rows = np.repeat(np.arange(len(docs)), [len(buckets) for buckets, _ in docs])
+        if not len(rows):
+            return np.zeros((len(docs), self.dims), dtype=np.float32)
+        buckets = np.concatenate([buckets for buckets, _ in docs]).astype(np.uint64)
+        weights = np.concatenate([weights for _, weights in docs]) * self.idf[buckets]
+
+        keys = buckets[:, None] * np.uint64(PROJECTION_NONZEROS) + np.arange(PROJECTION_NONZEROS, dtype=np.uint64)
+        hashed = _mix(keys)
+        columns = (hashed % np.uint64(self.dims)).astype(np.int64)
+        signs = np.where(hashed >> np.uint64(63), -1.0, 1.0)
+        cells = rows[:, None] * self.dims + columns
+        vectors = np.bincount(
+            cells.ravel(),
+            weights=(signs * weights[:, None]).ravel(),
+            minlength=len(docs) * self.dims
+        ).reshape(len(docs), self.dims)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return (vectors / np.where(norms > 0, norms, 1)).astype(np.float32)
+
+    def encode_articles(self, articles: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Vectors for articles (headline and lead), one row per article."""
+        return self._project([
+            self._sparse([(article.get("headline"), HEADLINE_WEIGHT), (_lead(article), 1.0)])
+            for article in articles
+        ])
+
+    def encode_query(self, text: str) -> np.ndarray:
+        """Vector for a search query."""
+        return self._project([self._sparse([(text, 1.0)])])[0]
+
+    def partial_fit(self, articles: Iterable[Dict[str, Any]]) -> None:
+        """Adds articles to the document frequencies (call refresh_idf() afterwards)."""
+        for article in articles:
+            buckets, _ = self._sparse([(article.get("headline"), 1.0), (_lead(article), 1.0)])
+            self.df[np.unique(buckets)] += 1
+            self.docs += 1
+
+    def refresh_idf(self) -> None:
+        self.idf = self._idf()
+
+    def save(self, path: str = MODEL_FILE) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, df=self.df, docs=self.docs, dims=self.dims)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = MODEL_FILE) -> "HashingEncoder":
+        """Loads a fitted model, or returns an unfitted encoder if there is none."""
+        if not os.path.exists(path):
+            logger.warning(f"No embedding model at {path}; vectors use uniform term weights "
+                           f"until migrate_index.py --rebuild-embeddings is run")
+            return cls()
+        with np.load(path) as model:
+            return cls(df=model["df"], docs=int(model["docs"]), dims=int(model["dims"]))
+
+
+_encoder = None
+_encoder_mtime = None
+_encoder_lock = threading.Lock()
+
+
+def _model_mtime() -> Optional[int]:
+    try:
+        return os.stat(MODEL_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_encoder() -> HashingEncoder:
+    """
+    Process-wide encoder, loaded from MODEL_FILE on first use and reloaded
+    when the file changes (e.g. after --rebuild-embeddings in another process).
+    """
+    global _encoder, _encoder_mtime
+    mtime = _model_mtime()
+    if _encoder is None or mtime != _encoder_mtime:
+        with _encoder_lock:
+            if _encoder is None or mtime != _encoder_mtime:
+                try:
+                    _encoder = HashingEncoder.load(MODEL_FILE)
+                except (OSError, ValueError, KeyError) as e:
+                    if _encoder is None:
+                        raise
+                    # Keep encoding with the previous model
+                    logger.warning(f"Could not reload embedding model {MODEL_FILE}: {e}")
+                _encoder_mtime = mtime
+    return _encoder
+
+
+def embed_articles(articles: List[Dict[str, Any]], encoder: Optional[HashingEncoder] = None) -> int:
+    """
+    Sets the "embedding" field of articles in place.
+
+    Returns:
+        int: Number of articles that got a vector (those without any words don't)
+    """
+    vectors = (encoder or get_encoder()).encode_articles(articles)
+    embedded = 0
+    for article, vector in zip(articles, vectors):
+        if vector.any():
+            article["embedding"] = np.round(vector, 5).tolist()
+            embedded += 1
+        else:
+            article.pop("embedding", None)  # cosine similarity rejects zero vectors
+    return embedded
+
+
+class EmbeddingUpdater:
+    """Fits the IDF model on the index and re-embeds every article."""
+
+    def __init__(self, index: str, model_file: str = MODEL_FILE, es_client=None):
+        self.index = index
+        self.model_file = model_file
+        self._es_client = es_client
+
+    @property
+    def es_client(self):
+        # Shared process-wide client unless one was given explicitly
+        return self._es_client or get_es_client()
+
+    def _scan(self, batch_size: int, fields: List[str]):
+        return helpers.scan(
+            self.es_client,
+            index=self.index,
+            query={"query": {"match_all": {}}, "_source": fields},
+            size=batch_size
+        )
+
+    def rebuild(self, batch_size: int = 500) -> bool:
+        """
+        Learns document frequencies from all articles, saves the model and
+        writes a fresh vector into every article.
+
+        Returns:
+            bool: True if every article was updated
+        """
+        try:
+            encoder = HashingEncoder()
+            encoder.partial_fit(hit["_source"] for hit in self._scan(batch_size, ["headline", "content"]))
+            encoder.refresh_idf()
+            encoder.save(self.model_file)
+            # get_encoder() picks the new model up by its modification time
+            logger.info(f"Fitted embedding model on {encoder.docs} articles ({self.model_file})")
+
+            ok = True
+            batch = []
+            for hit in self._scan(batch_size, ["url", "headline", "content"]):
+                batch.append(hit)
+                if len(batch) >= batch_size:
+                    ok = self._write(encoder, batch) and ok
+                    batch = []
+            if batch:
+                ok = self._write(encoder, batch) and ok
+            return ok
+
+        except Exception as e:
+            logger.error(f"Embedding rebuild failed: {e}")
+            return False
+
+    def _write(self, encoder: HashingEncoder, hits: List[Dict[str, Any]]) -> bool:
+        articles = [hit["_source"] for hit in hits]
+        embed_articles(articles, encoder)
+        actions = [
+            {
+                "_op_type": "update",
+                "_index": self.index,
+                "_id": hit["_id"],
+                "doc": {"embedding": article.get("embedding")}
+            }
+            for hit, article in zip(hits, articles)
+        ]
+        success, failed = helpers.bulk(self.es_client, actions, raise_on_error=False)
+        if failed:
+            logger.warning(f"Failed to update {len(failed)} embeddings")
+        return not failed
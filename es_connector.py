@@ -1,50 +1,233 @@
 # In file: es_connector.py
+"""
+Process-wide Elasticsearch client provider.
 
-from elasticsearch import Elasticsearch
+Every component (both scrapers, the Django backend, benchmarks) gets its client
+from get_es_client(), which lazily builds one pooled client per process and
+reuses it for every call. Settings come from environment variables so the same
+code runs locally, in Docker and under gunicorn.
+
+The client is fork-safe: a child process created after the client exists
+(e.g. gunicorn pre-fork workers) discards the inherited client and builds its
+own on first use, so no sockets are shared between processes.
+
+Async code (the ASGI backend) uses get_async_es_client(), which keeps one
+AsyncElasticsearch per process and event loop with the same settings. Each
+one is closed when its event loop shuts down.
+
+Requests that block until server-side work finishes (reindex, by-query
+operations, refresh) go through blocking_client(), which waits far longer
+and never retries a timed-out request: a retry would start the operation a
+second time while the first still runs.
+
+Both clients time every request into the es_request_duration_seconds
+histogram (see metrics.py), labelled by API operation.
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+from elasticsearch import AsyncElasticsearch, Elasticsearch
+
+from metrics import ES_REQUEST_SECONDS, es_operation
+
+# --- Configuration (override with environment variables) ---
+ES_HOST = os.environ.get("ES_HOST", "http://localhost:9200")
+ES_USER = os.environ.get("ES_USER", "elastic")
+ES_PASSWORD = os.environ.get("ES_PASSWORD", "JvQhvZYl")
+ES_CONNECTIONS_PER_NODE = int(os.environ.get("ES_CONNECTIONS_PER_NODE", "25"))  # pool size per node
+ES_REQUEST_TIMEOUT = float(os.environ.get("ES_REQUEST_TIMEOUT", "10"))  # default per-request timeout (s)
+ES_MAX_RETRIES = int(os.environ.get("ES_MAX_RETRIES", "3"))
+ES_BLOCKING_REQUEST_TIMEOUT = float(os.environ.get("ES_BLOCKING_REQUEST_TIMEOUT", "3600"))  # waiting reindex/by-query (s)
+ES_SNIFF = os.environ.get("ES_SNIFF", "0") == "1"  # discover cluster nodes on start/failure
+
+_client = None
+_client_pid = None
+_lock = threading.Lock()
+
+_async_client = None
+_async_client_loop = None
+_async_client_pid = None
+_async_client_closer = None
+
+
+class InstrumentedElasticsearch(Elasticsearch):
+    """Elasticsearch client that records per-operation request latency."""
+
+    def perform_request(self, method, path, **kwargs):
+        operation = es_operation(kwargs.get("endpoint_id"), path, kwargs.get("body"))
+        outcome = "error"
+        started = time.perf_counter()
+        try:
+            response = super().perform_request(method, path, **kwargs)
+            outcome = "ok"
+            return response
+        finally:
+            ES_REQUEST_SECONDS.labels(operation, outcome).observe(time.perf_counter() - started)
+
+
+class InstrumentedAsyncElasticsearch(AsyncElasticsearch):
+    """AsyncElasticsearch client that records per-operation request latency."""
+
+    async def perform_request(self, method, path, **kwargs):
+        operation = es_operation(kwargs.get("endpoint_id"), path, kwargs.get("body"))
+        outcome = "error"
+        started = time.perf_counter()
+        try:
+            response = await super().perform_request(method, path, **kwargs)
+            outcome = "ok"
+            return response
+        finally:
+            ES_REQUEST_SECONDS.labels(operation, outcome).observe(time.perf_counter() - started)
+
+
+def _client_options(**overrides) -> dict:
+    """Connection, pool, retry and timeout options shared by sync and async clients."""
+    options = {
+        "hosts": [ES_HOST],
+        "basic_auth": (ES_USER, ES_PASSWORD),
+        # For local development with a self-signed cert from Docker,
+        # we disable SSL certificate verification.
+        # In a production environment, you would provide the CA certificate instead.
+        "verify_certs": False,
+        "connections_per_node": ES_CONNECTIONS_PER_NODE,
+        "request_timeout": ES_REQUEST_TIMEOUT,
+        "max_retries": ES_MAX_RETRIES,
+        "retry_on_timeout": True,
+        "retry_on_status": (429, 502, 503, 504),
+    }
+    if ES_SNIFF:
+        options.update(
+            sniff_on_start=True,
+            sniff_on_node_failure=True,
+            min_delay_between_sniffing=60,
+        )
+    options.update(overrides)
+    return options
+
+
+def create_es_client(**overrides) -> Elasticsearch:
+    """
+    Creates a new, independent client with the configured pool, retry and timeout settings.
+
+    Prefer get_es_client(); this is for callers that need different options.
+    """
+    return InstrumentedElasticsearch(**_client_options(**overrides))
+
+
+def blocking_client(client: Elasticsearch) -> Elasticsearch:
+    """
+    The client with options for a call that blocks until the cluster finishes
+    the work (wait_for_completion, refresh): a long timeout and no retry on timeout.
+    """
+    return client.options(request_timeout=ES_BLOCKING_REQUEST_TIMEOUT, retry_on_timeout=False)
 
-# --- Configuration with your Credentials ---
-ES_HOST = "http://localhost:9200"
-ES_USER = "elastic"
-ES_PASSWORD = "JvQhvZYl"
 
 # --- Client Connection Function ---
-def get_es_client():
+def get_es_client() -> Elasticsearch:
     """
-    Creates and returns a client connection to a secure Elasticsearch instance.
+    Returns the shared client for this process, creating it on first use.
+
+    The client does not contact the cluster until the first request; use
+    client.ping() to check connectivity.
     """
-    print("Attempting to connect to Elasticsearch...")
+    global _client, _client_pid
+
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+
+    with _lock:
+        if _client is None or _client_pid != pid:
+            _client = create_es_client()
+            _client_pid = pid
+        return _client
+
+
+def close_es_client() -> None:
+    """Closes the shared client (e.g. at process shutdown)."""
+    global _client, _client_pid
+
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+def get_async_es_client() -> AsyncElasticsearch:
+    """
+    Returns the shared async client for this process and the running event loop.
+
+    Must be called from inside a coroutine. aiohttp sessions are bound to the
+    loop that created them, so a new loop (e.g. one per request when async
+    views run under WSGI) gets its own client; serve async views with an ASGI
+    server such as uvicorn to keep a single pooled client per worker.
+    """
+    global _async_client, _async_client_loop, _async_client_pid, _async_client_closer
+
+    loop = asyncio.get_running_loop()
+    pid = os.getpid()
+    if _async_client is None or _async_client_loop is not loop or _async_client_pid != pid:
+        _async_client = InstrumentedAsyncElasticsearch(**_client_options())
+        _async_client_loop = loop
+        _async_client_pid = pid
+        _async_client_closer = loop.create_task(_close_with_loop(_async_client))
+    return _async_client
+
+
+async def _close_with_loop(client: AsyncElasticsearch) -> None:
+    # Waits until its loop shuts down: asyncio.run() (which runs each async
+    # view under WSGI) cancels pending tasks before closing the loop, so the
+    # client's connections are closed while the loop can still do it.
     try:
-        # Create the client instance with authentication and SSL settings
-        client = Elasticsearch(
-            hosts=[ES_HOST],
-            basic_auth=(ES_USER, ES_PASSWORD),
-            # For local development with a self-signed cert from Docker,
-            # we disable SSL certificate verification.
-            # In a production environment, you would provide the CA certificate instead.
-            verify_certs=False
-        )
+        await asyncio.Event().wait()
+    finally:
+        await client.close()
+
+
+async def close_async_es_client() -> None:
+    """Closes the shared async client (e.g. on ASGI lifespan shutdown) from its event loop."""
+    global _async_client, _async_client_loop, _async_client_pid, _async_client_closer
+
+    if _async_client is not None and _async_client_pid == os.getpid():
+        _async_client_closer.cancel()  # a started closer closes it again; close() is idempotent
+        await _async_client.close()
+    _async_client = None
+    _async_client_loop = None
+    _async_client_pid = None
+    _async_client_closer = None
+
+
+def _reset_after_fork() -> None:
+    # The inherited clients' sockets belong to the parent; drop them without
+    # closing them and start with a fresh lock in the child.
+    global _client, _client_pid, _lock, _async_client, _async_client_loop, _async_client_pid, _async_client_closer
+    _client = None
+    _client_pid = None
+    _lock = threading.Lock()
+    _async_client = None
+    _async_client_loop = None
+    _async_client_pid = None
+    _async_client_closer = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
-        # Check if the connection is successful by pinging the server
-        if client.ping():
-            print("Successfully connected to Elasticsearch!")
-            return client
-        else:
-            print("Could not connect to Elasticsearch. The ping failed.")
-            return None
-    except Exception as e:
-        print(f"An error occurred while connecting to Elasticsearch: {e}")
-        return None
 
 # --- Main block to test the connection ---
 if __name__ == "__main__":
-    # Get the client connection
+    print("Attempting to connect to Elasticsearch...")
     es = get_es_client()
 
-    # If the connection was successful, 'es' will be a client object
-    if es:
+    if es.ping():
+        print("Successfully connected to Elasticsearch!")
         print("\nConnection test complete. You are ready to interact with your database.")
         # You can get more info to be sure
         print("\nCluster Information:")
         print(es.info())
     else:
-        print("\nConnection test failed. Please check your Docker container and credentials.")
\ No newline at end of file
+        print("\nConnection test failed. Please check your Docker container and credentials.")
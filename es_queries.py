@@ -0,0 +1,490 @@
+"""
+Elasticsearch query building shared by the scrapers and the Django backend.
+
+Everything here is pure (no client, no I/O): functions turn search parameters
+into request bodies and raw responses into the result dictionaries returned by
+ProthomAloScraperEnhanced.search_articles and the backend API, so both produce
+identical queries for the same filters.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from index_mappings import SOURCE_PROFILES
+
+DEFAULT_SEARCH_SIZE = 20
+
+# Fields callers may sort on; "url" is always appended as a unique tie-breaker
+# so search_after cursors are stable.
+SORTABLE_FIELDS = ("published_at", "scraped_at", "word_count", "_score")
+
+# "hybrid" fuses BM25 with kNN over the mapping v7 embedding field
+SEARCH_MODES = ("lexical", "hybrid")
+HYBRID_WINDOW = 50  # hits taken from each ranking before fusion (at least the page size)
+HYBRID_NUM_CANDIDATES = 200  # HNSW candidates per shard for the kNN side
+RRF_RANK_CONSTANT = 60  # k in the reciprocal rank fusion score 1 / (k + rank)
+
+HIGHLIGHT = {
+    # With indexed offsets (mapping v4) the unified highlighter reads postings
+    # instead of re-analyzing each article body
+    "type": "unified",
+    "fields": {
+        "headline": {},
+        "content": {"fragment_size": 150, "number_of_fragments": 3}
+    }
+}
+
+
+def build_query(query: str = None,
+                author: str = None,
+                location: str = None,
+                start_date: str = None,
+                end_date: str = None,
+                min_word_count: int = None,
+                max_word_count: int = None,
+                headline: str = None,
+                fuzzy: bool = True) -> Dict[str, Any]:
+    """
+    Build the bool query shared by searches and by-query maintenance operations.
+
+    Args:
+        query: Text to search in headline and content
+        author: Filter by exact author name
+        location: Filter by location
+        start_date: Start date for published_at filter (YYYY-MM-DD)
+        end_date: End date for published_at filter (YYYY-MM-DD)
+        min_word_count: Minimum word count
+        max_word_count: Maximum word count
+        headline: Exact headline to match
+        fuzzy: Let query terms match with typos (fuzziness AUTO)
+
+    Returns:
+        dict: Elasticsearch query clause
+    """
+    bool_query = {"must": [], "filter": []}
+
+    # Text search
+    if query:
+        multi_match = {
+            "query": query,
+            "fields": ["headline^2", "content"],
+            "type": "best_fields"
+        }
+        if fuzzy:
+            multi_match["fuzziness"] = "AUTO"
+        bool_query["must"].append({"multi_match": multi_match})
+    else:
+        bool_query["must"].append({"match_all": {}})
+
+    # Exact headline filter
+    if headline:
+        bool_query["filter"].append({
+            "term": {"headline.raw": headline}
+        })
+
+    # Author filter (exact, cacheable term lookup)
+    if author:
+        bool_query["filter"].append({
+            "term": {"author.keyword": author}
+        })
+
+    # Location filter
+    if location:
+        bool_query["filter"].append({
+            "term": {"location": location}
+        })
+
+    # Date range filter
+    if start_date or end_date:
+        date_range = {}
+        if start_date:
+            date_range["gte"] = start_date
+        if end_date:
+            date_range["lte"] = end_date
+
+        # published_at is stored as "yyyy-MM-dd HH:mm"; accept plain dates too
+        date_range["format"] = "yyyy-MM-dd||yyyy-MM-dd HH:mm"
+
+        bool_query["filter"].append({
+            "range": {"published_at": date_range}
+        })
+
+    # Word count range filter (0 is a real bound, e.g. max_word_count=0 for empty articles)
+    if min_word_count is not None or max_word_count is not None:
+        word_count_range = {}
+        if min_word_count is not None:
+            word_count_range["gte"] = min_word_count
+        if max_word_count is not None:
+            word_count_range["lte"] = max_word_count
+
+        bool_query["filter"].append({
+            "range": {"word_count": word_count_range}
+        })
+
+    return {"bool": bool_query}
+
+
+def is_restrictive_query(query: Dict[str, Any]) -> bool:
+    """
+    Whether a build_query clause can match less than the whole index.
+
+    Empty or None filter arguments leave the clause at match_all, which
+    by-query maintenance must never run with.
+    """
+    bool_query = query.get("bool", {})
+    if bool_query.get("filter"):
+        return True
+    return any("match_all" not in clause for clause in bool_query.get("must", []))
+
+
+def build_search_body(query: str = None,
+                      author: str = None,
+                      location: str = None,
+                      start_date: str = None,
+                      end_date: str = None,
+                      min_word_count: int = None,
+                      max_word_count: int = None,
+                      headline: str = None,
+                      size: int = DEFAULT_SEARCH_SIZE,
+                      sort_by: str = "published_at",
+                      sort_order: str = "desc",
+                      profile: str = "full",
+                      highlight: bool = False,
+                      search_after: Optional[List[Any]] = None,
+                      fuzzy: bool = True) -> Dict[str, Any]:
+    """
+    Build the search request body for the given filters.
+
+    Args:
+        size: Number of results to return
+        sort_by: Field to sort by
+        sort_order: Sort order (asc/desc)
+        profile: Projection profile - "list", "card" or "full" (see SOURCE_PROFILES)
+        highlight: Include headline/content highlights
+        search_after: Sort values of the last hit of the previous page
+        (remaining arguments as in build_query)
+
+    Returns:
+        dict: Elasticsearch search body
+    """
+    if profile not in SOURCE_PROFILES:
+        raise ValueError(f"Unknown projection profile: {profile}")
+
+    search_body = {
+        "size": size,
+        "sort": [{sort_by: {"order": sort_order}}, {"url": {"order": "asc"}}],
+        "query": build_query(
+            query=query,
+            author=author,
+            location=location,
+            start_date=start_date,
+            end_date=end_date,
+            min_word_count=min_word_count,
+            max_word_count=max_word_count,
+            headline=headline,
+            fuzzy=fuzzy
+        )
+    }
+
+    if search_after:
+        search_body["search_after"] = search_after
+
+    # Only ship the fields the caller's view needs
+    if SOURCE_PROFILES[profile] is not None:
+        search_body["_source"] = SOURCE_PROFILES[profile]
+
+    # Highlighting is opt-in
+    if highlight:
+        search_body["highlight"] = HIGHLIGHT
+
+    return search_body
+
+
+def format_search_response(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a raw search response (or one msearch item) into the result format
+    returned by search_articles.
+
+    Returns:
+        dict: Search results with hits and metadata; "next_search_after" holds
+              the sort values to continue from, or None on the last page
+    """
+    hits = response["hits"]["hits"]
+    results = {
+        "total_hits": response["hits"]["total"]["value"],
+        "max_score": response["hits"]["max_score"],
+        "took": response["took"],
+        "articles": [],
+        "next_search_after": hits[-1].get("sort") if hits else None
+    }
+
+    for hit in hits:
+        article = hit["_source"]
+        article["_id"] = hit["_id"]
+        article["_score"] = hit["_score"]
+
+        if "highlight" in hit:
+            article["highlight"] = hit["highlight"]
+
+        results["articles"].append(article)
+
+    if "aggregations" in response:
+        results["facets"] = format_facets(response["aggregations"])
+
+    return results
+
+
+def build_hybrid_searches(query: str,
+                          query_vector: List[float],
+                          author: str = None,
+                          location: str = None,
+                          start_date: str = None,
+                          end_date: str = None,
+                          min_word_count: int = None,
+                          max_word_count: int = None,
+                          headline: str = None,
+                          size: int = DEFAULT_SEARCH_SIZE,
+                          profile: str = "full",
+                          highlight: bool = False) -> List[Dict[str, Any]]:
+    """
+    Build the two searches fused by hybrid search, for one msearch.
+
+    The lexical side is the usual multi_match without fuzziness (the vector
+    side covers inflections and paraphrases at a fraction of the cost); the
+    kNN side searches the embedding field. Both apply the same filters and
+    return the top max(size, HYBRID_WINDOW) hits.
+
+    Args:
+        query: Search text
+        query_vector: Embedding of the search text (embeddings.py)
+        (remaining arguments as in build_search_body)
+
+    Returns:
+        list: [lexical body, kNN body]
+    """
+    filters = {
+        "author": author,
+        "location": location,
+        "start_date": start_date,
+        "end_date": end_date,
+        "min_word_count": min_word_count,
+        "max_word_count": max_word_count,
+        "headline": headline
+    }
+    window = max(size, HYBRID_WINDOW)
+
+    lexical = build_search_body(query=query, size=window, sort_by="_score", profile=profile,
+                                highlight=highlight, fuzzy=False, **filters)
+
+    knn = {
+        "size": window,
+        "knn": {
+            "field": "embedding",
+            "query_vector": query_vector,
+            "k": window,
+            "num_candidates": max(HYBRID_NUM_CANDIDATES, window),
+            "filter": build_query(**filters)["bool"]["filter"]
+        }
+    }
+    if SOURCE_PROFILES[profile] is not None:
+        knn["_source"] = SOURCE_PROFILES[profile]
+    if highlight:
+        # kNN hits have no query terms of their own to highlight
+        knn["highlight"] = {
+            **HIGHLIGHT,
+            "highlight_query": {"multi_match": {"query": query, "fields": ["headline", "content"]}}
+        }
+
+    return [lexical, knn]
+
+
+def fuse_search_responses(responses: List[Dict[str, Any]], size: int = DEFAULT_SEARCH_SIZE,
+                          rank_constant: int = RRF_RANK_CONSTANT) -> Dict[str, Any]:
+    """
+    Merge ranked search responses with reciprocal rank fusion.
+
+    Each article scores the sum of 1 / (rank_constant + rank) over the
+    rankings it appears in, so agreement between rankings counts for more
+    than any single raw score, whose scales (BM25, cosine) aren't comparable.
+
+    Returns:
+        dict: Results in the format of format_search_response, with the fused
+              score as "_score". "total_hits" counts the lexical matches (or the
+              fused candidates, if more) and hybrid results are a single page,
+              so "next_search_after" is always None.
+    """
+    scores: Dict[str, float] = {}
+    hits_by_id: Dict[str, Dict[str, Any]] = {}
+    for response in responses:
+        for rank, hit in enumerate(response["hits"]["hits"], 1):
+            scores[hit["_id"]] = scores.get(hit["_id"], 0.0) + 1.0 / (rank_constant + rank)
+            if hit["_id"] not in hits_by_id or "highlight" not in hits_by_id[hit["_id"]]:
+                hits_by_id[hit["_id"]] = hit
+
+    ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))[:size]
+    articles = []
+    for doc_id in ranked:
+        hit = hits_by_id[doc_id]
+        article = hit["_source"]
+        article["_id"] = doc_id
+        article["_score"] = round(scores[doc_id], 6)
+        if "highlight" in hit:
+            article["highlight"] = hit["highlight"]
+        articles.append(article)
+
+    return {
+        "total_hits": max(responses[0]["hits"]["total"]["value"] if responses else 0, len(scores)),
+        "max_score": articles[0]["_score"] if articles else None,
+        "took": max((response["took"] for response in responses), default=0),
+        "articles": articles,
+        "next_search_after": None
+    }
+
+
+def build_facet_aggs(size: int = 10, interval: str = "day") -> Dict[str, Any]:
+    """
+    Aggregations for author, location and publication-date facets.
+
+    Attach to a search body (``body["aggs"] = build_facet_aggs()``) to get facet
+    counts for the same filters in the same request.
+    """
+    return {
+        "authors": {"terms": {"field": "author.keyword", "size": size}},
+        "locations": {"terms": {"field": "location", "size": size}},
+        "published": {
+            "date_histogram": {
+                "field": "published_at",
+                "calendar_interval": interval,
+                "format": "yyyy-MM-dd",
+                "min_doc_count": 1
+            }
+        }
+    }
+
+
+def format_facets(aggs: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Convert facet aggregation results into plain {value, count} lists."""
+    facets = {}
+    if "authors" in aggs:
+        facets["author"] = [
+            {"value": b["key"], "count": b["doc_count"]} for b in aggs["authors"]["buckets"]
+        ]
+    if "locations" in aggs:
+        facets["location"] = [
+            {"value": b["key"], "count": b["doc_count"]} for b in aggs["locations"]["buckets"]
+        ]
+    if "published" in aggs:
+        facets["published"] = [
+            {"value": b["key_as_string"], "count": b["doc_count"]} for b in aggs["published"]["buckets"]
+        ]
+    return facets
+
+
+def build_suggest_body(prefix: str, size: int = 5) -> Dict[str, Any]:
+    """
+    Completion suggest request for headline and author prefixes (mapping v5).
+
+    Only the suggest section runs (no query phase), and headline options carry
+    just the fields needed to link to the article.
+    """
+    def completion(kind: str) -> Dict[str, Any]:
+        return {
+            "prefix": prefix,
+            "completion": {
+                "field": "suggest",
+                "size": size,
+                "skip_duplicates": True,
+                "contexts": {"kind": [kind]}
+            }
+        }
+
+    return {
+        "size": 0,
+        "_source": ["url", "headline"],
+        "suggest": {"headlines": completion("headline"), "authors": completion("author")}
+    }
+
+
+def format_suggest_response(response: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Convert a suggest response into headline and author suggestion lists."""
+    suggest = response.get("suggest", {})
+
+    def options(name: str) -> List[Dict[str, Any]]:
+        return suggest[name][0]["options"] if suggest.get(name) else []
+
+    return {
+        "headlines": [
+            {"headline": option["_source"]["headline"], "url": option["_source"]["url"]}
+            for option in options("headlines")
+        ],
+        "authors": [option["text"] for option in options("authors")]
+    }
+
+
+def build_statistics_body() -> Dict[str, Any]:
+    """Search body for index-wide statistics (total count and aggregations in one request)."""
+    return {
+        "size": 0,
+        "track_total_hits": True,
+        "aggs": {
+            "authors": {
+                "terms": {
+                    "field": "author.keyword",
+                    "size": 10
+                }
+            },
+            "unique_authors": {
+                "cardinality": {
+                    "field": "author.keyword"
+                }
+            },
+            "locations": {
+                "terms": {
+                    "field": "location",
+                    "size": 10
+                }
+            },
+            "word_count_stats": {
+                "stats": {
+                    "field": "word_count"
+                }
+            },
+            "latest_published": {
+                "max": {
+                    "field": "published_at"
+                }
+            },
+            "articles_by_date": {
+                "date_histogram": {
+                    "field": "published_at",
+                    "calendar_interval": "day"
+                }
+            }
+        }
+    }
+
+
+def format_statistics(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a statistics search response into the get_articles_statistics format."""
+    aggs = response["aggregations"]
+    word_counts = aggs["word_count_stats"]
+
+    return {
+        "total_articles": response["hits"]["total"]["value"],
+        "top_authors": [
+            {"author": bucket["key"], "count": bucket["doc_count"]}
+            for bucket in aggs["authors"]["buckets"]
+        ],
+        "unique_authors": aggs["unique_authors"]["value"],
+        "top_locations": [
+            {"location": bucket["key"], "count": bucket["doc_count"]}
+            for bucket in aggs["locations"]["buckets"]
+        ],
+        "word_count_stats": {
+            "average": round(word_counts["avg"] or 0, 2),
+            "min": word_counts["min"],
+            "max": word_counts["max"],
+            "total": word_counts["sum"]
+        },
+        "latest_published_at": aggs["latest_published"].get("value_as_string"),
+        "articles_per_day": len(aggs["articles_by_date"]["buckets"])
+    }
@@ -0,0 +1,131 @@
+"""
+URL frontier for links discovered inside articles.
+
+Stories linked from article bodies (the "আরও পড়ুন" links) often never show up
+in the collection API pages we poll. With link discovery enabled, the
+scrapers offer every same-site story link of each scraped article to a
+URLFrontier, which:
+
+1. drops links the persistent Bloom filter (bloom.py) has already seen, at
+   no network cost;
+2. confirms the probable-new rest against the index with one mget per
+   article, since the filter may not know every indexed URL, and adds the
+   ones found there to the filter;
+3. queues what is really new for the running pipeline or crawl daemon.
+
+URLs enter the filter only once they are known to be indexed (the frontier
+is a batch listener of the scraper), so a queued URL that is never scraped,
+e.g. because the process stopped, is simply discovered again later.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Iterable, List, Set
+from urllib.parse import quote, urljoin, urlsplit, urlunsplit
+
+from bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+LINK_SELECTOR = "div.story-content a[href]"
+MAX_PENDING = 10000  # queued URLs beyond this are dropped (and rediscovered later)
+
+
+def normalize_url(url: str) -> str:
+    """Drops query, fragment and trailing slash so one story has one URL."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip("/"), "", ""))
+
+
+def extract_story_links(soup, page_url: str, pattern) -> List[str]:
+    """
+    Story links in an article body.
+
+    Args:
+        soup: Parsed article page
+        page_url: URL of the article (base for relative links)
+        pattern: Compiled regex that story URLs must match (see sitemap.section_pattern)
+
+    Returns:
+        list: Normalized, de-duplicated story URLs other than the page itself
+    """
+    own = normalize_url(page_url)
+    links = []
+    for anchor in soup.select(LINK_SELECTOR):
+        url = normalize_url(urljoin(page_url, anchor["href"]))
+        if url != own and url not in links and pattern.match(url):
+            links.append(url)
+    return links
+
+
+def indexed_urls(es_client, index: str, urls: List[str]) -> Set[str]:
+    """URLs from `urls` that are already indexed (one mget, no sources)."""
+    if not urls:
+        return set()
+    response = es_client.mget(
+        index=index,
+        body={"ids": [quote(url, safe='') for url in urls]},
+        _source=False
+    )
+    return {url for url, doc in zip(urls, response["docs"]) if doc.get("found")}
+
+
+class URLFrontier:
+    """Queue of discovered URLs, de-duplicated by a Bloom filter and the index."""
+
+    def __init__(self, seen: BloomFilter, es_client_getter, index: str):
+        self.seen = seen
+        self._es_client = es_client_getter
+        self.index = index
+        self.pending = deque()
+        self._queued = set()  # mirrors pending
+        self._lock = threading.Lock()
+
+    def offer(self, urls: Iterable[str]) -> List[str]:
+        """
+        Queues the URLs that are neither in the filter nor in the index.
+
+        Returns:
+            list: The URLs that were queued
+        """
+        candidates = [url for url in urls if url not in self._queued and url not in self.seen]
+        if not candidates:
+            return []
+
+        try:
+            existing = indexed_urls(self._es_client(), self.index, candidates)
+        except Exception as e:
+            # Unconfirmed links would be queued or dropped blindly; try again next time
+            logger.warning(f"Could not confirm {len(candidates)} discovered links: {e}")
+            return []
+
+        new_urls = []
+        with self._lock:
+            for url in candidates:
+                if url in existing:
+                    self.seen.add(url)
+                elif url not in self._queued and len(self.pending) < MAX_PENDING:
+                    self._queued.add(url)
+                    self.pending.append(url)
+                    new_urls.append(url)
+        return new_urls
+
+    def mark_seen(self, urls: Iterable[str]) -> None:
+        """Records URLs fetched or indexed by other means."""
+        self.seen.update(urls)
+
+    def mark_batch_seen(self, articles: List[dict]) -> None:
+        """Batch listener: remembers every indexed article's URL."""
+        self.mark_seen(article["url"] for article in articles)
+        self.seen.flush()
+
+    def pop(self, limit: int) -> List[str]:
+        """Takes up to `limit` queued URLs, oldest first."""
+        with self._lock:
+            urls = [self.pending.popleft() for _ in range(min(limit, len(self.pending)))]
+            self._queued.difference_update(urls)
+        return urls
+
+    def __len__(self) -> int:
+        return len(self.pending)
@@ -0,0 +1,315 @@
+"""
+Versioned index definitions for the Prothom Alo articles index.
+
+Every mapping change gets a new version number. Physical indices are named
+``<alias>_v<version>`` and all reads and writes go through the alias, so a new
+version can be built next to the live one and swapped in atomically
+(see ProthomAloScraperEnhanced.migrate_index).
+
+Versions:
+- 1: Original mapping (author as text only)
+- 2: author.keyword sub-field for term filters and top-author aggregations
+- 3: Stored (unindexed) excerpt for lightweight list responses
+- 4: Offsets in the headline/content postings so highlighting doesn't re-analyze bodies
+- 5: Completion field for headline/author autocomplete
+- 6: Precomputed related-article list (maintained by related.py, not searchable)
+- 7: Document vector for kNN / hybrid search (computed at ingest by embeddings.py)
+"""
+
+import copy
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+EMBEDDING_DIMS = 256  # length of the v7 document vectors (see embeddings.py)
+EXCERPT_LENGTH = 200  # characters of content kept in the excerpt field
+SUGGEST_MAX_INPUTS = 8  # headline suffixes indexed per article (typing can start at any of the first words)
+
+# Values the scrapers store when a page element is missing; never suggested
+PLACEHOLDER_VALUES = ["Headline not found", "Author not found"]
+
+BASE_SETTINGS = {
+    "number_of_shards": 1,
+    "number_of_replicas": 1,
+    "analysis": {
+        "analyzer": {
+            "bengali_analyzer": {
+                "type": "standard",
+                "stopwords": "_none_"
+            }
+        }
+    }
+}
+
+_V1_PROPERTIES = {
+    "url": {"type": "keyword"},
+    "headline": {
+        "type": "text",
+        "analyzer": "bengali_analyzer",
+        "fields": {
+            "raw": {"type": "keyword"}
+        }
+    },
+    "author": {"type": "text"},
+    "location": {"type": "keyword"},
+    "published_at": {"type": "date", "format": "yyyy-MM-dd HH:mm"},
+    "content": {
+        "type": "text",
+        "analyzer": "bengali_analyzer"
+    },
+    "scraped_at": {"type": "date"},
+    "word_count": {"type": "integer"},
+    "last_updated": {"type": "date"}
+}
+
+_V2_PROPERTIES = {
+    **_V1_PROPERTIES,
+    "author": {
+        "type": "text",
+        "fields": {
+            "keyword": {"type": "keyword", "ignore_above": 256}
+        }
+    }
+}
+
+_V3_PROPERTIES = {
+    **_V2_PROPERTIES,
+    "excerpt": {"type": "text", "index": False}
+}
+
+_V4_PROPERTIES = {
+    **_V3_PROPERTIES,
+    "headline": {
+        "type": "text",
+        "analyzer": "bengali_analyzer",
+        "index_options": "offsets",
+        "fields": {
+            "raw": {"type": "keyword"}
+        }
+    },
+    "content": {
+        "type": "text",
+        "analyzer": "bengali_analyzer",
+        "index_options": "offsets"
+    }
+}
+
+_V5_PROPERTIES = {
+    **_V4_PROPERTIES,
+    # In-memory FST for prefix lookups; "kind" separates headline and author entries
+    "suggest": {
+        "type": "completion",
+        "analyzer": "bengali_analyzer",
+        "contexts": [{"name": "kind", "type": "category"}]
+    }
+}
+
+_V6_PROPERTIES = {
+    **_V5_PROPERTIES,
+    # [{"id": ..., "score": ...}, ...] best first; only ever read by key lookups
+    "related": {"type": "object", "enabled": False}
+}
+
+_V7_PROPERTIES = {
+    **_V6_PROPERTIES,
+    # Unit-length hashed TF-IDF projection; int8-quantized HNSW keeps the graph small
+    "embedding": {
+        "type": "dense_vector",
+        "dims": EMBEDDING_DIMS,
+        "index": True,
+        "similarity": "cosine",
+        "index_options": {"type": "int8_hnsw"}
+    }
+}
+
+MAPPING_VERSIONS: Dict[int, Dict[str, Any]] = {
+    1: _V1_PROPERTIES,
+    2: _V2_PROPERTIES,
+    3: _V3_PROPERTIES,
+    4: _V4_PROPERTIES,
+    5: _V5_PROPERTIES,
+    6: _V6_PROPERTIES,
+    7: _V7_PROPERTIES,
+}
+
+# Painless snippets run by the reindex when migrating *to* a version, used to
+# backfill fields that are normally computed at ingest time.
+MIGRATION_SCRIPTS: Dict[int, str] = {
+    # Mirrors build_excerpt(); lastIndexOf's start is inclusive, rfind's end is not
+    3: (
+        "if (ctx._source.excerpt == null && ctx._source.content != null) {"
+        " String c = ctx._source.content;"
+        " if (c.length() > params.excerpt_length) {"
+        "  int cut = c.lastIndexOf(' ', params.excerpt_length - 1);"
+        "  c = c.substring(0, cut > 0 ? cut : params.excerpt_length) + '…';"
+        " }"
+        " ctx._source.excerpt = c;"
+        "}"
+    ),
+    # Mirrors build_suggest()
+    5: (
+        "if (ctx._source.suggest == null) {"
+        " List entries = new ArrayList();"
+        " int weight = 1;"
+        " String p = ctx._source.published_at;"
+        " if (p != null && p.length() >= 10) {"
+        "  weight = (int) LocalDate.parse(p.substring(0, 10)).toEpochDay();"
+        " }"
+        " String h = ctx._source.headline;"
+        " if (h != null && !params.placeholders.contains(h.trim())) {"
+        "  h = h.trim();"
+        "  List inputs = new ArrayList();"
+        "  int start = 0;"
+        "  while (start >= 0 && inputs.size() < params.suggest_max_inputs) {"
+        "   String s = h.substring(start).trim();"
+        "   if (!s.isEmpty() && !inputs.contains(s)) { inputs.add(s); }"
+        "   int space = h.indexOf(' ', start);"
+        "   start = space < 0 ? -1 : space + 1;"
+        "  }"
+        "  if (!inputs.isEmpty()) {"
+        "   entries.add(['input': inputs, 'weight': weight, 'contexts': ['kind': ['headline']]]);"
+        "  }"
+        " }"
+        " String a = ctx._source.author;"
+        " if (a != null && !a.trim().isEmpty() && !params.placeholders.contains(a.trim())) {"
+        "  entries.add(['input': [a.trim()], 'weight': 1, 'contexts': ['kind': ['author']]]);"
+        " }"
+        " ctx._source.suggest = entries;"
+        "}"
+    ),
+}
+
+# _source filters for search responses; None returns the whole document.
+SOURCE_PROFILES: Dict[str, Optional[Union[List[str], Dict[str, List[str]]]]] = {
+    "list": ["url", "headline", "author", "published_at"],
+    "card": ["url", "headline", "author", "location", "published_at", "excerpt", "word_count"],
+    # Everything except index-only helper fields
+    "full": {"excludes": ["suggest", "related", "embedding"]},
+}
+
+CURRENT_MAPPING_VERSION = max(MAPPING_VERSIONS)
+
+# Saved searches (alerts.py) are percolator queries stored next to copies of
+# the article fields they can query; helper fields are left out.
+SAVED_SEARCH_PROPERTIES = {
+    "query": {"type": "percolator"},
+    "name": {"type": "keyword"},
+    "owner": {"type": "keyword"},
+    "filters": {"type": "object", "enabled": False},  # search_articles arguments, for display
+    "created_at": {"type": "date"},
+}
+PERCOLATOR_EXCLUDED_FIELDS = ("excerpt", "suggest", "related", "embedding")
+
+_VERSION_SUFFIX = re.compile(r"_v(\d+)$")
+
+
+def get_index_definition(version: int = CURRENT_MAPPING_VERSION) -> Dict[str, Any]:
+    """
+    Returns the full index body (settings and mappings) for a mapping version.
+
+    The version number is stored in the mapping ``_meta`` so it can be read
+    back from a live index.
+    """
+    if version not in MAPPING_VERSIONS:
+        raise ValueError(f"Unknown mapping version: {version}")
+
+    return {
+        "settings": copy.deepcopy(BASE_SETTINGS),
+        "mappings": {
+            "_meta": {"mapping_version": version},
+            "properties": copy.deepcopy(MAPPING_VERSIONS[version])
+        }
+    }
+
+
+def get_saved_search_index_definition(version: int = CURRENT_MAPPING_VERSION) -> Dict[str, Any]:
+    """
+    Returns the body of the saved-search (percolator) index.
+
+    Saved queries are parsed against this mapping, so it copies the article
+    fields of the given mapping version, with the same analyzers.
+    """
+    definition = get_index_definition(version)
+    properties = definition["mappings"]["properties"]
+    for field in PERCOLATOR_EXCLUDED_FIELDS:
+        properties.pop(field, None)
+    properties.update(copy.deepcopy(SAVED_SEARCH_PROPERTIES))
+    return definition
+
+
+def versioned_index_name(alias: str, version: int) -> str:
+    """Returns the physical index name for an alias and mapping version."""
+    return f"{alias}_v{version}"
+
+
+def parse_index_version(index_name: str) -> Optional[int]:
+    """Extracts the version from a physical index name, or None for legacy indices."""
+    match = _VERSION_SUFFIX.search(index_name)
+    return int(match.group(1)) if match else None
+
+
+def get_migration_script(from_version: int, to_version: int) -> Optional[Dict[str, Any]]:
+    """
+    Returns the reindex script that upgrades documents between two versions,
+    or None if no intermediate version needs one.
+    """
+    sources = [
+        MIGRATION_SCRIPTS[version]
+        for version in range(from_version + 1, to_version + 1)
+        if version in MIGRATION_SCRIPTS
+    ]
+    if not sources:
+        return None
+
+    return {
+        "lang": "painless",
+        "source": " ".join(sources),
+        "params": {
+            "excerpt_length": EXCERPT_LENGTH,
+            "suggest_max_inputs": SUGGEST_MAX_INPUTS,
+            "placeholders": PLACEHOLDER_VALUES
+        }
+    }
+
+
+def build_excerpt(content: str, length: int = EXCERPT_LENGTH) -> str:
+    """Returns the start of the article body, cut at a word boundary."""
+    if not content or len(content) <= length:
+        return content or ""
+
+    cut = content.rfind(" ", 0, length)
+    return content[:cut if cut > 0 else length] + "…"
+
+
+def _headline_suffixes(headline: str, limit: int = SUGGEST_MAX_INPUTS) -> List[str]:
+    """The headline and its tails starting at each following word."""
+    inputs = []
+    start = 0
+    while start >= 0 and len(inputs) < limit:
+        suffix = headline[start:].strip()
+        if suffix and suffix not in inputs:
+            inputs.append(suffix)
+        space = headline.find(" ", start)
+        start = -1 if space < 0 else space + 1
+    return inputs
+
+
+def build_suggest(headline: str, author: str, published_at: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Returns the completion field value for an article (mapping v5).
+
+    Headline entries are weighted by publication day so newer articles win
+    ties on the same prefix; author entries are deduplicated at query time.
+    """
+    weight = 1
+    if published_at and len(published_at) >= 10:
+        weight = (datetime.strptime(published_at[:10], "%Y-%m-%d") - datetime(1970, 1, 1)).days
+
+    entries = []
+    if headline and headline.strip() not in PLACEHOLDER_VALUES:
+        inputs = _headline_suffixes(headline.strip())
+        if inputs:
+            entries.append({"input": inputs, "weight": weight, "contexts": {"kind": ["headline"]}})
+    if author and author.strip() and author.strip() not in PLACEHOLDER_VALUES:
+        entries.append({"input": [author.strip()], "weight": 1, "contexts": {"kind": ["author"]}})
+    return entries
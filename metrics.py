@@ -0,0 +1,309 @@
+"""
+Process-local metrics in the Prometheus text exposition format.
+
+A deliberately small registry (counters, gauges and histograms with labels)
+so the scrapers and the backend need no extra dependency. Every metric lives
+in this module so both sides share names and buckets:
+
+- es_request_duration_seconds: Elasticsearch calls by operation and outcome,
+  recorded by the instrumented clients in es_connector.py
+- http_request_duration_seconds / http_responses_total: backend views
+  (news.middleware.MetricsMiddleware), exposed at /api/metrics/
+- news_es_breaker_state / news_stale_responses_total: backend outage handling
+  (news/resilience.py)
+- scraper_*: pipeline stage timings, queue depths and article outcomes,
+  exposed by start_metrics_server() in long-running scraper processes
+
+Values are per process: with several uvicorn workers each worker reports its
+own series, so scrape the workers individually or run one metrics worker.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_REGISTRY: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def labels(self, *values, **kwvalues):
+        """Returns the child series for the given label values."""
+        if kwvalues:
+            values = tuple(kwvalues[name] for name in self.labelnames)
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @property
+    def family(self) -> str:
+        """Name of the metric family in HELP/TYPE lines, which samples must use too."""
+        return self.name
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.family} {self.documentation}", f"# TYPE {self.family} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.inc(-amount)
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    @property
+    def family(self) -> str:
+        # The 0.0.4 text format types a counter under its sample name, _total included
+        return f"{self.name}_total"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self):
+        return [
+            f"{self.family}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+            for key, child in list(self._children.items())
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def _samples(self):
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+            for key, child in list(self._children.items())
+        ]
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self):
+        lines = []
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, inf)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+def render_metrics() -> str:
+    """Returns every registered metric in the Prometheus text format."""
+    return "\n".join(metric.render() for metric in _REGISTRY) + "\n"
+
+
+# --- Metrics ---
+
+ES_REQUEST_SECONDS = Histogram(
+    "es_request_duration_seconds",
+    "Elasticsearch request latency by operation (search, aggs, get, mget, msearch, bulk, ...)",
+    ["operation", "outcome"]
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Backend view latency until response headers",
+    ["view", "method"]
+)
+
+HTTP_RESPONSES = Counter(
+    "http_responses",
+    "Backend responses by view and status code",
+    ["view", "method", "status"]
+)
+
+ES_BREAKER_STATE = Gauge(
+    "news_es_breaker_state",
+    "Backend Elasticsearch circuit breaker state (0 closed, 1 half-open, 2 open)"
+)
+
+STALE_RESPONSES = Counter(
+    "news_stale_responses",
+    "Snapshot responses served while Elasticsearch was unavailable",
+    ["view"]
+)
+
+SCRAPER_STAGE_SECONDS = Histogram(
+    "scraper_stage_duration_seconds",
+    "Scraping pipeline stage latency (api_page, fetch, recrawl, parse, date, links, embed, bulk_flush)",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+
+SCRAPER_QUEUE_DEPTH = Gauge(
+    "scraper_queue_depth",
+    "Items waiting in a pipeline queue (urls to scrape, articles awaiting bulk indexing)",
+    ["queue"]
+)
+
+ARTICLES_INGESTED = Counter(
+    "scraper_articles_ingested",
+    "Articles successfully indexed"
+)
+
+ARTICLES_FAILED = Counter(
+    "scraper_articles_failed",
+    "Articles that could not be scraped or indexed, by stage",
+    ["stage"]
+)
+
+
+@contextmanager
+def time_stage(stage: str):
+    """Records the duration of a pipeline stage in scraper_stage_duration_seconds."""
+    with SCRAPER_STAGE_SECONDS.labels(stage).time():
+        yield
+
+
+def es_operation(endpoint_id: Optional[str], path: str, body) -> str:
+    """
+    Names an Elasticsearch request for the latency histogram.
+
+    Searches that only aggregate (size 0 with aggs) are reported as "aggs" so
+    dashboard and statistics queries don't blur search latency.
+    """
+    operation = endpoint_id or path.rstrip("/").rsplit("/", 1)[-1].lstrip("_") or "root"
+    if operation == "search" and isinstance(body, dict) and body.get("size") == 0 and (
+            "aggs" in body or "aggregations" in body):
+        return "aggs"
+    return operation
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        payload = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the scraper log
+        pass
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serves /metrics from a daemon thread; returns the server (call shutdown() to stop)."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,75 @@
+"""
+Index mapping migration command.
+
+Moves the live articles index to a newer mapping version (see index_mappings.py)
+with a sliced background reindex, catch-up passes for writes made during the
+copy and an atomic alias swap, so searches and scrapers keep running.
+
+Fields that can't be derived by the reindex script, such as the related
+articles added in version 6 and the document vectors added in version 7, are
+rebuilt afterwards with --rebuild-related and --rebuild-embeddings.
+
+Usage:
+    python migrate_index.py --status
+    python migrate_index.py
+    python migrate_index.py --version 2 --slices 4 --requests-per-second 1000
+    python migrate_index.py --rebuild-related
+    python migrate_index.py --rebuild-embeddings
+"""
+
+import argparse
+import sys
+
+from index_mappings import CURRENT_MAPPING_VERSION
+from scraper import ProthomAloScraperEnhanced, logger
+
+
+def main():
+    """Parses arguments and runs the migration."""
+    parser = argparse.ArgumentParser(description="Migrate the articles index to a new mapping version")
+    parser.add_argument("--status", action="store_true",
+                        help="Only print the current and latest mapping versions")
+    parser.add_argument("--version", type=int, default=CURRENT_MAPPING_VERSION,
+                        help=f"Target mapping version (default: {CURRENT_MAPPING_VERSION})")
+    parser.add_argument("--slices", default=None,
+                        help='Parallel reindex slices, a number or "auto"')
+    parser.add_argument("--requests-per-second", type=float, default=None,
+                        help="Reindex throttle, -1 for unthrottled")
+    parser.add_argument("--delete-old", action="store_true",
+                        help="Delete the previous index version after the alias swap")
+    parser.add_argument("--rebuild-related", action="store_true",
+                        help="Recompute every article's related list (after migrating to v6+)")
+    parser.add_argument("--rebuild-embeddings", action="store_true",
+                        help="Fit the embedding model and re-embed every article (after migrating to v7+)")
+    args = parser.parse_args()
+
+    scraper = ProthomAloScraperEnhanced()
+    if not scraper.connect_to_elasticsearch():
+        sys.exit(1)
+
+    if args.status:
+        logger.info(f"Current mapping version: {scraper.get_index_version()}")
+        logger.info(f"Latest mapping version: {CURRENT_MAPPING_VERSION}")
+        return
+
+    if args.rebuild_related:
+        sys.exit(0 if scraper.rebuild_related_articles() else 1)
+
+    if args.rebuild_embeddings:
+        sys.exit(0 if scraper.rebuild_embeddings() else 1)
+
+    slices = args.slices
+    if slices is not None and slices != "auto":
+        slices = int(slices)
+
+    success = scraper.migrate_index(
+        target_version=args.version,
+        slices=slices,
+        requests_per_second=args.requests_per_second,
+        delete_old=args.delete_old
+    )
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
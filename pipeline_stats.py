@@ -0,0 +1,200 @@
+"""
+Per-stage instrumentation and end-of-run reports for the scraping pipeline.
+
+A PipelineRun collects stage timings (monotonic perf_counter) for API page
+fetches, article fetches, re-crawl checks, parsing, date normalization and bulk flushes, plus
+bytes downloaded, failures by category and the slowest URLs. Recording a
+sample is a list append and a histogram update (see metrics.py); nothing is
+formatted in the hot loop unless a JSON-lines events file is configured.
+
+At the end of a run, finish() builds a report with throughput and latency
+percentiles per stage, logs a short summary and can append the report as one
+JSON line to a file for trend tracking.
+"""
+
+import heapq
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from metrics import ARTICLES_FAILED, SCRAPER_STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("api_page", "fetch", "recrawl", "parse", "date", "links", "embed", "bulk_flush")
+# Failures in these stages lose the article; others are recorded but not fatal
+ARTICLE_STAGES = ("fetch", "parse", "bulk_flush")
+SLOWEST_URLS = 10
+
+
+def failure_category(error: Any) -> str:
+    """Short, low-cardinality name for what went wrong."""
+    if isinstance(error, str):
+        return error
+    if isinstance(error, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "connection"
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return f"http_{error.response.status_code}"
+    return type(error).__name__
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class PipelineRun:
+    """In-memory recorder for one pipeline run, shared by the fetch and indexing threads."""
+
+    def __init__(self, events_file: Optional[str] = None, slowest: int = SLOWEST_URLS):
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+        self.durations: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.counts = Counter()
+        self.failures = Counter()
+        self.bytes_downloaded = 0
+        self.slowest_size = slowest
+        self._slowest: List[tuple] = []  # min-heap of (seconds, url)
+        self._histograms = {stage: SCRAPER_STAGE_SECONDS.labels(stage) for stage in STAGES}
+        self._events = open(events_file, "a", encoding="utf-8") if events_file else None
+        self._lock = threading.Lock()  # guards the tallies and the events file
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        event["ts"] = time.time()
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._events:  # may have been closed by finish() meanwhile
+                self._events.write(line)
+
+    def record(self, stage: str, seconds: float, url: Optional[str] = None, nbytes: int = 0) -> None:
+        """Records one successful stage execution."""
+        self._histograms[stage].observe(seconds)
+        with self._lock:
+            self.durations[stage].append(seconds)
+            self.bytes_downloaded += nbytes
+        if self._events:
+            self._emit({"event": "stage", "stage": stage, "ms": round(seconds * 1000, 3),
+                        "url": url, "bytes": nbytes})
+
+    @contextmanager
+    def stage(self, stage: str, url: Optional[str] = None):
+        """Times the enclosed block as one execution of `stage` (failures are not timed)."""
+        started = time.perf_counter()
+        yield
+        self.record(stage, time.perf_counter() - started, url)
+
+    def record_failure(self, stage: str, error: Any, url: Optional[str] = None, count: int = 1) -> None:
+        """Counts a failure under "<stage>:<category>"."""
+        category = failure_category(error)
+        with self._lock:
+            self.failures[f"{stage}:{category}"] += count
+        if stage in ARTICLE_STAGES:
+            ARTICLES_FAILED.labels(stage).inc(count)
+        if self._events:
+            self._emit({"event": "failure", "stage": stage, "category": category,
+                        "url": url, "count": count, "error": str(error)[:200]})
+
+    def record_url(self, url: str, seconds: float) -> None:
+        """Tracks end-to-end scrape time of an article for the slowest-URL list."""
+        entry = (seconds, url)
+        with self._lock:
+            if len(self._slowest) < self.slowest_size:
+                heapq.heappush(self._slowest, entry)
+            elif entry > self._slowest[0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increments a run counter (discovered, scraped, indexed, ...)."""
+        with self._lock:
+            self.counts[name] += amount
+
+    def report(self) -> Dict[str, Any]:
+        """Builds the end-of-run report."""
+        elapsed = time.perf_counter() - self.started
+        with self._lock:
+            durations = {stage: sorted(samples) for stage, samples in self.durations.items() if samples}
+            counts = dict(self.counts)
+            failures = dict(self.failures.most_common())
+            slowest = sorted(self._slowest, reverse=True)
+
+        stages = {}
+        for stage, ordered in durations.items():
+            stages[stage] = {
+                "count": len(ordered),
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+                "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+                "p95_ms": round(_percentile(ordered, 95) * 1000, 2),
+                "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2),
+            }
+
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_s": round(elapsed, 3),
+            "counts": counts,
+            "articles_per_second": round(counts.get("indexed", 0) / elapsed, 3) if elapsed else 0.0,
+            "bytes_downloaded": self.bytes_downloaded,
+            "stages": stages,
+            "failures": failures,
+            "slowest_urls": [
+                {"url": url, "ms": round(seconds * 1000, 1)}
+                for seconds, url in slowest
+            ],
+        }
+
+    def finish(self, report_file: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Closes the run: logs a summary and optionally appends the report to a file.
+
+        Args:
+            report_file: JSON-lines file receiving one report per run
+
+        Returns:
+            dict: The run report
+        """
+        report = self.report()
+        if self._events:
+            self._emit({"event": "run_finished", "duration_s": report["duration_s"]})
+            with self._lock:
+                if self._events:
+                    self._events.close()
+                    self._events = None
+
+        counts = report["counts"]
+        logger.info(
+            f"Run finished in {report['duration_s']}s: {counts.get('indexed', 0)} indexed, "
+            f"{counts.get('scraped', 0)}/{counts.get('discovered', 0)} scraped, "
+            f"{report['articles_per_second']} articles/s, "
+            f"{report['bytes_downloaded'] / 1024 / 1024:.2f} MB downloaded"
+        )
+        for stage, stats in report["stages"].items():
+            logger.info(
+                f"  {stage:<10} n={stats['count']:<5} p50={stats['p50_ms']}ms "
+                f"p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms max={stats['max_ms']}ms"
+            )
+        if report["failures"]:
+            logger.info(f"  failures: {report['failures']}")
+        if report["slowest_urls"]:
+            slowest = report["slowest_urls"][0]
+            logger.info(f"  slowest: {slowest['url']} ({slowest['ms']}ms)")
+
+        if report_file:
+            try:
+                with open(report_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(report, ensure_ascii=False) + "\n")
+            except OSError as e:
+                logger.error(f"Failed to write run report to {report_file}: {e}")
+
+        return report
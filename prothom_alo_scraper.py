@@ -13,28 +13,60 @@ Features:
 - Duplicate prevention using URL-based document IDs
 """
 
+import argparse
+import os
+import sys
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, quote
 import time
 from datetime import datetime
-from elasticsearch import Elasticsearch, helpers
+from elasticsearch import helpers
 import logging
 from typing import Optional, Dict, List, Any
 
+from article_feed import FeedPublisher
+from bloom import BloomFilter
+from crawl_daemon import CrawlDaemon
+from es_connector import get_es_client
+from frontier import URLFrontier, extract_story_links
+from index_mappings import (
+    CURRENT_MAPPING_VERSION,
+    build_excerpt,
+    build_suggest,
+    get_index_definition,
+    versioned_index_name,
+)
+from metrics import (
+    ARTICLES_INGESTED,
+    SCRAPER_QUEUE_DEPTH,
+    start_metrics_server,
+)
+from pipeline_stats import PipelineRun
+from related import BULK_REFRESH as RELATED_BULK_REFRESH, RelatedArticlesUpdater
+from sitemap import SECTIONS, section_pattern
+
 # --- Configuration ---
 class Config:
     """Centralized configuration for the scraper."""
     BASE_URL = "https://www.prothomalo.com/"
     API_URL = "https://www.prothomalo.com/api/v1/collections/politics"
-    ES_HOST = "http://localhost:9200"
-    ES_USER = "elastic"
-    ES_PASSWORD = "JvQhvZYl"
-    ES_INDEX = "prothomalo_politics"
+    ES_INDEX = "prothomalo_politics"  # alias in front of the versioned index
     DEFAULT_MAX_PAGES = 2
     STORIES_PER_PAGE = 12
     REQUEST_DELAY = 1  # seconds between requests
     BULK_INDEX_SIZE = 100  # documents per bulk operation
+    FEED_ENABLED = True  # publish indexed articles to the live feed (article_feed.py)
+    RELATED_ENABLED = True  # maintain precomputed related articles (related.py)
+    RECRAWL_ENABLED = False  # re-crawls need scraper.py's parser and partial updates (recrawl.py)
+    METRICS_PORT = int(os.environ.get("SCRAPER_METRICS_PORT", "0"))  # /metrics listener, 0 disables
+    RUN_EVENTS_FILE = os.environ.get("SCRAPER_EVENTS_FILE")  # JSON-lines stage events, off if unset
+    RUN_REPORT_FILE = os.environ.get("SCRAPER_RUN_REPORT")  # JSON-lines end-of-run reports, off if unset
+    DISCOVER_LINKS = os.environ.get("SCRAPER_DISCOVER_LINKS", "0") == "1"  # follow story links in articles (frontier.py)
+    MAX_DISCOVERED_LINKS = 50  # discovered articles scraped per run or daemon cycle
+    SEEN_FILTER_FILE = os.environ.get("SCRAPER_SEEN_FILTER", "seen_urls.bloom")  # Bloom filter of known URLs
+    SEEN_FILTER_CAPACITY = 1_000_000
+    SEEN_FILTER_ERROR_RATE = float(os.environ.get("SCRAPER_SEEN_FILTER_FP", "0.001"))
 
 # --- Logging Setup ---
 logging.basicConfig(
@@ -53,6 +85,28 @@ class ProthomAloScraper:
     def __init__(self):
         self.config = Config()
         self.es_client = None
+        # Pooled HTTP session: keeps connections to the site warm across pages and cycles
+        self.session = requests.Session()
+        # Callables receiving each successfully indexed bulk batch
+        self.batch_listeners = []
+        if self.config.FEED_ENABLED:
+            self.batch_listeners.append(FeedPublisher().publish_batch)
+        self.related_updater = RelatedArticlesUpdater(self.config.ES_INDEX)
+        # Stage timings and failures; replaced with a fresh recorder per pipeline run
+        self.run_stats = PipelineRun()
+        if self.config.RELATED_ENABLED:
+            self.batch_listeners.append(self.related_updater.update_batch)
+        # Queue of same-site story links found in scraped articles
+        self.frontier = None
+        if self.config.DISCOVER_LINKS:
+            seen = BloomFilter(
+                self.config.SEEN_FILTER_FILE,
+                self.config.SEEN_FILTER_CAPACITY,
+                self.config.SEEN_FILTER_ERROR_RATE
+            )
+            self.frontier = URLFrontier(seen, get_es_client, self.config.ES_INDEX)
+            self.story_link_pattern = section_pattern(self.config.BASE_URL, SECTIONS)
+            self.batch_listeners.append(self.frontier.mark_batch_seen)
         self.bengali_to_english_digits = str.maketrans('০১২৩৪৫৬৭৮৯', '0123456789')
         self.bengali_months = {
             'জানুয়ারি': '01', 'ফেব্রুয়ারি': '02', 'মার্চ': '03', 'এপ্রিল': '04',
@@ -69,11 +123,8 @@ class ProthomAloScraper:
         """
         try:
             logger.info("Connecting to Elasticsearch...")
-            self.es_client = Elasticsearch(
-                hosts=[self.config.ES_HOST],
-                basic_auth=(self.config.ES_USER, self.config.ES_PASSWORD),
-                verify_certs=False  # For local Docker development
-            )
+            # Shared, pooled client (connection settings live in es_connector.py)
+            self.es_client = get_es_client()
             
             if self.es_client.ping():
                 logger.info("Successfully connected to Elasticsearch")
@@ -88,7 +139,7 @@ class ProthomAloScraper:
     
     def create_index_if_not_exists(self) -> bool:
         """
-        Creates the Elasticsearch index with proper mapping if it doesn't exist.
+        Creates the versioned Elasticsearch index behind the ES_INDEX alias if it doesn't exist.
         
         Returns:
             bool: True if index exists or was created successfully
@@ -98,45 +149,14 @@ class ProthomAloScraper:
                 logger.info(f"Index '{self.config.ES_INDEX}' already exists")
                 return True
             
-            logger.info(f"Creating index '{self.config.ES_INDEX}' with custom mapping...")
-            
-            index_mapping = {
-                "settings": {
-                    "number_of_shards": 1,
-                    "number_of_replicas": 1,
-                    "analysis": {
-                        "analyzer": {
-                            "bengali_analyzer": {
-                                "type": "standard",
-                                "stopwords": "_none_"
-                            }
-                        }
-                    }
-                },
-                "mappings": {
-                    "properties": {
-                        "url": {"type": "keyword"},
-                        "headline": {
-                            "type": "text", 
-                            "analyzer": "bengali_analyzer",
-                            "fields": {
-                                "raw": {"type": "keyword"}
-                            }
-                        },
-                        "author": {"type": "text"},
-                        "location": {"type": "keyword"},
-                        "published_at": {"type": "date", "format": "yyyy-MM-dd HH:mm"},
-                        "content": {
-                            "type": "text", 
-                            "analyzer": "bengali_analyzer"
-                        },
-                        "scraped_at": {"type": "date"},
-                        "word_count": {"type": "integer"}
-                    }
-                }
-            }
+            index_name = versioned_index_name(self.config.ES_INDEX, CURRENT_MAPPING_VERSION)
+            logger.info(f"Creating index '{index_name}' with alias '{self.config.ES_INDEX}'...")
+            
+            # Mapping is shared with the enhanced scraper (see index_mappings.py)
+            index_definition = get_index_definition(CURRENT_MAPPING_VERSION)
+            index_definition["aliases"] = {self.config.ES_INDEX: {}}
             
-            self.es_client.indices.create(index=self.config.ES_INDEX, body=index_mapping)
+            self.es_client.indices.create(index=index_name, body=index_definition)
             logger.info("Index created successfully")
             return True
             
@@ -225,10 +245,15 @@ class ProthomAloScraper:
         Returns:
             dict: Article data or None if scraping fails
         """
+        stage = "fetch"
+        started = time.perf_counter()
         try:
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
+            fetched = time.perf_counter()
+            self.run_stats.record("fetch", fetched - started, url, len(response.content))
             
+            stage = "parse"
             soup = BeautifulSoup(response.content, "html.parser")
             
             # Extract article data using CSS selectors
@@ -246,7 +271,11 @@ class ProthomAloScraper:
             publication_date_raw = date_tag.get_text(strip=True) if date_tag else "Date not found"
 
             publication_date_cleaned = publication_date_raw.split(":", 1)[-1].strip()
+            date_started = time.perf_counter()
             publication_date = self.parse_bengali_date(publication_date_cleaned)
+            self.run_stats.record("date", time.perf_counter() - date_started, url)
+            if publication_date is None:
+                self.run_stats.record_failure("date", "unparsed_date", url)
 
             
             # Extract content paragraphs
@@ -263,20 +292,56 @@ class ProthomAloScraper:
                 "location": location,
                 "published_at":publication_date,
                 "content": content,
+                "excerpt": build_excerpt(content),
+                "suggest": build_suggest(headline, author, publication_date),
                 "scraped_at": datetime.now().isoformat(),
                 "word_count": word_count
             }
+            finished = time.perf_counter()
+            self.run_stats.record("parse", finished - fetched, url)
+            self.run_stats.record_url(url, finished - started)
             
-            logger.info(f"Successfully scraped: {headline[:50]}...")
+            if self.frontier is not None:
+                self.frontier.offer(extract_story_links(soup, url, self.story_link_pattern))
+                self.run_stats.record("links", time.perf_counter() - finished, url)
+            
+            # Lazy %-formatting: skipped entirely unless debug logging is on
+            logger.debug("Successfully scraped: %.50s...", headline)
             return article_data
             
         except requests.exceptions.RequestException as e:
+            self.run_stats.record_failure(stage, e, url)
             logger.error(f"HTTP error scraping {url}: {e}")
             return None
         except Exception as e:
+            self.run_stats.record_failure(stage, e, url)
             logger.error(f"Unexpected error scraping {url}: {e}")
             return None
     
+    def fetch_api_page(self, skip: int, limit: Optional[int] = None) -> List[str]:
+        """
+        Fetches one page of the collection API (newest stories first).
+        
+        Args:
+            skip: Number of stories to skip
+            limit: Stories per page (defaults to STORIES_PER_PAGE)
+            
+        Returns:
+            list: Article URLs on the page, empty past the end of the collection
+        """
+        params = {'skip': skip, 'limit': limit or self.config.STORIES_PER_PAGE}
+        started = time.perf_counter()
+        response = self.session.get(self.config.API_URL, params=params, timeout=10)
+        response.raise_for_status()
+        self.run_stats.record("api_page", time.perf_counter() - started, nbytes=len(response.content))
+        
+        urls = []
+        for story in response.json().get('items', []):
+            slug = story.get('story', {}).get('slug')
+            if slug:
+                urls.append(urljoin(self.config.BASE_URL, slug))
+        return urls
+    
     def get_article_urls_from_api(self, max_pages: int) -> List[str]:
         """
         Fetches article URLs from the Prothom Alo API.
@@ -290,35 +355,34 @@ class ProthomAloScraper:
         article_urls = []
         
         for page_num in range(max_pages):
-            skip = page_num * self.config.STORIES_PER_PAGE
-            params = {'skip': skip, 'limit': self.config.STORIES_PER_PAGE}
-            
             try:
                 logger.info(f"Fetching page {page_num + 1}/{max_pages} from API...")
-                response = requests.get(self.config.API_URL, params=params, timeout=10)
-                response.raise_for_status()
-                
-                stories = response.json().get('items', [])
-                if not stories:
+                urls = self.fetch_api_page(page_num * self.config.STORIES_PER_PAGE)
+                if not urls:
                     logger.info("No more stories found, stopping pagination")
                     break
                 
-                for story in stories:
-                    slug = story.get('story', {}).get('slug')
-                    if slug:
-                        url = urljoin(self.config.BASE_URL, slug)
-                        article_urls.append(url)
+                article_urls.extend(urls)
                 
                 # Rate limiting
                 time.sleep(self.config.REQUEST_DELAY)
                 
             except Exception as e:
+                self.run_stats.record_failure("api_page", e)
                 logger.error(f"Error fetching API page {page_num + 1}: {e}")
                 break
         
         logger.info(f"Found {len(article_urls)} article URLs")
         return article_urls
     
+    def _notify_batch_listeners(self, articles: List[Dict[str, Any]]) -> None:
+        """Hands a committed bulk batch to every registered batch listener."""
+        for listener in self.batch_listeners:
+            try:
+                listener(articles)
+            except Exception as e:
+                logger.warning(f"Batch listener {listener} failed: {e}")
+    
     def bulk_index_articles(self, articles: List[Dict[str, Any]]) -> bool:
         """
         Efficiently bulk index articles into Elasticsearch.
@@ -348,14 +412,38 @@ class ProthomAloScraper:
             
             logger.info(f"Starting bulk indexing of {len(actions)} documents...")
             
-            # Use bulk helper for efficient indexing
-            success, failed = helpers.bulk(
+            # Use the streaming bulk helper: it reports each chunk as soon as Elasticsearch
+            # commits it, so listeners hear about articles batch by batch
+            started = time.perf_counter()
+            chunk_size = self.config.BULK_INDEX_SIZE
+            success, failed = 0, []
+            indexed = []
+            results = helpers.streaming_bulk(
                 self.es_client,
                 actions,
-                chunk_size=self.config.BULK_INDEX_SIZE,
+                chunk_size=chunk_size,
                 request_timeout=60,
-                raise_on_error=False
+                raise_on_error=False,
+                # Related lists need the batch searchable; wait for the next refresh
+                refresh=RELATED_BULK_REFRESH if self.config.RELATED_ENABLED else None
             )
+            for i, (ok, item) in enumerate(results):
+                if ok:
+                    success += 1
+                    indexed.append(articles[i])
+                else:
+                    failed.append(item)
+                if (i + 1) % chunk_size == 0 and indexed:
+                    self._notify_batch_listeners(indexed)
+                    indexed = []
+            if indexed:
+                self._notify_batch_listeners(indexed)
+            self.run_stats.record("bulk_flush", time.perf_counter() - started)
+            self.run_stats.count("indexed", success)
+            ARTICLES_INGESTED.inc(success)
+            if failed:
+                self.run_stats.record_failure("bulk_flush", "rejected", count=len(failed))
+            SCRAPER_QUEUE_DEPTH.labels("bulk").set(0)
             
             logger.info(f"Successfully indexed {success} documents")
             if failed:
@@ -371,7 +459,7 @@ class ProthomAloScraper:
     
     def run_scraping_pipeline(self, max_pages: int = None) -> bool:
         """
-        Runs the complete scraping and indexing pipeline.
+        Runs the complete scraping and indexing pipeline and reports its stage timings.
         
         Args:
             max_pages: Number of pages to scrape (defaults to config value)
@@ -379,6 +467,14 @@ class ProthomAloScraper:
         Returns:
             bool: True if pipeline completed successfully
         """
+        self.run_stats = PipelineRun(events_file=self.config.RUN_EVENTS_FILE)
+        try:
+            return self._run_pipeline(max_pages)
+        finally:
+            self.run_stats.finish(report_file=self.config.RUN_REPORT_FILE)
+    
+    def _run_pipeline(self, max_pages: int = None) -> bool:
+        """Discovers, scrapes and bulk indexes articles for run_scraping_pipeline()."""
         if max_pages is None:
             max_pages = self.config.DEFAULT_MAX_PAGES
         
@@ -401,18 +497,32 @@ class ProthomAloScraper:
         # Step 4: Scrape articles
         scraped_articles = []
         total_urls = len(article_urls)
+        self.run_stats.count("discovered", total_urls)
+        links_budget = self.config.MAX_DISCOVERED_LINKS
         
         for i, url in enumerate(article_urls, 1):
-            logger.info(f"Scraping article {i}/{total_urls}: {url}")
+            SCRAPER_QUEUE_DEPTH.labels("urls").set(total_urls - i + 1)
+            logger.debug("Scraping article %d/%d: %s", i, total_urls, url)
             
             article_data = self.scrape_single_article(url)
             if article_data:
                 scraped_articles.append(article_data)
+                self.run_stats.count("scraped")
+                SCRAPER_QUEUE_DEPTH.labels("bulk").set(len(scraped_articles))
+            
+            # Follow links found in the articles (they are scraped last)
+            if self.frontier is not None and links_budget > 0:
+                linked = [link for link in self.frontier.pop(links_budget) if link not in article_urls]
+                links_budget -= len(linked)
+                article_urls.extend(linked)
+                total_urls = len(article_urls)
+                self.run_stats.count("linked", len(linked))
             
             # Rate limiting between requests
             if i < total_urls:  # Don't sleep after the last request
                 time.sleep(self.config.REQUEST_DELAY)
         
+        SCRAPER_QUEUE_DEPTH.labels("urls").set(0)
         logger.info(f"Successfully scraped {len(scraped_articles)}/{total_urls} articles")
         
         # Step 5: Bulk index to Elasticsearch
@@ -424,8 +534,20 @@ class ProthomAloScraper:
 
 def main():
     """Main entry point for the scraper."""
+    parser = argparse.ArgumentParser(description="Prothom Alo politics scraper")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep polling for new articles until SIGTERM (see crawl_daemon.py)")
+    args = parser.parse_args()
+    
     scraper = ProthomAloScraper()
     
+    if scraper.config.METRICS_PORT:
+        start_metrics_server(scraper.config.METRICS_PORT)
+        logger.info(f"Serving metrics on port {scraper.config.METRICS_PORT}")
+    
+    if args.daemon:
+        sys.exit(0 if CrawlDaemon(scraper).run() else 1)
+    
     # You can customize the number of pages to scrape
     max_pages = 2  # Change this value as needed
     
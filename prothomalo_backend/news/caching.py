@@ -0,0 +1,130 @@
+"""
+Conditional GET and server-side response caching for the news endpoints.
+
+Responses are validated by a cheap freshness token derived from the index
+(document count plus max scraped_at/last_updated). The token is looked up in
+ES at most once per NEWS_FRESHNESS_TTL seconds and shared through Django's
+cache. Repeat requests are answered with 304 Not Modified when the client's
+validator matches, or from the rendered-response cache otherwise, so they
+never reach Elasticsearch. The per-client rate limit is checked first, so
+cached answers are throttled like any other request.
+
+The default cache is the in-process LocMemCache, whose calls never block, so
+it is used directly from the async views rather than through Django's async
+cache API (which hops every call through a single worker thread).
+"""
+
+import hashlib
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from es_connector import get_async_es_client
+
+from .resilience import es_call
+from .throttling import throttle_response
+
+logger = logging.getLogger(__name__)
+
+FRESHNESS_CACHE_KEY = "news:freshness"
+
+FRESHNESS_QUERY = {
+    "size": 0,
+    "track_total_hits": True,
+    "aggs": {
+        "last_scraped": {"max": {"field": "scraped_at"}},
+        "last_updated": {"max": {"field": "last_updated"}}
+    }
+}
+
+
+async def get_freshness():
+    """
+    Returns (validator, last_modified_timestamp) for the articles index, or
+    None if it can't be determined.
+    """
+    freshness = cache.get(FRESHNESS_CACHE_KEY)
+    if freshness is not None:
+        return freshness
+
+    try:
+        res = await es_call(
+            get_async_es_client().search(index=settings.ES_INDEX, body=FRESHNESS_QUERY),
+            "freshness"
+        )
+    except Exception as e:
+        logger.warning(f"Freshness check failed: {e}")
+        return None
+
+    aggs = res["aggregations"]
+    timestamps = [aggs[name]["value"] for name in ("last_scraped", "last_updated") if aggs[name]["value"]]
+    last_modified = int(max(timestamps) / 1000) if timestamps else 0
+    validator = f"{res['hits']['total']['value']}-{last_modified}"
+
+    freshness = (validator, last_modified)
+    cache.set(FRESHNESS_CACHE_KEY, freshness, settings.NEWS_FRESHNESS_TTL)
+    return freshness
+
+
+def conditional_news_view(view):
+    """
+    Wraps an async news view with the client rate limit, ETag/Last-Modified
+    validation, 304 responses, Cache-Control headers and a server-side cache
+    of rendered responses.
+    """
+    @wraps(view)
+    async def wrapped(request, *args, **kwargs):
+        # Cached and 304 responses count against the client's rate too
+        throttled = throttle_response(request)
+        if throttled:
+            return throttled
+
+        if request.method not in ("GET", "HEAD"):
+            return await view(request, *args, **kwargs)
+
+        freshness = await get_freshness()
+        if freshness is None:
+            return await view(request, *args, **kwargs)
+        validator, last_modified = freshness
+
+        # The representation depends on the URL (filters, cursor) and negotiated format
+        digest = hashlib.sha1(
+            f"{validator}|{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}".encode("utf-8")
+        ).hexdigest()
+        # Weak, like the one CompressionMiddleware leaves on encoded bodies, so
+        # 200s and 304s carry the same validator whatever the Content-Encoding
+        etag = f'W/"{digest}"'
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cache_key = f"news:response:{digest}"
+            cached = cache.get(cache_key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                response = await view(request, *args, **kwargs)
+                # Errors and stale fallbacks must not be cached or validated
+                if response.status_code != 200 or response.has_header("X-Cache-Status"):
+                    return response
+                cache.set(cache_key, (response.content, response["Content-Type"]),
+                          settings.NEWS_RESPONSE_CACHE_TTL)
+
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=settings.NEWS_CACHE_MAX_AGE,
+            stale_while_revalidate=settings.NEWS_STALE_WHILE_REVALIDATE,
+        )
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+    return wrapped
@@ -0,0 +1,139 @@
+"""
+In-process hub behind the live article feed (/api/news/stream/).
+
+Each worker process owns one FeedSubscriber socket (see article_feed.py) that
+the scrapers publish to. Incoming articles carry the event id their publisher
+gave them, so every worker sends the same id for the same article. Each one is
+rendered once as an SSE frame and kept in a ring buffer so reconnecting
+clients can resume from their Last-Event-ID on any worker. Connected clients
+only read from in-memory queues, so the number of listeners never reaches
+Elasticsearch.
+
+Frames are queued with a local arrival sequence number, which keeps replayed
+and live frames in order without rewriting the publishers' ids.
+"""
+
+import asyncio
+import collections
+import logging
+from typing import Deque, List, Optional, Set, Tuple
+
+import orjson
+from django.conf import settings
+
+from article_feed import FeedSubscriber
+
+logger = logging.getLogger(__name__)
+
+
+def event_stamp(event_id: str) -> Optional[int]:
+    """The publish time (microseconds) at the start of an event id, or None."""
+    try:
+        return int(event_id.split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+class FeedClient:
+    """One connected stream: a bounded queue of (sequence, frame) pairs."""
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # Set when the client fell too far behind and was dropped from the hub
+        self.overflowed = False
+
+
+class FeedHub:
+    def __init__(self, buffer_size: int, queue_size: int):
+        # (sequence, event_id, frame), oldest first
+        self.buffer: Deque[Tuple[int, str, bytes]] = collections.deque(maxlen=buffer_size)
+        self.buffered_ids: Set[str] = set()
+        self.queue_size = queue_size
+        self.clients: Set[FeedClient] = set()
+        self.last_sequence = 0
+        self.subscriber: Optional[FeedSubscriber] = None
+        self.loop = None
+
+    def start(self) -> None:
+        """Starts receiving on the running loop (first client connection)."""
+        loop = asyncio.get_running_loop()
+        if self.loop is loop:
+            return
+        if self.subscriber is None:
+            self.subscriber = FeedSubscriber()
+            logger.info(f"Live feed listening on {self.subscriber.path}")
+        if self.loop is not None:
+            self.loop.remove_reader(self.subscriber.fileno())
+        loop.add_reader(self.subscriber.fileno(), self._drain)
+        self.loop = loop
+
+    def _drain(self) -> None:
+        while True:
+            message = self.subscriber.receive()
+            if message is None:
+                return
+            if message.get("type") == "articles":
+                for article in message["articles"]:
+                    self._publish(article)
+
+    def _publish(self, article: dict) -> None:
+        event_id = str(article.pop("event_id", ""))
+        if not event_id or "\n" in event_id:
+            logger.warning(f"Discarding feed article without a usable event id: {article.get('url')}")
+            return
+        if event_id in self.buffered_ids:
+            return  # already published
+
+        if len(self.buffer) == self.buffer.maxlen:
+            self.buffered_ids.discard(self.buffer[0][1])
+        self.last_sequence += 1
+        # Rendered once and shared by every client
+        frame = b"id: %s\nevent: article\ndata: %s\n\n" % (event_id.encode(), orjson.dumps(article))
+        self.buffer.append((self.last_sequence, event_id, frame))
+        self.buffered_ids.add(event_id)
+
+        for client in list(self.clients):
+            try:
+                client.queue.put_nowait((self.last_sequence, frame))
+            except asyncio.QueueFull:
+                # Slow client: end its stream once drained; the browser
+                # reconnects and resumes from its Last-Event-ID
+                client.overflowed = True
+                self.clients.discard(client)
+
+    def connect(self) -> FeedClient:
+        self.start()
+        client = FeedClient(self.queue_size)
+        self.clients.add(client)
+        return client
+
+    def disconnect(self, client: FeedClient) -> None:
+        self.clients.discard(client)
+
+    def replay(self, last_event_id: Optional[str]) -> List[Tuple[int, bytes]]:
+        """Buffered (sequence, frame) pairs after last_event_id (nothing for new clients)."""
+        if not last_event_id:
+            return []
+        buffered = list(self.buffer)
+        if last_event_id in self.buffered_ids:
+            position = next(i for i, (_, event_id, _) in enumerate(buffered) if event_id == last_event_id)
+            return [(sequence, frame) for sequence, _, frame in buffered[position + 1:]]
+
+        # Evicted or never seen here: resume from the event's publish time
+        stamp = event_stamp(last_event_id)
+        if stamp is None:
+            return []
+        return [
+            (sequence, frame) for sequence, event_id, frame in buffered
+            if (event_stamp(event_id) or 0) > stamp
+        ]
+
+
+_hub: Optional[FeedHub] = None
+
+
+def get_feed_hub() -> FeedHub:
+    global _hub
+    if _hub is None:
+        _hub = FeedHub(settings.NEWS_FEED_BUFFER_SIZE, settings.NEWS_FEED_CLIENT_QUEUE_SIZE)
+    return _hub
@@ -0,0 +1,116 @@
+"""
+Middleware for the news API.
+
+MetricsMiddleware records per-view latency and status codes (see metrics.py).
+
+CompressionMiddleware negotiates response compression through Accept-Encoding.
+It prefers brotli when the client accepts it (and the Brotli package is
+installed), otherwise gzip. Compressed bodies of responses carrying an ETag
+(the cached news endpoints) are memoized in Django's cache, so repeat traffic
+doesn't pay for compression again. Streaming responses (e.g. SSE) pass
+through untouched.
+"""
+
+import gzip
+import time
+
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from metrics import HTTP_REQUEST_SECONDS, HTTP_RESPONSES
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+MIN_COMPRESS_SIZE = 512  # bytes; smaller bodies aren't worth the CPU
+COMPRESSED_CACHE_TTL = 300  # seconds
+
+
+def _accepted_encodings(header):
+    """Parses Accept-Encoding into {encoding: q}."""
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    return accepted
+
+
+def _choose_encoding(header):
+    accepted = _accepted_encodings(header)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    for encoding in candidates:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def _compress(content, encoding):
+    if encoding == "br":
+        return brotli.compress(content, quality=5)
+    return gzip.compress(content, compresslevel=6, mtime=0)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    def process_response(self, request, response):
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if len(response.content) < MIN_COMPRESS_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = _choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        etag = response.get("ETag")
+        cache_key = f"compressed:{encoding}:{etag}" if etag else None
+        compressed = cache.get(cache_key) if cache_key else None
+        if compressed is None:
+            compressed = _compress(response.content, encoding)
+            if cache_key:
+                cache.set(cache_key, compressed, COMPRESSED_CACHE_TTL)
+
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        # The compressed body is a different representation of the same resource
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    """
+    Times every request until its response headers and counts status codes.
+
+    Series are labelled by URL name (not path) so query strings and article
+    URLs don't create unbounded label values.
+    """
+    def process_request(self, request):
+        request._metrics_started = time.perf_counter()
+
+    def process_response(self, request, response):
+        started = getattr(request, "_metrics_started", None)
+        if started is None:
+            return response
+
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "unmatched"
+        HTTP_REQUEST_SECONDS.labels(view, request.method).observe(time.perf_counter() - started)
+        HTTP_RESPONSES.labels(view, request.method, response.status_code).inc()
+        return response
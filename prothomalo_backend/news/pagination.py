@@ -0,0 +1,33 @@
+"""
+Opaque cursors for search_after pagination.
+
+A cursor is the sort values of the last hit on a page, JSON-encoded and
+base64url-wrapped, so deep pages cost the same as the first one.
+"""
+
+import base64
+import binascii
+import json
+
+
+def encode_cursor(sort_values):
+    raw = json.dumps(sort_values, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or not values:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def next_page_url(request, sort_values):
+    """Returns the absolute URL of the next page, keeping all other query parameters."""
+    params = request.GET.copy()
+    params["cursor"] = encode_cursor(sort_values)
+    return request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
@@ -0,0 +1,180 @@
+"""
+Circuit breaker and stale-response fallback for Elasticsearch outages.
+
+Every ES call made by the news views goes through es_call(), which enforces a
+per-endpoint deadline (NEWS_ES_DEADLINES) and feeds a process-wide circuit
+breaker. After NEWS_BREAKER_FAILURE_THRESHOLD consecutive failures the breaker
+opens and calls fail immediately instead of queueing behind a slow cluster;
+after NEWS_BREAKER_RESET_TIMEOUT seconds one probe request is let through
+(half-open) and its outcome closes or re-opens the breaker.
+
+Views wrapped with stale_fallback() keep a snapshot of their last good
+response per URL in the "snapshots" cache. While ES is unavailable that
+snapshot is served with ``X-Cache-Status: STALE`` (plus Age), or a 503 with
+Retry-After when there is none, so clients never see raw exception strings.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from elasticsearch import ApiError, ConnectionError, ConnectionTimeout
+
+from metrics import ES_BREAKER_STATE, STALE_RESPONSES
+
+from .responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class ESUnavailable(Exception):
+    """Elasticsearch failed, timed out or the breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"Elasticsearch circuit breaker {self.state} -> {state}")
+        self.state = state
+        ES_BREAKER_STATE.set(_STATE_VALUES[state])
+
+    def allow(self) -> bool:
+        """Whether a call may go to Elasticsearch now."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.probe_in_flight = False
+        self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.probe_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    def retry_after(self) -> int:
+        """Seconds until the next probe (0 when closed)."""
+        if self.state == CLOSED:
+            return 0
+        return max(1, int(self.reset_timeout - (time.monotonic() - self.opened_at) + 0.999))
+
+
+_breaker = None
+
+
+def get_breaker() -> CircuitBreaker:
+    global _breaker
+    if _breaker is None:
+        _breaker = CircuitBreaker(settings.NEWS_BREAKER_FAILURE_THRESHOLD, settings.NEWS_BREAKER_RESET_TIMEOUT)
+    return _breaker
+
+
+def _is_outage(error: Exception) -> bool:
+    """Timeouts, connection errors, overload and server errors count against the breaker."""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError, ConnectionTimeout)):
+        return True
+    if isinstance(error, ApiError):
+        return error.meta.status == 429 or error.meta.status >= 500
+    return False
+
+
+async def es_call(awaitable, endpoint: str):
+    """
+    Awaits an Elasticsearch call under the endpoint's deadline and the breaker.
+
+    Raises ESUnavailable on outages; other errors (e.g. 404, bad queries) are
+    re-raised unchanged and count as a healthy cluster.
+    """
+    breaker = get_breaker()
+    if not breaker.allow():
+        awaitable.close()  # never started
+        raise ESUnavailable("circuit open")
+
+    deadline = settings.NEWS_ES_DEADLINES.get(endpoint, settings.NEWS_ES_DEFAULT_DEADLINE)
+    try:
+        result = await asyncio.wait_for(awaitable, timeout=deadline)
+    except asyncio.CancelledError:
+        # Client went away; say nothing about ES health but free the probe slot
+        breaker.probe_in_flight = False
+        raise
+    except Exception as e:
+        if _is_outage(e):
+            breaker.record_failure()
+            raise ESUnavailable(f"{endpoint}: {type(e).__name__}") from e
+        breaker.record_success()
+        raise
+    breaker.record_success()
+    return result
+
+
+def _snapshot_key(request) -> str:
+    digest = hashlib.sha1(
+        f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}".encode("utf-8")
+    ).hexdigest()
+    return f"news:snapshot:{digest}"
+
+
+def stale_fallback(view):
+    """
+    Wraps an async news view: snapshots good responses and serves the last
+    snapshot (or a 503) when the view raises ESUnavailable.
+    """
+    @wraps(view)
+    async def wrapped(request, *args, **kwargs):
+        snapshots = caches["snapshots"]
+        key = _snapshot_key(request)
+        try:
+            response = await view(request, *args, **kwargs)
+        except ESUnavailable as e:
+            logger.warning(f"Serving fallback for {request.path}: {e}")
+            retry_after = get_breaker().retry_after() or 1
+            snapshot = snapshots.get(key)
+            if snapshot is None:
+                response = FastJSONResponse(
+                    {"error": "Search is temporarily unavailable. Please retry shortly."},
+                    status=503
+                )
+                response["Retry-After"] = str(retry_after)
+                return response
+
+            content, content_type, stored_at = snapshot
+            STALE_RESPONSES.labels(request.resolver_match.url_name).inc()
+            response = HttpResponse(content, content_type=content_type)
+            response["X-Cache-Status"] = "STALE"
+            response["Age"] = str(int(time.time() - stored_at))
+            # Let clients come back for fresh data as soon as ES recovers
+            patch_cache_control(response, max_age=retry_after)
+            return response
+
+        if response.status_code == 200 and not response.streaming:
+            snapshots.set(key, (response.content, response["Content-Type"], time.time()),
+                          settings.NEWS_SNAPSHOT_TTL)
+        return response
+
+    return wrapped
@@ -0,0 +1,15 @@
+import orjson
+from django.http import HttpResponse
+
+
+class FastJSONResponse(HttpResponse):
+    """
+    JSON response serialized with orjson.
+
+    Output is compact UTF-8 without ``\\uXXXX`` escaping, so each Bengali
+    character costs 3 bytes instead of 6, and serialization is several times
+    faster than the stdlib encoder used by JsonResponse.
+    """
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=orjson.dumps(data), **kwargs)
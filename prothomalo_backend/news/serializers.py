@@ -0,0 +1,76 @@
+from rest_framework import serializers
+
+from es_queries import DEFAULT_SEARCH_SIZE, SORTABLE_FIELDS
+from index_mappings import SOURCE_PROFILES
+from trending import FIELDS as TRENDING_FIELDS, TOP_TERMS
+
+from .pagination import decode_cursor
+
+SORT_CHOICES = [field for name in SORTABLE_FIELDS for field in (name, f"-{name}")]
+
+
+class SearchParamsSerializer(serializers.Serializer):
+    """Validates query parameters for the news search endpoint."""
+    q = serializers.CharField(required=False, allow_blank=True)
+    author = serializers.CharField(required=False)
+    location = serializers.CharField(required=False)
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    min_word_count = serializers.IntegerField(required=False, min_value=0)
+    max_word_count = serializers.IntegerField(required=False, min_value=0)
+    sort = serializers.ChoiceField(choices=SORT_CHOICES, default="-published_at")
+    page_size = serializers.IntegerField(default=DEFAULT_SEARCH_SIZE, min_value=1, max_value=100)
+    cursor = serializers.CharField(required=False)
+    profile = serializers.ChoiceField(choices=list(SOURCE_PROFILES), default="card")
+    highlight = serializers.BooleanField(default=False)
+    # Facets default to the first page only; pass facets=true/false to override
+    facets = serializers.BooleanField(required=False, allow_null=True, default=None)
+    interval = serializers.ChoiceField(choices=["day", "week", "month", "year"], default="day")
+
+    def validate_cursor(self, value):
+        try:
+            return decode_cursor(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid cursor.")
+
+    def to_search_kwargs(self):
+        """Maps validated parameters onto es_queries.build_search_body arguments."""
+        data = self.validated_data
+        sort = data["sort"]
+        return {
+            "query": data.get("q") or None,
+            "author": data.get("author"),
+            "location": data.get("location"),
+            "start_date": data["start_date"].isoformat() if data.get("start_date") else None,
+            "end_date": data["end_date"].isoformat() if data.get("end_date") else None,
+            "min_word_count": data.get("min_word_count"),
+            "max_word_count": data.get("max_word_count"),
+            "size": data["page_size"],
+            "sort_by": sort.lstrip("-"),
+            "sort_order": "desc" if sort.startswith("-") else "asc",
+            "profile": data["profile"],
+            "highlight": data["highlight"],
+            "search_after": data.get("cursor"),
+        }
+
+
+class SuggestParamsSerializer(serializers.Serializer):
+    """Validates query parameters for the autocomplete endpoint."""
+    # Completion inputs are capped at 50 characters, so longer prefixes can't match
+    q = serializers.CharField(max_length=50)
+    size = serializers.IntegerField(default=5, min_value=1, max_value=10)
+
+    def validate_q(self, value):
+        # Collapse whitespace so "ঢাকা  " and "ঢাকা" share a cache entry
+        return " ".join(value.split())
+
+
+class RelatedParamsSerializer(serializers.Serializer):
+    """Validates query parameters for the related-articles endpoint."""
+    url = serializers.CharField()
+
+
+class TrendingParamsSerializer(serializers.Serializer):
+    """Validates query parameters for the trending-terms endpoint."""
+    field = serializers.ChoiceField(choices=list(TRENDING_FIELDS), default="headline")
+    k = serializers.IntegerField(default=10, min_value=1, max_value=TOP_TERMS)
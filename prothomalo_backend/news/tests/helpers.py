@@ -0,0 +1,102 @@
+"""Fixtures shared by the news test modules."""
+
+import os
+import tempfile
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase
+
+from news.caching import FRESHNESS_QUERY
+
+
+def make_article(url, published_at, content="", headline="শিরোনাম", author="নিজস্ব প্রতিবেদক"):
+    return {
+        "url": url,
+        "headline": headline,
+        "author": author,
+        "location": "ঢাকা",
+        "published_at": published_at,
+        "content": content,
+        "word_count": len(content.split()),
+    }
+
+
+class TempDirMixin:
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+
+def make_scraper(es_client, **config):
+    """A ProthomAloScraperEnhanced around a (fake) client, without the constructor's side effects."""
+    from scraper import Config, ProthomAloScraperEnhanced
+
+    scraper = ProthomAloScraperEnhanced.__new__(ProthomAloScraperEnhanced)
+    scraper.config = Config()
+    for name, value in config.items():
+        setattr(scraper.config, name, value)
+    scraper.es_client = es_client
+    return scraper
+
+
+def search_response(*sources, total=None):
+    """A raw search response (or msearch item) with one hit per source."""
+    hits = [
+        {"_id": source["url"], "_score": 1.0, "_source": dict(source), "sort": [source.get("published_at"), source["url"]]}
+        for source in sources
+    ]
+    return {
+        "took": 1,
+        "hits": {"total": {"value": len(hits) if total is None else total}, "max_score": 1.0, "hits": hits},
+    }
+
+
+class NewsAPITestCase(SimpleTestCase):
+    """
+    Drives the news API through the test client against a fake async ES client.
+
+    Article searches are answered from self.search_results in call order (an
+    exception instance is raised instead); freshness checks see an index with
+    self.index_count documents last scraped at self.index_scraped_at.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for alias in ("default", "snapshots"):
+            caches[alias].clear()
+        self.search_results = []
+        self.index_count = 3
+        self.index_scraped_at = 1_750_000_000_000  # ms, as ES returns date maxima
+        self.es = mock.Mock()
+        self.es.search = mock.AsyncMock(side_effect=self._search)
+        self.es.get = mock.AsyncMock()
+        self.es.mget = mock.AsyncMock()
+        for target in ("news.views.get_async_es_client", "news.caching.get_async_es_client"):
+            patcher = mock.patch(target, return_value=self.es)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch("news.resilience._breaker", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _search(self, index, body):
+        if body is FRESHNESS_QUERY:
+            return {
+                "hits": {"total": {"value": self.index_count}},
+                "aggregations": {"last_scraped": {"value": self.index_scraped_at},
+                                 "last_updated": {"value": None}},
+            }
+        result = self.search_results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def search_bodies(self):
+        """Bodies of the article searches made so far (freshness checks left out)."""
+        return [call.kwargs["body"] for call in self.es.search.call_args_list
+                if call.kwargs["body"] is not FRESHNESS_QUERY]
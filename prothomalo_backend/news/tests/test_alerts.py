@@ -0,0 +1,124 @@
+import json
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+from elasticsearch import NotFoundError
+
+from alerts import (
+    QueueFileDispatcher,
+    SavedSearchAlerts,
+    WebhookDispatcher,
+    build_saved_search,
+    saved_search_id,
+)
+from es_queries import build_query
+
+from .helpers import TempDirMixin, make_article
+
+A = make_article("https://example.com/a", "2025-01-01 10:00", "বিএনপির সমাবেশ")
+B = make_article("https://example.com/b", "2025-01-01 11:00", "আওয়ামী লীগের সভা")
+
+
+def percolate_response(*matches, total=None):
+    hits = [
+        {"_id": search_id, "_source": {"name": name, "owner": "desk"},
+         "fields": {"_percolator_document_slot": slots}}
+        for search_id, name, slots in matches
+    ]
+    return {"hits": {"total": {"value": len(hits) if total is None else total}, "hits": hits}}
+
+
+class SavedSearchTests(SimpleTestCase):
+    def test_document_holds_the_search_query(self):
+        document = build_saved_search("BNP", "desk", query="বিএনপি", author="", location=None)
+
+        self.assertEqual(document["filters"], {"query": "বিএনপি"})
+        self.assertEqual(document["query"], build_query(query="বিএনপি"))
+        self.assertEqual(document["owner"], "desk")
+
+    def test_invalid_filters(self):
+        with self.assertRaises(ValueError):
+            build_saved_search("Sorted", sort="date")
+        with self.assertRaises(ValueError):
+            build_saved_search("Empty", query="")
+
+    def test_ids_are_scoped_by_owner(self):
+        self.assertEqual(saved_search_id("BNP", "desk"), "desk%2FBNP")
+        self.assertEqual(saved_search_id("Dhaka 10"), "Dhaka%2010")
+
+
+class SavedSearchAlertsTests(SimpleTestCase):
+    def setUp(self):
+        self.es = mock.Mock()
+        self.dispatcher = mock.Mock()
+        self.dispatcher.dispatch.return_value = True
+        self.alerts = SavedSearchAlerts("saved", dispatcher=self.dispatcher, es_client=self.es)
+
+    def test_one_alert_per_matching_article(self):
+        self.es.search.return_value = percolate_response(("desk%2FBNP", "BNP", [0, 1]), ("party", "Party", [1]))
+        article = dict(A, embedding=[0.1] * 4, related=[])
+
+        self.assertTrue(self.alerts.update_batch([article, B]))
+
+        documents = self.es.search.call_args.kwargs["body"]["query"]["percolate"]["documents"]
+        self.assertNotIn("embedding", documents[0])
+        self.assertNotIn("related", documents[0])
+        alerts = self.dispatcher.dispatch.call_args.args[0]
+        self.assertEqual([(alert["search_id"], alert["article"]["url"]) for alert in alerts],
+                         [("desk%2FBNP", A["url"]), ("desk%2FBNP", B["url"]), ("party", B["url"])])
+        self.assertNotIn("content", alerts[0]["article"])
+
+    def test_no_matches_dispatch_nothing(self):
+        self.es.search.return_value = percolate_response()
+
+        self.assertTrue(self.alerts.update_batch([A]))
+        self.dispatcher.dispatch.assert_not_called()
+
+    def test_missing_index_means_no_saved_searches(self):
+        self.es.search.side_effect = NotFoundError("not found", mock.Mock(status=404), {})
+
+        self.assertTrue(self.alerts.update_batch([A]))
+
+    def test_percolation_errors_are_reported(self):
+        self.es.search.side_effect = RuntimeError("cluster down")
+
+        with self.assertLogs("alerts", "ERROR"):
+            self.assertFalse(self.alerts.update_batch([A]))
+
+    def test_saved_searches_are_visible_to_the_next_batch(self):
+        self.es.indices.exists.return_value = False
+
+        self.assertEqual(self.alerts.save_search("BNP", "desk", query="বিএনপি"), "desk%2FBNP")
+
+        self.es.indices.create.assert_called_once()
+        self.assertEqual(self.es.index.call_args.kwargs["refresh"], "wait_for")
+        self.assertIsNone(self.alerts.save_search("Bad", query="বিএনপি", sort="date"))
+
+
+class DispatcherTests(TempDirMixin, SimpleTestCase):
+    def test_queue_file_gets_one_line_per_alert(self):
+        path = self.path("alerts.jsonl")
+        dispatcher = QueueFileDispatcher(path)
+
+        self.assertTrue(dispatcher.dispatch([{"name": "বিএনপি"}]))
+        self.assertTrue(dispatcher.dispatch([{"name": "a"}, {"name": "b"}]))
+
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual([json.loads(line)["name"] for line in f], ["বিএনপি", "a", "b"])
+
+    def test_unwritable_queue_file(self):
+        with self.assertLogs("alerts", "ERROR"):
+            self.assertFalse(QueueFileDispatcher(self.path("missing/alerts.jsonl")).dispatch([{"name": "a"}]))
+
+    def test_webhook(self):
+        dispatcher = WebhookDispatcher("https://hooks.example.com/alerts", timeout=1)
+        dispatcher.session = mock.Mock()
+
+        self.assertTrue(dispatcher.dispatch([{"name": "a"}]))
+        dispatcher.session.post.assert_called_once_with("https://hooks.example.com/alerts",
+                                                        json={"alerts": [{"name": "a"}]}, timeout=1)
+
+        dispatcher.session.post.side_effect = requests.ConnectionError("refused")
+        with self.assertLogs("alerts", "ERROR"):
+            self.assertFalse(dispatcher.dispatch([{"name": "a"}]))
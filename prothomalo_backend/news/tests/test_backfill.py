@@ -0,0 +1,135 @@
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from backfill import FLUSH_ATTEMPTS, Backfill, RateLimiter, Shard
+
+from .helpers import TempDirMixin
+
+API_URL = "https://example.com/api/collections/politics"
+
+
+def urls(skip, count):
+    return [f"https://example.com/{n}" for n in range(skip, skip + count)]
+
+
+class RateLimiterTests(SimpleTestCase):
+    def test_requests_are_spaced_by_the_interval(self):
+        with mock.patch("backfill.time.monotonic", return_value=100.0), mock.patch("backfill.time.sleep") as sleep:
+            limiter = RateLimiter(rate=4)
+            for _ in range(3):
+                limiter.acquire()
+
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.25, 0.5])
+
+
+class ShardTests(SimpleTestCase):
+    def test_round_trip(self):
+        shard = Shard(0, 300, next_skip=100, step=100, name="https://example.com/sitemap.xml")
+
+        restored = Shard.from_dict(json.loads(json.dumps(shard.to_dict())))
+
+        self.assertEqual(restored.to_dict(), shard.to_dict())
+        self.assertFalse(restored.done)
+        restored.next_skip = 300
+        self.assertTrue(restored.done)
+
+
+class BackfillTests(TempDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.depth = 1000  # stories in the collection
+        self.scraper = self.make_scraper()
+        self.backfill = self.make_backfill(self.scraper)
+        patcher = mock.patch("backfill.time.sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_scraper(self):
+        scraper = mock.Mock()
+        scraper.config = mock.Mock(STORIES_PER_PAGE=10, API_URL=API_URL, ES_INDEX="prothomalo_politics")
+        scraper.fetch_api_page.side_effect = lambda skip, limit: urls(skip, max(0, min(limit, self.depth - skip)))
+        return scraper
+
+    def make_backfill(self, scraper, shards=4):
+        return Backfill(scraper, shards=shards, workers=1, rate=1000, limit=50,
+                        state_file=self.path("state.json"))
+
+    def test_probes_split_the_collection_into_shards(self):
+        self.backfill.plan()
+
+        self.assertEqual(self.backfill.limit, 50)
+        self.assertEqual(self.backfill.total, 1000)
+        self.assertEqual([(shard.start, shard.end) for shard in self.backfill.shards],
+                         [(0, 250), (250, 500), (500, 750), (750, 1000)])
+
+    def test_depth_is_found_to_page_granularity(self):
+        self.depth = 170
+        self.backfill.limit = 50
+
+        self.assertEqual(self.backfill.probe_depth(), 200)
+
+    def test_saved_shards_are_resumed(self):
+        self.backfill.plan()
+        self.backfill.shards[1].next_skip = 400
+        self.backfill.save_state()
+
+        resumed = self.make_backfill(self.make_scraper())
+        resumed.plan()
+
+        self.assertEqual([shard.to_dict() for shard in resumed.shards],
+                         [shard.to_dict() for shard in self.backfill.shards])
+        resumed.scraper.fetch_api_page.assert_not_called()
+
+    def test_state_of_another_collection_is_ignored(self):
+        self.backfill.plan()
+        other = self.make_scraper()
+        other.config.API_URL = "https://example.com/api/collections/sports"
+
+        self.assertFalse(self.make_backfill(other)._load_state())
+
+    def test_checkpoint_waits_for_earlier_pages(self):
+        shard = Shard(0, 150, step=50)
+        self.backfill._open_page(shard, 0, 1)
+        self.backfill._open_page(shard, 50, 1)
+
+        self.backfill._complete(shard, 50)
+        self.assertEqual(shard.next_skip, 0)
+
+        self.backfill._complete(shard, 0)
+        self.assertEqual(shard.next_skip, 100)
+        self.assertEqual(dict(shard.pages), {})
+
+    def test_indexed_urls_are_not_queued(self):
+        shard = Shard(0, 100, step=50)
+        with mock.patch("backfill.indexed_urls", return_value=set(urls(0, 2))):
+            self.assertTrue(self.backfill._queue_page(shard, 0, urls(0, 3)))
+
+        self.assertEqual(self.backfill.urls.get_nowait(), (shard, 0, "https://example.com/2"))
+        self.assertTrue(self.backfill.urls.empty())
+        self.assertEqual(dict(shard.pages), {0: 1})
+
+    def test_flush_completes_pages_and_saves(self):
+        self.backfill.plan()
+        shard = self.backfill.shards[0]
+        self.backfill._open_page(shard, 0, 2)
+        self.scraper.bulk_index_articles.return_value = True
+
+        self.assertTrue(self.backfill._flush([(shard, 0, {"url": "a"}), (shard, 0, {"url": "b"})]))
+
+        self.assertEqual(shard.next_skip, 50)
+        with open(self.path("state.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["shards"][0]["next"], 50)
+
+    def test_failed_flush_stops_with_the_pages_open(self):
+        shard = Shard(0, 100, step=50)
+        self.backfill._open_page(shard, 0, 1)
+        self.scraper.bulk_index_articles.return_value = False
+
+        self.assertFalse(self.backfill._flush([(shard, 0, {"url": "a"})]))
+
+        self.assertEqual(self.scraper.bulk_index_articles.call_count, FLUSH_ATTEMPTS)
+        self.assertTrue(self.backfill.stop_event.is_set())
+        self.assertEqual(shard.next_skip, 0)
+        self.assertEqual(dict(shard.pages), {0: 1})
@@ -0,0 +1,81 @@
+from unittest import mock
+from urllib.parse import quote
+
+from django.test import SimpleTestCase
+
+from .helpers import make_article, make_scraper, search_response
+
+
+class MultiGetTests(SimpleTestCase):
+    def test_articles_come_back_in_request_order_with_gaps(self):
+        es = mock.Mock()
+        es.mget.return_value = {"docs": [
+            {"_id": quote("https://example.com/2", safe=""), "found": True,
+             "_source": make_article("https://example.com/2", "2025-01-02 10:00")},
+            {"_id": quote("https://example.com/missing", safe=""), "found": False},
+        ]}
+        scraper = make_scraper(es)
+
+        articles = scraper.get_articles_by_urls(["https://example.com/2", "https://example.com/missing"])
+
+        self.assertEqual(es.mget.call_count, 1)
+        self.assertEqual(es.mget.call_args.kwargs["body"],
+                         {"ids": [quote("https://example.com/2", safe=""), quote("https://example.com/missing", safe="")]})
+        self.assertEqual(articles[0]["url"], "https://example.com/2")
+        self.assertIsNone(articles[1])
+
+    def test_no_request_for_an_empty_batch(self):
+        es = mock.Mock()
+        self.assertEqual(make_scraper(es).get_articles_by_urls([]), [])
+        es.mget.assert_not_called()
+
+
+class MultiSearchTests(SimpleTestCase):
+    def test_searches_share_one_round_trip(self):
+        es = mock.Mock()
+        es.msearch.return_value = {"responses": [
+            search_response(make_article("https://example.com/1", "2025-01-01 10:00")),
+            {"error": {"type": "search_phase_execution_exception"}},
+        ]}
+        scraper = make_scraper(es)
+
+        results = scraper.multi_search_articles([{"author": "নিজস্ব প্রতিবেদক", "size": 5}, {"location": "ঢাকা"}])
+
+        body = es.msearch.call_args.kwargs["body"]
+        self.assertEqual(len(body), 4)
+        self.assertEqual(body[1]["size"], 5)
+        self.assertEqual(body[3]["size"], scraper.config.DEFAULT_SEARCH_SIZE)
+        self.assertEqual([article["url"] for article in results[0]["articles"]], ["https://example.com/1"])
+        self.assertEqual(results[1]["articles"], [])
+        self.assertIn("error", results[1])
+
+    def test_invalid_specification_fails_alone(self):
+        es = mock.Mock()
+        es.msearch.return_value = {"responses": [
+            search_response(make_article("https://example.com/1", "2025-01-01 10:00")),
+            search_response(),
+        ]}
+        scraper = make_scraper(es)
+
+        results = scraper.multi_search_articles([
+            {"query": "নির্বাচন"},
+            {"query": "বন্যা", "mode": "hybrid"},
+            {"authr": "typo"},
+            {"location": "ঢাকা", "mode": "lexical"},
+            {"profile": "unknown"},
+        ])
+
+        # Only the two valid searches are sent, and their results land in place
+        self.assertEqual(len(es.msearch.call_args.kwargs["body"]), 4)
+        self.assertEqual(results[0]["total_hits"], 1)
+        self.assertEqual(results[3]["total_hits"], 0)
+        self.assertNotIn("error", results[3])
+        self.assertIn("hybrid", results[1]["error"])
+        self.assertIn("authr", results[2]["error"])
+        self.assertIn("error", results[4])
+
+    def test_all_invalid_skips_the_request(self):
+        es = mock.Mock()
+        results = make_scraper(es).multi_search_articles([{"mode": "hybrid"}])
+        es.msearch.assert_not_called()
+        self.assertIn("error", results[0])
@@ -0,0 +1,87 @@
+from unittest import mock
+
+from django.core.cache import cache
+
+from news.caching import FRESHNESS_CACHE_KEY
+from news.throttling import ClientRateThrottle
+
+from .helpers import NewsAPITestCase, make_article, search_response
+
+ARTICLE = make_article("https://example.com/a", "2025-01-01 10:00")
+
+
+class ConditionalNewsViewTests(NewsAPITestCase):
+    def test_repeat_request_is_served_from_the_cache(self):
+        self.search_results = [search_response(ARTICLE)]
+
+        first = self.client.get("/api/news/")
+        second = self.client.get("/api/news/")
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(len(self.search_bodies()), 1)
+        self.assertIn("max-age=10", first["Cache-Control"])
+        self.assertIn("Last-Modified", first)
+
+    def test_matching_validator_gets_a_304(self):
+        self.search_results = [search_response(ARTICLE)]
+        etag = self.client.get("/api/news/")["ETag"]
+
+        response = self.client.get("/api/news/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_new_articles_change_the_validator(self):
+        self.search_results = [search_response(ARTICLE), search_response(ARTICLE)]
+        etag = self.client.get("/api/news/")["ETag"]
+
+        self.index_count += 1
+        cache.delete(FRESHNESS_CACHE_KEY)
+        response = self.client.get("/api/news/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(self.search_bodies()), 2)
+
+    def test_each_url_has_its_own_validator(self):
+        self.search_results = [search_response(ARTICLE), search_response(ARTICLE)]
+
+        first = self.client.get("/api/news/search/?q=নির্বাচন&facets=false")
+        second = self.client.get("/api/news/search/?q=সংসদ&facets=false")
+
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+    def test_freshness_is_checked_once_per_ttl(self):
+        self.search_results = [search_response(ARTICLE), search_response(ARTICLE)]
+
+        self.client.get("/api/news/")
+        self.client.get("/api/news/search/?facets=false")
+
+        freshness_checks = len(self.es.search.call_args_list) - len(self.search_bodies())
+        self.assertEqual(freshness_checks, 1)
+
+    def test_errors_are_not_cached(self):
+        self.es.get.side_effect = ValueError("boom")
+
+        response = self.client.get("/api/news/related/?url=https://example.com/a")
+
+        self.assertEqual(response.status_code, 500)
+        self.assertNotIn("ETag", response)
+        self.client.get("/api/news/related/?url=https://example.com/a")
+        self.assertEqual(self.es.get.await_count, 2)
+
+    def test_cached_responses_are_throttled(self):
+        self.search_results = [search_response(ARTICLE)]
+        rates = {"anon": "2/minute", "suggest": "600/minute"}
+
+        with mock.patch.object(ClientRateThrottle, "THROTTLE_RATES", rates):
+            etag = self.client.get("/api/news/")["ETag"]
+            self.assertEqual(self.client.get("/api/news/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            response = self.client.get("/api/news/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(len(self.search_bodies()), 1)
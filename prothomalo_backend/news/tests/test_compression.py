@@ -0,0 +1,106 @@
+import gzip
+import unittest
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from news import middleware
+from news.middleware import _accepted_encodings, _choose_encoding
+from news.responses import FastJSONResponse
+
+from .helpers import NewsAPITestCase, make_article, search_response
+
+# Enough cards to clear MIN_COMPRESS_SIZE
+ARTICLES = [make_article(f"https://example.com/{n}", "2025-01-01 10:00", headline="নির্বাচন কমিশনের বৈঠক")
+            for n in range(10)]
+
+
+class EncodingNegotiationTests(SimpleTestCase):
+    def test_quality_values(self):
+        self.assertEqual(_accepted_encodings("gzip;q=0.5, br, identity;q=0, x;q=bad"),
+                         {"gzip": 0.5, "br": 1.0, "identity": 0.0, "x": 0.0})
+
+    def test_gzip_without_brotli(self):
+        with mock.patch.object(middleware, "brotli", None):
+            self.assertEqual(_choose_encoding("gzip, br"), "gzip")
+            self.assertIsNone(_choose_encoding("br"))
+
+    def test_brotli_preferred_when_available(self):
+        with mock.patch.object(middleware, "brotli", mock.Mock()):
+            self.assertEqual(_choose_encoding("gzip, br"), "br")
+            self.assertEqual(_choose_encoding("gzip, br;q=0"), "gzip")
+            self.assertEqual(_choose_encoding("*"), "br")
+
+    def test_nothing_acceptable(self):
+        self.assertIsNone(_choose_encoding(""))
+        self.assertIsNone(_choose_encoding("gzip;q=0, identity"))
+
+
+class FastJSONResponseTests(SimpleTestCase):
+    def test_bengali_is_not_escaped(self):
+        response = FastJSONResponse({"headline": "নির্বাচন"})
+
+        self.assertEqual(response.content, '{"headline":"নির্বাচন"}'.encode("utf-8"))
+        self.assertEqual(response["Content-Type"], "application/json")
+
+
+@mock.patch.object(middleware, "brotli", None)
+class CompressionMiddlewareTests(NewsAPITestCase):
+    def test_large_responses_are_gzipped(self):
+        self.search_results = [search_response(*ARTICLES)]
+
+        response = self.client.get("/api/news/", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), FastJSONResponse(ARTICLES).content)
+
+    def test_identity_when_not_accepted(self):
+        self.search_results = [search_response(*ARTICLES)]
+
+        response = self.client.get("/api/news/")
+
+        self.assertNotIn("Content-Encoding", response)
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_small_responses_are_left_alone(self):
+        self.search_results = [search_response(ARTICLES[0])]
+
+        response = self.client.get("/api/news/", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_compressed_and_not_modified_responses_share_the_validator(self):
+        self.search_results = [search_response(*ARTICLES)]
+
+        compressed = self.client.get("/api/news/", HTTP_ACCEPT_ENCODING="gzip")
+        identity = self.client.get("/api/news/")
+        not_modified = self.client.get("/api/news/", HTTP_ACCEPT_ENCODING="gzip",
+                                       HTTP_IF_NONE_MATCH=compressed["ETag"])
+
+        self.assertTrue(compressed["ETag"].startswith('W/"'))
+        self.assertEqual(identity["ETag"], compressed["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], compressed["ETag"])
+
+    def test_compressed_bodies_are_memoized_by_etag(self):
+        self.search_results = [search_response(*ARTICLES)]
+
+        with mock.patch.object(middleware, "_compress", wraps=middleware._compress) as compress:
+            first = self.client.get("/api/news/", HTTP_ACCEPT_ENCODING="gzip")
+            second = self.client.get("/api/news/", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(second.content, first.content)
+
+
+@unittest.skipIf(middleware.brotli is None, "Brotli is not installed")
+class BrotliCompressionTests(NewsAPITestCase):
+    def test_brotli_round_trip(self):
+        self.search_results = [search_response(*ARTICLES)]
+
+        response = self.client.get("/api/news/", HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(middleware.brotli.decompress(response.content), FastJSONResponse(ARTICLES).content)
@@ -0,0 +1,126 @@
+from datetime import datetime
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from crawl_daemon import START_INTERVAL, CrawlDaemon, PollScheduler
+
+NOON = datetime(2025, 1, 1, 12, 0)
+MIDNIGHT = datetime(2025, 1, 1, 0, 0)
+
+
+class PollSchedulerTests(SimpleTestCase):
+    def setUp(self):
+        self.scheduler = PollScheduler(min_interval=60, max_interval=1800, target_per_poll=3, smoothing=0.5)
+
+    def test_unobserved_hours_use_the_start_interval(self):
+        self.assertEqual(self.scheduler.next_interval(NOON), START_INTERVAL)
+
+    def test_busy_hours_poll_often_and_quiet_hours_rarely(self):
+        self.scheduler.observe(6, 600, now=NOON)  # 36 articles/hour
+        self.scheduler.observe(0, 3600, now=MIDNIGHT)
+
+        self.assertEqual(self.scheduler.next_interval(NOON), 300)
+        self.assertEqual(self.scheduler.next_interval(MIDNIGHT), 1800)
+
+    def test_intervals_are_clamped(self):
+        self.scheduler.observe(100, 60, now=NOON)
+        self.scheduler.observe(1, 36000, now=MIDNIGHT)
+
+        self.assertEqual(self.scheduler.next_interval(NOON), 60)
+        self.assertEqual(self.scheduler.next_interval(MIDNIGHT), 1800)
+
+    def test_rates_are_smoothed_per_hour(self):
+        self.scheduler.observe(12, 3600, now=NOON)
+        self.scheduler.observe(36, 3600, now=NOON)
+        self.scheduler.observe(5, 0, now=NOON)  # ignored
+
+        self.assertEqual(self.scheduler.hourly_rate[12], 24)
+        self.assertEqual(self.scheduler.next_interval(NOON), 450)
+
+
+def page(start, count=4):
+    return [f"https://example.com/{n}" for n in range(start, start + count)]
+
+
+class CrawlDaemonTests(SimpleTestCase):
+    def setUp(self):
+        self.scraper = mock.Mock()
+        self.scraper.config = mock.Mock(
+            STORIES_PER_PAGE=4, REQUEST_DELAY=0, BULK_INDEX_SIZE=2, MAX_DISCOVERED_LINKS=5,
+            RUN_EVENTS_FILE=None, RUN_REPORT_FILE=None, ES_INDEX="prothomalo_politics",
+        )
+        self.scraper.frontier = None
+        self.scraper.scrape_single_article.side_effect = lambda url: {"url": url}
+        self.daemon = CrawlDaemon(self.scraper, max_pages=5, known_size=10)
+        self.indexed = set()
+        patcher = mock.patch("crawl_daemon.indexed_urls",
+                             side_effect=lambda client, index, urls: {u for u in urls if u in self.indexed})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_paging_stops_at_mostly_indexed_pages(self):
+        self.scraper.fetch_api_page.side_effect = lambda offset: page(offset)
+        self.indexed = set(page(4)[1:])
+
+        self.assertEqual(self.daemon.poll_new_urls(), page(0) + page(4)[:1])
+        self.assertEqual(self.scraper.fetch_api_page.call_count, 2)
+
+    def test_known_urls_skip_the_index_lookup(self):
+        self.scraper.fetch_api_page.side_effect = lambda offset: page(offset) if offset == 0 else []
+        self.daemon._remember(page(0)[:2])
+
+        self.assertEqual(self.daemon.poll_new_urls(), page(0)[2:])
+
+    def test_known_urls_are_bounded(self):
+        self.daemon._remember(page(0, count=15))
+
+        self.assertEqual(list(self.daemon.known), page(5, count=10))
+
+    def test_api_errors_end_the_poll(self):
+        self.scraper.fetch_api_page.side_effect = [page(0), RuntimeError("503")]
+
+        self.assertEqual(self.daemon.poll_new_urls(), page(0))
+
+    def test_cycle_flushes_in_batches_and_remembers_indexed_urls(self):
+        self.scraper.fetch_api_page.side_effect = lambda offset: page(offset, count=3) if offset == 0 else []
+        self.scraper.bulk_index_articles.return_value = True
+
+        self.assertEqual(self.daemon.run_cycle(), 3)
+
+        batches = [[a["url"] for a in call.args[0]] for call in self.scraper.bulk_index_articles.call_args_list]
+        self.assertEqual(batches, [page(0, count=2), page(2, count=1)])
+        self.assertEqual(list(self.daemon.known), page(0, count=3))
+
+    def test_scraped_articles_are_flushed_when_a_cycle_fails(self):
+        self.scraper.fetch_api_page.side_effect = lambda offset: page(offset, count=3) if offset == 0 else []
+        self.scraper.scrape_single_article.side_effect = [{"url": "https://example.com/0"}, RuntimeError("boom")]
+
+        with self.assertRaises(RuntimeError):
+            self.daemon.run_cycle()
+
+        self.scraper.bulk_index_articles.assert_called_once_with([{"url": "https://example.com/0"}])
+
+    def test_stop_request_ends_the_cycle(self):
+        self.scraper.fetch_api_page.side_effect = lambda offset: page(offset, count=3) if offset == 0 else []
+
+        def scrape(url):
+            self.daemon.request_stop()
+            return {"url": url}
+        self.scraper.scrape_single_article.side_effect = scrape
+
+        self.daemon.run_cycle()
+
+        self.assertEqual(self.scraper.scrape_single_article.call_count, 1)
+        self.scraper.bulk_index_articles.assert_called_once_with([{"url": "https://example.com/0"}])
+
+    def test_discovered_links_join_the_cycle(self):
+        self.scraper.fetch_api_page.side_effect = lambda offset: page(offset, count=1) if offset == 0 else []
+        self.scraper.frontier = mock.Mock()
+        self.scraper.frontier.pop.side_effect = [["https://example.com/linked"], []]
+
+        self.assertEqual(self.daemon.run_cycle(), 1)
+
+        scraped = [call.args[0] for call in self.scraper.scrape_single_article.call_args_list]
+        self.assertEqual(scraped, ["https://example.com/0", "https://example.com/linked"])
+        self.assertEqual(self.scraper.frontier.pop.call_args_list, [mock.call(5), mock.call(4)])
@@ -0,0 +1,111 @@
+import os
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+import embeddings
+from embeddings import EmbeddingUpdater, HashingEncoder, embed_articles, get_encoder, stem
+from index_mappings import EMBEDDING_DIMS
+
+from .helpers import TempDirMixin, make_article
+
+ELECTION = make_article("https://example.com/a", "2025-01-01 10:00", "নির্বাচনের তফসিল ঘোষণা করেছে কমিশন",
+                        headline="নির্বাচন কমিশনের তফসিল")
+BUDGET = make_article("https://example.com/b", "2025-01-01 11:00", "সংসদে বাজেট পেশ করলেন অর্থমন্ত্রী",
+                      headline="বাজেট অধিবেশন")
+
+
+class HashingEncoderTests(SimpleTestCase):
+    def test_stem(self):
+        self.assertEqual(stem("নির্বাচনের"), "নির্বাচন")
+        self.assertEqual(stem("দলগুলোর"), "দল")
+        self.assertEqual(stem("কে"), "কে")
+
+    def test_vectors_are_normalized_and_topical(self):
+        encoder = HashingEncoder()
+        election, budget = encoder.encode_articles([ELECTION, BUDGET])
+        query = encoder.encode_query("নির্বাচনে তফসিল")
+
+        self.assertEqual(election.shape, (EMBEDDING_DIMS,))
+        self.assertAlmostEqual(float(np.linalg.norm(election)), 1.0, places=5)
+        self.assertGreater(query @ election, query @ budget)
+
+    def test_articles_without_words_get_no_vector(self):
+        articles = [dict(ELECTION), {"url": "https://example.com/empty", "headline": "", "content": "", "embedding": [1]}]
+
+        self.assertEqual(embed_articles(articles, HashingEncoder()), 1)
+
+        self.assertEqual(len(articles[0]["embedding"]), EMBEDDING_DIMS)
+        self.assertNotIn("embedding", articles[1])
+
+    def test_rare_terms_weigh_more_after_fitting(self):
+        encoder = HashingEncoder()
+        encoder.partial_fit([ELECTION, BUDGET, make_article("https://example.com/c", "2025-01-01 12:00",
+                                                            headline="নির্বাচন পর্যবেক্ষণ")])
+        encoder.refresh_idf()
+
+        common, _ = encoder._word_features("নির্বাচন")
+        rare, _ = encoder._word_features("বাজেট")
+        self.assertTrue(encoder.fitted)
+        self.assertLess(encoder.idf[common[0]], encoder.idf[rare[0]])
+
+
+class ModelFileTests(TempDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.model_file = self.path("model.npz")
+        for name, value in (("MODEL_FILE", self.model_file), ("_encoder", None), ("_encoder_mtime", None)):
+            patcher = mock.patch.object(embeddings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def fitted(self, *articles):
+        encoder = HashingEncoder()
+        encoder.partial_fit(articles)
+        return encoder
+
+    def test_save_and_load(self):
+        encoder = self.fitted(ELECTION, BUDGET)
+        encoder.save(self.model_file)
+
+        loaded = HashingEncoder.load(self.model_file)
+
+        self.assertEqual(loaded.docs, 2)
+        self.assertTrue(np.array_equal(loaded.df, encoder.df))
+        self.assertTrue(loaded.fitted)
+
+    def test_encoder_is_reloaded_when_the_model_changes(self):
+        unfitted = get_encoder()
+        self.assertFalse(unfitted.fitted)
+        self.assertIs(get_encoder(), unfitted)
+
+        self.fitted(ELECTION).save(self.model_file)
+        self.assertEqual(get_encoder().docs, 1)
+
+        self.fitted(ELECTION, BUDGET).save(self.model_file)
+        stat = os.stat(self.model_file)
+        os.utime(self.model_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(get_encoder().docs, 2)
+
+    def test_unreadable_model_keeps_the_previous_encoder(self):
+        self.fitted(ELECTION).save(self.model_file)
+        encoder = get_encoder()
+        with open(self.model_file, "wb") as f:
+            f.write(b"not a model")
+        os.utime(self.model_file, ns=(0, 1))
+
+        with self.assertLogs("embeddings", "WARNING"):
+            self.assertIs(get_encoder(), encoder)
+        self.assertIs(get_encoder(), encoder)
+
+    def test_rebuild_fits_saves_and_embeds(self):
+        hits = [{"_id": "a", "_source": dict(ELECTION)}, {"_id": "b", "_source": dict(BUDGET)}]
+        with mock.patch("embeddings.helpers.scan", side_effect=lambda *args, **kwargs: iter(hits)), \
+                mock.patch("embeddings.helpers.bulk", return_value=(2, [])) as bulk:
+            self.assertTrue(EmbeddingUpdater("prothomalo_politics", self.model_file, es_client=mock.Mock()).rebuild())
+
+        actions = list(bulk.call_args.args[1])
+        self.assertEqual([action["_id"] for action in actions], ["a", "b"])
+        self.assertEqual(len(actions[0]["doc"]["embedding"]), EMBEDDING_DIMS)
+        self.assertEqual(get_encoder().docs, 2)
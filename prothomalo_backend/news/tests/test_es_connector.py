@@ -0,0 +1,146 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+import es_connector
+
+
+class SharedClientMixin:
+    """Gives each test its own process-wide client state."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.multiple(
+            es_connector,
+            _client=None, _client_pid=None,
+            _async_client=None, _async_client_loop=None,
+            _async_client_pid=None, _async_client_closer=None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class SharedClientTests(SharedClientMixin, SimpleTestCase):
+    def test_one_client_per_process(self):
+        client = es_connector.get_es_client()
+
+        self.assertIs(es_connector.get_es_client(), client)
+        self.assertIsInstance(client, es_connector.InstrumentedElasticsearch)
+
+    def test_client_uses_the_pool_and_retry_settings(self):
+        client = es_connector.get_es_client()
+
+        self.assertEqual(client._request_timeout, es_connector.ES_REQUEST_TIMEOUT)
+        self.assertEqual(client._max_retries, es_connector.ES_MAX_RETRIES)
+        self.assertTrue(client._retry_on_timeout)
+        self.assertEqual(client._retry_on_status, (429, 502, 503, 504))
+
+    def test_forked_child_builds_its_own_client(self):
+        parent_client = es_connector.get_es_client()
+
+        with mock.patch("es_connector.os.getpid", return_value=es_connector._client_pid + 1):
+            child_client = es_connector.get_es_client()
+
+        self.assertIsNot(child_client, parent_client)
+
+    def test_fork_hook_drops_inherited_clients(self):
+        es_connector.get_es_client()
+        lock = es_connector._lock
+
+        with mock.patch.object(es_connector, "_lock", lock):
+            es_connector._reset_after_fork()
+            self.assertIsNone(es_connector._client)
+            self.assertIsNot(es_connector._lock, lock)
+
+    def test_close_discards_the_client(self):
+        client = es_connector.get_es_client()
+
+        with mock.patch.object(client, "close") as close:
+            es_connector.close_es_client()
+
+        close.assert_called_once_with()
+        self.assertIsNot(es_connector.get_es_client(), client)
+
+    def test_close_does_not_touch_an_inherited_client(self):
+        client = es_connector.get_es_client()
+
+        with mock.patch.object(client, "close") as close, \
+                mock.patch("es_connector.os.getpid", return_value=es_connector._client_pid + 1):
+            es_connector.close_es_client()
+
+        close.assert_not_called()
+
+
+class BlockingClientTests(SharedClientMixin, SimpleTestCase):
+    def test_long_timeout_without_retry(self):
+        client = es_connector.get_es_client()
+        blocking = es_connector.blocking_client(client)
+
+        self.assertEqual(blocking._request_timeout, es_connector.ES_BLOCKING_REQUEST_TIMEOUT)
+        self.assertFalse(blocking._retry_on_timeout)
+        self.assertIs(blocking.transport, client.transport)
+
+    def test_shared_client_keeps_its_options(self):
+        client = es_connector.get_es_client()
+        es_connector.blocking_client(client)
+
+        self.assertEqual(client._request_timeout, es_connector.ES_REQUEST_TIMEOUT)
+        self.assertTrue(client._retry_on_timeout)
+
+
+class FakeAsyncClient:
+    """Stands in for InstrumentedAsyncElasticsearch, which needs aiohttp at construction."""
+
+    def __init__(self, **options):
+        self.options = options
+        self.closed = 0
+
+    async def close(self):
+        self.closed += 1
+
+
+@mock.patch("es_connector.InstrumentedAsyncElasticsearch", FakeAsyncClient)
+class AsyncClientTests(SharedClientMixin, SimpleTestCase):
+    def test_one_client_per_loop(self):
+        async def two_lookups():
+            return es_connector.get_async_es_client(), es_connector.get_async_es_client()
+
+        first, again = asyncio.run(two_lookups())
+        second, _ = asyncio.run(two_lookups())
+
+        self.assertIs(first, again)
+        self.assertIsNot(first, second)
+        self.assertEqual(first.options["request_timeout"], es_connector.ES_REQUEST_TIMEOUT)
+
+    def test_client_is_closed_when_its_loop_shuts_down(self):
+        async def lookup():
+            return es_connector.get_async_es_client()
+
+        client = asyncio.run(lookup())
+
+        self.assertEqual(client.closed, 1)
+
+    def test_explicit_close_forgets_the_client(self):
+        async def lookup_and_close():
+            client = es_connector.get_async_es_client()
+            await asyncio.sleep(0)  # let the closer start waiting
+            await es_connector.close_async_es_client()
+            return client, es_connector.get_async_es_client()
+
+        client, replacement = asyncio.run(lookup_and_close())
+
+        self.assertGreaterEqual(client.closed, 1)
+        self.assertIsNot(replacement, client)
+        self.assertEqual(replacement.closed, 1)  # closed by its own closer at shutdown
+
+    def test_close_before_the_closer_starts(self):
+        async def lookup_and_close():
+            client = es_connector.get_async_es_client()
+            await es_connector.close_async_es_client()
+            return client
+
+        client = asyncio.run(lookup_and_close())
+
+        self.assertEqual(client.closed, 1)
+        self.assertIsNone(es_connector._async_client)
@@ -0,0 +1,172 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from article_feed import FeedPublisher, FeedSubscriber
+
+from news.feed import FeedClient, FeedHub, event_stamp
+from news.views import NewsStreamAPIView
+
+from .helpers import TempDirMixin, make_article
+
+
+def summary(event_id, url="https://example.com/a"):
+    return {"event_id": event_id, "url": url, "headline": "শিরোনাম"}
+
+
+def frame_ids(frames):
+    return [frame.split(b"\n", 1)[0].decode()[len("id: "):] for _, frame in frames]
+
+
+class FeedPublisherTests(TempDirMixin, SimpleTestCase):
+    def test_subscribers_receive_unique_increasing_ids(self):
+        subscriber = FeedSubscriber(socket_dir=self.tmp.name)
+        self.addCleanup(subscriber.close)
+        first, second = FeedPublisher(socket_dir=self.tmp.name), FeedPublisher(socket_dir=self.tmp.name)
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+        batch = [make_article(f"https://example.com/{n}", "2025-01-01 10:00") for n in range(3)]
+
+        # Both publishers stamp within the same microsecond
+        with mock.patch("article_feed.time.time_ns", return_value=1_750_000_000_000_000_000):
+            first.publish_batch(batch)
+            second.publish_batch(batch)
+
+        ids = [article["event_id"] for _ in range(2) for article in subscriber.receive()["articles"]]
+        self.assertEqual(len(set(ids)), 6)
+        self.assertEqual([event_stamp(i) for i in ids[:3]],
+                         [1_750_000_000_000_000, 1_750_000_000_000_001, 1_750_000_000_000_002])
+        self.assertTrue(all(i.endswith(second.publisher_id) for i in ids[3:]))
+
+    def test_no_subscribers_is_a_no_op(self):
+        publisher = FeedPublisher(socket_dir=self.path("missing"))
+        self.addCleanup(publisher.close)
+
+        publisher.publish_batch([make_article("https://example.com/a", "2025-01-01 10:00")])
+
+
+class FeedHubTests(SimpleTestCase):
+    def hub(self, buffer_size=10, queue_size=10):
+        hub = FeedHub(buffer_size, queue_size)
+        client = FeedClient(queue_size)
+        hub.clients.add(client)
+        return hub, client
+
+    def test_publisher_ids_are_kept(self):
+        hub, client = self.hub()
+
+        hub._publish(summary("200-b"))
+        hub._publish(summary("100-a"))
+
+        self.assertEqual(frame_ids(hub.replay("1")), ["200-b", "100-a"])
+        self.assertEqual(client.queue.qsize(), 2)
+
+    def test_workers_send_the_same_ids_whatever_they_received(self):
+        complete, lossy = FeedHub(10, 10), FeedHub(10, 10)
+        for event_id in ("100-a", "101-a", "102-a"):
+            complete._publish(summary(event_id))
+        lossy._publish(summary("102-a"))  # missed the first two datagrams
+
+        self.assertEqual(frame_ids(lossy.replay("101-a")), ["102-a"])
+        self.assertEqual(frame_ids(complete.replay("101-a")), ["102-a"])
+
+    def test_duplicates_are_dropped(self):
+        hub, client = self.hub()
+
+        hub._publish(summary("100-a"))
+        hub._publish(summary("100-a"))
+
+        self.assertEqual(len(hub.buffer), 1)
+        self.assertEqual(client.queue.qsize(), 1)
+
+    def test_articles_without_an_id_are_dropped(self):
+        hub, _ = self.hub()
+
+        hub._publish({"url": "https://example.com/a"})
+        hub._publish(summary("1\nevent: x"))
+
+        self.assertEqual(len(hub.buffer), 0)
+
+    def test_replay_after_a_buffered_id(self):
+        hub, _ = self.hub()
+        for event_id in ("100-a", "101-b", "099-c"):
+            hub._publish(summary(event_id))
+
+        # Arrival order, not id order, after an id this worker buffered
+        self.assertEqual(frame_ids(hub.replay("100-a")), ["101-b", "099-c"])
+        self.assertEqual(hub.replay(None), [])
+
+    def test_replay_after_an_evicted_id_uses_the_publish_time(self):
+        hub, _ = self.hub(buffer_size=2)
+        for event_id in ("100-a", "101-a", "102-a"):
+            hub._publish(summary(event_id))
+
+        self.assertNotIn("100-a", hub.buffered_ids)
+        self.assertEqual(frame_ids(hub.replay("100-a")), ["101-a", "102-a"])
+        self.assertEqual(frame_ids(hub.replay("101-x")), ["102-a"])
+        self.assertEqual(hub.replay("garbage"), [])
+
+    def test_evicted_ids_can_be_published_again(self):
+        hub, _ = self.hub(buffer_size=1)
+
+        hub._publish(summary("100-a"))
+        hub._publish(summary("101-a"))
+        hub._publish(summary("100-a"))
+
+        self.assertEqual([event_id for _, event_id, _ in hub.buffer], ["100-a"])
+
+    def test_slow_clients_are_dropped(self):
+        hub, client = self.hub(queue_size=1)
+
+        hub._publish(summary("100-a"))
+        hub._publish(summary("101-a"))
+
+        self.assertTrue(client.overflowed)
+        self.assertNotIn(client, hub.clients)
+
+
+class NewsStreamTests(SimpleTestCase):
+    def collect(self, hub, last_event_id, publish_during=(), count=3):
+        async def run():
+            stream = NewsStreamAPIView().stream(hub, last_event_id)
+            frames = [await stream.__anext__()]
+            for event_id in publish_during:
+                hub._publish(summary(event_id))
+            while len(frames) < count:
+                frames.append(await asyncio.wait_for(stream.__anext__(), timeout=1))
+            await stream.aclose()
+            return frames
+
+        with mock.patch.object(hub, "start"):
+            return asyncio.run(run())
+
+    def test_replay_then_live_events(self):
+        hub = FeedHub(10, 10)
+        hub._publish(summary("100-a"))
+        hub._publish(summary("101-a"))
+
+        frames = self.collect(hub, "100-a", publish_during=["102-a"], count=3)
+
+        self.assertEqual(frames[0], b"retry: 3000\n\n")
+        self.assertTrue(frames[1].startswith(b"id: 101-a\nevent: article\n"))
+        self.assertTrue(frames[2].startswith(b"id: 102-a\n"))
+        self.assertEqual(hub.clients, set())
+
+    def test_new_clients_only_get_live_events(self):
+        hub = FeedHub(10, 10)
+        hub._publish(summary("100-a"))
+
+        frames = self.collect(hub, None, publish_during=["100-a", "101-a"], count=2)
+
+        self.assertTrue(frames[1].startswith(b"id: 101-a\n"))
+
+    def test_last_event_id_header_is_passed_through(self):
+        hub = FeedHub(10, 10)
+        with mock.patch("news.views.get_feed_hub", return_value=hub), \
+                mock.patch.object(NewsStreamAPIView, "stream", return_value=iter([])) as stream:
+            response = self.client.get("/api/news/stream/", HTTP_LAST_EVENT_ID="101-a")
+
+        stream.assert_called_once_with(hub, "101-a")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
@@ -0,0 +1,107 @@
+from unittest import mock
+
+from bs4 import BeautifulSoup
+from django.test import SimpleTestCase
+
+from bloom import BloomFilter
+from frontier import URLFrontier, extract_story_links, normalize_url
+from sitemap import section_pattern
+
+from .helpers import TempDirMixin
+
+BASE_URL = "https://www.prothomalo.com"
+
+
+class BloomFilterTests(TempDirMixin, SimpleTestCase):
+    def test_keys_survive_reopening(self):
+        path = self.path("seen.bloom")
+        urls = [f"https://example.com/{i}" for i in range(500)]
+
+        bloom = BloomFilter(path, capacity=1000, error_rate=0.001)
+        self.assertTrue(bloom.add(urls[0]))
+        self.assertFalse(bloom.add(urls[0]))
+        bloom.update(urls[1:])
+        bloom.close()
+
+        reopened = BloomFilter(path, capacity=1000, error_rate=0.001)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.count, len(urls))
+        self.assertTrue(all(url in reopened for url in urls))
+        unseen = sum(f"https://example.com/other/{i}" in reopened for i in range(1000))
+        self.assertLess(unseen, 10)
+
+    def test_other_files_are_rejected(self):
+        path = self.path("other.bin")
+        with open(path, "wb") as f:
+            f.write(b"\0" * 128)
+
+        with self.assertRaises(ValueError):
+            BloomFilter(path)
+
+
+class StoryLinkTests(SimpleTestCase):
+    def test_story_links_in_the_body(self):
+        soup = BeautifulSoup(
+            '<div class="story-content">'
+            '<a href="/politics/b?utm_source=x">b</a>'
+            f'<a href="{BASE_URL}/politics/b/">b again</a>'
+            '<a href="/politics/a#top">itself</a>'
+            '<a href="/sports/c">other section</a>'
+            '<a href="https://example.com/politics/d">other site</a>'
+            '</div><a href="/politics/e">outside the body</a>',
+            "html.parser",
+        )
+
+        links = extract_story_links(soup, f"{BASE_URL}/politics/a", section_pattern(BASE_URL, ["politics"]))
+
+        self.assertEqual(links, [f"{BASE_URL}/politics/b"])
+
+    def test_normalize_url(self):
+        self.assertEqual(normalize_url(f"{BASE_URL}/politics/a/?x=1#y"), f"{BASE_URL}/politics/a")
+
+
+class URLFrontierTests(TempDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.seen = BloomFilter(self.path("seen.bloom"), capacity=1000, error_rate=0.001)
+        self.addCleanup(self.seen.close)
+        self.es = mock.Mock()
+        self.frontier = URLFrontier(self.seen, lambda: self.es, "prothomalo_politics")
+
+    def found(self, *flags):
+        self.es.mget.return_value = {"docs": [{"found": flag} for flag in flags]}
+
+    def test_only_unindexed_links_are_queued(self):
+        self.seen.add("https://example.com/known")
+        self.found(True, False)
+
+        queued = self.frontier.offer(["https://example.com/known", "https://example.com/indexed",
+                                      "https://example.com/new"])
+
+        self.assertEqual(queued, ["https://example.com/new"])
+        self.assertEqual(len(self.es.mget.call_args.kwargs["body"]["ids"]), 2)
+        self.assertIn("https://example.com/indexed", self.seen)
+        self.assertNotIn("https://example.com/new", self.seen)
+
+    def test_queued_links_are_not_offered_twice(self):
+        self.found(False)
+        self.frontier.offer(["https://example.com/new"])
+
+        self.assertEqual(self.frontier.offer(["https://example.com/new"]), [])
+        self.assertEqual(self.es.mget.call_count, 1)
+
+    def test_unconfirmed_links_are_dropped(self):
+        self.es.mget.side_effect = RuntimeError("cluster down")
+
+        self.assertEqual(self.frontier.offer(["https://example.com/new"]), [])
+        self.assertEqual(len(self.frontier), 0)
+
+    def test_pop_oldest_first_and_mark_indexed_batches(self):
+        self.found(False, False, False)
+        self.frontier.offer(["https://example.com/1", "https://example.com/2", "https://example.com/3"])
+
+        self.assertEqual(self.frontier.pop(2), ["https://example.com/1", "https://example.com/2"])
+        self.assertEqual(len(self.frontier), 1)
+
+        self.frontier.mark_batch_seen([{"url": "https://example.com/1"}])
+        self.assertIn("https://example.com/1", self.seen)
@@ -0,0 +1,77 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from es_queries import build_query, is_restrictive_query
+
+from .helpers import make_scraper
+
+
+def fake_client(action=None):
+    es = mock.Mock()
+    es.options.return_value = es  # blocking_client() calls share the fake
+    es.update_by_query.return_value = {"task": "node:1"}
+    es.delete_by_query.return_value = {"task": "node:2"}
+    if action:
+        es.tasks.get.return_value = {"task": {"action": action, "status": {}}}
+    return es
+
+
+class ByQueryGuardTests(SimpleTestCase):
+    def test_unfiltered_queries_are_not_restrictive(self):
+        self.assertFalse(is_restrictive_query(build_query()))
+        self.assertFalse(is_restrictive_query(build_query(query="", author="", location=None)))
+
+    def test_any_filter_or_text_query_is_restrictive(self):
+        self.assertTrue(is_restrictive_query(build_query(author="নিজস্ব প্রতিবেদক")))
+        self.assertTrue(is_restrictive_query(build_query(query="নির্বাচন")))
+        self.assertTrue(is_restrictive_query(build_query(start_date="2025-01-01")))
+        # Zero is a real bound, not a missing one
+        self.assertTrue(is_restrictive_query(build_query(max_word_count=0)))
+
+    def test_maintenance_without_filters_is_refused(self):
+        es = fake_client()
+        scraper = make_scraper(es)
+
+        self.assertIsNone(scraper.update_articles_by_query({"location": "ঢাকা"}, author=""))
+        self.assertIsNone(scraper.delete_articles_by_query())
+        es.update_by_query.assert_not_called()
+        es.delete_by_query.assert_not_called()
+
+    def test_filtered_maintenance_runs_throttled_in_the_background(self):
+        es = fake_client()
+        scraper = make_scraper(es)
+
+        self.assertEqual(scraper.delete_articles_by_query(end_date="2020-01-01", requests_per_second=50), "node:2")
+        kwargs = es.delete_by_query.call_args.kwargs
+        self.assertEqual(kwargs["requests_per_second"], 50)
+        self.assertFalse(kwargs["wait_for_completion"])
+        self.assertEqual(kwargs["conflicts"], "proceed")
+        self.assertEqual(kwargs["body"]["query"], build_query(end_date="2020-01-01"))
+
+
+class RethrottleTests(SimpleTestCase):
+    def rethrottle(self, action):
+        es = fake_client(action)
+        self.assertTrue(make_scraper(es).rethrottle_task("node:1", 100))
+        return es
+
+    def test_update_by_query_task(self):
+        es = self.rethrottle("indices:data/write/update/byquery")
+        es.update_by_query_rethrottle.assert_called_once_with(task_id="node:1", requests_per_second=100)
+        es.delete_by_query_rethrottle.assert_not_called()
+
+    def test_delete_by_query_task(self):
+        es = self.rethrottle("indices:data/write/delete/byquery")
+        es.delete_by_query_rethrottle.assert_called_once_with(task_id="node:1", requests_per_second=100)
+        es.update_by_query_rethrottle.assert_not_called()
+
+    def test_reindex_task(self):
+        es = self.rethrottle("indices:data/write/reindex")
+        es.reindex_rethrottle.assert_called_once_with(task_id="node:1", requests_per_second=100)
+
+    def test_other_tasks_are_not_rethrottled(self):
+        es = fake_client("indices:data/write/bulk")
+        self.assertFalse(make_scraper(es).rethrottle_task("node:1", 100))
+        es.update_by_query_rethrottle.assert_not_called()
+        es.delete_by_query_rethrottle.assert_not_called()
@@ -0,0 +1,69 @@
+from django.test import SimpleTestCase
+
+from benchmarks.fixtures import generate_corpus
+from es_queries import build_search_body
+from index_mappings import (
+    CURRENT_MAPPING_VERSION,
+    MAPPING_VERSIONS,
+    get_index_definition,
+    get_migration_script,
+    parse_index_version,
+    versioned_index_name,
+)
+
+
+class HighlightOffsetsTests(SimpleTestCase):
+    def test_text_fields_index_offsets_from_v4(self):
+        for version in range(4, CURRENT_MAPPING_VERSION + 1):
+            properties = get_index_definition(version)["mappings"]["properties"]
+            for field in ("headline", "content"):
+                with self.subTest(version=version, field=field):
+                    self.assertEqual(properties[field]["index_options"], "offsets")
+                    self.assertEqual(properties[field]["analyzer"], "bengali_analyzer")
+
+    def test_older_versions_keep_default_postings(self):
+        properties = get_index_definition(3)["mappings"]["properties"]
+        self.assertNotIn("index_options", properties["content"])
+
+    def test_headline_keeps_its_keyword_subfield(self):
+        properties = get_index_definition(4)["mappings"]["properties"]
+        self.assertEqual(properties["headline"]["fields"]["raw"], {"type": "keyword"})
+
+    def test_highlighter_is_unified(self):
+        highlight = build_search_body(query="সংসদ", highlight=True)["highlight"]
+        self.assertEqual(highlight["type"], "unified")
+        self.assertEqual(set(highlight["fields"]), {"headline", "content"})
+
+    def test_offsets_need_no_backfill_script(self):
+        # Offsets are rebuilt by reindexing alone
+        self.assertIsNone(get_migration_script(3, 4))
+
+
+class IndexDefinitionTests(SimpleTestCase):
+    def test_version_is_stored_in_the_mapping(self):
+        for version in MAPPING_VERSIONS:
+            with self.subTest(version=version):
+                self.assertEqual(get_index_definition(version)["mappings"]["_meta"]["mapping_version"], version)
+
+    def test_unknown_version_is_rejected(self):
+        with self.assertRaises(ValueError):
+            get_index_definition(CURRENT_MAPPING_VERSION + 1)
+
+    def test_definitions_are_independent_copies(self):
+        get_index_definition(4)["mappings"]["properties"]["content"]["index_options"] = "docs"
+        self.assertEqual(get_index_definition(4)["mappings"]["properties"]["content"]["index_options"], "offsets")
+
+    def test_versioned_names_round_trip(self):
+        self.assertEqual(parse_index_version(versioned_index_name("prothomalo_politics", 4)), 4)
+        self.assertIsNone(parse_index_version("prothomalo_politics"))
+
+
+class BenchmarkCorpusTests(SimpleTestCase):
+    def test_corpus_is_deterministic(self):
+        self.assertEqual(generate_corpus(size=20, seed=7), generate_corpus(size=20, seed=7))
+        self.assertNotEqual(generate_corpus(size=20, seed=7), generate_corpus(size=20, seed=8))
+
+    def test_corpus_matches_the_mapping(self):
+        properties = get_index_definition()["mappings"]["properties"]
+        for article in generate_corpus(size=5):
+            self.assertLessEqual(set(article), set(properties))
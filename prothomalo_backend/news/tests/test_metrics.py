@@ -0,0 +1,98 @@
+import urllib.error
+import urllib.request
+
+from django.test import SimpleTestCase
+
+import metrics
+from metrics import CONTENT_TYPE, Counter, Gauge, Histogram, es_operation, start_metrics_server
+
+
+class MetricsTestMixin:
+    def metric(self, metric):
+        """Keeps a metric made by a test out of the shared registry afterwards."""
+        self.addCleanup(metrics._REGISTRY.remove, metric)
+        return metric
+
+
+class RenderTests(MetricsTestMixin, SimpleTestCase):
+    def test_counter_family_includes_total(self):
+        counter = self.metric(Counter("test_events", "Events seen", ["kind"]))
+        counter.labels("a").inc()
+        counter.labels(kind="a").inc(2)
+
+        self.assertEqual(counter.render().splitlines(), [
+            "# HELP test_events_total Events seen",
+            "# TYPE test_events_total counter",
+            'test_events_total{kind="a"} 3.0',
+        ])
+
+    def test_gauge_without_labels(self):
+        gauge = self.metric(Gauge("test_depth", "Queue depth"))
+        gauge.set(4)
+        gauge.labels().dec()
+
+        self.assertIn("test_depth 3", gauge.render())
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.metric(Histogram("test_seconds", "Latency", ["op"], buckets=(1, 0.1)))
+        for value in (0.05, 0.5, 0.7, 3):
+            histogram.labels("search").observe(value)
+
+        self.assertEqual(histogram.render().splitlines()[2:], [
+            'test_seconds_bucket{op="search",le="0.1"} 1',
+            'test_seconds_bucket{op="search",le="1.0"} 3',
+            'test_seconds_bucket{op="search",le="+Inf"} 4',
+            'test_seconds_sum{op="search"} 4.25',
+            'test_seconds_count{op="search"} 4',
+        ])
+
+    def test_label_values_are_escaped(self):
+        counter = self.metric(Counter("test_escaped", "Escaping", ["path"]))
+        counter.labels('a"b\\c\nd').inc()
+
+        self.assertIn('path="a\\"b\\\\c\\nd"', counter.render())
+
+    def test_timer(self):
+        histogram = self.metric(Histogram("test_timed_seconds", "Timed"))
+        with histogram.labels().time():
+            pass
+
+        self.assertEqual(histogram.labels().count, 1)
+
+
+class ESOperationTests(SimpleTestCase):
+    def test_names(self):
+        self.assertEqual(es_operation("msearch", "/_msearch", None), "msearch")
+        self.assertEqual(es_operation(None, "/prothomalo_politics/_search", {"size": 10}), "search")
+        self.assertEqual(es_operation(None, "/", None), "root")
+
+    def test_aggregation_only_searches(self):
+        self.assertEqual(es_operation("search", "/i/_search", {"size": 0, "aggs": {}}), "aggs")
+        self.assertEqual(es_operation("search", "/i/_search", {"size": 0}), "search")
+
+
+class MetricsEndpointTests(SimpleTestCase):
+    def test_backend_metrics(self):
+        self.client.get("/api/trending/")
+
+        response = self.client.get("/api/metrics/")
+
+        self.assertEqual(response["Content-Type"], CONTENT_TYPE)
+        body = response.content.decode()
+        self.assertIn("# TYPE http_responses_total counter", body)
+        self.assertIn('http_responses_total{view="news-trending",method="GET",status="200"}', body)
+        self.assertIn("# TYPE es_request_duration_seconds histogram", body)
+
+    def test_scraper_metrics_server(self):
+        server = start_metrics_server(0, host="127.0.0.1")
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        with urllib.request.urlopen(f"{base}/metrics") as response:
+            self.assertEqual(response.headers["Content-Type"], CONTENT_TYPE)
+            self.assertIn(b"scraper_stage_duration_seconds", response.read())
+        with self.assertRaises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{base}/other")
+        error.exception.close()
+        self.assertEqual(error.exception.code, 404)
@@ -0,0 +1,103 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from index_mappings import CURRENT_MAPPING_VERSION
+
+from .helpers import make_scraper
+
+ALIAS = "prothomalo_politics"
+TARGET = f"{ALIAS}_v{CURRENT_MAPPING_VERSION}"
+
+
+def fake_cluster(source_index, source_version):
+    """A fake client serving ALIAS from source_index (a legacy index when they are equal)."""
+    es = mock.Mock()
+    es.options.return_value = es
+    es.indices.exists_alias.return_value = source_index != ALIAS
+    es.indices.get_alias.return_value = {source_index: {}}
+    es.indices.exists.side_effect = lambda index: index == source_index
+    es.indices.get_mapping.return_value = {
+        source_index: {"mappings": {"_meta": {"mapping_version": source_version}}}
+    }
+    es.reindex.side_effect = lambda **kwargs: (
+        {"created": 0, "updated": 0} if kwargs["wait_for_completion"] else {"task": "node:1"}
+    )
+    return es
+
+
+def migrate(es, **kwargs):
+    scraper = make_scraper(es)
+    with mock.patch.object(scraper, "wait_for_task", return_value={"completed": True}):
+        return scraper.migrate_index(**kwargs)
+
+
+def call_names(es):
+    """The fake's calls as (name, kwargs), without the blocking_client() hops."""
+    return [(name, kwargs) for name, _, kwargs in es.mock_calls if name != "options"]
+
+
+def write_block_index(calls, index, value=True):
+    return calls.index(("indices.put_settings", {"index": index, "body": {"index": {"blocks.write": value}}}))
+
+
+class MigrateIndexTests(SimpleTestCase):
+    def test_versioned_source_is_frozen_before_the_last_pass_and_swap(self):
+        source = f"{ALIAS}_v{CURRENT_MAPPING_VERSION - 1}"
+        es = fake_cluster(source, CURRENT_MAPPING_VERSION - 1)
+
+        self.assertTrue(migrate(es))
+
+        calls = call_names(es)
+        blocked = write_block_index(calls, source)
+        reindexes = [i for i, (name, _) in enumerate(calls) if name == "reindex"]
+        swap = next(i for i, (name, _) in enumerate(calls) if name == "indices.update_aliases")
+        self.assertTrue(blocked < reindexes[-1] < swap)
+        self.assertEqual(reindexes[-1], max(reindexes))
+        # Nothing is copied after the swap, and every pass may update existing documents
+        self.assertTrue(all(name != "reindex" for name, _ in calls[swap:]))
+        self.assertTrue(all("op_type" not in calls[i][1]["body"]["dest"] for i in reindexes))
+        self.assertEqual(calls[swap][1]["body"]["actions"], [
+            {"add": {"index": TARGET, "alias": ALIAS}},
+            {"remove": {"index": source, "alias": ALIAS}},
+        ])
+        es.indices.delete.assert_not_called()
+
+    def test_legacy_index_is_replaced_by_the_alias(self):
+        es = fake_cluster(ALIAS, 1)
+
+        self.assertTrue(migrate(es, target_version=CURRENT_MAPPING_VERSION))
+
+        calls = call_names(es)
+        write_block_index(calls, ALIAS)
+        es.indices.update_aliases.assert_called_once_with(body={"actions": [
+            {"add": {"index": TARGET, "alias": ALIAS}},
+            {"remove_index": {"index": ALIAS}},
+        ]})
+
+    def test_delete_old_removes_the_frozen_source(self):
+        source = f"{ALIAS}_v{CURRENT_MAPPING_VERSION - 1}"
+        es = fake_cluster(source, CURRENT_MAPPING_VERSION - 1)
+
+        self.assertTrue(migrate(es, delete_old=True))
+
+        es.indices.delete.assert_called_once_with(index=source)
+
+    def test_failed_swap_lifts_the_write_block(self):
+        source = f"{ALIAS}_v{CURRENT_MAPPING_VERSION - 1}"
+        es = fake_cluster(source, CURRENT_MAPPING_VERSION - 1)
+        es.indices.update_aliases.side_effect = RuntimeError("alias conflict")
+
+        self.assertFalse(migrate(es))
+
+        calls = call_names(es)
+        self.assertLess(write_block_index(calls, source), write_block_index(calls, source, value=None))
+
+    def test_current_index_is_left_alone(self):
+        source = f"{ALIAS}_v{CURRENT_MAPPING_VERSION}"
+        es = fake_cluster(source, CURRENT_MAPPING_VERSION)
+
+        self.assertTrue(migrate(es))
+
+        es.indices.create.assert_not_called()
+        es.indices.put_settings.assert_not_called()
@@ -0,0 +1,100 @@
+import json
+import threading
+
+import requests
+from django.test import SimpleTestCase
+
+from pipeline_stats import PipelineRun, _percentile, failure_category
+
+from .helpers import TempDirMixin
+
+
+class FailureCategoryTests(SimpleTestCase):
+    def test_categories(self):
+        response = requests.Response()
+        response.status_code = 503
+
+        self.assertEqual(failure_category(requests.exceptions.ReadTimeout()), "timeout")
+        self.assertEqual(failure_category(requests.exceptions.ConnectionError()), "connection")
+        self.assertEqual(failure_category(requests.exceptions.HTTPError(response=response)), "http_503")
+        self.assertEqual(failure_category(ValueError("x")), "ValueError")
+        self.assertEqual(failure_category("no_headline"), "no_headline")
+
+    def test_nearest_rank_percentile(self):
+        ordered = [float(n) for n in range(1, 101)]
+
+        self.assertEqual(_percentile(ordered, 50), 50.0)
+        self.assertEqual(_percentile(ordered, 99), 99.0)
+        self.assertEqual(_percentile([7.0], 95), 7.0)
+        self.assertEqual(_percentile([], 50), 0.0)
+
+
+class PipelineRunTests(TempDirMixin, SimpleTestCase):
+    def test_report(self):
+        run = PipelineRun(slowest=2)
+        for ms in (10, 20, 30, 40):
+            run.record("fetch", ms / 1000, nbytes=100)
+        run.record_failure("fetch", requests.exceptions.ReadTimeout(), count=2)
+        run.record_failure("parse", "no_headline")
+        for seconds, url in ((0.5, "a"), (2.0, "b"), (1.0, "c")):
+            run.record_url(url, seconds)
+        run.count("indexed", 3)
+
+        report = run.report()
+
+        self.assertEqual(report["stages"]["fetch"], {"count": 4, "mean_ms": 25.0, "p50_ms": 20.0,
+                                                     "p95_ms": 40.0, "p99_ms": 40.0, "max_ms": 40.0})
+        self.assertNotIn("parse", report["stages"])
+        self.assertEqual(report["failures"], {"fetch:timeout": 2, "parse:no_headline": 1})
+        self.assertEqual(report["slowest_urls"], [{"url": "b", "ms": 2000.0}, {"url": "c", "ms": 1000.0}])
+        self.assertEqual(report["bytes_downloaded"], 400)
+        self.assertEqual(report["counts"], {"indexed": 3})
+        self.assertGreater(report["articles_per_second"], 0)
+
+    def test_failed_stages_are_not_timed(self):
+        run = PipelineRun()
+
+        with self.assertRaises(ValueError):
+            with run.stage("parse"):
+                raise ValueError("bad html")
+        with run.stage("parse"):
+            pass
+
+        self.assertEqual(len(run.durations["parse"]), 1)
+
+    def test_events_and_report_files(self):
+        events, reports = self.path("events.jsonl"), self.path("runs.jsonl")
+        run = PipelineRun(events_file=events)
+        run.record("api_page", 0.2, url="https://example.com/api")
+        run.record_failure("fetch", "http_404", url="https://example.com/a")
+
+        report = run.finish(report_file=reports)
+        run.record("fetch", 0.1)  # late samples after finish() are not written
+
+        with open(events, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line["event"] for line in lines], ["stage", "failure", "run_finished"])
+        self.assertEqual(lines[0]["ms"], 200.0)
+        with open(reports, encoding="utf-8") as f:
+            self.assertEqual(json.loads(f.read())["failures"], report["failures"])
+
+    def test_concurrent_recording(self):
+        run = PipelineRun(events_file=self.path("events.jsonl"))
+
+        def work():
+            for _ in range(500):
+                run.record("fetch", 0.001, nbytes=1)
+                run.count("scraped")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        run.finish()
+
+        self.assertEqual(run.bytes_downloaded, 2000)
+        self.assertEqual(run.counts["scraped"], 2000)
+        self.assertEqual(len(run.durations["fetch"]), 2000)
+        with open(self.path("events.jsonl"), encoding="utf-8") as f:
+            self.assertEqual(sum(1 for _ in f), 2001)
@@ -0,0 +1,68 @@
+from django.test import SimpleTestCase
+
+from es_queries import HIGHLIGHT, build_search_body, format_search_response
+from index_mappings import SOURCE_PROFILES, build_excerpt, get_migration_script
+from storage import project_source
+
+from .helpers import make_article, search_response
+
+
+class ProjectionProfileTests(SimpleTestCase):
+    def test_list_and_card_profiles_filter_the_source(self):
+        self.assertEqual(build_search_body(profile="list")["_source"], SOURCE_PROFILES["list"])
+        self.assertEqual(build_search_body(profile="card")["_source"], SOURCE_PROFILES["card"])
+        self.assertIn("excerpt", SOURCE_PROFILES["card"])
+        self.assertNotIn("content", SOURCE_PROFILES["card"])
+
+    def test_full_profile_drops_only_index_helpers(self):
+        excludes = build_search_body()["_source"]["excludes"]
+        self.assertEqual(set(excludes), {"suggest", "related", "embedding"})
+
+    def test_unknown_profile_is_rejected(self):
+        with self.assertRaises(ValueError):
+            build_search_body(profile="everything")
+
+    def test_highlights_are_opt_in(self):
+        self.assertNotIn("highlight", build_search_body(query="নির্বাচন"))
+        self.assertEqual(build_search_body(query="নির্বাচন", highlight=True)["highlight"], HIGHLIGHT)
+
+    def test_highlights_are_passed_through(self):
+        response = search_response(make_article("https://example.com/a", "2025-01-01T00:00:00"))
+        response["hits"]["hits"][0]["highlight"] = {"headline": ["<em>শিরোনাম</em>"]}
+
+        article = format_search_response(response)["articles"][0]
+
+        self.assertEqual(article["highlight"], {"headline": ["<em>শিরোনাম</em>"]})
+
+    def test_stored_documents_use_the_same_profiles(self):
+        article = dict(make_article("https://example.com/a", "2025-01-01T00:00:00", content="লেখা"),
+                       excerpt="লেখা", embedding=[0.1], suggest=[])
+
+        self.assertEqual(set(project_source(article, "list")), set(SOURCE_PROFILES["list"]))
+        self.assertEqual(set(project_source(article, "card")), set(SOURCE_PROFILES["card"]))
+        self.assertNotIn("embedding", project_source(article, "full"))
+        self.assertIn("content", project_source(article, "full"))
+
+
+class ExcerptTests(SimpleTestCase):
+    def test_short_content_is_kept_whole(self):
+        self.assertEqual(build_excerpt("ছোট লেখা", length=20), "ছোট লেখা")
+        self.assertEqual(build_excerpt(None), "")
+
+    def test_long_content_is_cut_at_a_word_boundary(self):
+        self.assertEqual(build_excerpt("এক দুই তিন চার", length=8), "এক দুই…")
+
+    def test_unbroken_content_is_cut_at_the_length(self):
+        self.assertEqual(build_excerpt("ক" * 12, length=5), "ক" * 5 + "…")
+
+    def test_space_at_the_length_is_not_included(self):
+        # The migration script mirrors this bound with lastIndexOf(' ', length - 1)
+        self.assertEqual(build_excerpt("abcd efgh", length=4), "abcd…")
+        self.assertEqual(build_excerpt("ab cd efgh", length=5), "ab…")
+
+    def test_migration_script_uses_the_same_length(self):
+        script = get_migration_script(2, 3)
+
+        self.assertEqual(script["lang"], "painless")
+        self.assertIn("lastIndexOf(' ', params.excerpt_length - 1)", script["source"])
+        self.assertLessEqual(len(build_excerpt("ক " * 200)), script["params"]["excerpt_length"] + 1)
@@ -0,0 +1,171 @@
+import time
+from datetime import datetime
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from recrawl import MAX_RECHECK, MIN_RECHECK, RecrawlScheduler, Recrawler
+
+from .helpers import TempDirMixin, make_article, make_scraper
+
+A, B = "https://example.com/a", "https://example.com/b"
+
+
+class RecrawlSchedulerTests(TempDirMixin, SimpleTestCase):
+    NOW = 1_750_000_000.0
+
+    def setUp(self):
+        super().setUp()
+        self.scheduler = RecrawlScheduler(self.path("recrawl_state.json"))
+
+    def track(self, url, age_hours):
+        published = datetime.fromtimestamp(self.NOW - age_hours * 3600).strftime("%Y-%m-%d %H:%M")
+        self.assertTrue(self.scheduler.track(make_article(url, published), now=self.NOW))
+        return self.scheduler.entries[url]
+
+    def test_interval_follows_age_within_bounds(self):
+        fresh = self.track("https://example.com/fresh", age_hours=0.5)
+        day_old = self.track("https://example.com/day", age_hours=24)
+        day_old["factor"] = 1000.0
+
+        self.assertEqual(self.scheduler.interval(fresh, self.NOW), MIN_RECHECK)
+        self.assertEqual(self.scheduler.interval(day_old, self.NOW), MAX_RECHECK)
+        day_old["factor"] = 1.0
+        # Published times have minute precision
+        self.assertAlmostEqual(self.scheduler.interval(day_old, self.NOW), 6 * 3600, delta=60)
+
+    def test_changes_shorten_and_unchanged_checks_stretch_the_interval(self):
+        entry = self.track("https://example.com/story", age_hours=24)
+        base = self.scheduler.interval(entry, self.NOW)
+
+        self.scheduler.record("https://example.com/story", changed=True, now=self.NOW)
+        self.assertLess(self.scheduler.interval(entry, self.NOW), base)
+        self.scheduler.record("https://example.com/story", changed=False, now=self.NOW)
+        self.scheduler.record("https://example.com/story", changed=False, now=self.NOW)
+        self.assertGreater(self.scheduler.interval(entry, self.NOW), base)
+
+    def test_due_articles_come_most_overdue_first(self):
+        self.track("https://example.com/day", age_hours=24)
+        self.track("https://example.com/fresh", age_hours=1)
+
+        self.assertEqual(self.scheduler.pop_due(10, now=self.NOW), [])
+        self.assertEqual(self.scheduler.pop_due(10, now=self.NOW + 7 * 3600),
+                         ["https://example.com/fresh", "https://example.com/day"])
+
+    def test_state_survives_restarts(self):
+        self.track("https://example.com/story", age_hours=24)
+        self.scheduler.watermark = "2025-06-15T12:00:00"
+        self.scheduler.save()
+
+        reloaded = RecrawlScheduler(self.path("recrawl_state.json"))
+
+        self.assertEqual(reloaded.entries, self.scheduler.entries)
+        self.assertEqual(reloaded.watermark, "2025-06-15T12:00:00")
+        self.assertEqual(reloaded.pop_due(10, now=self.NOW + 7 * 3600), ["https://example.com/story"])
+
+
+def page_response(status=200, etag=None):
+    response = mock.Mock(status_code=status, content=b"<html></html>", headers={"ETag": etag} if etag else {})
+    return response
+
+
+class RecrawlerTests(TempDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.scraper = mock.Mock()
+        self.scraper.config = mock.Mock(REQUEST_DELAY=0, EMBEDDINGS_ENABLED=False)
+        self.scraper.parse_article_page.side_effect = lambda url, soup: self.pages[url]
+        self.scheduler = RecrawlScheduler(self.path("recrawl_state.json"))
+        self.recrawler = Recrawler(self.scraper, self.scheduler)
+        self.pages = {}
+        # Tracked ten days ago and published a day before that, so due now
+        tracked = time.time() - 10 * 86400
+        for url in (A, B):
+            self.pages[url] = make_article(url, datetime.fromtimestamp(tracked - 86400).strftime("%Y-%m-%d %H:%M"),
+                                           content="প্রথম সংস্করণ")
+            self.scheduler.track(self.pages[url], now=tracked)
+
+    def edit(self, url):
+        self.pages[url] = dict(self.pages[url], content="সংশোধিত সংস্করণ", excerpt="সংশোধিত",
+                               suggest={"input": ["শিরোনাম"]})
+
+    def test_not_modified_pages_are_unchanged(self):
+        self.scraper.session.get.return_value = page_response(304)
+        self.scheduler.entries[A]["etag"] = 'W/"v1"'
+
+        self.assertIsNone(self.recrawler.check(A))
+
+        self.assertEqual(self.scraper.session.get.call_args.kwargs["headers"], {"If-None-Match": 'W/"v1"'})
+        self.assertEqual(self.scheduler.entries[A]["checks"], 1)
+        self.scraper.parse_article_page.assert_not_called()
+
+    def test_removed_stories_leave_the_schedule(self):
+        self.scraper.session.get.return_value = page_response(404)
+
+        self.assertIsNone(self.recrawler.check(A))
+        self.assertNotIn(A, self.scheduler.entries)
+
+    def test_incomplete_pages_are_failed_checks(self):
+        self.scraper.session.get.return_value = page_response()
+        self.pages[A] = dict(self.pages[A], headline="Headline not found", content="")
+
+        self.assertIsNone(self.recrawler.check(A))
+
+        entry = self.scheduler.entries[A]
+        self.assertEqual((entry["checks"], entry["changes"]), (0, 0))
+
+    def test_edited_articles_are_updated(self):
+        self.scraper.session.get.return_value = page_response(etag='W/"v2"')
+        self.edit(A)
+        self.scraper.bulk_update_articles.return_value = set()
+        old_hash = self.scheduler.entries[A]["hash"]
+
+        self.assertEqual(self.recrawler.run_due(), 1)
+
+        [(url, fields)] = self.scraper.bulk_update_articles.call_args.args[0]
+        self.assertEqual((url, fields["content"]), (A, "সংশোধিত সংস্করণ"))
+        self.assertNotEqual(self.scheduler.entries[A]["hash"], old_hash)
+        self.assertEqual(self.scheduler.entries[A]["etag"], 'W/"v2"')
+        self.assertEqual(self.scheduler.entries[A]["changes"], 1)
+
+    def test_failed_updates_keep_the_old_version(self):
+        self.scraper.session.get.return_value = page_response(etag='W/"v2"')
+        self.edit(A)
+        self.edit(B)
+        self.scraper.bulk_update_articles.return_value = {B}
+        old_hash = self.scheduler.entries[B]["hash"]
+
+        self.assertEqual(self.recrawler.run_due(), 1)
+
+        self.assertEqual(self.scheduler.entries[A]["changes"], 1)
+        failed = self.scheduler.entries[B]
+        self.assertEqual((failed["hash"], failed["etag"], failed["changes"]), (old_hash, None, 0))
+
+
+class BulkUpdateTests(SimpleTestCase):
+    def setUp(self):
+        self.scraper = make_scraper(mock.Mock(), ES_INDEX="prothomalo_politics", BULK_INDEX_SIZE=100)
+
+    def test_failed_documents_are_reported_by_url(self):
+        failure = {"update": {"_id": "https%3A%2F%2Fexample.com%2Fb", "status": 404, "error": {"type": "missing"}}}
+
+        def bulk(client, actions, **kwargs):
+            self.actions = list(actions)
+            return 1, [failure]
+
+        with mock.patch("scraper.helpers.bulk", side_effect=bulk), self.assertLogs("scraper", "WARNING"):
+            failed = self.scraper.bulk_update_articles([(A, {"content": "a"}), (B, {"content": "b"})])
+
+        self.assertEqual(failed, {B})
+        self.assertEqual(self.actions[0]["_id"], "https%3A%2F%2Fexample.com%2Fa")
+        self.assertIn("last_updated", self.actions[0]["doc"])
+
+    def test_failed_requests_fail_every_url(self):
+        def bulk(client, actions, **kwargs):
+            next(actions)
+            raise ConnectionError("cluster down")
+
+        with mock.patch("scraper.helpers.bulk", side_effect=bulk), self.assertLogs("scraper", "ERROR"):
+            failed = self.scraper.bulk_update_articles(iter([(A, {"content": "a"}), (B, {"content": "b"})]))
+
+        self.assertEqual(failed, {A, B})
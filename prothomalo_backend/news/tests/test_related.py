@@ -0,0 +1,125 @@
+from unittest import mock
+from urllib.parse import quote
+
+from django.test import SimpleTestCase
+from elasticsearch import NotFoundError
+
+from related import ADD_RELATED_SCRIPT, RelatedArticlesUpdater, build_related_query, related_ids
+from storage import ElasticsearchStore
+
+from .helpers import NewsAPITestCase, make_article
+
+INDEX = "prothomalo_politics"
+A, B, C = (quote(f"https://example.com/{name}", safe="") for name in "abc")
+
+
+def related_hits(*scored):
+    return {"hits": {"hits": [{"_id": doc_id, "_score": score} for doc_id, score in scored]}}
+
+
+class RelatedArticlesUpdaterTests(SimpleTestCase):
+    def setUp(self):
+        self.es = mock.Mock()
+        self.updater = RelatedArticlesUpdater(INDEX, size=2, es_client=self.es)
+        patcher = mock.patch("related.helpers.bulk", return_value=(0, []))
+        self.bulk = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def actions(self):
+        return list(self.bulk.call_args.args[1])
+
+    def test_own_lists_then_neighbor_splices(self):
+        self.es.msearch.return_value = {"responses": [related_hits((B, 3.14159), (C, 1.5))]}
+
+        self.assertTrue(self.updater.update_batch([{"url": "https://example.com/a"}]))
+
+        searches = self.es.msearch.call_args.kwargs["body"]
+        self.assertEqual(searches, [{"index": INDEX}, build_related_query(INDEX, A, 2)])
+        own, *neighbors = self.actions()
+        self.assertEqual(own, {"_op_type": "update", "_index": INDEX, "_id": A,
+                               "doc": {"related": [{"id": B, "score": 3.1416}, {"id": C, "score": 1.5}]}})
+        self.assertEqual([action["_id"] for action in neighbors], [B, C])
+        self.assertEqual(neighbors[0]["script"]["source"], ADD_RELATED_SCRIPT)
+        self.assertEqual(neighbors[0]["script"]["params"], {"entry": {"id": A, "score": 3.1416}, "size": 2})
+        self.es.indices.refresh.assert_not_called()
+
+    def test_rebuild_mode_writes_own_lists_only(self):
+        self.es.msearch.return_value = {"responses": [related_hits((B, 2.0))]}
+
+        self.updater.update_batch([{"url": "https://example.com/a"}], propagate=False, refresh=True)
+
+        self.assertEqual([action["_id"] for action in self.actions()], [A])
+        self.es.indices.refresh.assert_called_once_with(index=INDEX)
+
+    def test_failed_searches_are_skipped(self):
+        self.es.msearch.return_value = {"responses": [{"error": {"type": "boom"}}, related_hits()]}
+
+        self.assertTrue(self.updater.update_batch([{"url": "https://example.com/a"},
+                                                   {"url": "https://example.com/b"}]))
+
+        self.assertEqual(self.actions(), [{"_op_type": "update", "_index": INDEX, "_id": B,
+                                           "doc": {"related": []}}])
+
+    def test_errors_are_reported(self):
+        self.es.msearch.side_effect = RuntimeError("cluster down")
+
+        self.assertFalse(self.updater.update_batch([{"url": "https://example.com/a"}]))
+        self.assertTrue(self.updater.update_batch([]))
+
+    def test_related_query_likes_the_indexed_document(self):
+        query = build_related_query(INDEX, A)["query"]["more_like_this"]
+
+        self.assertEqual(query["like"], [{"_index": INDEX, "_id": A}])
+        self.assertEqual(query["fields"], ["headline", "content"])
+
+    def test_related_ids(self):
+        self.assertEqual(related_ids({"related": [{"id": B, "score": 2}, {"id": C, "score": 1}]}), [B, C])
+        self.assertEqual(related_ids({"related": None}), [])
+        self.assertEqual(related_ids({}), [])
+
+
+class BulkRefreshTests(SimpleTestCase):
+    def test_store_passes_its_refresh_policy(self):
+        store = ElasticsearchStore(INDEX, es_client=mock.Mock(), refresh="wait_for")
+        batches = []
+
+        with mock.patch("storage.helpers.streaming_bulk", return_value=iter([(True, {})])) as bulk:
+            store.bulk_index_articles([make_article("https://example.com/a", "2025-01-01 10:00")],
+                                      on_batch=batches.append)
+
+        self.assertEqual(bulk.call_args.kwargs["refresh"], "wait_for")
+        self.assertEqual(len(batches), 1)
+
+
+class NewsRelatedViewTests(NewsAPITestCase):
+    def test_cards_of_related_articles(self):
+        self.es.get.return_value = {"_source": {"related": [{"id": B, "score": 2.0}, {"id": C, "score": 1.0}]}}
+        self.es.mget.return_value = {"docs": [
+            {"_id": B, "found": True, "_source": {"url": "https://example.com/b"}},
+            {"_id": C, "found": False},
+        ]}
+
+        response = self.client.get("/api/news/related/?url=https://example.com/a")
+
+        self.assertEqual(response.json(), {"results": [{"url": "https://example.com/b"}]})
+        self.assertEqual(self.es.get.call_args.kwargs["id"], A)
+        self.assertEqual(self.es.mget.call_args.kwargs["body"], {"ids": [B, C]})
+        self.assertNotIn("content", self.es.mget.call_args.kwargs["source_includes"])
+
+    def test_article_without_neighbors(self):
+        self.es.get.return_value = {"_source": {}}
+
+        response = self.client.get("/api/news/related/?url=https://example.com/a")
+
+        self.assertEqual(response.json(), {"results": []})
+        self.es.mget.assert_not_called()
+
+    def test_unknown_article(self):
+        self.es.get.side_effect = NotFoundError("not found", mock.Mock(status=404), {})
+
+        response = self.client.get("/api/news/related/?url=https://example.com/missing")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_url_is_required(self):
+        self.assertEqual(self.client.get("/api/news/related/").status_code, 400)
@@ -0,0 +1,132 @@
+import asyncio
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from elasticsearch import ConnectionError as ESConnectionError
+
+from news.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, ESUnavailable, es_call, get_breaker
+
+from .helpers import NewsAPITestCase, make_article, search_response
+
+ARTICLE = make_article("https://example.com/a", "2025-01-01 10:00")
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("news.resilience.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.retry_after(), 10)
+
+    def test_one_probe_after_the_reset_timeout(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now += 10
+
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_failed_probe_reopens(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now += 10
+        self.breaker.allow()
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+
+
+@override_settings(NEWS_BREAKER_FAILURE_THRESHOLD=1, NEWS_ES_DEFAULT_DEADLINE=0.05)
+class ESCallTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch("news.resilience._breaker", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def call(self, coroutine):
+        return asyncio.run(es_call(coroutine, "test"))
+
+    def test_slow_calls_hit_the_deadline_and_open_the_breaker(self):
+        with self.assertRaises(ESUnavailable):
+            self.call(asyncio.sleep(1))
+        self.assertEqual(get_breaker().state, OPEN)
+
+        # Further calls fail fast without being awaited
+        never_started = mock.AsyncMock()()
+        with self.assertRaises(ESUnavailable):
+            self.call(never_started)
+
+    def test_connection_errors_are_outages(self):
+        async def fail():
+            raise ESConnectionError("connection refused")
+
+        with self.assertRaises(ESUnavailable):
+            self.call(fail())
+
+    def test_other_errors_pass_through_and_count_as_healthy(self):
+        async def fail():
+            raise ValueError("bad query")
+
+        with self.assertRaises(ValueError):
+            self.call(fail())
+        self.assertEqual(get_breaker().state, CLOSED)
+
+
+class ServerErrorTests(NewsAPITestCase):
+    def test_exception_text_never_reaches_the_client(self):
+        secret = "index prothomalo_politics_v7 at 10.0.0.5:9200 rejected the query"
+        self.es.get.side_effect = ValueError(secret)
+
+        for path in ("/api/news/", "/api/news/search/?q=নির্বাচন", "/api/news/stats/",
+                     "/api/news/suggest/?q=নির্বা", "/api/news/related/?url=https://example.com/a"):
+            self.search_results = [ValueError(secret), ValueError(secret)]  # search and facets
+            with self.subTest(path=path), self.assertLogs("news.views", "ERROR") as logs:
+                response = self.client.get(path)
+
+                self.assertEqual(response.status_code, 500)
+                self.assertEqual(response.json(), {"error": "Internal server error"})
+                self.assertNotIn(secret.encode(), response.content)
+                self.assertIn(secret, "\n".join(logs.output))
+
+
+class StaleFallbackTests(NewsAPITestCase):
+    def test_last_good_response_is_served_during_an_outage(self):
+        self.search_results = [search_response(ARTICLE), ESConnectionError("connection refused")]
+        good = self.client.get("/api/news/")
+        caches["default"].clear()  # response cache and freshness token expire
+
+        stale = self.client.get("/api/news/")
+
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale.content, good.content)
+        self.assertEqual(stale["X-Cache-Status"], "STALE")
+        self.assertIn("Age", stale)
+
+    def test_503_without_a_snapshot(self):
+        self.search_results = [ESConnectionError("connection refused")]
+
+        response = self.client.get("/api/news/")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response)
+        self.assertNotIn(b"connection refused", response.content)
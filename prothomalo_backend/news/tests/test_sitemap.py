@@ -0,0 +1,122 @@
+import gzip
+import io
+from datetime import date
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from sitemap import SitemapDiscovery, date_in_url, iter_sitemap, section_pattern
+
+BASE_URL = "https://www.prothomalo.com"
+INDEX_URL = f"{BASE_URL}/sitemap.xml"
+
+
+def sitemap_index(*entries):
+    items = "".join(
+        f"<sitemap><loc>{loc}</loc>{f'<lastmod>{lastmod}</lastmod>' if lastmod else ''}</sitemap>"
+        for loc, lastmod in entries
+    )
+    return f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{items}</sitemapindex>'
+
+
+def urlset(*entries):
+    items = "".join(
+        f"<url><loc>{loc}</loc><news:news><news:publication_date>{published}</news:publication_date>"
+        f"</news:news></url>"
+        for loc, published in entries
+    )
+    return ('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+            f'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">{items}</urlset>')
+
+
+class FakeSession:
+    """Serves sitemap documents by URL (gzipped for .gz URLs)."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.requested = []
+        self.closed = []
+
+    def get(self, url, stream=False, timeout=None):
+        self.requested.append(url)
+        body = self.documents[url].encode()
+        response = mock.Mock()
+        response.raw = io.BytesIO(gzip.compress(body) if url.endswith(".gz") else body)
+        response.close.side_effect = lambda: self.closed.append(url)
+        return response
+
+
+class HelperTests(SimpleTestCase):
+    def test_date_in_url(self):
+        self.assertEqual(date_in_url(f"{BASE_URL}/sitemap/sitemap-daily-2024-05-01.xml"), date(2024, 5, 1))
+        self.assertEqual(date_in_url(f"{BASE_URL}/sitemap/2024/05/01.xml"), date(2024, 5, 1))
+        self.assertIsNone(date_in_url(f"{BASE_URL}/sitemap/sitemap-2024-13-01.xml"))
+        self.assertIsNone(date_in_url(f"{BASE_URL}/sitemap/news.xml"))
+
+    def test_section_pattern(self):
+        pattern = section_pattern(f"{BASE_URL}/", ["politics", "/bangladesh/"])
+
+        self.assertTrue(pattern.match(f"{BASE_URL}/politics/abc"))
+        self.assertTrue(pattern.match(f"{BASE_URL}/bangladesh/abc"))
+        self.assertFalse(pattern.match(f"{BASE_URL}/sports/abc"))
+        self.assertFalse(pattern.match(f"{BASE_URL}/politics/"))
+
+
+class IterSitemapTests(SimpleTestCase):
+    def test_entries_are_streamed_with_their_days(self):
+        url = f"{BASE_URL}/sitemap-2024-05-01.xml.gz"
+        session = FakeSession({url: urlset((f"{BASE_URL}/politics/a", "2024-05-01T10:00:00+06:00"),
+                                           (f"{BASE_URL}/politics/b", "not a date"))})
+
+        entries = list(iter_sitemap(session, url))
+
+        self.assertEqual(entries, [("url", f"{BASE_URL}/politics/a", date(2024, 5, 1)),
+                                   ("url", f"{BASE_URL}/politics/b", None)])
+        self.assertEqual(session.closed, [url])
+
+    def test_response_is_closed_when_reading_stops_early(self):
+        session = FakeSession({INDEX_URL: sitemap_index((f"{BASE_URL}/a.xml", None), (f"{BASE_URL}/b.xml", None))})
+
+        entries = iter_sitemap(session, INDEX_URL)
+        self.assertEqual(next(entries), ("sitemap", f"{BASE_URL}/a.xml", None))
+        entries.close()
+
+        self.assertEqual(session.closed, [INDEX_URL])
+
+
+class SitemapDiscoveryTests(SimpleTestCase):
+    def setUp(self):
+        self.may_first = f"{BASE_URL}/sitemap/sitemap-daily-2024-05-01.xml"
+        self.may_second = f"{BASE_URL}/sitemap/sitemap-daily-2024-05-02.xml"
+        self.nested = f"{BASE_URL}/sitemap/news.xml"
+        self.session = FakeSession({
+            INDEX_URL: sitemap_index(
+                (f"{BASE_URL}/sitemap/sitemap-daily-2024-04-30.xml", None),
+                (self.may_first, None),
+                (self.may_second, None),
+                (f"{BASE_URL}/sitemap/archive.xml", "2024-01-01"),
+                (self.nested, "2024-06-01"),
+            ),
+            self.may_first: urlset((f"{BASE_URL}/politics/a", "2024-05-01"),
+                                   (f"{BASE_URL}/sports/b", "2024-05-01")),
+            self.nested: sitemap_index((self.may_second, None), (f"{BASE_URL}/sitemap/sitemap-daily-2024-06-01.xml", None)),
+            self.may_second: urlset((f"{BASE_URL}/politics/c", "2024-05-02"),
+                                    (f"{BASE_URL}/politics/d", "2024-04-20")),
+        })
+        self.throttle = mock.Mock()
+        self.discovery = SitemapDiscovery(self.session, BASE_URL, index_url=INDEX_URL, sections=["politics"],
+                                          since=date(2024, 5, 1), until=date(2024, 5, 31), throttle=self.throttle)
+
+    def test_sitemaps_outside_the_window_are_skipped(self):
+        self.assertEqual(self.discovery.sitemaps(), [self.may_first, self.may_second, self.nested])
+
+    def test_urls_are_filtered_by_section_and_day(self):
+        self.assertEqual(list(self.discovery.urls(self.may_first)), [f"{BASE_URL}/politics/a"])
+
+    def test_nested_indexes_are_followed(self):
+        self.assertEqual(list(self.discovery.urls(self.nested)), [f"{BASE_URL}/politics/c"])
+        self.assertEqual(self.session.requested, [self.nested, self.may_second])
+        self.assertEqual(self.throttle.call_count, 2)
+
+    def test_key_covers_the_settings(self):
+        self.assertEqual(self.discovery.key, f"{INDEX_URL}|politics|2024-05-01|2024-05-31")
@@ -0,0 +1,85 @@
+from django.test import SimpleTestCase
+
+from storage import SQLiteStore
+
+from .helpers import TempDirMixin, make_article
+
+
+class SQLiteStoreTests(TempDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.store = SQLiteStore(self.path("articles.sqlite3"))
+        self.addCleanup(self.store.close)
+        self.store.open()
+
+    def urls(self, result):
+        return [article["url"] for article in result["articles"]]
+
+    def test_bengali_words_are_not_split_at_vowel_signs(self):
+        self.store.bulk_index_articles([
+            make_article("https://example.com/1", "2025-01-01 10:00", "জাতীয় নির্বাচন কমিশন"),
+            make_article("https://example.com/2", "2025-01-01 11:00", "চন্দ্রযান উৎক্ষেপণ"),
+        ])
+
+        self.assertEqual(self.urls(self.store.search_articles("নির্বাচন")), ["https://example.com/1"])
+        # "চন" ends নির্বাচন; only a word starting with it may match
+        self.assertEqual(self.urls(self.store.search_articles("চন")), ["https://example.com/2"])
+        # Query terms match as prefixes
+        self.assertEqual(self.urls(self.store.search_articles("নির্বা")), ["https://example.com/1"])
+
+    def test_zero_width_joiners_do_not_affect_matching(self):
+        self.store.bulk_index_articles([
+            make_article("https://example.com/1", "2025-01-01 10:00", "র\u200dযাব অভিযান"),
+        ])
+
+        self.assertEqual(self.urls(self.store.search_articles("রযাব")), ["https://example.com/1"])
+        self.assertEqual(self.urls(self.store.search_articles("র\u200cযাব")), ["https://example.com/1"])
+
+    def test_keyset_pagination_visits_every_article_once(self):
+        # Two pairs share a published_at, so pages must break ties by URL
+        dates = ["2025-01-03 09:00", "2025-01-02 09:00", "2025-01-02 09:00",
+                 "2025-01-01 09:00", "2025-01-01 09:00"]
+        articles = [make_article(f"https://example.com/{i}", date) for i, date in enumerate(dates)]
+        self.store.bulk_index_articles(articles)
+
+        seen, search_after = [], None
+        while True:
+            page = self.store.search_articles(size=2, profile="list", search_after=search_after)
+            self.assertEqual(page["total_hits"], 5)
+            if not page["articles"]:
+                break
+            seen.extend(self.urls(page))
+            search_after = page["next_search_after"]
+
+        by_url = sorted(articles, key=lambda article: article["url"])
+        expected = sorted(by_url, key=lambda article: article["published_at"], reverse=True)
+        self.assertEqual(seen, [article["url"] for article in expected])
+
+    def test_zero_word_count_bound_is_applied(self):
+        self.store.bulk_index_articles([
+            make_article("https://example.com/empty", "2025-01-01 10:00", ""),
+            make_article("https://example.com/full", "2025-01-01 11:00", "এক দুই তিন"),
+        ])
+
+        self.assertEqual(self.urls(self.store.search_articles(max_word_count=0)), ["https://example.com/empty"])
+
+
+    def test_undated_articles_sort_last_and_keep_paging(self):
+        dates = ["2025-01-02 09:00", None, "2025-01-01 09:00", None, None]
+        articles = [make_article(f"https://example.com/{i}", date) for i, date in enumerate(dates)]
+        self.store.bulk_index_articles(articles)
+
+        for sort_order in ("desc", "asc"):
+            seen, search_after = [], None
+            while True:
+                page = self.store.search_articles(size=2, profile="list", sort_order=sort_order,
+                                                  search_after=search_after)
+                if not page["articles"]:
+                    break
+                seen.extend(self.urls(page))
+                search_after = page["next_search_after"]
+
+            dated = ["https://example.com/0", "https://example.com/2"]
+            if sort_order == "asc":
+                dated.reverse()
+            self.assertEqual(seen, dated + ["https://example.com/1", "https://example.com/3", "https://example.com/4"])
@@ -0,0 +1,83 @@
+from django.test import SimpleTestCase
+
+from es_queries import build_suggest_body, format_suggest_response
+from index_mappings import SUGGEST_MAX_INPUTS, build_suggest
+
+from .helpers import NewsAPITestCase
+
+
+def suggest_response(headlines=(), authors=()):
+    return {
+        "took": 1,
+        "hits": {"total": {"value": 0}, "hits": []},
+        "suggest": {
+            "headlines": [{"options": [{"text": h, "_source": {"headline": h, "url": f"https://example.com/{n}"}}
+                                       for n, h in enumerate(headlines)]}],
+            "authors": [{"options": [{"text": a} for a in authors]}],
+        },
+    }
+
+
+class BuildSuggestTests(SimpleTestCase):
+    def test_headline_suffixes_and_author(self):
+        entries = build_suggest("ঢাকায় নির্বাচন কমিশনের বৈঠক", " নিজস্ব প্রতিবেদক ", "2025-01-02 10:00")
+
+        headline, author = entries
+        self.assertEqual(headline["input"], ["ঢাকায় নির্বাচন কমিশনের বৈঠক", "নির্বাচন কমিশনের বৈঠক",
+                                             "কমিশনের বৈঠক", "বৈঠক"])
+        self.assertEqual(headline["contexts"], {"kind": ["headline"]})
+        self.assertEqual(author, {"input": ["নিজস্ব প্রতিবেদক"], "weight": 1, "contexts": {"kind": ["author"]}})
+
+    def test_newer_articles_weigh_more(self):
+        older = build_suggest("শিরোনাম", None, "2025-01-01 10:00")[0]["weight"]
+        newer = build_suggest("শিরোনাম", None, "2025-01-02 08:00")[0]["weight"]
+
+        self.assertEqual(newer, older + 1)
+        self.assertEqual(build_suggest("শিরোনাম", None, None)[0]["weight"], 1)
+
+    def test_long_headlines_are_capped(self):
+        headline = " ".join(f"শব্দ{n}" for n in range(20))
+
+        self.assertEqual(len(build_suggest(headline, None, None)[0]["input"]), SUGGEST_MAX_INPUTS)
+
+    def test_placeholders_are_skipped(self):
+        self.assertEqual(build_suggest("Headline not found", "Author not found", None), [])
+
+
+class SuggestBodyTests(SimpleTestCase):
+    def test_completion_only_request(self):
+        body = build_suggest_body("নির্বা", size=3)
+
+        self.assertEqual(body["size"], 0)
+        self.assertNotIn("query", body)
+        self.assertEqual(body["suggest"]["headlines"]["completion"]["contexts"], {"kind": ["headline"]})
+        self.assertEqual(body["suggest"]["authors"]["completion"]["size"], 3)
+        self.assertTrue(body["suggest"]["authors"]["completion"]["skip_duplicates"])
+
+    def test_response_formatting(self):
+        result = format_suggest_response(suggest_response(["নির্বাচন কমিশন"], ["নিজস্ব প্রতিবেদক"]))
+
+        self.assertEqual(result, {
+            "headlines": [{"headline": "নির্বাচন কমিশন", "url": "https://example.com/0"}],
+            "authors": ["নিজস্ব প্রতিবেদক"],
+        })
+        self.assertEqual(format_suggest_response({}), {"headlines": [], "authors": []})
+
+
+class NewsSuggestViewTests(NewsAPITestCase):
+    def test_hot_prefixes_are_answered_from_memory(self):
+        self.search_results = [suggest_response(["নির্বাচন কমিশন"])]
+
+        first = self.client.get("/api/news/suggest/?q=নির্বা")
+        second = self.client.get("/api/news/suggest/?q=নির্বা  &size=5")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(len(self.search_bodies()), 1)
+        self.assertIn("max-age=30", first["Cache-Control"])
+
+    def test_prefix_and_size_are_validated(self):
+        for query in ("", "?q=", "?q=" + "ক" * 51, "?q=ক&size=11"):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f"/api/news/suggest/{query}").status_code, 400)
+        self.assertEqual(self.search_bodies(), [])
@@ -0,0 +1,120 @@
+import json
+from datetime import datetime
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from scraper import ProthomAloScraperEnhanced
+from trending import TrendingTerms, extract_terms
+
+from .helpers import TempDirMixin, make_article, make_scraper
+
+
+class TrendingTermsTests(TempDirMixin, SimpleTestCase):
+    RECENT_HOURS = 2
+    BASELINE_HOURS = 4
+
+    def open_terms(self, snapshot_path=None):
+        terms = TrendingTerms(self.path("counts.cms"), snapshot_path=snapshot_path,
+                              recent_hours=self.RECENT_HOURS, baseline_hours=self.BASELINE_HOURS)
+        self.addCleanup(terms.close)
+        return terms
+
+    def hour_string(self, terms, hours_ago):
+        return datetime.fromtimestamp((terms.current_hour - hours_ago) * 3600).strftime("%Y-%m-%d %H:%M")
+
+    def assertWindowSums(self, terms):
+        recent, baseline = terms.recent.copy(), terms.baseline.copy()
+        terms._sum_windows()
+        self.assertTrue((terms.recent == recent).all())
+        self.assertTrue((terms.baseline == baseline).all())
+
+    def test_incremental_window_sums_match_the_hourly_slots(self):
+        terms = self.open_terms()
+        terms.add_articles([
+            make_article(f"https://example.com/{hours_ago}", self.hour_string(terms, hours_ago),
+                         headline="বন্যা পরিস্থিতি")
+            for hours_ago in range(6)
+        ])
+        self.assertWindowSums(terms)
+
+        for _ in range(7):
+            terms.advance(terms.current_hour + 1)
+            self.assertWindowSums(terms)
+
+    def test_counts_are_kept_per_window(self):
+        terms = self.open_terms()
+        [flood], [election] = extract_terms("বন্যা"), extract_terms("নির্বাচন")
+        terms.add_articles(
+            [make_article(f"https://example.com/new/{i}", self.hour_string(terms, 0), headline="বন্যা")
+             for i in range(4)]
+            + [make_article(f"https://example.com/old/{i}", self.hour_string(terms, 4), headline="নির্বাচন")
+               for i in range(4)]
+        )
+
+        trending = [entry["term"] for entry in terms.score("headline", [flood, election])]
+        self.assertEqual(trending, [flood])
+
+        # Once the burst has moved into the baseline window nothing trends
+        terms.advance(terms.current_hour + self.RECENT_HOURS)
+        self.assertEqual(terms.score("headline", [flood, election]), [])
+
+    def test_counts_are_locked_by_one_process(self):
+        self.open_terms()
+
+        with self.assertRaises(RuntimeError):
+            self.open_terms()
+
+    def test_quiet_hours_are_rescored_once(self):
+        snapshot_path = self.path("trending.json")
+        terms = self.open_terms(snapshot_path)
+        [flood] = extract_terms("বন্যা")
+        terms.update_batch([make_article(f"https://example.com/{i}", self.hour_string(terms, 0), headline="বন্যা")
+                            for i in range(4)])
+        self.assertEqual([entry["term"] for entry in terms.top["headline"]], [flood])
+
+        self.assertFalse(terms.tick(terms.current_hour))
+        self.assertTrue(terms.tick(terms.current_hour + self.RECENT_HOURS))
+        self.assertFalse(terms.tick(terms.current_hour))
+
+        with open(snapshot_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["fields"]["headline"], [])
+
+
+class ScraperTrendingTests(SimpleTestCase):
+    def setUp(self):
+        self.scraper = make_scraper(None, TRENDING_ENABLED=True, TRENDING_RETRY_INTERVAL=600)
+        self.scraper.trending = None
+        self.scraper._trending_retry_at = 0.0
+        self.now = 1000.0
+        patcher = mock.patch("scraper.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_constructor_leaves_the_counts_unopened(self):
+        with mock.patch("scraper.TrendingTerms") as engine:
+            scraper = ProthomAloScraperEnhanced()
+
+        engine.assert_not_called()
+        self.assertIn(scraper._count_trending, scraper.batch_listeners)
+
+    def test_counts_open_with_the_first_batch(self):
+        with mock.patch("scraper.TrendingTerms") as engine:
+            self.scraper._count_trending([{"url": "https://example.com/a"}])
+            self.scraper._count_trending([{"url": "https://example.com/b"}])
+
+        engine.assert_called_once_with()
+        self.assertEqual(engine.return_value.update_batch.call_count, 2)
+
+    def test_locked_counts_are_retried_later(self):
+        with mock.patch("scraper.TrendingTerms", side_effect=[RuntimeError("in use"), mock.Mock()]) as engine, \
+                self.assertLogs("scraper", "WARNING"):
+            self.assertFalse(self.scraper.refresh_trending())
+            self.scraper._count_trending([{"url": "https://example.com/a"}])
+            self.assertEqual(engine.call_count, 1)
+
+            self.now += 600
+            self.scraper._count_trending([{"url": "https://example.com/b"}])
+
+        self.assertEqual(engine.call_count, 2)
+        self.scraper.trending.update_batch.assert_called_once_with([{"url": "https://example.com/b"}])
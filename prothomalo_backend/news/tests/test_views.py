@@ -0,0 +1,112 @@
+from urllib.parse import parse_qs, urlparse
+
+from es_queries import build_statistics_body
+
+from news.pagination import decode_cursor, encode_cursor
+
+from .helpers import NewsAPITestCase, make_article, search_response
+
+FACETS = {
+    "aggregations": {
+        "authors": {"buckets": [{"key": "নিজস্ব প্রতিবেদক", "doc_count": 2}]},
+        "locations": {"buckets": [{"key": "ঢাকা", "doc_count": 2}]},
+        "published": {"buckets": [{"key_as_string": "2025-01-01", "doc_count": 2}]},
+    }
+}
+
+
+def articles(count):
+    return [make_article(f"https://example.com/{n}", f"2025-01-0{n + 1} 10:00") for n in range(count)]
+
+
+class NewsSearchViewTests(NewsAPITestCase):
+    def test_first_page_has_results_facets_and_next_link(self):
+        self.search_results = [search_response(*articles(2), total=5), FACETS]
+
+        response = self.client.get("/api/news/search/?q=নির্বাচন&author=নিজস্ব প্রতিবেদক&page_size=2")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["count"], 5)
+        self.assertEqual([a["url"] for a in data["results"]],
+                         ["https://example.com/0", "https://example.com/1"])
+        self.assertEqual(data["facets"]["author"], [{"value": "নিজস্ব প্রতিবেদক", "count": 2}])
+        self.assertEqual(data["facets"]["published"], [{"value": "2025-01-01", "count": 2}])
+
+        cursor = parse_qs(urlparse(data["next"]).query)["cursor"][0]
+        self.assertEqual(decode_cursor(cursor), ["2025-01-02 10:00", "https://example.com/1"])
+
+        search, facets = self.search_bodies()
+        self.assertEqual(search["size"], 2)
+        self.assertEqual(search["_source"], ["url", "headline", "author", "location",
+                                             "published_at", "excerpt", "word_count"])
+        # Facets count the filtered result set without fetching hits
+        self.assertEqual(facets["size"], 0)
+        self.assertEqual(facets["query"], search["query"])
+
+    def test_later_pages_skip_facets_and_last_page_has_no_next(self):
+        self.search_results = [search_response(*articles(1), total=3)]
+        cursor = encode_cursor(["2025-01-02 10:00", "https://example.com/1"])
+
+        response = self.client.get(f"/api/news/search/?page_size=2&cursor={cursor}")
+
+        data = response.json()
+        self.assertNotIn("facets", data)
+        self.assertIsNone(data["next"])
+        (search,) = self.search_bodies()
+        self.assertEqual(search["search_after"], ["2025-01-02 10:00", "https://example.com/1"])
+
+    def test_sort_and_facet_overrides(self):
+        self.search_results = [search_response(), FACETS]
+
+        self.client.get("/api/news/search/?sort=word_count&facets=true&interval=month&cursor="
+                        + encode_cursor([10, "https://example.com/1"]))
+
+        search, facets = self.search_bodies()
+        self.assertEqual(search["sort"][0], {"word_count": {"order": "asc"}})
+        self.assertEqual(facets["aggs"]["published"]["date_histogram"]["calendar_interval"], "month")
+
+    def test_invalid_parameters_are_rejected_before_es(self):
+        for query in ("sort=headline", "page_size=0", "cursor=not-a-cursor", "start_date=yesterday"):
+            with self.subTest(query=query):
+                response = self.client.get(f"/api/news/search/?{query}")
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.search_bodies(), [])
+
+
+class NewsStatsViewTests(NewsAPITestCase):
+    def test_statistics_are_formatted(self):
+        self.search_results = [{
+            "hits": {"total": {"value": 12}},
+            "aggregations": {
+                "authors": {"buckets": [{"key": "নিজস্ব প্রতিবেদক", "doc_count": 7}]},
+                "unique_authors": {"value": 4},
+                "locations": {"buckets": [{"key": "ঢাকা", "doc_count": 9}]},
+                "word_count_stats": {"avg": 412.345, "min": 80, "max": 1200, "sum": 4948},
+                "latest_published": {"value_as_string": "2025-01-03 09:00"},
+                "articles_by_date": {"buckets": [{}, {}, {}]},
+            },
+        }]
+
+        response = self.client.get("/api/news/stats/")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["total_articles"], 12)
+        self.assertEqual(data["top_authors"], [{"author": "নিজস্ব প্রতিবেদক", "count": 7}])
+        self.assertEqual(data["word_count_stats"]["average"], 412.35)
+        self.assertEqual(data["articles_per_day"], 3)
+        self.assertEqual(self.search_bodies(), [build_statistics_body()])
+
+
+class NewsListViewTests(NewsAPITestCase):
+    def test_latest_cards(self):
+        self.search_results = [search_response(*articles(2))]
+
+        response = self.client.get("/api/news/")
+
+        self.assertEqual([a["url"] for a in response.json()],
+                         ["https://example.com/0", "https://example.com/1"])
+        (search,) = self.search_bodies()
+        self.assertEqual(search["sort"], [{"published_at": {"order": "desc"}}])
+        self.assertNotIn("content", search["_source"])
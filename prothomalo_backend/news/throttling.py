@@ -0,0 +1,38 @@
+from rest_framework.throttling import AnonRateThrottle
+
+from .responses import FastJSONResponse
+
+
+class ClientRateThrottle(AnonRateThrottle):
+    """
+    Per-client-IP throttle using the DRF "anon" rate.
+
+    Unlike AnonRateThrottle it never inspects request.user, which would load
+    the session synchronously inside the async news views.
+    """
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request)
+        }
+
+
+class SuggestRateThrottle(ClientRateThrottle):
+    """Separate, higher per-client budget for keystroke-driven autocomplete."""
+    scope = 'suggest'
+
+
+def throttle_response(request, throttle_class=ClientRateThrottle):
+    """Returns a 429 response if the client is over its rate, otherwise None."""
+    throttle = throttle_class()
+    if throttle.allow_request(request, None):
+        return None
+
+    wait = throttle.wait()
+    response = FastJSONResponse(
+        {"detail": f"Request was throttled. Expected available in {int(wait or 0)} seconds."},
+        status=429
+    )
+    if wait is not None:
+        response["Retry-After"] = str(int(wait))
+    return response
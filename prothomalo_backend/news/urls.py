@@ -1,6 +1,27 @@
 from django.urls import path
-from .views import NewsListAPIView
+from .caching import conditional_news_view
+from .resilience import stale_fallback
+from .views import (
+    MetricsView,
+    NewsListAPIView,
+    NewsRelatedAPIView,
+    NewsSearchAPIView,
+    NewsStatsAPIView,
+    NewsStreamAPIView,
+    NewsSuggestAPIView,
+    NewsTrendingAPIView,
+)
 
 urlpatterns = [
-    path('news/', NewsListAPIView.as_view(), name='news-list'),
+    path('news/', conditional_news_view(stale_fallback(NewsListAPIView.as_view())), name='news-list'),
+    path('news/search/', conditional_news_view(stale_fallback(NewsSearchAPIView.as_view())), name='news-search'),
+    path('news/stats/', conditional_news_view(stale_fallback(NewsStatsAPIView.as_view())), name='news-stats'),
+    path('news/related/', conditional_news_view(stale_fallback(NewsRelatedAPIView.as_view())), name='news-related'),
+    # Autocomplete keeps its own short-lived prefix cache
+    path('news/suggest/', stale_fallback(NewsSuggestAPIView.as_view()), name='news-suggest'),
+    # Live feed: streamed, so never wrapped in the response cache
+    path('news/stream/', NewsStreamAPIView.as_view(), name='news-stream'),
+    # Served from the scrapers' trending snapshot, never from ES
+    path('trending/', NewsTrendingAPIView.as_view(), name='news-trending'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
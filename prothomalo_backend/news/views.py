@@ -1,27 +1,315 @@
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
-from elasticsearch import Elasticsearch
+import asyncio
+import hashlib
+import logging
+from urllib.parse import quote
+
+import orjson
 from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.views import View
 
-class NewsListAPIView(APIView):
-    def get(self, request):
-        es = Elasticsearch(
-            hosts=[settings.ES_HOST],
-            basic_auth=(settings.ES_USER, settings.ES_PASSWORD),
-            verify_certs=False,
-        )
+from elasticsearch import NotFoundError
+
+from es_connector import get_async_es_client
+from index_mappings import SOURCE_PROFILES
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render_metrics
+from es_queries import (
+    build_facet_aggs,
+    build_query,
+    build_search_body,
+    build_statistics_body,
+    build_suggest_body,
+    format_facets,
+    format_search_response,
+    format_statistics,
+    format_suggest_response,
+)
+
+from .feed import get_feed_hub
+from .pagination import next_page_url
+from .resilience import ESUnavailable, es_call
+from .responses import FastJSONResponse
+from related import related_ids
+from trending import TrendingSnapshot
+
+from .serializers import (
+    RelatedParamsSerializer,
+    SearchParamsSerializer,
+    SuggestParamsSerializer,
+    TrendingParamsSerializer,
+)
+from .throttling import SuggestRateThrottle, throttle_response
+
+# Fields rendered by the frontend news cards; the full article body stays in ES.
+CARD_FIELDS = SOURCE_PROFILES["card"]
+
+# Latest top terms written by the scrapers (trending.py), kept in memory per worker
+TRENDING = TrendingSnapshot()
+
+logger = logging.getLogger(__name__)
+
+
+def server_error(request):
+    """Logs the exception being handled and returns a 500 that doesn't reveal it."""
+    logger.exception(f"Request to {request.path} failed")
+    return FastJSONResponse({"error": "Internal server error"}, status=500)
+
+
+class NewsListAPIView(View):
+    async def get(self, request):
+        # Process-wide pooled async client, reused across requests
+        es = get_async_es_client()
         try:
-            res = es.search(
-                index="prothomalo_politics",
+            res = await es_call(es.search(
+                index=settings.ES_INDEX,
                 body={
                     "size": 20,
                     "sort": [{"published_at": {"order": "desc"}}],
+                    "_source": CARD_FIELDS,
                     "query": {"match_all": {}}
                 }
-            )
+            ), "news-list")
             hits = res['hits']['hits']
             articles = [hit['_source'] for hit in hits]
-            return Response(articles)
-        except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return FastJSONResponse(articles)
+        except ESUnavailable:
+            raise  # handled by stale_fallback
+        except Exception:
+            return server_error(request)
+
+
+class NewsSearchAPIView(View):
+    """
+    Full-text search with filters, sorting, cursor pagination and facets.
+
+    Query parameters: q, author, location, start_date, end_date, min_word_count,
+    max_word_count, sort (e.g. -published_at), page_size, cursor, profile
+    (list/card/full), highlight, facets, interval (facet date histogram).
+    Results and facet counts are fetched from ES concurrently.
+    """
+    async def get(self, request):
+        params = SearchParamsSerializer(data=request.GET)
+        if not params.is_valid():
+            return FastJSONResponse(params.errors, status=400)
+        search_kwargs = params.to_search_kwargs()
+
+        want_facets = params.validated_data["facets"]
+        if want_facets is None:
+            want_facets = search_kwargs["search_after"] is None
+
+        es = get_async_es_client()
+        requests = [es_call(es.search(index=settings.ES_INDEX, body=build_search_body(**search_kwargs)),
+                            "news-search")]
+        if want_facets:
+            facet_filters = {
+                key: search_kwargs[key]
+                for key in ("query", "author", "location", "start_date", "end_date",
+                            "min_word_count", "max_word_count")
+            }
+            requests.append(es_call(es.search(
+                index=settings.ES_INDEX,
+                body={
+                    "size": 0,
+                    "query": build_query(**facet_filters),
+                    "aggs": build_facet_aggs(interval=params.validated_data["interval"])
+                }
+            ), "news-search"))
+
+        try:
+            responses = await asyncio.gather(*requests)
+        except ESUnavailable:
+            raise  # handled by stale_fallback
+        except Exception:
+            return server_error(request)
+
+        results = format_search_response(responses[0])
+        has_more = len(results["articles"]) == search_kwargs["size"]
+
+        data = {
+            "count": results["total_hits"],
+            "took": results["took"],
+            "next": next_page_url(request, results["next_search_after"]) if has_more else None,
+            "results": results["articles"],
+        }
+        if want_facets:
+            data["facets"] = format_facets(responses[1]["aggregations"])
+        return FastJSONResponse(data)
+
+
+class NewsStatsAPIView(View):
+    """Index-wide statistics: totals, top authors/locations and word counts."""
+    async def get(self, request):
+        es = get_async_es_client()
+        try:
+            res = await es_call(es.search(index=settings.ES_INDEX, body=build_statistics_body()), "news-stats")
+            return FastJSONResponse(format_statistics(res))
+        except ESUnavailable:
+            raise  # handled by stale_fallback
+        except Exception:
+            return server_error(request)
+
+
+class NewsSuggestAPIView(View):
+    """
+    Headline and author autocomplete: top prefix matches for ?q= (size 1-10).
+
+    Served by the in-memory completion suggester (mapping v5), which skips the
+    query phase entirely; hot prefixes are answered from the in-process cache
+    for NEWS_SUGGEST_CACHE_TTL seconds without contacting Elasticsearch.
+    """
+    async def get(self, request):
+        throttled = throttle_response(request, SuggestRateThrottle)
+        if throttled:
+            return throttled
+
+        params = SuggestParamsSerializer(data=request.GET)
+        if not params.is_valid():
+            return FastJSONResponse(params.errors, status=400)
+        prefix = params.validated_data["q"]
+        size = params.validated_data["size"]
+
+        # Prefixes may contain spaces and Bengali text; hash them into a safe key
+        digest = hashlib.sha1(f"{size}|{prefix}".encode()).hexdigest()
+        cache_key = f"news:suggest:{digest}"
+        content = cache.get(cache_key)
+
+        if content is None:
+            es = get_async_es_client()
+            try:
+                res = await es_call(es.search(index=settings.ES_INDEX, body=build_suggest_body(prefix, size)),
+                                    "news-suggest")
+            except ESUnavailable:
+                raise  # handled by stale_fallback
+            except Exception:
+                return server_error(request)
+            content = orjson.dumps(format_suggest_response(res))
+            cache.set(cache_key, content, settings.NEWS_SUGGEST_CACHE_TTL)
+
+        response = HttpResponse(content, content_type="application/json")
+        patch_cache_control(response, public=True, max_age=settings.NEWS_SUGGEST_CACHE_TTL)
+        return response
+
+
+class NewsRelatedAPIView(View):
+    """
+    Related articles for ?url=, precomputed at ingest (mapping v6).
+
+    One realtime get reads the article's stored related IDs and a single mget
+    fetches their cards; nothing is re-analyzed per request.
+    """
+    async def get(self, request):
+        params = RelatedParamsSerializer(data=request.GET)
+        if not params.is_valid():
+            return FastJSONResponse(params.errors, status=400)
+
+        es = get_async_es_client()
+        try:
+            article = await es_call(es.get(
+                index=settings.ES_INDEX,
+                id=quote(params.validated_data["url"], safe=""),
+                source_includes=["related"]
+            ), "news-related")
+            doc_ids = related_ids(article["_source"])
+            if not doc_ids:
+                return FastJSONResponse({"results": []})
+
+            res = await es_call(
+                es.mget(index=settings.ES_INDEX, body={"ids": doc_ids}, source_includes=CARD_FIELDS),
+                "news-related"
+            )
+            results = [doc["_source"] for doc in res["docs"] if doc.get("found")]
+            return FastJSONResponse({"results": results})
+        except NotFoundError:
+            return FastJSONResponse({"error": "Article not found"}, status=404)
+        except ESUnavailable:
+            raise  # handled by stale_fallback
+        except Exception:
+            return server_error(request)
+
+
+class NewsTrendingAPIView(View):
+    """
+    Top ?k= trending terms (1-100) in headlines or bodies (?field=).
+
+    The scrapers score terms as each batch is indexed and write the result
+    to the trending snapshot; this only slices the copy held in memory, which
+    is reloaded when the file changes, so Elasticsearch is never queried.
+    """
+    async def get(self, request):
+        throttled = throttle_response(request)
+        if throttled:
+            return throttled
+
+        params = TrendingParamsSerializer(data=request.GET)
+        if not params.is_valid():
+            return FastJSONResponse(params.errors, status=400)
+        field = params.validated_data["field"]
+
+        snapshot = TRENDING.get()
+        response = FastJSONResponse({
+            "field": field,
+            "updated_at": snapshot.get("updated_at"),
+            "recent_hours": snapshot.get("recent_hours"),
+            "baseline_hours": snapshot.get("baseline_hours"),
+            "terms": TRENDING.top(field, params.validated_data["k"]),
+        })
+        patch_cache_control(response, public=True, max_age=settings.NEWS_TRENDING_CACHE_MAX_AGE)
+        return response
+
+
+class MetricsView(View):
+    """This worker's metrics in the Prometheus text format."""
+    async def get(self, request):
+        return HttpResponse(render_metrics(), content_type=METRICS_CONTENT_TYPE)
+
+
+class NewsStreamAPIView(View):
+    """
+    Server-sent events stream of newly indexed articles.
+
+    Each event is a card-sized article summary pushed by the scrapers as soon
+    as a bulk batch is committed; no Elasticsearch query is made per client.
+    Reconnecting clients send Last-Event-ID (or ?last_event_id=) to receive
+    the events they missed, as long as they are still in the worker's buffer.
+    """
+    async def get(self, request):
+        throttled = throttle_response(request)
+        if throttled:
+            return throttled
+
+        last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+
+        response = StreamingHttpResponse(
+            self.stream(get_feed_hub(), last_event_id),
+            content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # don't let nginx hold events back
+        return response
+
+    async def stream(self, hub, last_event_id):
+        # Subscribe before replaying so nothing published in between is lost
+        client = hub.connect()
+        try:
+            yield b"retry: 3000\n\n"
+            # Highest hub sequence sent; queued copies of replayed frames are skipped
+            sent = 0
+            for sequence, frame in hub.replay(last_event_id):
+                sent = sequence
+                yield frame
+
+            while not (client.overflowed and client.queue.empty()):
+                try:
+                    sequence, frame = await asyncio.wait_for(
+                        client.queue.get(), timeout=settings.NEWS_FEED_HEARTBEAT
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if sequence > sent:
+                    sent = sequence
+                    yield frame
+        finally:
+            hub.disconnect(client)
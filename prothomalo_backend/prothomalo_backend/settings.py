@@ -10,11 +10,17 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Modules shared with the scrapers (es_connector, index_mappings) live in the repository root.
+REPO_ROOT = BASE_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -43,7 +49,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    'corsheaders.middleware.CorsMiddleware',  # Add at the top
+    'news.middleware.MetricsMiddleware',  # outermost, so timings cover every layer
+    'corsheaders.middleware.CorsMiddleware',
+    'news.middleware.CompressionMiddleware',  # br/gzip; runs last on the way out
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -128,6 +136,64 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
-ES_HOST = "http://localhost:9200"
-ES_USER = "elastic"
-ES_PASSWORD = "JvQhvZYl"
+# Elasticsearch connection settings (ES_HOST, ES_USER, ES_PASSWORD, pool size,
+# timeouts) are read from the environment by es_connector.py.
+ES_INDEX = "prothomalo_politics"
+
+# Throttle anonymous API clients so the backend shields Elasticsearch
+REST_FRAMEWORK = {
+    'DEFAULT_THROTTLE_CLASSES': [
+        'rest_framework.throttling.AnonRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '120/minute',
+        'suggest': '600/minute',
+    },
+}
+
+# Response caching for the news API (see news/caching.py)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'prothomalo-news',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+    # Last good response per URL, served while Elasticsearch is unavailable
+    # (see news/resilience.py); kept apart so response-cache culling can't evict it
+    'snapshots': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'prothomalo-news-snapshots',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
+
+NEWS_FRESHNESS_TTL = 5  # seconds between index freshness checks against ES
+NEWS_RESPONSE_CACHE_TTL = 300  # seconds a rendered response stays in the server cache
+NEWS_CACHE_MAX_AGE = 10  # Cache-Control max-age for clients
+NEWS_STALE_WHILE_REVALIDATE = 60  # Cache-Control stale-while-revalidate for clients
+
+# Elasticsearch outage handling (see news/resilience.py)
+NEWS_ES_DEADLINES = {  # seconds an endpoint waits for ES, including client retries
+    'news-list': 0.5,
+    'news-search': 1.5,
+    'news-stats': 2.0,
+    'news-related': 0.5,
+    'news-suggest': 0.2,
+    'freshness': 0.3,
+}
+NEWS_ES_DEFAULT_DEADLINE = 1.0
+NEWS_BREAKER_FAILURE_THRESHOLD = 5  # consecutive failures that open the breaker
+NEWS_BREAKER_RESET_TIMEOUT = 10  # seconds before a half-open probe
+NEWS_SNAPSHOT_TTL = 24 * 60 * 60  # seconds a last-good response can be served stale
+
+NEWS_SUGGEST_CACHE_TTL = 30  # seconds a hot autocomplete prefix is answered from memory
+NEWS_TRENDING_CACHE_MAX_AGE = 60  # Cache-Control max-age for /api/trending/
+
+# Live feed (/api/news/stream/)
+NEWS_FEED_BUFFER_SIZE = 1000  # recent events kept per worker for Last-Event-ID resume
+NEWS_FEED_CLIENT_QUEUE_SIZE = 256  # pending events per client before it is disconnected
+NEWS_FEED_HEARTBEAT = 15  # seconds between keep-alive comments on idle streams
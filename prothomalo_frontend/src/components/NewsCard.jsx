@@ -9,7 +9,7 @@ const NewsCard = ({ news }) => {
       <p className="text-gray-600 text-sm">
         {news.author} • {news.location} • {news.published_at}
       </p>
-      <p className="mt-2 text-justify">{news.content.slice(0, 300)}...</p>
+      <p className="mt-2 text-justify">{news.excerpt}</p>
     </div>
   );
 };
@@ -0,0 +1,362 @@
+"""
+Re-crawl scheduler for articles edited after publication.
+
+Indexed stories are revisited on a schedule that follows their age and how
+often they have changed: a story is rechecked after AGE_FRACTION of its age
+(so a two-hour-old story after 30 minutes, a ten-day-old one after two and
+a half days), clamped to [MIN_RECHECK, MAX_RECHECK]. Each observed change
+halves that interval for the story and each unchanged check stretches it,
+within [MIN_FACTOR, MAX_FACTOR]. Stories older than TRACK_DAYS leave the
+schedule.
+
+Rechecks are cheap when nothing changed:
+
+- Requests carry the ETag / Last-Modified validators of the previous
+  response, so an unchanged page can be answered with an empty 304.
+- Otherwise the page is parsed and the stored content hash (headline,
+  author, location, date and body) decides whether anything changed.
+
+A page whose headline, author, date or body could not be parsed (an error
+page or a layout change) counts as a failed check, never as an edit.
+Changed articles are written back with partial updates, which set
+last_updated (see ProthomAloScraperEnhanced.bulk_update_articles); an
+article's new hash and validators are only stored once its own update
+succeeded, so a failed write is retried at the next check.
+
+The schedule is a heap of (due time, URL) over per-URL state, saved as JSON
+in RECRAWL_STATE. New articles join it from the index (sync), whichever
+process indexed them. The crawl daemon rechecks up to RECRAWL_PER_CYCLE due
+articles per cycle.
+
+Usage:
+    python scraper.py --daemon
+    python scraper.py --recrawl 200
+"""
+
+import hashlib
+import heapq
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from elasticsearch import helpers
+
+from embeddings import embed_articles
+
+logger = logging.getLogger(__name__)
+
+RECRAWL_STATE_FILE = os.environ.get("RECRAWL_STATE", "recrawl_state.json")
+RECRAWL_PER_CYCLE = int(os.environ.get("RECRAWL_PER_CYCLE", "20"))  # rechecks per daemon cycle
+TRACK_DAYS = int(os.environ.get("RECRAWL_TRACK_DAYS", "90"))  # older stories are no longer rechecked
+MIN_RECHECK = 15 * 60  # seconds
+MAX_RECHECK = 30 * 24 * 3600
+AGE_FRACTION = 0.25  # recheck after this fraction of the article's age
+CHANGED_FACTOR = 0.5  # interval multiplier after a change...
+UNCHANGED_FACTOR = 1.5  # ...and after an unchanged check
+MIN_FACTOR = 0.25
+MAX_FACTOR = 4.0
+SYNC_OVERLAP = timedelta(minutes=10)  # re-read window for articles indexed late by other processes
+
+HASHED_FIELDS = ("headline", "author", "location", "published_at", "content")
+# Fields rewritten when a page changed; url and scraped_at stay as first indexed
+UPDATED_FIELDS = ("headline", "author", "location", "published_at", "content", "excerpt", "suggest", "word_count")
+# What parse_article_page fills in when a selector finds nothing
+PLACEHOLDERS = {"headline": "Headline not found", "author": "Author not found"}
+
+
+def content_hash(article: Dict[str, Any]) -> str:
+    """Digest of the scraped fields that editors change."""
+    payload = json.dumps([article.get(field) for field in HASHED_FIELDS], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def missing_fields(article: Dict[str, Any]) -> List[str]:
+    """Fields of a parsed page that came out as placeholders or empty."""
+    missing = [field for field, placeholder in PLACEHOLDERS.items() if article.get(field) == placeholder]
+    missing += [field for field in ("published_at", "content") if not article.get(field)]
+    return missing
+
+
+def _timestamp(published_at: Optional[str]) -> Optional[float]:
+    try:
+        return datetime.strptime(published_at, "%Y-%m-%d %H:%M").timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class RecrawlScheduler:
+    """Due times of tracked articles, with the validators and hash of their last version."""
+
+    def __init__(self, state_file: str = RECRAWL_STATE_FILE):
+        self.state_file = state_file
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.watermark: Optional[str] = None  # latest scraped_at synced from the index
+        self.heap: List[tuple] = []
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                state = json.load(f)
+            self.entries = state["entries"]
+            self.watermark = state.get("watermark")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable re-crawl state {self.state_file}: {e}")
+            return
+        self.heap = [(entry["due"], url) for url, entry in self.entries.items()]
+        heapq.heapify(self.heap)
+
+    def save(self) -> None:
+        tmp = f"{self.state_file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"watermark": self.watermark, "entries": self.entries}, f)
+        os.replace(tmp, self.state_file)
+
+    def interval(self, entry: Dict[str, Any], now: float) -> float:
+        """Seconds until the next check of an article."""
+        age = now - (entry["published"] or entry["tracked"])
+        return min(max(AGE_FRACTION * age * entry["factor"], MIN_RECHECK), MAX_RECHECK)
+
+    def _schedule(self, url: str, entry: Dict[str, Any], now: float) -> None:
+        entry["due"] = now + self.interval(entry, now)
+        heapq.heappush(self.heap, (entry["due"], url))
+
+    def track(self, article: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """Adds an indexed article to the schedule; returns False if it is known or too old."""
+        url = article["url"]
+        now = now or time.time()
+        published = _timestamp(article.get("published_at"))
+        if url in self.entries or (published and now - published > TRACK_DAYS * 86400):
+            return False
+        entry = {
+            "published": published,
+            "tracked": now,
+            "factor": 1.0,
+            "checks": 0,
+            "changes": 0,
+            "hash": content_hash(article),
+            "etag": None,
+            "last_modified": None,
+        }
+        self.entries[url] = entry
+        self._schedule(url, entry, now)
+        return True
+
+    def pop_due(self, limit: int, now: Optional[float] = None) -> List[str]:
+        """Takes up to `limit` URLs whose check is due, most overdue first."""
+        now = now or time.time()
+        urls = []
+        while self.heap and len(urls) < limit and self.heap[0][0] <= now:
+            due, url = heapq.heappop(self.heap)
+            entry = self.entries.get(url)
+            if entry is None or entry["due"] != due:
+                continue  # rescheduled or dropped since this heap entry was pushed
+            published = entry["published"] or entry["tracked"]
+            if now - published > TRACK_DAYS * 86400:
+                del self.entries[url]
+                continue
+            urls.append(url)
+        return urls
+
+    def record(self, url: str, changed: Optional[bool], now: Optional[float] = None, **fields) -> None:
+        """
+        Reschedules a checked article.
+
+        Args:
+            url: Article URL
+            changed: True/False for a completed check, None if the check failed
+            now: Check time (default: now)
+            **fields: New "hash", "etag" and "last_modified" values
+        """
+        entry = self.entries.get(url)
+        if entry is None:
+            return
+        now = now or time.time()
+        if changed is not None:
+            entry["checks"] += 1
+            if changed:
+                entry["changes"] += 1
+                entry["factor"] = max(MIN_FACTOR, entry["factor"] * CHANGED_FACTOR)
+            else:
+                entry["factor"] = min(MAX_FACTOR, entry["factor"] * UNCHANGED_FACTOR)
+        entry.update(fields)
+        self._schedule(url, entry, now)
+
+    def requeue(self, urls: List[str]) -> None:
+        """Puts popped but unchecked URLs back, still due."""
+        for url in urls:
+            entry = self.entries.get(url)
+            if entry is not None:
+                heapq.heappush(self.heap, (entry["due"], url))
+
+    def drop(self, url: str) -> None:
+        self.entries.pop(url, None)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class Recrawler:
+    """Runs due rechecks with a scraper's HTTP session and writes changes to the index."""
+
+    def __init__(self, scraper, scheduler: Optional[RecrawlScheduler] = None):
+        self.scraper = scraper
+        self.config = scraper.config
+        # An empty scheduler is falsy (__len__)
+        self.scheduler = scheduler if scheduler is not None else RecrawlScheduler(self.config.RECRAWL_STATE_FILE)
+
+    def sync(self) -> int:
+        """
+        Tracks articles indexed since the last sync (by any process).
+
+        Returns:
+            int: Number of newly tracked articles
+        """
+        filters = [{"range": {"published_at": {"gte": f"now-{TRACK_DAYS}d"}}}]
+        if self.scheduler.watermark:
+            since = datetime.fromisoformat(self.scheduler.watermark) - SYNC_OVERLAP
+            filters.append({"range": {"scraped_at": {"gte": since.isoformat()}}})
+
+        added = 0
+        watermark = self.scheduler.watermark
+        for hit in helpers.scan(
+            self.scraper.es_client,
+            index=self.config.ES_INDEX,
+            query={"query": {"bool": {"filter": filters}},
+                   "_source": ["url", "scraped_at", *HASHED_FIELDS]},
+            size=500
+        ):
+            article = hit["_source"]
+            if self.scheduler.track(article):
+                added += 1
+            scraped_at = article.get("scraped_at")
+            if scraped_at and (watermark is None or scraped_at > watermark):
+                watermark = scraped_at
+        self.scheduler.watermark = watermark
+        if added:
+            logger.info(f"Tracking {added} more articles for re-crawls ({len(self.scheduler)} in total)")
+        return added
+
+    def check(self, url: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Rechecks one article and reschedules it, unless it changed.
+
+        A changed article stays unscheduled until run_due has written it back
+        and records it with the returned fields.
+
+        Returns:
+            tuple: (re-scraped article, its new hash and validators) if it changed,
+                   otherwise None
+        """
+        entry = self.scheduler.entries[url]
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        stage = "recrawl"
+        started = time.perf_counter()
+        try:
+            response = self.scraper.session.get(url, headers=headers, timeout=10)
+            if response.status_code == 304:
+                self.scraper.run_stats.record("recrawl", time.perf_counter() - started, url)
+                self.scraper.run_stats.count("recrawl_unchanged")
+                self.scheduler.record(url, changed=False)
+                return None
+            if response.status_code in (404, 410):
+                # Unpublished story: stop checking, keep what was indexed
+                logger.warning(f"{url} is gone ({response.status_code}); no longer re-crawled")
+                self.scheduler.drop(url)
+                return None
+            response.raise_for_status()
+            fetched = time.perf_counter()
+            self.scraper.run_stats.record("recrawl", fetched - started, url, len(response.content))
+
+            stage = "parse"
+            article = self.scraper.parse_article_page(url, BeautifulSoup(response.content, "html.parser"))
+            self.scraper.run_stats.record("parse", time.perf_counter() - fetched, url)
+            missing = missing_fields(article)
+            if missing:
+                self.scraper.run_stats.record_failure("parse", "incomplete_page", url)
+                logger.warning(f"Re-crawl of {url} found no {', '.join(missing)}; keeping the indexed version")
+                self.scheduler.record(url, changed=None)
+                return None
+
+            fields = {
+                "hash": content_hash(article),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            if fields["hash"] != entry["hash"]:
+                self.scraper.run_stats.count("recrawl_changed")
+                return article, fields
+            self.scheduler.record(url, changed=False, **fields)
+            self.scraper.run_stats.count("recrawl_unchanged")
+            return None
+
+        except Exception as e:
+            self.scraper.run_stats.record_failure(stage, e, url)
+            logger.warning(f"Re-crawl of {url} failed: {e}")
+            self.scheduler.record(url, changed=None)
+            return None
+
+    def run_due(self, limit: int = RECRAWL_PER_CYCLE, stop_event=None) -> int:
+        """
+        Rechecks up to `limit` due articles and updates the changed ones.
+
+        Returns:
+            int: Number of articles updated
+        """
+        urls = self.scheduler.pop_due(limit)
+        changed = []
+        for i, url in enumerate(urls):
+            if stop_event is not None and stop_event.is_set():
+                self.scheduler.requeue(urls[i:])
+                break
+            result = self.check(url)
+            if result:
+                changed.append(result)
+            if i < len(urls) - 1:
+                if stop_event is not None:
+                    stop_event.wait(self.config.REQUEST_DELAY)
+                else:
+                    time.sleep(self.config.REQUEST_DELAY)
+
+        updated = 0
+        if changed:
+            articles = [article for article, _ in changed]
+            failed = {article["url"] for article in articles}
+            try:
+                if self.config.EMBEDDINGS_ENABLED:
+                    embed_articles(articles)
+                updates = []
+                for article in articles:
+                    fields = {field: article[field] for field in UPDATED_FIELDS}
+                    if self.config.EMBEDDINGS_ENABLED:
+                        fields["embedding"] = article.get("embedding")
+                    updates.append((article["url"], fields))
+                failed = self.scraper.bulk_update_articles(updates)
+            except Exception as e:
+                logger.error(f"Failed to update {len(articles)} edited articles: {e}")
+
+            for article, fields in changed:
+                if article["url"] in failed:
+                    # Keep the old hash and validators so the next check fetches and writes it again
+                    self.scheduler.record(article["url"], changed=None)
+                else:
+                    self.scheduler.record(article["url"], changed=True, **fields)
+                    updated += 1
+            if updated:
+                logger.info(f"Updated {updated} edited articles")
+        if urls:
+            logger.info(f"Re-crawled {len(urls)} articles, {len(changed)} changed")
+        self.scheduler.save()
+        return updated
+
@@ -0,0 +1,193 @@
+"""
+Precomputed related articles (mapping v6 "related" field).
+
+Each article stores its best matches as a short [{"id", "score"}] list, so an
+article page gets related stories with key lookups instead of running
+more_like_this per view. Lists are computed once per article when its bulk
+batch is committed: one msearch of more_like_this queries (which selects each
+document's most significant terms) covers the whole batch, and the new
+articles are also spliced into their neighbors' lists with scripted partial
+updates, keeping older articles' lists current incrementally.
+
+Batch members can only match each other once they are searchable, so the
+bulk requests feeding update_batch use refresh=BULK_REFRESH: each waits for
+the next scheduled refresh instead of forcing one per batch.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+from elasticsearch import helpers
+
+from es_connector import get_es_client
+
+logger = logging.getLogger(__name__)
+
+RELATED_SIZE = 5  # related articles kept per document
+BULK_REFRESH = "wait_for"  # refresh policy of bulk requests whose batches reach update_batch
+
+MORE_LIKE_THIS = {
+    "fields": ["headline", "content"],
+    "min_term_freq": 2,
+    "min_doc_freq": 2,
+    "max_query_terms": 25,
+    "minimum_should_match": "30%"
+}
+
+# Inserts params.entry into a document's related list if it ranks in the top params.size
+ADD_RELATED_SCRIPT = (
+    "List r = ctx._source.related == null ? new ArrayList() : ctx._source.related;"
+    " r.removeIf(e -> e.id == params.entry.id);"
+    " if (r.size() < params.size || r.get(r.size() - 1).score < params.entry.score) {"
+    "  r.add(params.entry);"
+    "  r.sort((a, b) -> Double.compare(b.score, a.score));"
+    "  while (r.size() > params.size) { r.remove(r.size() - 1); }"
+    "  ctx._source.related = r;"
+    " } else {"
+    "  ctx.op = 'noop';"
+    " }"
+)
+
+
+def build_related_query(index: str, doc_id: str, size: int = RELATED_SIZE) -> Dict[str, Any]:
+    """more_like_this search for an indexed document (the document itself is excluded)."""
+    return {
+        "size": size,
+        "_source": False,
+        "query": {
+            "more_like_this": {**MORE_LIKE_THIS, "like": [{"_index": index, "_id": doc_id}]}
+        }
+    }
+
+
+def related_ids(article: Dict[str, Any]) -> List[str]:
+    """Document IDs from an article's related list, best match first."""
+    return [entry["id"] for entry in article.get("related") or []]
+
+
+class RelatedArticlesUpdater:
+    """Batch listener that maintains the related lists of newly indexed articles."""
+
+    def __init__(self, index: str, size: int = RELATED_SIZE, es_client=None):
+        self.index = index
+        self.size = size
+        self._es_client = es_client
+
+    @property
+    def es_client(self):
+        # Shared process-wide client unless one was given explicitly
+        return self._es_client or get_es_client()
+
+    def update_batch(self, articles: List[Dict[str, Any]],
+                     propagate: bool = True, refresh: bool = False) -> bool:
+        """
+        Computes related lists for a committed batch of articles.
+
+        Args:
+            articles: Indexed articles (only "url" is used)
+            propagate: Also offer each article to its neighbors' lists
+            refresh: Refresh the index first so batch members can match each other
+                     (not needed if they were indexed with refresh=BULK_REFRESH)
+
+        Returns:
+            bool: True if the lists were written
+        """
+        if not articles:
+            return True
+
+        try:
+            doc_ids = [quote(article["url"], safe="") for article in articles]
+            if refresh:
+                self.es_client.indices.refresh(index=self.index)
+
+            searches = []
+            for doc_id in doc_ids:
+                searches.append({"index": self.index})
+                searches.append(build_related_query(self.index, doc_id, self.size))
+            responses = self.es_client.msearch(body=searches)["responses"]
+
+            own_updates = []
+            neighbor_updates = []
+            for doc_id, response in zip(doc_ids, responses):
+                if "error" in response:
+                    logger.warning(f"Related search failed for {doc_id}: {response['error']}")
+                    continue
+
+                related = [
+                    {"id": hit["_id"], "score": round(hit["_score"], 4)}
+                    for hit in response["hits"]["hits"]
+                ]
+                own_updates.append({
+                    "_op_type": "update",
+                    "_index": self.index,
+                    "_id": doc_id,
+                    "doc": {"related": related}
+                })
+
+                if propagate:
+                    for entry in related:
+                        neighbor_updates.append({
+                            "_op_type": "update",
+                            "_index": self.index,
+                            "_id": entry["id"],
+                            "retry_on_conflict": 3,
+                            "script": {
+                                "lang": "painless",
+                                "source": ADD_RELATED_SCRIPT,
+                                "params": {
+                                    "entry": {"id": doc_id, "score": entry["score"]},
+                                    "size": self.size
+                                }
+                            }
+                        })
+
+            # Own lists first so a neighbor update never gets overwritten by them
+            success, failed = helpers.bulk(
+                self.es_client,
+                own_updates + neighbor_updates,
+                raise_on_error=False
+            )
+            if failed:
+                logger.warning(f"Failed to update {len(failed)} related lists")
+            logger.info(f"Updated related articles for {len(own_updates)} documents")
+            return True
+
+        except Exception as e:
+            logger.error(f"Related articles update failed: {e}")
+            return False
+
+    def rebuild(self, batch_size: int = 500, query: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Recomputes related lists for every article (e.g. after migrating to v6).
+
+        Args:
+            batch_size: Articles per msearch/bulk round
+            query: Optional query restricting which articles are rebuilt
+
+        Returns:
+            bool: True if every batch was written
+        """
+        try:
+            hits = helpers.scan(
+                self.es_client,
+                index=self.index,
+                query={"query": query or {"match_all": {}}, "_source": ["url"]},
+                size=batch_size
+            )
+
+            ok = True
+            batch = []
+            for hit in hits:
+                batch.append(hit["_source"])
+                if len(batch) >= batch_size:
+                    # Every document gets its own list, so no propagation is needed
+                    ok = self.update_batch(batch, propagate=False, refresh=False) and ok
+                    batch = []
+            if batch:
+                ok = self.update_batch(batch, propagate=False, refresh=False) and ok
+            return ok
+
+        except Exception as e:
+            logger.error(f"Related articles rebuild failed: {e}")
+            return False
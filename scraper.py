@@ -8,36 +8,124 @@ New Features Added:
 - Advanced search with multiple parameters
 - Content filtering by date, author, location
 - Individual article retrieval and updates
+- Batched retrieval (mget) and multi-search (msearch)
+- Throttled bulk updates and update/delete by query
+- Versioned mappings with zero-downtime migration (see migrate_index.py)
+- Projection profiles (list/card/full) and opt-in highlighting
+- Headline/author autocomplete from a completion field (mapping v5)
+- Related articles precomputed at ingest (mapping v6, see related.py)
+- Document vectors computed at ingest and hybrid BM25 + kNN search (mapping v7, see embeddings.py)
+- Prometheus metrics for ES calls and pipeline stages (see metrics.py)
+- Per-stage run reports with throughput, percentiles and failures (see pipeline_stats.py)
+- Continuous crawl mode with adaptive polling (--daemon, see crawl_daemon.py)
+- Optional discovery of stories linked from articles (see frontier.py)
+- Pluggable storage: Elasticsearch or an embedded SQLite FTS5 database (see storage.py)
+- Live feed of indexed batches for the backend's SSE stream (article_feed.py)
+- Trending headline/body terms over rolling hourly windows (see trending.py)
+- Saved-search alerts percolated against each indexed batch (see alerts.py)
+- Scheduled re-crawls of indexed articles to pick up edits (--recrawl, see recrawl.py)
 - Bulk operations and analytics
 - Query building helpers
 - Data management utilities
 """
 
+import argparse
+import os
+import sys
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, quote
 import time
 from datetime import datetime, timedelta
-from elasticsearch import Elasticsearch, helpers
+from elasticsearch import helpers
 from elasticsearch.exceptions import NotFoundError, RequestError
 import logging
-from typing import Optional, Dict, List, Any, Union
+from typing import Optional, Dict, List, Any, Union, Iterable, Set, Tuple
 import json
 
+from alerts import SavedSearchAlerts
+from article_feed import FeedPublisher
+from bloom import BloomFilter
+from crawl_daemon import CrawlDaemon
+from embeddings import EmbeddingUpdater, embed_articles
+from es_connector import blocking_client, get_es_client
+from es_queries import (
+    build_query,
+    build_search_body,
+    build_suggest_body,
+    format_search_response,
+    format_suggest_response,
+    is_restrictive_query,
+)
+from frontier import URLFrontier, extract_story_links
+from index_mappings import (
+    CURRENT_MAPPING_VERSION,
+    build_excerpt,
+    build_suggest,
+    get_index_definition,
+    get_migration_script,
+    parse_index_version,
+    versioned_index_name,
+)
+from metrics import (
+    ARTICLES_INGESTED,
+    SCRAPER_QUEUE_DEPTH,
+    start_metrics_server,
+)
+from pipeline_stats import PipelineRun
+from recrawl import Recrawler
+from related import BULK_REFRESH as RELATED_BULK_REFRESH, RelatedArticlesUpdater, related_ids
+from sitemap import SECTIONS, section_pattern
+from storage import ElasticsearchStore, get_article_store
+from trending import TrendingTerms
+
+# search_articles keyword arguments accepted in a multi_search_articles specification
+SEARCH_PARAMETERS = frozenset({
+    "query", "author", "location", "start_date", "end_date", "min_word_count", "max_word_count",
+    "size", "sort_by", "sort_order", "headline", "profile", "highlight", "search_after", "mode",
+})
+
+# Rethrottle API of each throttled task type, by the end of its task action
+TASK_RETHROTTLE = {
+    "update/byquery": "update_by_query_rethrottle",
+    "delete/byquery": "delete_by_query_rethrottle",
+    "/reindex": "reindex_rethrottle",
+}
+
 # --- Configuration ---
 class Config:
     """Centralized configuration for the scraper."""
     BASE_URL = "https://www.prothomalo.com/"
     API_URL = "https://www.prothomalo.com/api/v1/collections/politics"
-    ES_HOST = "http://localhost:9200"
-    ES_USER = "elastic"
-    ES_PASSWORD = "JvQhvZYl"
-    ES_INDEX = "prothomalo_politics"
+    ES_INDEX = "prothomalo_politics"  # alias in front of the versioned index
     DEFAULT_MAX_PAGES = 2
     STORIES_PER_PAGE = 12
     REQUEST_DELAY = 1  # seconds between requests
     BULK_INDEX_SIZE = 100  # documents per bulk operation
     DEFAULT_SEARCH_SIZE = 20  # default number of search results
+    MAINTENANCE_SLICES = "auto"  # parallel slices for update/delete by query
+    MAINTENANCE_REQUESTS_PER_SECOND = 500  # throttle for by-query maintenance
+    TASK_POLL_INTERVAL = 5  # seconds between background task progress polls
+    MIGRATION_CATCH_UP_PASSES = 3  # max catch-up reindex passes before the alias swap
+    MIGRATION_CATCH_UP_MARGIN = 60  # seconds of overlap between catch-up passes
+    FEED_ENABLED = True  # publish indexed articles to the live feed (article_feed.py)
+    RELATED_ENABLED = True  # maintain precomputed related articles (related.py)
+    EMBEDDINGS_ENABLED = True  # compute document vectors for hybrid search (embeddings.py)
+    TRENDING_ENABLED = os.environ.get("SCRAPER_TRENDING", "1") == "1"  # count trending terms (trending.py)
+    TRENDING_RETRY_INTERVAL = 600  # seconds before retrying trending counts locked by another process
+    ALERTS_ENABLED = os.environ.get("SCRAPER_ALERTS", "1") == "1"  # percolate batches against saved searches (alerts.py)
+    METRICS_PORT = int(os.environ.get("SCRAPER_METRICS_PORT", "0"))  # /metrics listener, 0 disables
+    RUN_EVENTS_FILE = os.environ.get("SCRAPER_EVENTS_FILE")  # JSON-lines stage events, off if unset
+    RUN_REPORT_FILE = os.environ.get("SCRAPER_RUN_REPORT")  # JSON-lines end-of-run reports, off if unset
+    DISCOVER_LINKS = os.environ.get("SCRAPER_DISCOVER_LINKS", "0") == "1"  # follow story links in articles (frontier.py)
+    MAX_DISCOVERED_LINKS = 50  # discovered articles scraped per run or daemon cycle
+    SEEN_FILTER_FILE = os.environ.get("SCRAPER_SEEN_FILTER", "seen_urls.bloom")  # Bloom filter of known URLs
+    SEEN_FILTER_CAPACITY = 1_000_000
+    SEEN_FILTER_ERROR_RATE = float(os.environ.get("SCRAPER_SEEN_FILTER_FP", "0.001"))
+    ARTICLE_STORE = os.environ.get("ARTICLE_STORE", "elasticsearch")  # "elasticsearch" or "sqlite" (storage.py)
+    ARTICLE_DB = os.environ.get("ARTICLE_DB", "articles.sqlite3")  # database file of the sqlite store
+    RECRAWL_ENABLED = os.environ.get("SCRAPER_RECRAWL", "1") == "1"  # daemon rechecks indexed articles (recrawl.py)
+    RECRAWL_STATE_FILE = os.environ.get("RECRAWL_STATE", "recrawl_state.json")  # re-crawl schedule
 
 # --- Logging Setup ---
 logging.basicConfig(
@@ -56,6 +144,42 @@ class ProthomAloScraperEnhanced:
     def __init__(self):
         self.config = Config()
         self.es_client = None
+        # Where articles are indexed, fetched and searched
+        self.store = get_article_store(self.config.ES_INDEX, self.config.ARTICLE_STORE, self.config.ARTICLE_DB)
+        uses_elasticsearch = isinstance(self.store, ElasticsearchStore)
+        # Pooled HTTP session: keeps connections to the site warm across pages and cycles
+        self.session = requests.Session()
+        # Callables receiving each successfully indexed bulk batch
+        self.batch_listeners = []
+        if self.config.FEED_ENABLED:
+            self.batch_listeners.append(FeedPublisher().publish_batch)
+        self.related_updater = RelatedArticlesUpdater(self.config.ES_INDEX)
+        # Stage timings and failures; replaced with a fresh recorder per pipeline run
+        self.run_stats = PipelineRun()
+        if self.config.RELATED_ENABLED and uses_elasticsearch:
+            self.store.refresh = RELATED_BULK_REFRESH
+            self.batch_listeners.append(self.related_updater.update_batch)
+        # Saved searches matched against each new batch (percolator, so ES only)
+        self.alerts = SavedSearchAlerts()
+        if self.config.ALERTS_ENABLED and uses_elasticsearch:
+            self.batch_listeners.append(self.alerts.update_batch)
+        # Rolling term counts behind /api/trending/; works with any store. Opened
+        # with the first indexed batch, so only processes that ingest lock the file
+        self.trending = None
+        self._trending_retry_at = 0.0
+        if self.config.TRENDING_ENABLED:
+            self.batch_listeners.append(self._count_trending)
+        # Queue of same-site story links found in scraped articles
+        self.frontier = None
+        if self.config.DISCOVER_LINKS and uses_elasticsearch:
+            seen = BloomFilter(
+                self.config.SEEN_FILTER_FILE,
+                self.config.SEEN_FILTER_CAPACITY,
+                self.config.SEEN_FILTER_ERROR_RATE
+            )
+            self.frontier = URLFrontier(seen, get_es_client, self.config.ES_INDEX)
+            self.story_link_pattern = section_pattern(self.config.BASE_URL, SECTIONS)
+            self.batch_listeners.append(self.frontier.mark_batch_seen)
         self.bengali_to_english_digits = str.maketrans('০১২৩৪৫৬৭৮৯', '0123456789')
         self.bengali_months = {
             'জানুয়ারি': '01', 'ফেব্রুয়ারি': '02', 'মার্চ': '03', 'এপ্রিল': '04',
@@ -67,11 +191,8 @@ class ProthomAloScraperEnhanced:
         """Establishes connection to Elasticsearch with authentication."""
         try:
             logger.info("Connecting to Elasticsearch...")
-            self.es_client = Elasticsearch(
-                hosts=[self.config.ES_HOST],
-                basic_auth=(self.config.ES_USER, self.config.ES_PASSWORD),
-                verify_certs=False
-            )
+            # Shared, pooled client (connection settings live in es_connector.py)
+            self.es_client = get_es_client()
             
             if self.es_client.ping():
                 logger.info("Successfully connected to Elasticsearch")
@@ -84,53 +205,43 @@ class ProthomAloScraperEnhanced:
             logger.error(f"Failed to connect to Elasticsearch: {e}")
             return False
     
+    def open_storage(self) -> bool:
+        """Connects to the configured article store and creates its index or schema."""
+        if isinstance(self.store, ElasticsearchStore):
+            return self.connect_to_elasticsearch() and self.create_index_if_not_exists()
+        try:
+            self.store.open()
+            logger.info(f"Opened {self.store.name} article store")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to open {self.store.name} article store: {e}")
+            return False
+    
     def create_index_if_not_exists(self) -> bool:
-        """Creates the Elasticsearch index with proper mapping if it doesn't exist."""
+        """
+        Creates the versioned articles index behind the ES_INDEX alias if neither exists.
+        
+        Existing indices are left alone; if they use an older mapping version a
+        warning points at the migration command.
+        """
         try:
             if self.es_client.indices.exists(index=self.config.ES_INDEX):
                 logger.info(f"Index '{self.config.ES_INDEX}' already exists")
+                version = self.get_index_version()
+                if version is not None and version < CURRENT_MAPPING_VERSION:
+                    logger.warning(
+                        f"Index '{self.config.ES_INDEX}' uses mapping v{version}, latest is "
+                        f"v{CURRENT_MAPPING_VERSION}; run migrate_index.py to upgrade"
+                    )
                 return True
             
-            logger.info(f"Creating index '{self.config.ES_INDEX}' with custom mapping...")
-            
-            index_mapping = {
-                "settings": {
-                    "number_of_shards": 1,
-                    "number_of_replicas": 1,
-                    "analysis": {
-                        "analyzer": {
-                            "bengali_analyzer": {
-                                "type": "standard",
-                                "stopwords": "_none_"
-                            }
-                        }
-                    }
-                },
-                "mappings": {
-                    "properties": {
-                        "url": {"type": "keyword"},
-                        "headline": {
-                            "type": "text", 
-                            "analyzer": "bengali_analyzer",
-                            "fields": {
-                                "raw": {"type": "keyword"}
-                            }
-                        },
-                        "author": {"type": "text"},
-                        "location": {"type": "keyword"},
-                        "published_at": {"type": "date", "format": "yyyy-MM-dd HH:mm"},
-                        "content": {
-                            "type": "text", 
-                            "analyzer": "bengali_analyzer"
-                        },
-                        "scraped_at": {"type": "date"},
-                        "word_count": {"type": "integer"},
-                        "last_updated": {"type": "date"}
-                    }
-                }
-            }
+            index_name = versioned_index_name(self.config.ES_INDEX, CURRENT_MAPPING_VERSION)
+            logger.info(f"Creating index '{index_name}' with alias '{self.config.ES_INDEX}'...")
             
-            self.es_client.indices.create(index=self.config.ES_INDEX, body=index_mapping)
+            index_definition = get_index_definition(CURRENT_MAPPING_VERSION)
+            index_definition["aliases"] = {self.config.ES_INDEX: {}}
+            
+            self.es_client.indices.create(index=index_name, body=index_definition)
             logger.info("Index created successfully")
             return True
             
@@ -167,77 +278,116 @@ class ProthomAloScraperEnhanced:
     
     def scrape_single_article(self, url: str) -> Optional[Dict[str, Any]]:
         """Scrapes a single article from the given URL."""
+        stage = "fetch"
+        started = time.perf_counter()
         try:
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
+            fetched = time.perf_counter()
+            self.run_stats.record("fetch", fetched - started, url, len(response.content))
             
+            stage = "parse"
             soup = BeautifulSoup(response.content, "html.parser")
+            article_data = self.parse_article_page(url, soup)
+            finished = time.perf_counter()
+            self.run_stats.record("parse", finished - fetched, url)
+            self.run_stats.record_url(url, finished - started)
             
-            headline_tag = soup.select_one("h1.IiRps")
-            headline = headline_tag.get_text(strip=True) if headline_tag else "Headline not found"
-            
-            author_tag = soup.select_one("span.contributor-name._8TSJC")
-            author = author_tag.get_text(strip=True) if author_tag else "Author not found"
-            
-            location_tag = soup.select_one("span.author-location._8-umj")
-            location = location_tag.get_text(strip=True) if location_tag else "Location not found"
-            location = location.replace("Location: ", "").strip()
-            
-            date_tag = soup.select_one("div.time-social-share-wrapper span:first-child")
-            publication_date_raw = date_tag.get_text(strip=True) if date_tag else "Date not found"
-            publication_date_cleaned = publication_date_raw.split(":", 1)[-1].strip()
-            publication_date = self.parse_bengali_date(publication_date_cleaned)
-            
-            content_paragraphs = soup.select("div.story-content p")
-            content = "\n".join([p.get_text(strip=True) for p in content_paragraphs])
-            word_count = len(content.split()) if content else 0
-            
-            article_data = {
-                "url": url,
-                "headline": headline,
-                "author": author,
-                "location": location,
-                "published_at": publication_date,
-                "content": content,
-                "scraped_at": datetime.now().isoformat(),
-                "word_count": word_count,
-                "last_updated": datetime.now().isoformat()
-            }
+            if self.frontier is not None:
+                self.frontier.offer(extract_story_links(soup, url, self.story_link_pattern))
+                self.run_stats.record("links", time.perf_counter() - finished, url)
             
-            logger.info(f"Successfully scraped: {headline[:50]}...")
+            # Lazy %-formatting: skipped entirely unless debug logging is on
+            logger.debug("Successfully scraped: %.50s...", article_data["headline"])
             return article_data
             
         except Exception as e:
+            self.run_stats.record_failure(stage, e, url)
             logger.error(f"Error scraping {url}: {e}")
             return None
     
+    def parse_article_page(self, url: str, soup: BeautifulSoup) -> Dict[str, Any]:
+        """Builds the article document from a parsed article page."""
+        headline_tag = soup.select_one("h1.IiRps")
+        headline = headline_tag.get_text(strip=True) if headline_tag else "Headline not found"
+        
+        author_tag = soup.select_one("span.contributor-name._8TSJC")
+        author = author_tag.get_text(strip=True) if author_tag else "Author not found"
+        
+        location_tag = soup.select_one("span.author-location._8-umj")
+        location = location_tag.get_text(strip=True) if location_tag else "Location not found"
+        location = location.replace("Location: ", "").strip()
+        
+        date_tag = soup.select_one("div.time-social-share-wrapper span:first-child")
+        publication_date_raw = date_tag.get_text(strip=True) if date_tag else "Date not found"
+        publication_date_cleaned = publication_date_raw.split(":", 1)[-1].strip()
+        date_started = time.perf_counter()
+        publication_date = self.parse_bengali_date(publication_date_cleaned)
+        self.run_stats.record("date", time.perf_counter() - date_started, url)
+        if publication_date is None:
+            self.run_stats.record_failure("date", "unparsed_date", url)
+        
+        content_paragraphs = soup.select("div.story-content p")
+        content = "\n".join([p.get_text(strip=True) for p in content_paragraphs])
+        word_count = len(content.split()) if content else 0
+        
+        article_data = {
+            "url": url,
+            "headline": headline,
+            "author": author,
+            "location": location,
+            "published_at": publication_date,
+            "content": content,
+            "excerpt": build_excerpt(content),
+            "suggest": build_suggest(headline, author, publication_date),
+            "scraped_at": datetime.now().isoformat(),
+            "word_count": word_count,
+            "last_updated": datetime.now().isoformat()
+        }
+        return article_data
+    
+    def fetch_api_page(self, skip: int, limit: Optional[int] = None) -> List[str]:
+        """
+        Fetches one page of the collection API (newest stories first).
+        
+        Args:
+            skip: Number of stories to skip
+            limit: Stories per page (defaults to STORIES_PER_PAGE)
+            
+        Returns:
+            list: Article URLs on the page, empty past the end of the collection
+        """
+        params = {'skip': skip, 'limit': limit or self.config.STORIES_PER_PAGE}
+        started = time.perf_counter()
+        response = self.session.get(self.config.API_URL, params=params, timeout=10)
+        response.raise_for_status()
+        self.run_stats.record("api_page", time.perf_counter() - started, nbytes=len(response.content))
+        
+        urls = []
+        for story in response.json().get('items', []):
+            slug = story.get('story', {}).get('slug')
+            if slug:
+                urls.append(urljoin(self.config.BASE_URL, slug))
+        return urls
+    
     def get_article_urls_from_api(self, max_pages: int) -> List[str]:
         """Fetches article URLs from the Prothom Alo API."""
         article_urls = []
         
         for page_num in range(max_pages):
-            skip = page_num * self.config.STORIES_PER_PAGE
-            params = {'skip': skip, 'limit': self.config.STORIES_PER_PAGE}
-            
             try:
                 logger.info(f"Fetching page {page_num + 1}/{max_pages} from API...")
-                response = requests.get(self.config.API_URL, params=params, timeout=10)
-                response.raise_for_status()
-                
-                stories = response.json().get('items', [])
-                if not stories:
+                urls = self.fetch_api_page(page_num * self.config.STORIES_PER_PAGE)
+                if not urls:
                     logger.info("No more stories found, stopping pagination")
                     break
                 
-                for story in stories:
-                    slug = story.get('story', {}).get('slug')
-                    if slug:
-                        url = urljoin(self.config.BASE_URL, slug)
-                        article_urls.append(url)
+                article_urls.extend(urls)
                 
                 time.sleep(self.config.REQUEST_DELAY)
                 
             except Exception as e:
+                self.run_stats.record_failure("api_page", e)
                 logger.error(f"Error fetching API page {page_num + 1}: {e}")
                 break
         
@@ -274,33 +424,66 @@ class ProthomAloScraperEnhanced:
             logger.error(f"Failed to insert article: {e}")
             return False
     
+    def _notify_batch_listeners(self, articles: List[Dict[str, Any]]) -> None:
+        """Hands a committed bulk batch to every registered batch listener."""
+        for listener in self.batch_listeners:
+            try:
+                listener(articles)
+            except Exception as e:
+                logger.warning(f"Batch listener {listener} failed: {e}")
+    
+    def _open_trending(self) -> Optional[TrendingTerms]:
+        """The trending engine, opened on first use; None while disabled or locked elsewhere."""
+        if self.trending is None and self.config.TRENDING_ENABLED and time.monotonic() >= self._trending_retry_at:
+            try:
+                self.trending = TrendingTerms()
+            except (OSError, RuntimeError, ValueError) as e:
+                self._trending_retry_at = time.monotonic() + self.config.TRENDING_RETRY_INTERVAL
+                logger.warning(f"Trending terms skipped for {self.config.TRENDING_RETRY_INTERVAL}s: {e}")
+        return self.trending
+    
+    def _count_trending(self, articles: List[Dict[str, Any]]) -> None:
+        """Batch listener: counts an indexed batch into the trending terms."""
+        trending = self._open_trending()
+        if trending is not None:
+            trending.update_batch(articles)
+    
+    def refresh_trending(self) -> bool:
+        """
+        Rescores the trending terms once per hour, also when nothing was indexed.
+        
+        Returns:
+            bool: True if a new snapshot was written
+        """
+        trending = self._open_trending()
+        return trending is not None and trending.tick()
+    
     def bulk_index_articles(self, articles: List[Dict[str, Any]]) -> bool:
-        """Efficiently bulk index articles into Elasticsearch."""
+        """Efficiently bulk index articles into the article store."""
         if not articles:
             logger.warning("No articles to index")
             return False
         
         try:
-            actions = []
-            for article in articles:
-                doc_id = quote(article['url'], safe='')
-                
-                action = {
-                    "_index": self.config.ES_INDEX,
-                    "_id": doc_id,
-                    "_source": article
-                }
-                actions.append(action)
+            logger.info(f"Starting bulk indexing of {len(articles)} documents...")
             
-            logger.info(f"Starting bulk indexing of {len(actions)} documents...")
+            if self.config.EMBEDDINGS_ENABLED and isinstance(self.store, ElasticsearchStore):
+                with self.run_stats.stage("embed"):
+                    embed_articles(articles)
             
-            success, failed = helpers.bulk(
-                self.es_client,
-                actions,
+            # Listeners hear about each chunk as soon as the store commits it
+            started = time.perf_counter()
+            success, failed = self.store.bulk_index_articles(
+                articles,
                 chunk_size=self.config.BULK_INDEX_SIZE,
-                request_timeout=60,
-                raise_on_error=False
+                on_batch=self._notify_batch_listeners
             )
+            self.run_stats.record("bulk_flush", time.perf_counter() - started)
+            self.run_stats.count("indexed", success)
+            ARTICLES_INGESTED.inc(success)
+            if failed:
+                self.run_stats.record_failure("bulk_flush", "rejected", count=len(failed))
+            SCRAPER_QUEUE_DEPTH.labels("bulk").set(0)
             
             logger.info(f"Successfully indexed {success} documents")
             if failed:
@@ -323,22 +506,14 @@ class ProthomAloScraperEnhanced:
             dict: Article data or None if not found
         """
         try:
-            doc_id = quote(url, safe='')
-            response = self.es_client.get(
-                index=self.config.ES_INDEX,
-                id=doc_id
-            )
-            
-            article_data = response['_source']
-            article_data['_id'] = response['_id']
-            article_data['_score'] = response.get('_score')
+            article_data = self.store.get_article_by_url(url)
+            if article_data is None:
+                logger.warning(f"Article not found for URL: {url}")
+                return None
             
             logger.info(f"Retrieved article: {article_data.get('headline', 'Unknown')[:50]}...")
             return article_data
             
-        except NotFoundError:
-            logger.warning(f"Article not found for URL: {url}")
-            return None
         except Exception as e:
             logger.error(f"Error retrieving article: {e}")
             return None
@@ -356,7 +531,8 @@ class ProthomAloScraperEnhanced:
         try:
             response = self.es_client.get(
                 index=self.config.ES_INDEX,
-                id=doc_id
+                id=doc_id,
+                source_excludes=["embedding"]
             )
             
             article_data = response['_source']
@@ -371,6 +547,152 @@ class ProthomAloScraperEnhanced:
             logger.error(f"Error retrieving article by ID: {e}")
             return None
     
+    def _mget_articles(self, doc_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fetch several documents in one mget round trip.
+        
+        Args:
+            doc_ids: Elasticsearch document IDs
+            
+        Returns:
+            list: Article data (with "_id") or None per ID, in request order
+        """
+        response = self.es_client.mget(
+            index=self.config.ES_INDEX,
+            body={"ids": doc_ids},
+            source_excludes=["embedding"]
+        )
+        
+        articles = []
+        for doc in response["docs"]:
+            if doc.get("found"):
+                article_data = doc["_source"]
+                article_data["_id"] = doc["_id"]
+                articles.append(article_data)
+            else:
+                if "error" in doc:
+                    logger.error(f"Error retrieving article by ID {doc['_id']}: {doc['error']}")
+                articles.append(None)
+        
+        return articles
+    
+    def get_articles_by_urls(self, urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Retrieve several articles by URL with a single request.
+        
+        Args:
+            urls: List of article URLs
+            
+        Returns:
+            list: Article data or None (not found) for each URL, in the same order
+        """
+        if not urls:
+            return []
+        
+        try:
+            articles = self._mget_articles([quote(url, safe='') for url in urls])
+            
+            for url, article_data in zip(urls, articles):
+                if article_data is None:
+                    logger.warning(f"Article not found for URL: {url}")
+                else:
+                    article_data["_score"] = None
+            
+            logger.info(f"Retrieved {sum(a is not None for a in articles)}/{len(urls)} articles")
+            return articles
+            
+        except Exception as e:
+            logger.error(f"Error retrieving articles: {e}")
+            return [None] * len(urls)
+    
+    def get_articles_by_ids(self, doc_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Retrieve several articles by document ID with a single request.
+        
+        Args:
+            doc_ids: List of Elasticsearch document IDs
+            
+        Returns:
+            list: Article data or None (not found) for each ID, in the same order
+        """
+        if not doc_ids:
+            return []
+        
+        try:
+            articles = self._mget_articles(doc_ids)
+            
+            for doc_id, article_data in zip(doc_ids, articles):
+                if article_data is None:
+                    logger.warning(f"Article not found for ID: {doc_id}")
+            
+            return articles
+            
+        except Exception as e:
+            logger.error(f"Error retrieving articles by ID: {e}")
+            return [None] * len(doc_ids)
+    
+    def get_related_articles(self, url: str) -> List[Dict[str, Any]]:
+        """
+        Retrieve the precomputed related articles of an article.
+        
+        Args:
+            url: The article URL
+            
+        Returns:
+            list: Related articles, best match first
+        """
+        try:
+            response = self.es_client.get(
+                index=self.config.ES_INDEX,
+                id=quote(url, safe=''),
+                _source=["related"]
+            )
+            doc_ids = related_ids(response["_source"])
+            if not doc_ids:
+                return []
+            
+            return [article for article in self._mget_articles(doc_ids) if article is not None]
+            
+        except NotFoundError:
+            logger.warning(f"Article not found for URL: {url}")
+            return []
+        except Exception as e:
+            logger.error(f"Error retrieving related articles: {e}")
+            return []
+    
+    def rebuild_related_articles(self, batch_size: int = 500) -> bool:
+        """Recomputes the related list of every article (e.g. after migrating to mapping v6)."""
+        logger.info("Rebuilding related articles...")
+        return self.related_updater.rebuild(batch_size=batch_size)
+    
+    def rebuild_embeddings(self, batch_size: int = 500) -> bool:
+        """Fits the embedding model on the index and re-embeds every article (e.g. after migrating to mapping v7)."""
+        logger.info("Rebuilding article embeddings...")
+        return EmbeddingUpdater(self.config.ES_INDEX).rebuild(batch_size=batch_size)
+    
+    def recrawl_articles(self, limit: int) -> bool:
+        """
+        Rechecks up to `limit` indexed articles that are due and updates the edited ones.
+        
+        Returns:
+            bool: True if the re-crawl ran
+        """
+        if not isinstance(self.store, ElasticsearchStore):
+            logger.error("Re-crawls need ARTICLE_STORE=elasticsearch")
+            return False
+        if not self.connect_to_elasticsearch():
+            return False
+        try:
+            self.run_stats = PipelineRun(events_file=self.config.RUN_EVENTS_FILE)
+            recrawler = Recrawler(self)
+            recrawler.sync()
+            recrawler.run_due(limit)
+            self.run_stats.finish(report_file=self.config.RUN_REPORT_FILE)
+            return True
+        except Exception as e:
+            logger.error(f"Re-crawl failed: {e}")
+            return False
+    
     def update_article(self, url: str, updates: Dict[str, Any]) -> bool:
         """
         Update an existing article in Elasticsearch.
@@ -442,13 +764,18 @@ class ProthomAloScraperEnhanced:
                        max_word_count: int = None,
                        size: int = None,
                        sort_by: str = "published_at",
-                       sort_order: str = "desc") -> Dict[str, Any]:
+                       sort_order: str = "desc",
+                       headline: str = None,
+                       profile: str = "full",
+                       highlight: bool = False,
+                       search_after: List[Any] = None,
+                       mode: str = "lexical") -> Dict[str, Any]:
         """
         Advanced search with multiple filters.
         
         Args:
             query: Text to search in headline and content
-            author: Filter by author name  
+            author: Filter by exact author name
             location: Filter by location
             start_date: Start date for published_at filter (YYYY-MM-DD)
             end_date: End date for published_at filter (YYYY-MM-DD)
@@ -457,100 +784,37 @@ class ProthomAloScraperEnhanced:
             size: Number of results to return
             sort_by: Field to sort by
             sort_order: Sort order (asc/desc)
+            headline: Exact headline to match
+            profile: Projection profile - "list", "card" or "full" (see SOURCE_PROFILES)
+            highlight: Include headline/content highlights in each article
+            search_after: "next_search_after" from the previous page's results
+            mode: "lexical" (BM25) or "hybrid" (BM25 and kNN fused by rank; single page)
             
         Returns:
             dict: Search results with hits and metadata
         """
-        if size is None:
-            size = self.config.DEFAULT_SEARCH_SIZE
-        
         try:
-            # Build the search query
-            search_body = {
-                "size": size,
-                "sort": [{sort_by: {"order": sort_order}}],
-                "query": {"bool": {"must": [], "filter": []}},
-                "highlight": {
-                    "fields": {
-                        "headline": {},
-                        "content": {"fragment_size": 150, "number_of_fragments": 3}
-                    }
-                }
-            }
-            
-            # Text search
-            if query:
-                search_body["query"]["bool"]["must"].append({
-                    "multi_match": {
-                        "query": query,
-                        "fields": ["headline^2", "content"],
-                        "type": "best_fields",
-                        "fuzziness": "AUTO"
-                    }
-                })
-            else:
-                search_body["query"]["bool"]["must"].append({"match_all": {}})
-            
-            # Author filter
-            if author:
-                search_body["query"]["bool"]["filter"].append({
-                    "match": {"author": author}
-                })
-            
-            # Location filter
-            if location:
-                search_body["query"]["bool"]["filter"].append({
-                    "term": {"location": location}
-                })
-            
-            # Date range filter
-            if start_date or end_date:
-                date_range = {}
-                if start_date:
-                    date_range["gte"] = start_date
-                if end_date:
-                    date_range["lte"] = end_date
-                
-                search_body["query"]["bool"]["filter"].append({
-                    "range": {"published_at": date_range}
-                })
-            
-            # Word count range filter
-            if min_word_count or max_word_count:
-                word_count_range = {}
-                if min_word_count:
-                    word_count_range["gte"] = min_word_count
-                if max_word_count:
-                    word_count_range["lte"] = max_word_count
-                
-                search_body["query"]["bool"]["filter"].append({
-                    "range": {"word_count": word_count_range}
-                })
-            
-            # Execute search
-            response = self.es_client.search(
-                index=self.config.ES_INDEX,
-                body=search_body
+            if size is None:
+                size = self.config.DEFAULT_SEARCH_SIZE
+            
+            results = self.store.search_articles(
+                query=query,
+                author=author,
+                location=location,
+                start_date=start_date,
+                end_date=end_date,
+                min_word_count=min_word_count,
+                max_word_count=max_word_count,
+                headline=headline,
+                size=size,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                profile=profile,
+                highlight=highlight,
+                search_after=search_after,
+                mode=mode
             )
             
-            # Process results
-            results = {
-                "total_hits": response["hits"]["total"]["value"],
-                "max_score": response["hits"]["max_score"],
-                "took": response["took"],
-                "articles": []
-            }
-            
-            for hit in response["hits"]["hits"]:
-                article = hit["_source"]
-                article["_id"] = hit["_id"]
-                article["_score"] = hit["_score"]
-                
-                if "highlight" in hit:
-                    article["highlight"] = hit["highlight"]
-                
-                results["articles"].append(article)
-            
             logger.info(f"Search completed: {results['total_hits']} results found")
             return results
             
@@ -558,6 +822,68 @@ class ProthomAloScraperEnhanced:
             logger.error(f"Search failed: {e}")
             return {"total_hits": 0, "articles": [], "error": str(e)}
     
+    def multi_search_articles(self, searches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run several searches in a single msearch round trip.
+        
+        Each entry is a dict of search_articles keyword arguments, e.g.
+        ``[{"author": "প্রতিবেদক", "size": 5}, {"location": "ঢাকা"}]``.
+        
+        Args:
+            searches: List of search specifications
+            
+        Returns:
+            list: One search_articles-style result per specification, in order.
+                  A failed or invalid search yields an empty result with an "error" key.
+        """
+        if not searches:
+            return []
+        
+        # An invalid specification fails on its own instead of failing the whole batch
+        results: List[Optional[Dict[str, Any]]] = [None] * len(searches)
+        msearch_body, positions = [], []
+        for i, spec in enumerate(searches):
+            try:
+                msearch_body.append({"index": self.config.ES_INDEX})
+                msearch_body.append(self._multi_search_body(spec))
+                positions.append(i)
+            except (TypeError, ValueError) as e:
+                msearch_body.pop()
+                logger.error(f"Invalid search specification {spec}: {e}")
+                results[i] = {"total_hits": 0, "articles": [], "error": str(e)}
+        
+        if positions:
+            try:
+                response = self.es_client.msearch(body=msearch_body)
+                for i, item in zip(positions, response["responses"]):
+                    if "error" in item:
+                        logger.error(f"Search failed: {item['error']}")
+                        results[i] = {"total_hits": 0, "articles": [], "error": str(item["error"])}
+                    else:
+                        results[i] = format_search_response(item)
+            except Exception as e:
+                logger.error(f"Multi-search failed: {e}")
+                for i in positions:
+                    results[i] = {"total_hits": 0, "articles": [], "error": str(e)}
+        
+        logger.info(f"Multi-search completed: {len(results)} searches")
+        return results
+    
+    def _multi_search_body(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Search body for one multi_search_articles specification; ValueError if it is invalid."""
+        if not isinstance(spec, dict):
+            raise ValueError("A search specification must be a dict")
+        unknown = set(spec) - SEARCH_PARAMETERS
+        if unknown:
+            raise ValueError(f"Unknown search parameters: {', '.join(sorted(unknown))}")
+        mode = spec.get("mode", "lexical")
+        if mode != "lexical":
+            raise ValueError(f"Multi-search only runs lexical searches, not {mode}")
+        
+        params = {key: value for key, value in spec.items() if key != "mode"}
+        params["size"] = spec.get("size") or self.config.DEFAULT_SEARCH_SIZE
+        return build_search_body(**params)
+    
     def filter_articles_by_date_range(self, start_date: str, end_date: str, size: int = 50) -> List[Dict[str, Any]]:
         """
         Filter articles by date range.
@@ -626,65 +952,8 @@ class ProthomAloScraperEnhanced:
             dict: Statistics including counts, averages, and distributions
         """
         try:
-            # Get total count
-            count_response = self.es_client.count(index=self.config.ES_INDEX)
-            total_articles = count_response['count']
-            
-            # Get aggregations for detailed stats
-            agg_body = {
-                "size": 0,
-                "aggs": {
-                    "authors": {
-                        "terms": {
-                            "field": "author.keyword",
-                            "size": 10
-                        }
-                    },
-                    "locations": {
-                        "terms": {
-                            "field": "location",
-                            "size": 10
-                        }
-                    },
-                    "word_count_stats": {
-                        "stats": {
-                            "field": "word_count"
-                        }
-                    },
-                    "articles_by_date": {
-                        "date_histogram": {
-                            "field": "published_at",
-                            "calendar_interval": "day"
-                        }
-                    }
-                }
-            }
-            
-            response = self.es_client.search(
-                index=self.config.ES_INDEX,
-                body=agg_body
-            )
-            
-            aggs = response["aggregations"]
-            
-            stats = {
-                "total_articles": total_articles,
-                "top_authors": [
-                    {"author": bucket["key"], "count": bucket["doc_count"]}
-                    for bucket in aggs["authors"]["buckets"]
-                ],
-                "top_locations": [
-                    {"location": bucket["key"], "count": bucket["doc_count"]}
-                    for bucket in aggs["locations"]["buckets"]
-                ],
-                "word_count_stats": {
-                    "average": round(aggs["word_count_stats"]["avg"], 2),
-                    "min": aggs["word_count_stats"]["min"],
-                    "max": aggs["word_count_stats"]["max"],
-                    "total": aggs["word_count_stats"]["sum"]
-                },
-                "articles_per_day": len(aggs["articles_by_date"]["buckets"])
-            }
+            # Total count and aggregations in a single request (or a few SQL queries)
+            stats = self.store.get_articles_statistics()
             
             logger.info("Statistics retrieved successfully")
             return stats
@@ -704,7 +973,29 @@ class ProthomAloScraperEnhanced:
         Returns:
             list: List of matching articles
         """
-        return self.search_articles(query=keyword, size=size)["articles"]
+        return self.search_articles(query=keyword, size=size, highlight=True)["articles"]
+    
+    def suggest_headlines(self, prefix: str, size: int = 5) -> Dict[str, List[Any]]:
+        """
+        Autocomplete headlines and author names from a typed prefix.
+        
+        Args:
+            prefix: Text typed so far
+            size: Maximum suggestions per kind
+            
+        Returns:
+            dict: "headlines" ({headline, url} items) and "authors" (names)
+        """
+        try:
+            response = self.es_client.search(
+                index=self.config.ES_INDEX,
+                body=build_suggest_body(prefix, size)
+            )
+            return format_suggest_response(response)
+            
+        except Exception as e:
+            logger.error(f"Suggest failed: {e}")
+            return {"headlines": [], "authors": []}
     
     def upsert_article(self, article_data: Dict[str, Any]) -> bool:
         """
@@ -738,21 +1029,517 @@ class ProthomAloScraperEnhanced:
             logger.error(f"Upsert failed: {e}")
             return False
     
+    # ========================
+    # BULK MAINTENANCE OPERATIONS
+    # ========================
+    
+    def bulk_update_articles(self, updates: Iterable[Tuple[str, Dict[str, Any]]]) -> Set[str]:
+        """
+        Apply partial updates to many articles using the bulk API.
+        
+        Args:
+            updates: Iterable of (url, fields_to_update) pairs; consumed lazily
+            
+        Returns:
+            set: URLs whose update failed (all of them if the request failed)
+        """
+        urls_by_id = {}
+        
+        def generate_actions():
+            for url, fields in updates:
+                doc = dict(fields)
+                doc['last_updated'] = datetime.now().isoformat()
+                doc_id = quote(url, safe='')
+                urls_by_id[doc_id] = url
+                yield {
+                    "_op_type": "update",
+                    "_index": self.config.ES_INDEX,
+                    "_id": doc_id,
+                    "doc": doc
+                }
+        
+        actions = generate_actions()
+        try:
+            success, failed = helpers.bulk(
+                self.es_client,
+                actions,
+                chunk_size=self.config.BULK_INDEX_SIZE,
+                request_timeout=60,
+                raise_on_error=False
+            )
+            
+            logger.info(f"Successfully updated {success} documents")
+            if failed:
+                logger.warning(f"Failed to update {len(failed)} documents")
+                for failure in failed[:5]:
+                    logger.error(f"Update failure: {failure}")
+            
+            # Each failure is {"update": {"_id": ..., "status": ..., "error": ...}}
+            return {
+                urls_by_id.get(item.get("_id"), item.get("_id"))
+                for failure in failed
+                for item in failure.values()
+            }
+            
+        except Exception as e:
+            logger.error(f"Bulk update failed: {e}")
+            for _ in actions:
+                pass  # collect the URLs the request never read
+            return set(urls_by_id.values())
+    
+    def update_articles_by_query(self,
+                                 updates: Dict[str, Any],
+                                 slices: Union[int, str] = None,
+                                 requests_per_second: float = None,
+                                 wait_for_completion: bool = False,
+                                 **filters) -> Optional[Union[str, Dict[str, Any]]]:
+        """
+        Set fields on every article matching the given filters.
+        
+        Filters use the same keywords as search_articles (query, author, location,
+        start_date, end_date, min_word_count, max_word_count, headline).
+        
+        Args:
+            updates: Dictionary of fields to set on each matching article
+            slices: Number of parallel slices ("auto" lets ES pick one per shard)
+            requests_per_second: Throttle in sub-requests per second (-1 disables)
+            wait_for_completion: Block until done instead of returning a task ID
+            **filters: search_articles filter arguments
+            
+        Returns:
+            str or dict: Task ID when running in the background, the final response
+                         when waiting, or None on failure
+        """
+        query = build_query(**filters)
+        if not is_restrictive_query(query):
+            logger.error("Refusing to update by query without any effective filters")
+            return None
+        
+        doc = dict(updates)
+        doc['last_updated'] = datetime.now().isoformat()
+        
+        body = {
+            "query": query,
+            "script": {
+                "lang": "painless",
+                "source": "for (entry in params.doc.entrySet()) { ctx._source[entry.getKey()] = entry.getValue(); }",
+                "params": {"doc": doc}
+            }
+        }
+        
+        return self._run_by_query("update", body,
+                                  slices, requests_per_second, wait_for_completion)
+    
+    def delete_articles_by_query(self,
+                                 slices: Union[int, str] = None,
+                                 requests_per_second: float = None,
+                                 wait_for_completion: bool = False,
+                                 **filters) -> Optional[Union[str, Dict[str, Any]]]:
+        """
+        Delete every article matching the given filters.
+        
+        Example - purge a bad scrape:
+            scraper.delete_articles_by_query(headline="Headline not found")
+        
+        Args:
+            slices: Number of parallel slices ("auto" lets ES pick one per shard)
+            requests_per_second: Throttle in sub-requests per second (-1 disables)
+            wait_for_completion: Block until done instead of returning a task ID
+            **filters: search_articles filter arguments
+            
+        Returns:
+            str or dict: Task ID when running in the background, the final response
+                         when waiting, or None on failure
+        """
+        query = build_query(**filters)
+        if not is_restrictive_query(query):
+            logger.error("Refusing to delete by query without any effective filters")
+            return None
+        
+        body = {"query": query}
+        
+        return self._run_by_query("delete", body,
+                                  slices, requests_per_second, wait_for_completion)
+    
+    def _run_by_query(self, name: str, body: Dict[str, Any],
+                      slices: Union[int, str], requests_per_second: float,
+                      wait_for_completion: bool) -> Optional[Union[str, Dict[str, Any]]]:
+        """Submit an update/delete-by-query request with throttling and slicing."""
+        if slices is None:
+            slices = self.config.MAINTENANCE_SLICES
+        if requests_per_second is None:
+            requests_per_second = self.config.MAINTENANCE_REQUESTS_PER_SECOND
+        
+        try:
+            # Submitting the same by-query twice would run it twice: never retry on timeout
+            operation = getattr(blocking_client(self.es_client), f"{name}_by_query")
+            response = operation(
+                index=self.config.ES_INDEX,
+                body=body,
+                conflicts="proceed",
+                slices=slices,
+                requests_per_second=requests_per_second,
+                wait_for_completion=wait_for_completion
+            )
+            
+            if wait_for_completion:
+                logger.info(f"{name.capitalize()} by query completed: {response.get(name + 'd', 0)} documents")
+                return response
+            
+            task_id = response["task"]
+            logger.info(f"{name.capitalize()} by query started as task {task_id}")
+            return task_id
+            
+        except Exception as e:
+            logger.error(f"{name.capitalize()} by query failed: {e}")
+            return None
+    
+    def get_task_status(self, task_id: str) -> Dict[str, Any]:
+        """
+        Get progress of a background update/delete-by-query task.
+        
+        Args:
+            task_id: Task ID returned by a by-query operation
+            
+        Returns:
+            dict: Completion flag, counters and progress fraction
+        """
+        try:
+            response = self.es_client.tasks.get(task_id=task_id)
+            status = response["task"]["status"]
+            total = status.get("total", 0)
+            done = status.get("updated", 0) + status.get("created", 0) + status.get("deleted", 0)
+            
+            return {
+                "task_id": task_id,
+                "completed": response.get("completed", False),
+                "total": total,
+                "updated": status.get("updated", 0),
+                "deleted": status.get("deleted", 0),
+                "version_conflicts": status.get("version_conflicts", 0),
+                "requests_per_second": status.get("requests_per_second"),
+                "progress": round(done / total, 4) if total else 0.0,
+                "failures": response.get("response", {}).get("failures", []),
+                "error": response.get("error")
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get task status: {e}")
+            return {"task_id": task_id, "error": str(e)}
+    
+    def wait_for_task(self, task_id: str, poll_interval: float = None,
+                      timeout: float = None) -> Dict[str, Any]:
+        """
+        Poll a background task until it completes, logging progress.
+        
+        Args:
+            task_id: Task ID returned by a by-query operation
+            poll_interval: Seconds between polls
+            timeout: Give up after this many seconds (None waits forever)
+            
+        Returns:
+            dict: Last task status
+        """
+        if poll_interval is None:
+            poll_interval = self.config.TASK_POLL_INTERVAL
+        
+        started = time.monotonic()
+        while True:
+            status = self.get_task_status(task_id)
+            if status.get("completed") or status.get("error"):
+                logger.info(f"Task {task_id} finished: {status}")
+                return status
+            
+            logger.info(f"Task {task_id} progress: {status['progress']:.1%} of {status['total']}")
+            
+            if timeout is not None and time.monotonic() - started > timeout:
+                logger.warning(f"Stopped waiting for task {task_id} after {timeout}s")
+                return status
+            
+            time.sleep(poll_interval)
+    
+    def rethrottle_task(self, task_id: str, requests_per_second: float) -> bool:
+        """
+        Change the throttle of a running update/delete-by-query or reindex task.
+        
+        Args:
+            task_id: Task ID returned by a by-query operation or a background reindex
+            requests_per_second: New throttle (-1 disables throttling)
+            
+        Returns:
+            bool: True if the throttle was changed
+        """
+        try:
+            # Each task type has its own rethrottle endpoint
+            action = self.es_client.tasks.get(task_id=task_id)["task"]["action"]
+            rethrottle = next(
+                (method for suffix, method in TASK_RETHROTTLE.items() if action.endswith(suffix)),
+                None
+            )
+            if rethrottle is None:
+                logger.error(f"Task {task_id} ({action}) cannot be rethrottled")
+                return False
+            getattr(self.es_client, rethrottle)(
+                task_id=task_id,
+                requests_per_second=requests_per_second
+            )
+            logger.info(f"Task {task_id} rethrottled to {requests_per_second} requests/s")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to rethrottle task: {e}")
+            return False
+    
+    # ========================
+    # INDEX MIGRATION
+    # ========================
+    
+    def _resolve_index(self) -> Optional[str]:
+        """
+        Returns the physical index currently behind ES_INDEX.
+        
+        Returns:
+            str: Index name (ES_INDEX itself for a legacy, non-aliased index),
+                 or None if nothing exists yet
+        """
+        alias = self.config.ES_INDEX
+        if self.es_client.indices.exists_alias(name=alias):
+            return next(iter(self.es_client.indices.get_alias(name=alias)))
+        if self.es_client.indices.exists(index=alias):
+            return alias
+        return None
+    
+    def get_index_version(self) -> Optional[int]:
+        """
+        Get the mapping version of the live articles index.
+        
+        Returns:
+            int: Mapping version (1 for legacy indices without version metadata),
+                 or None if the index doesn't exist or can't be inspected
+        """
+        try:
+            index_name = self._resolve_index()
+            if index_name is None:
+                return None
+            
+            mapping = self.es_client.indices.get_mapping(index=index_name)[index_name]["mappings"]
+            version = mapping.get("_meta", {}).get("mapping_version")
+            return version or parse_index_version(index_name) or 1
+            
+        except Exception as e:
+            logger.error(f"Failed to get index version: {e}")
+            return None
+    
+    def _reindex(self, source_index: str, target_index: str,
+                 query: Dict[str, Any] = None, op_type: str = None,
+                 script: Dict[str, Any] = None,
+                 slices: Union[int, str] = 1, requests_per_second: float = -1,
+                 wait_for_completion: bool = True) -> Union[str, Dict[str, Any]]:
+        """Copy documents between indices; returns a task ID or the final response."""
+        body = {
+            "source": {"index": source_index, "size": 1000},
+            "dest": {"index": target_index}
+        }
+        if query:
+            body["source"]["query"] = query
+        if op_type:
+            body["dest"]["op_type"] = op_type
+        if script:
+            body["script"] = script
+        
+        response = blocking_client(self.es_client).reindex(
+            body=body,
+            conflicts="proceed",
+            slices=slices,
+            requests_per_second=requests_per_second,
+            wait_for_completion=wait_for_completion
+        )
+        return response if wait_for_completion else response["task"]
+    
+    def _catch_up(self, source_index: str, target_index: str, since: datetime,
+                  script: Dict[str, Any] = None) -> int:
+        """
+        Copy documents written to the source index since the given time.
+        
+        Returns:
+            int: Number of documents created or updated in the target index
+        """
+        cutoff = (since - timedelta(seconds=self.config.MIGRATION_CATCH_UP_MARGIN)).isoformat()
+        blocking_client(self.es_client).indices.refresh(index=source_index)
+        
+        response = self._reindex(
+            source_index,
+            target_index,
+            query={
+                "bool": {
+                    "should": [
+                        {"range": {"scraped_at": {"gte": cutoff}}},
+                        {"range": {"last_updated": {"gte": cutoff}}}
+                    ],
+                    "minimum_should_match": 1
+                }
+            },
+            script=script
+        )
+        return response.get("created", 0) + response.get("updated", 0)
+    
+    def migrate_index(self,
+                      target_version: int = None,
+                      slices: Union[int, str] = None,
+                      requests_per_second: float = None,
+                      delete_old: bool = False) -> bool:
+        """
+        Move the articles index to a new mapping version without downtime.
+        
+        Steps:
+        1. Create ``<ES_INDEX>_v<target_version>`` with replicas and refresh disabled
+        2. Copy all documents with a sliced, throttled background _reindex
+        3. Catch up on documents written during the copy (repeated until quiet)
+        4. Restore index settings, make the old index read-only, copy what was
+           written since the last pass and atomically point the ES_INDEX alias
+           at the new index
+        
+        Documents deleted from the old index during the copy are not propagated.
+        Scraper writes are rejected (not lost) for the few seconds between the
+        write block and the swap. A previous versioned index stays read-only
+        for rollback unless delete_old is set; a legacy concrete index named
+        ES_INDEX is replaced by the alias in the same atomic request.
+        
+        Args:
+            target_version: Mapping version to migrate to (defaults to the latest)
+            slices: Parallel reindex slices ("auto" uses one per shard)
+            requests_per_second: Reindex throttle (-1 disables throttling)
+            delete_old: Delete the previous versioned index after the swap
+            
+        Returns:
+            bool: True if the index is at the target version afterwards
+        """
+        if target_version is None:
+            target_version = CURRENT_MAPPING_VERSION
+        if slices is None:
+            slices = self.config.MAINTENANCE_SLICES
+        if requests_per_second is None:
+            requests_per_second = self.config.MAINTENANCE_REQUESTS_PER_SECOND
+        
+        alias = self.config.ES_INDEX
+        source_index = None
+        write_blocked = False
+        
+        try:
+            source_index = self._resolve_index()
+            if source_index is None:
+                logger.info("No existing index, creating it at the latest version")
+                return self.create_index_if_not_exists()
+            
+            source_version = self.get_index_version()
+            if source_version is None:
+                return False
+            if source_version >= target_version:
+                logger.info(f"Index '{source_index}' is already at mapping v{source_version}")
+                return True
+            
+            target_index = versioned_index_name(alias, target_version)
+            if self.es_client.indices.exists(index=target_index):
+                logger.error(f"Target index '{target_index}' already exists; delete it to retry the migration")
+                return False
+            
+            logger.info(f"Migrating '{source_index}' (v{source_version}) to '{target_index}' (v{target_version})...")
+            
+            # Step 1: Create the new index tuned for bulk loading
+            index_definition = get_index_definition(target_version)
+            replicas = index_definition["settings"]["number_of_replicas"]
+            index_definition["settings"]["number_of_replicas"] = 0
+            index_definition["settings"]["refresh_interval"] = "-1"
+            self.es_client.indices.create(index=target_index, body=index_definition)
+            
+            # Step 2: Sliced background copy, backfilling ingest-time fields
+            script = get_migration_script(source_version, target_version)
+            copy_started = datetime.now()
+            task_id = self._reindex(source_index, target_index, script=script, slices=slices,
+                                    requests_per_second=requests_per_second,
+                                    wait_for_completion=False)
+            logger.info(f"Reindex started as task {task_id}")
+            status = self.wait_for_task(task_id)
+            if status.get("error") or status.get("failures"):
+                logger.error(f"Reindex failed: {status.get('error') or status.get('failures')}")
+                return False
+            
+            # Step 3: Catch up on writes made during the copy
+            since = copy_started
+            for pass_num in range(1, self.config.MIGRATION_CATCH_UP_PASSES + 1):
+                pass_started = datetime.now()
+                copied = self._catch_up(source_index, target_index, since, script=script)
+                logger.info(f"Catch-up pass {pass_num}: {copied} documents")
+                since = pass_started
+                if copied == 0:
+                    break
+            
+            # Step 4: Restore settings and swap the alias atomically
+            self.es_client.indices.put_settings(
+                index=target_index,
+                body={"index": {"number_of_replicas": replicas, "refresh_interval": None}}
+            )
+            blocking_client(self.es_client).indices.refresh(index=target_index)
+            
+            # Stop writes to the old index so the last pass copies every new document and update
+            self.es_client.indices.put_settings(index=source_index, body={"index": {"blocks.write": True}})
+            write_blocked = True
+            copied = self._catch_up(source_index, target_index, since, script=script)
+            logger.info(f"Final pass with writes blocked: {copied} documents")
+            
+            actions = [{"add": {"index": target_index, "alias": alias}}]
+            if source_index == alias:
+                actions.append({"remove_index": {"index": source_index}})
+            else:
+                actions.append({"remove": {"index": source_index, "alias": alias}})
+            self.es_client.indices.update_aliases(body={"actions": actions})
+            write_blocked = False  # writes go to the new index now
+            logger.info(f"Alias '{alias}' now points to '{target_index}'")
+            
+            if source_index != alias and delete_old:
+                self.es_client.indices.delete(index=source_index)
+                logger.info(f"Deleted old index '{source_index}'")
+            
+            logger.info("Migration completed successfully")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Index migration failed: {e}")
+            if write_blocked:
+                try:
+                    self.es_client.indices.put_settings(index=source_index, body={"index": {"blocks.write": None}})
+                except Exception as unblock_error:
+                    logger.error(f"Could not lift the write block on '{source_index}': {unblock_error}")
+            return False
+    
     # ========================
     # PIPELINE OPERATIONS
     # ========================
     
     def run_scraping_pipeline(self, max_pages: int = None) -> bool:
-        """Runs the complete scraping and indexing pipeline."""
+        """
+        Runs the complete scraping and indexing pipeline and reports its stage timings.
+        
+        Args:
+            max_pages: Number of pages to scrape (defaults to config value)
+            
+        Returns:
+            bool: True if pipeline completed successfully
+        """
+        self.run_stats = PipelineRun(events_file=self.config.RUN_EVENTS_FILE)
+        try:
+            return self._run_pipeline(max_pages)
+        finally:
+            self.run_stats.finish(report_file=self.config.RUN_REPORT_FILE)
+    
+    def _run_pipeline(self, max_pages: int = None) -> bool:
+        """Discovers, scrapes and bulk indexes articles for run_scraping_pipeline()."""
         if max_pages is None:
             max_pages = self.config.DEFAULT_MAX_PAGES
         
         logger.info(f"Starting scraping pipeline for {max_pages} pages...")
         
-        if not self.connect_to_elasticsearch():
-            return False
-        
-        if not self.create_index_if_not_exists():
+        if not self.open_storage():
             return False
         
         article_urls = self.get_article_urls_from_api(max_pages)
@@ -762,17 +1549,31 @@ class ProthomAloScraperEnhanced:
         
         scraped_articles = []
         total_urls = len(article_urls)
+        self.run_stats.count("discovered", total_urls)
+        links_budget = self.config.MAX_DISCOVERED_LINKS
         
         for i, url in enumerate(article_urls, 1):
-            logger.info(f"Scraping article {i}/{total_urls}: {url}")
+            SCRAPER_QUEUE_DEPTH.labels("urls").set(total_urls - i + 1)
+            logger.debug("Scraping article %d/%d: %s", i, total_urls, url)
             
             article_data = self.scrape_single_article(url)
             if article_data:
                 scraped_articles.append(article_data)
+                self.run_stats.count("scraped")
+                SCRAPER_QUEUE_DEPTH.labels("bulk").set(len(scraped_articles))
+            
+            # Follow links found in the articles (they are scraped last)
+            if self.frontier is not None and links_budget > 0:
+                linked = [link for link in self.frontier.pop(links_budget) if link not in article_urls]
+                links_budget -= len(linked)
+                article_urls.extend(linked)
+                total_urls = len(article_urls)
+                self.run_stats.count("linked", len(linked))
             
             if i < total_urls:
                 time.sleep(self.config.REQUEST_DELAY)
         
+        SCRAPER_QUEUE_DEPTH.labels("urls").set(0)
         logger.info(f"Successfully scraped {len(scraped_articles)}/{total_urls} articles")
         
         if scraped_articles:
@@ -783,14 +1584,28 @@ class ProthomAloScraperEnhanced:
 
 def main():
     """Main entry point with example usage of all features."""
+    parser = argparse.ArgumentParser(description="Prothom Alo politics scraper")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep polling for new articles until SIGTERM (see crawl_daemon.py)")
+    parser.add_argument("--recrawl", type=int, metavar="N",
+                        help="Recheck up to N indexed articles that are due for a re-crawl, then exit (see recrawl.py)")
+    args = parser.parse_args()
+    
     scraper = ProthomAloScraperEnhanced()
     
-    # Connect to Elasticsearch
-    if not scraper.connect_to_elasticsearch():
-        return
+    if scraper.config.METRICS_PORT:
+        start_metrics_server(scraper.config.METRICS_PORT)
+        logger.info(f"Serving metrics on port {scraper.config.METRICS_PORT}")
+    
+    if args.daemon:
+        sys.exit(0 if CrawlDaemon(scraper).run() else 1)
     
-    # Create index
-    scraper.create_index_if_not_exists()
+    if args.recrawl is not None:
+        sys.exit(0 if scraper.recrawl_articles(args.recrawl) else 1)
+    
+    # Connect to the article store and create its index or schema
+    if not scraper.open_storage():
+        return
     
     # Example operations
     logger.info("="*60)
@@ -803,12 +1618,12 @@ def main():
     
     # 2. Search articles
     logger.info("\n2. Searching articles...")
-    search_results = scraper.search_articles(query="রাজনীতি", size=5)
+    search_results = scraper.search_articles(query="রাজনীতি", size=5, profile="card")
     logger.info(f"Found {search_results['total_hits']} articles")
     
     # 3. Filter by author
     logger.info("\n3. Getting articles by author...")
-    author_articles = scraper.filter_articles_by_author("প্রতিবেদক", size=3)
+    author_articles = scraper.filter_articles_by_author("নিজস্ব প্রতিবেদক", size=3)
     logger.info(f"Found {len(author_articles)} articles by author")
     
     # 4. Get recent articles
@@ -0,0 +1,518 @@
+"""
+Pluggable article storage.
+
+ArticleStore is the storage interface behind the enhanced scraper's
+bulk_index_articles, get_article_by_url, search_articles and
+get_articles_statistics. Two implementations share the result formats of
+es_queries.py, so callers can't tell them apart:
+
+- ElasticsearchStore: the articles index (default), with an optional
+  hybrid BM25 + kNN search mode (mapping v7, see embeddings.py).
+- SQLiteStore: a single SQLite file with an FTS5 index, for edge
+  deployments, CI and local development without a cluster.
+
+SQLite notes:
+- FTS5's unicode61 tokenizer treats combining marks as separators, which
+  splits Bengali words at every vowel sign and virama (নির্বাচন -> ন, র, চন).
+  The Bengali marks are declared as token characters, and text is NFC
+  normalized with ZWJ/ZWNJ removed before indexing and querying.
+- Search terms match as prefixes ("নির্বাচন" finds নির্বাচনে, নির্বাচনের), the
+  closest FTS5 gets to the Bengali analyzer's stemming; there is no
+  fuzziness. Ranking is bm25 with headlines weighted 2:1 as in build_query.
+- WAL journaling lets readers run alongside the writer, each bulk chunk is
+  one transaction, and every statement is a constant SQL string so the
+  connection's statement cache prepares it once.
+
+Select the backend with ARTICLE_STORE=elasticsearch|sqlite (and
+ARTICLE_DB for the SQLite file).
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from elasticsearch import helpers
+from elasticsearch.exceptions import NotFoundError
+
+from bengali_text import BENGALI_MARKS, bn_normalize, bn_words
+from embeddings import get_encoder
+from es_connector import get_es_client
+from es_queries import (
+    DEFAULT_SEARCH_SIZE,
+    SEARCH_MODES,
+    SORTABLE_FIELDS,
+    build_hybrid_searches,
+    build_search_body,
+    build_statistics_body,
+    format_search_response,
+    format_statistics,
+    fuse_search_responses,
+)
+from index_mappings import SOURCE_PROFILES
+
+logger = logging.getLogger(__name__)
+
+STORE_BACKEND = os.environ.get("ARTICLE_STORE", "elasticsearch")  # "elasticsearch" or "sqlite"
+SQLITE_PATH = os.environ.get("ARTICLE_DB", "articles.sqlite3")
+
+BatchCallback = Callable[[List[Dict[str, Any]]], None]
+
+
+class ArticleStore(ABC):
+    """Storage interface for scraped articles."""
+
+    name = ""
+
+    def open(self) -> bool:
+        """Connects and creates the schema if needed; True when ready."""
+        return True
+
+    @abstractmethod
+    def bulk_index_articles(self, articles: List[Dict[str, Any]], chunk_size: int = 100,
+                            on_batch: Optional[BatchCallback] = None) -> Tuple[int, List[Any]]:
+        """
+        Inserts or replaces articles (keyed by URL).
+
+        Args:
+            articles: Article documents
+            chunk_size: Articles per request or transaction
+            on_batch: Called with each committed chunk's articles
+
+        Returns:
+            tuple: (number stored, list of per-article errors)
+        """
+
+    @abstractmethod
+    def get_article_by_url(self, url: str) -> Optional[Dict[str, Any]]:
+        """The article stored for a URL (with "_id"), or None."""
+
+    @abstractmethod
+    def search_articles(self,
+                        query: str = None,
+                        author: str = None,
+                        location: str = None,
+                        start_date: str = None,
+                        end_date: str = None,
+                        min_word_count: int = None,
+                        max_word_count: int = None,
+                        headline: str = None,
+                        size: int = DEFAULT_SEARCH_SIZE,
+                        sort_by: str = "published_at",
+                        sort_order: str = "desc",
+                        profile: str = "full",
+                        highlight: bool = False,
+                        search_after: Optional[List[Any]] = None,
+                        mode: str = "lexical") -> Dict[str, Any]:
+        """Filtered search in the format of es_queries.format_search_response."""
+
+    @abstractmethod
+    def get_articles_statistics(self) -> Dict[str, Any]:
+        """Collection statistics in the format of es_queries.format_statistics."""
+
+
+class ElasticsearchStore(ArticleStore):
+    """Articles in an Elasticsearch index (or alias)."""
+
+    name = "elasticsearch"
+
+    def __init__(self, index: str, es_client=None, refresh: Optional[str] = None):
+        self.index = index
+        self._es_client = es_client
+        # Bulk refresh policy, e.g. "wait_for" when batch listeners search the new documents
+        self.refresh = refresh
+
+    @property
+    def es_client(self):
+        # Shared process-wide client unless one was given explicitly
+        return self._es_client or get_es_client()
+
+    def open(self) -> bool:
+        return bool(self.es_client.ping())
+
+    def bulk_index_articles(self, articles, chunk_size=100, on_batch=None):
+        actions = (
+            {"_index": self.index, "_id": quote(article["url"], safe=''), "_source": article}
+            for article in articles
+        )
+        # streaming_bulk reports each chunk as soon as Elasticsearch commits it
+        success, failed, indexed = 0, [], []
+        results = helpers.streaming_bulk(
+            self.es_client,
+            actions,
+            chunk_size=chunk_size,
+            request_timeout=60,
+            raise_on_error=False,
+            refresh=self.refresh
+        )
+        for i, (ok, item) in enumerate(results):
+            if ok:
+                success += 1
+                indexed.append(articles[i])
+            else:
+                failed.append(item)
+            if (i + 1) % chunk_size == 0 and indexed:
+                if on_batch:
+                    on_batch(indexed)
+                indexed = []
+        if indexed and on_batch:
+            on_batch(indexed)
+        return success, failed
+
+    def get_article_by_url(self, url):
+        try:
+            response = self.es_client.get(index=self.index, id=quote(url, safe=''),
+                                          source_excludes=["embedding"])
+        except NotFoundError:
+            return None
+        article = response["_source"]
+        article["_id"] = response["_id"]
+        article["_score"] = response.get("_score")
+        return article
+
+    def search_articles(self, query=None, author=None, location=None, start_date=None,
+                        end_date=None, min_word_count=None, max_word_count=None, headline=None,
+                        size=DEFAULT_SEARCH_SIZE, sort_by="published_at", sort_order="desc",
+                        profile="full", highlight=False, search_after=None, mode="lexical"):
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        if mode == "hybrid" and query:
+            query_vector = get_encoder().encode_query(query)
+            if query_vector.any():
+                return self._hybrid_search(query, query_vector, size=size, profile=profile,
+                                           highlight=highlight, author=author, location=location,
+                                           start_date=start_date, end_date=end_date,
+                                           min_word_count=min_word_count,
+                                           max_word_count=max_word_count, headline=headline)
+
+        body = build_search_body(
+            query=query,
+            author=author,
+            location=location,
+            start_date=start_date,
+            end_date=end_date,
+            min_word_count=min_word_count,
+            max_word_count=max_word_count,
+            headline=headline,
+            size=size,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            profile=profile,
+            highlight=highlight,
+            search_after=search_after
+        )
+        return format_search_response(self.es_client.search(index=self.index, body=body))
+
+    def _hybrid_search(self, query, query_vector, size, profile, highlight, **filters):
+        """BM25 and kNN in one msearch, fused by reciprocal rank."""
+        searches = build_hybrid_searches(query, query_vector.tolist(), size=size, profile=profile,
+                                         highlight=highlight, **filters)
+        body = []
+        for search in searches:
+            body.append({"index": self.index})
+            body.append(search)
+        lexical, knn = self.es_client.msearch(body=body)["responses"]
+        if "error" in lexical:
+            raise RuntimeError(f"Lexical search failed: {lexical['error']}")
+        if "error" in knn:
+            # e.g. an index still on mapping v6 without the embedding field
+            logger.warning(f"kNN search failed, returning lexical results only: {knn['error']}")
+            return fuse_search_responses([lexical], size)
+        return fuse_search_responses([lexical, knn], size)
+
+    def get_articles_statistics(self):
+        return format_statistics(self.es_client.search(index=self.index, body=build_statistics_body()))
+
+
+# --- SQLite ---
+
+TOKENIZER = f"unicode61 remove_diacritics 0 tokenchars '{BENGALI_MARKS}'"
+
+_COLUMNS = ("url", "headline", "author", "location", "published_at", "content", "excerpt",
+            "scraped_at", "word_count", "last_updated")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    headline TEXT,
+    author TEXT,
+    location TEXT,
+    published_at TEXT,
+    content TEXT,
+    excerpt TEXT,
+    scraped_at TEXT,
+    word_count INTEGER,
+    last_updated TEXT,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_published_at ON articles (published_at);
+CREATE INDEX IF NOT EXISTS articles_author ON articles (author, published_at);
+CREATE INDEX IF NOT EXISTS articles_location ON articles (location, published_at);
+CREATE INDEX IF NOT EXISTS articles_word_count ON articles (word_count);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    headline, content, content='articles', content_rowid='id', tokenize="{TOKENIZER}"
+);
+-- The index holds normalized text; deletes must pass the same values
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, headline, content)
+    VALUES (new.id, bn_normalize(new.headline), bn_normalize(new.content));
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, headline, content)
+    VALUES ('delete', old.id, bn_normalize(old.headline), bn_normalize(old.content));
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, headline, content)
+    VALUES ('delete', old.id, bn_normalize(old.headline), bn_normalize(old.content));
+    INSERT INTO articles_fts (rowid, headline, content)
+    VALUES (new.id, bn_normalize(new.headline), bn_normalize(new.content));
+END;
+"""
+
+_UPSERT = (
+    f"INSERT INTO articles ({', '.join(_COLUMNS)}, doc) VALUES ({', '.join('?' * (len(_COLUMNS) + 1))}) "
+    f"ON CONFLICT (url) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in _COLUMNS[1:] + ("doc",))
+)
+
+# bm25() is lower for better matches; scores are reported negated like ES scores
+_SCORE = "-bm25(articles_fts, 2.0, 1.0)"
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """FTS5 MATCH expression: any query term, each matched as a prefix."""
+    tokens = bn_words(query)
+    if not tokens:
+        return None
+    return " OR ".join(f'"{token}"*' for token in tokens)
+
+
+def project_source(article: Dict[str, Any], profile: str) -> Dict[str, Any]:
+    """Applies a SOURCE_PROFILES projection to a stored document."""
+    fields = SOURCE_PROFILES[profile]
+    if fields is None:
+        return article
+    if isinstance(fields, dict):
+        excluded = set(fields.get("excludes", []))
+        return {key: value for key, value in article.items() if key not in excluded}
+    return {key: article[key] for key in fields if key in article}
+
+
+class SQLiteStore(ArticleStore):
+    """Articles in an SQLite database with an FTS5 full-text index."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets them read while another writes
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, cached_statements=256)
+            connection.create_function("bn_normalize", 1, bn_normalize, deterministic=True)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            self._local.connection = connection
+        return connection
+
+    def open(self) -> bool:
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+        return True
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def bulk_index_articles(self, articles, chunk_size=100, on_batch=None):
+        success, failed = 0, []
+        connection = self.connection
+        for start in range(0, len(articles), chunk_size):
+            chunk = articles[start:start + chunk_size]
+            rows = [
+                tuple(article.get(column) for column in _COLUMNS)
+                + (json.dumps(article, ensure_ascii=False),)
+                for article in chunk
+            ]
+            try:
+                with connection:  # one transaction per chunk
+                    connection.executemany(_UPSERT, rows)
+            except sqlite3.Error as e:
+                failed.extend({"url": article.get("url"), "error": str(e)} for article in chunk)
+                continue
+            success += len(chunk)
+            if on_batch:
+                on_batch(chunk)
+        return success, failed
+
+    def get_article_by_url(self, url):
+        row = self.connection.execute("SELECT doc FROM articles WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        article = json.loads(row[0])
+        article["_id"] = quote(url, safe='')
+        article["_score"] = None
+        return article
+
+    def search_articles(self, query=None, author=None, location=None, start_date=None,
+                        end_date=None, min_word_count=None, max_word_count=None, headline=None,
+                        size=DEFAULT_SEARCH_SIZE, sort_by="published_at", sort_order="desc",
+                        profile="full", highlight=False, search_after=None, mode="lexical"):
+        if profile not in SOURCE_PROFILES:
+            raise ValueError(f"Unknown projection profile: {profile}")
+        if sort_by not in SORTABLE_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+        if mode != "lexical":
+            raise ValueError(f"The sqlite store only supports lexical search, not {mode}")
+        started = time.perf_counter()
+
+        match = build_match_query(query) if query else None
+        if query and match is None:
+            return {"total_hits": 0, "max_score": None, "took": 0, "articles": [],
+                    "next_search_after": None}
+
+        # Filters mirror es_queries.build_query
+        where, params = [], []
+        if match:
+            where.append("articles_fts MATCH ?")
+            params.append(match)
+        if headline:
+            where.append("a.headline = ?")
+            params.append(headline)
+        if author:
+            where.append("a.author = ?")
+            params.append(author)
+        if location:
+            where.append("a.location = ?")
+            params.append(location)
+        if start_date:
+            where.append("a.published_at >= ?")
+            params.append(start_date)
+        if end_date:
+            # A plain date includes the whole day, as in the Elasticsearch range filter
+            where.append("a.published_at <= ?")
+            params.append(f"{end_date} 23:59" if len(end_date) == 10 else end_date)
+        if min_word_count is not None:
+            where.append("a.word_count >= ?")
+            params.append(min_word_count)
+        if max_word_count is not None:
+            where.append("a.word_count <= ?")
+            params.append(max_word_count)
+
+        source = "articles a JOIN articles_fts ON articles_fts.rowid = a.id" if match else "articles a"
+        score = _SCORE if match else "1.0"
+        sort_column = score if sort_by == "_score" else f"a.{sort_by}"
+        where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+
+        total = self.connection.execute(f"SELECT count(*) FROM {source}{where_sql}", params).fetchone()[0]
+
+        page_where, page_params = list(where), list(params)
+        if search_after:
+            # Keyset pagination on (sort value, url) like the ES sort + tie-breaker;
+            # missing values sort last in either direction, as in Elasticsearch
+            after_value, after_url = search_after
+            if after_value is None:
+                page_where.append(f"({sort_column} IS NULL AND a.url > ?)")
+                page_params.append(after_url)
+            else:
+                beyond = "<" if sort_order == "desc" else ">"
+                page_where.append(f"({sort_column} IS NULL OR {sort_column} {beyond} ? "
+                                  f"OR ({sort_column} = ? AND a.url > ?))")
+                page_params.extend([after_value, after_value, after_url])
+
+        highlight_sql = ""
+        if highlight and match:
+            highlight_sql = (", highlight(articles_fts, 0, '<em>', '</em>')"
+                             ", snippet(articles_fts, 1, '<em>', '</em>', '…', 24)")
+        direction = "DESC" if sort_order == "desc" else "ASC"
+        page_where_sql = f" WHERE {' AND '.join(page_where)}" if page_where else ""
+        rows = self.connection.execute(
+            f"SELECT a.url, a.doc, {score}, {sort_column}{highlight_sql} FROM {source}{page_where_sql} "
+            f"ORDER BY {sort_column} IS NULL, {sort_column} {direction}, a.url ASC LIMIT ?",
+            page_params + [size]
+        ).fetchall()
+
+        articles = []
+        for row in rows:
+            article = project_source(json.loads(row[1]), profile)
+            article["_id"] = quote(row[0], safe='')
+            article["_score"] = row[2]
+            if highlight_sql:
+                article["highlight"] = {"headline": [row[4]], "content": [row[5]]}
+            articles.append(article)
+
+        return {
+            "total_hits": total,
+            "max_score": max((row[2] for row in rows), default=None),
+            "took": int((time.perf_counter() - started) * 1000),
+            "articles": articles,
+            "next_search_after": [rows[-1][3], rows[-1][0]] if rows else None
+        }
+
+    def get_articles_statistics(self):
+        connection = self.connection
+        total, unique_authors, average, minimum, maximum, words, latest, first = connection.execute(
+            "SELECT count(*), count(DISTINCT author), avg(word_count), min(word_count), "
+            "max(word_count), sum(word_count), max(published_at), min(published_at) FROM articles"
+        ).fetchone()
+        top_authors = connection.execute(
+            "SELECT author, count(*) AS n FROM articles WHERE author IS NOT NULL "
+            "GROUP BY author ORDER BY n DESC, author LIMIT 10"
+        ).fetchall()
+        top_locations = connection.execute(
+            "SELECT location, count(*) AS n FROM articles WHERE location IS NOT NULL "
+            "GROUP BY location ORDER BY n DESC, location LIMIT 10"
+        ).fetchall()
+
+        # The ES daily histogram has a bucket for every day from first to last
+        days = 0
+        if first and latest:
+            days = connection.execute(
+                "SELECT CAST(julianday(substr(?, 1, 10)) - julianday(substr(?, 1, 10)) AS INTEGER) + 1",
+                (latest, first)
+            ).fetchone()[0]
+
+        return {
+            "total_articles": total,
+            "top_authors": [{"author": author, "count": count} for author, count in top_authors],
+            "unique_authors": unique_authors,
+            "top_locations": [{"location": location, "count": count} for location, count in top_locations],
+            "word_count_stats": {
+                "average": round(average or 0, 2),
+                "min": minimum,
+                "max": maximum,
+                "total": words
+            },
+            "latest_published_at": latest,
+            "articles_per_day": days
+        }
+
+
+def get_article_store(index: str, backend: str = STORE_BACKEND, path: str = SQLITE_PATH) -> ArticleStore:
+    """
+    Creates the configured store.
+
+    Args:
+        index: Elasticsearch index or alias (elasticsearch backend)
+        backend: "elasticsearch" or "sqlite"
+        path: Database file (sqlite backend)
+    """
+    if backend == "elasticsearch":
+        return ElasticsearchStore(index)
+    if backend == "sqlite":
+        return SQLiteStore(path)
+    raise ValueError(f"Unknown article store: {backend}")
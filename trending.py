@@ -0,0 +1,369 @@
+"""
+Trending terms over rolling time windows, updated as articles are indexed.
+
+The scraper feeds every committed bulk batch to a TrendingTerms engine (it
+is a batch listener, so it works with any article store). For each article
+the distinct words of the headline and of the body, lower-cased and stemmed
+like the embeddings (embeddings.stem), are counted in the hour the article
+was published. Counts are document frequencies: an article mentioning a
+word ten times counts once.
+
+Storage: one count-min sketch per hour and field, in a ring of
+RECENT_HOURS + BASELINE_HOURS hourly slots kept in a memory-mapped file
+(about 20 MB at the defaults), so counts survive restarts and no term list
+is needed. Running sums of the recent and baseline windows are kept in
+memory and moved along whenever the clock enters a new hour, so adding a
+batch touches only its own terms. The file is locked by the process that
+counts into it. Scrapers open it when they index their first batch, so
+processes that only read or migrate the index never take the lock; other
+scrapers indexing at the same time (e.g. a backfill next to the crawl
+daemon) skip trending until it is free.
+
+A term trends when it appears in more articles over the last RECENT_HOURS
+than its baseline rate predicts:
+
+    expected = baseline count * RECENT_HOURS / baseline hours observed
+    score    = (recent - expected) / sqrt(expected + SMOOTHING)
+
+Scores are recomputed after every batch for the batch's terms plus the
+current candidates (bounded by MAX_CANDIDATES), and again by tick() once
+the clock enters a new hour, so trends fade during hours without new
+articles. The top TOP_TERMS per field are written atomically to
+SNAPSHOT_FILE. The backend
+(/api/trending/) serves slices of that snapshot from memory, reloading it
+only when the file changes, so requests never reach Elasticsearch.
+"""
+
+import fcntl
+import functools
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from bengali_text import bn_words
+from embeddings import stem
+
+logger = logging.getLogger(__name__)
+
+TRENDING_DIR = os.environ.get(
+    "TRENDING_DIR", os.path.join(tempfile.gettempdir(), "prothomalo-trending")
+)
+COUNTS_FILE = os.path.join(TRENDING_DIR, "counts.cms")
+SNAPSHOT_FILE = os.path.join(TRENDING_DIR, "trending.json")
+FIELDS = ("headline", "content")
+RECENT_HOURS = int(os.environ.get("TRENDING_RECENT_HOURS", "6"))
+BASELINE_HOURS = int(os.environ.get("TRENDING_BASELINE_HOURS", "72"))
+SKETCH_DEPTH = 4
+SKETCH_WIDTH = 1 << 13  # counters per row; wide enough for a few thousand words an hour
+MIN_COUNT = 3  # articles in the recent window before a term can trend
+SMOOTHING = 2.0  # pseudo-count that keeps rare words from trending on a single mention
+MAX_CANDIDATES = 2000  # terms rescored per field on every batch
+TOP_TERMS = 100  # terms per field written to the snapshot
+MIN_TERM_LENGTH = 2
+
+MAGIC = b"PATREND1"
+# magic, hourly slots, fields, sketch depth, sketch width, recent hours, current hour, first hour
+_HEADER = struct.Struct("<8sQQQQQqq")
+_CLOCK_OFFSET = _HEADER.size - 16
+
+# Article bodies repeat a small vocabulary; stem each word once
+_stem = functools.lru_cache(maxsize=200_000)(stem)
+
+
+def epoch_hour(value: Optional[str] = None) -> Optional[int]:
+    """
+    Hours since the epoch of a published_at value, or of now.
+
+    Args:
+        value: "YYYY-MM-DD HH:MM" or ISO date/time string; None for the current hour
+
+    Returns:
+        int: Hour number, or None if the value cannot be parsed
+    """
+    if value is None:
+        return int(time.time() // 3600)
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace(" ", "T", 1))
+    except (AttributeError, ValueError):
+        return None
+    return int(parsed.timestamp() // 3600)
+
+
+def extract_terms(text: Optional[str]) -> List[str]:
+    """Distinct stemmed words of a text, without numbers and one-letter words."""
+    words = {word.lower() for word in bn_words(text)}
+    terms = {_stem(word) for word in words if not word.isdigit()}
+    return [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+
+
+class TrendingTerms:
+    """Hourly count-min sketches in a ring, with incremental trending scores."""
+
+    def __init__(self, path: str = COUNTS_FILE, snapshot_path: Optional[str] = SNAPSHOT_FILE,
+                 recent_hours: int = RECENT_HOURS, baseline_hours: int = BASELINE_HOURS):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self._lock = threading.RLock()
+        hours = recent_hours + baseline_hours
+        shape = (hours, len(FIELDS), SKETCH_DEPTH, SKETCH_WIDTH)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            now = epoch_hour()
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, *shape, recent_hours, now, now))
+                f.truncate(_HEADER.size + int(np.prod(shape)) * 4)
+            logger.info(f"Created trending counts {path}: {hours} hourly sketches")
+
+        self._file = open(path, "r+b")
+        try:
+            # The window sums live in memory, so only one process may write the counts
+            fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._file.close()
+            raise RuntimeError(f"Trending counts {path} are in use by another process")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, *stored_shape, self.recent_hours, self.current_hour, self.first_hour = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a trending counts file")
+        if (tuple(stored_shape), self.recent_hours) != (shape, recent_hours):
+            logger.warning(f"Trending counts {path} keep their original windows; delete the file to resize")
+            shape = tuple(stored_shape)
+
+        self.hours = shape[0]
+        self.baseline_hours = self.hours - self.recent_hours
+        self.counts = np.ndarray(shape, dtype=np.uint32, buffer=self._map, offset=_HEADER.size)
+        self._sum_windows()
+        self.candidates: Dict[str, Dict[str, None]] = {field: {} for field in FIELDS}
+        self.top: Dict[str, List[Dict[str, Any]]] = {field: [] for field in FIELDS}
+        self.scored_hour: Optional[int] = None  # hour of the last written snapshot
+        self._load_candidates()
+        self.advance()
+
+    def _slot(self, hour: int) -> int:
+        return hour % self.hours
+
+    def _recent_slots(self) -> List[int]:
+        return [self._slot(self.current_hour - i) for i in range(self.recent_hours)]
+
+    def _sum_windows(self) -> None:
+        """Recomputes both window sums from the hourly slots."""
+        recent = np.zeros(self.hours, dtype=bool)
+        recent[self._recent_slots()] = True
+        self.recent = self.counts[recent].sum(axis=0, dtype=np.uint64)
+        self.baseline = self.counts[~recent].sum(axis=0, dtype=np.uint64)
+
+    def _load_candidates(self) -> None:
+        # The last snapshot's terms keep trending lists stable across restarts
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            for field in FIELDS:
+                for entry in snapshot["fields"].get(field, []):
+                    self.candidates[field][entry["term"]] = None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable trending snapshot {self.snapshot_path}: {e}")
+
+    def advance(self, now: Optional[int] = None) -> None:
+        """Moves the windows forward to the current hour, expiring old slots."""
+        now = epoch_hour() if now is None else now
+        with self._lock:
+            if now <= self.current_hour:
+                return
+            if now - self.current_hour >= self.hours:
+                self.counts[:] = 0
+                self.current_hour = self.first_hour = now
+                self._sum_windows()
+            else:
+                for hour in range(self.current_hour + 1, now + 1):
+                    # One hour leaves the recent window, the oldest one the ring
+                    leaving_recent = self.counts[self._slot(hour - self.recent_hours)]
+                    self.recent -= leaving_recent
+                    self.baseline += leaving_recent
+                    expired = self.counts[self._slot(hour)]
+                    self.baseline -= expired
+                    expired[:] = 0
+                self.current_hour = now
+            struct.pack_into("<qq", self._map, _CLOCK_OFFSET, self.current_hour, self.first_hour)
+
+    def _cells(self, terms: List[str]) -> np.ndarray:
+        """Counter index of every term in every sketch row, shape (depth, terms)."""
+        data = [term.encode("utf-8") for term in terms]
+        h1 = np.array([zlib.crc32(d) for d in data], dtype=np.uint64)
+        h2 = np.array([zlib.crc32(d, 0x9E3779B9) | 1 for d in data], dtype=np.uint64)
+        rows = np.arange(SKETCH_DEPTH, dtype=np.uint64)[:, None]
+        return ((h1 + rows * h2) % np.uint64(SKETCH_WIDTH)).astype(np.intp)
+
+    def _estimate(self, sums: np.ndarray, field: int, cells: np.ndarray) -> np.ndarray:
+        return sums[field, np.arange(SKETCH_DEPTH)[:, None], cells].min(axis=0)
+
+    def add_articles(self, articles: Iterable[Dict[str, Any]]) -> int:
+        """
+        Counts the terms of articles in their publication hour.
+
+        Articles older than the ring are skipped; undated or future-dated ones
+        count in the current hour.
+
+        Returns:
+            int: Number of articles counted
+        """
+        self.advance()
+        grouped: Dict[Tuple[int, int], List[str]] = {}
+        counted = 0
+        for article in articles:
+            hour = epoch_hour(article.get("published_at")) if article.get("published_at") else None
+            hour = self.current_hour if hour is None else min(hour, self.current_hour)
+            if hour <= self.current_hour - self.hours:
+                continue
+            counted += 1
+            for field_id, field in enumerate(FIELDS):
+                terms = extract_terms(article.get(field))
+                grouped.setdefault((hour, field_id), []).extend(terms)
+                self.candidates[field].update(dict.fromkeys(terms))
+
+        with self._lock:
+            depth = np.arange(SKETCH_DEPTH)[:, None]
+            for (hour, field_id), terms in grouped.items():
+                if not terms:
+                    continue
+                cells = self._cells(terms)
+                sketch = self.counts[self._slot(hour), field_id]
+                np.add.at(sketch, (depth, cells), 1)
+                window = self.recent if hour > self.current_hour - self.recent_hours else self.baseline
+                np.add.at(window[field_id], (depth, cells), 1)
+            self.first_hour = min(self.first_hour, min((hour for hour, _ in grouped), default=self.first_hour))
+            struct.pack_into("<qq", self._map, _CLOCK_OFFSET, self.current_hour, self.first_hour)
+        return counted
+
+    def score(self, field: str, terms: List[str]) -> List[Dict[str, Any]]:
+        """Trending entries for terms of a field, highest score first (trending ones only)."""
+        if not terms:
+            return []
+        field_id = FIELDS.index(field)
+        cells = self._cells(terms)
+        with self._lock:
+            recent = self._estimate(self.recent, field_id, cells).astype(np.float64)
+            baseline = self._estimate(self.baseline, field_id, cells).astype(np.float64)
+            observed = min(self.baseline_hours, max(0, self.current_hour - self.recent_hours - self.first_hour + 1))
+        expected = baseline * self.recent_hours / observed if observed else np.zeros_like(baseline)
+        scores = (recent - expected) / np.sqrt(expected + SMOOTHING)
+        scores[recent < MIN_COUNT] = -np.inf
+
+        order = np.argsort(-scores, kind="stable")
+        return [
+            {
+                "term": terms[i],
+                "score": round(float(scores[i]), 3),
+                "recent": int(recent[i]),
+                "expected": round(float(expected[i]), 2),
+            }
+            for i in order if scores[i] > 0
+        ]
+
+    def refresh(self) -> None:
+        """Rescores the candidates, prunes them and rebuilds the top lists."""
+        for field in FIELDS:
+            ranked = self.score(field, list(self.candidates[field]))
+            self.top[field] = ranked[:TOP_TERMS]
+            if len(self.candidates[field]) > MAX_CANDIDATES:
+                # Keep trending terms first, then the most recently added ones
+                keep = dict.fromkeys(entry["term"] for entry in ranked[:MAX_CANDIDATES])
+                for term in reversed(self.candidates[field]):
+                    if len(keep) >= MAX_CANDIDATES:
+                        break
+                    keep.setdefault(term, None)
+                self.candidates[field] = keep
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "recent_hours": self.recent_hours,
+            "baseline_hours": self.baseline_hours,
+            "fields": self.top,
+        }
+
+    def write_snapshot(self) -> None:
+        if not self.snapshot_path:
+            return
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.snapshot_path)
+
+    def update_batch(self, articles: List[Dict[str, Any]]) -> None:
+        """Batch listener: counts an indexed batch and publishes fresh top terms."""
+        with self._lock:
+            if self.add_articles(articles):
+                self.refresh()
+                self.write_snapshot()
+                self.scored_hour = self.current_hour
+
+    def tick(self, now: Optional[int] = None) -> bool:
+        """
+        Rescores and publishes the top terms if the hour changed since the last snapshot.
+
+        Args:
+            now: Epoch hour to move to (default: the current hour)
+
+        Returns:
+            bool: True if a new snapshot was written
+        """
+        now = epoch_hour() if now is None else now
+        with self._lock:
+            if self.scored_hour is not None and now <= self.scored_hour:
+                return False
+            self.advance(now)
+            self.refresh()
+            self.write_snapshot()
+            self.scored_hour = self.current_hour
+            return True
+
+    def flush(self) -> None:
+        self._map.flush()
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.flush()
+            self._map.close()
+        self._file.close()
+
+
+class TrendingSnapshot:
+    """Read side for the backend: the latest snapshot, reloaded when the file changes."""
+
+    def __init__(self, path: str = SNAPSHOT_FILE):
+        self.path = path
+        self._mtime = None
+        self._data: Dict[str, Any] = {"updated_at": None, "fields": {field: [] for field in FIELDS}}
+
+    def get(self) -> Dict[str, Any]:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return self._data
+        if mtime != self._mtime:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._data = json.load(f)
+                self._mtime = mtime
+            except (OSError, ValueError) as e:
+                # Keep serving the previous snapshot
+                logger.warning(f"Could not read trending snapshot {self.path}: {e}")
+        return self._data
+
+    def top(self, field: str, k: int) -> List[Dict[str, Any]]:
+        """The k highest-scoring terms of a field."""
+        return self.get()["fields"].get(field, [])[:k]